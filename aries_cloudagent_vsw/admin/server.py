@@ -4,9 +4,11 @@ import asyncio
 import logging
 from typing import Callable, Coroutine, Sequence, Set
 import uuid
+import warnings
 
 from aiohttp import web
 from aiohttp_apispec import (
+    AiohttpApiSpec,
     docs,
     response_schema,
     setup_aiohttp_apispec,
@@ -22,6 +24,9 @@ from ..ledger.error import LedgerConfigError, LedgerTransactionError
 from ..messaging.responder import BaseResponder
 from ..transport.queue.basic import BasicMessageQueue
 from ..transport.outbound.message import OutboundMessage
+from ..utils.loop_monitor import LoopMonitor
+from ..utils.metrics import Metrics
+from ..utils.startup_timer import StartupTimer
 from ..utils.stats import Collector
 from ..utils.task_queue import TaskQueue
 from ..version import __version__
@@ -45,6 +50,45 @@ class AdminStatusSchema(Schema):
     """Schema for the status endpoint."""
 
 
+class LoopStallSchema(Schema):
+    """Schema for an event loop stall."""
+
+    lag = fields.Float(description="Lag of the loop wake-up, in seconds", example=0.35)
+    time = fields.Float(
+        description="Time of the stall, in seconds since the epoch",
+        example=1600000000.0,
+    )
+    stack = fields.List(
+        fields.Str(description="Stack frame"),
+        description="Stack of the call blocking the loop, if captured",
+        allow_none=True,
+    )
+
+
+class AdminStatusLoopSchema(Schema):
+    """Schema for the event loop status endpoint."""
+
+    interval = fields.Float(
+        description="Interval between measurements, in seconds", example=0.1
+    )
+    threshold = fields.Float(
+        description="Lag above which the loop is considered blocked, in seconds",
+        example=0.05,
+    )
+    count = fields.Int(description="Number of measurements", example=1000)
+    max_lag = fields.Float(description="Maximum lag, in seconds", example=0.35)
+    percentiles = fields.Dict(
+        keys=fields.Str(description="Percentile", example="p99"),
+        values=fields.Float(description="Lag, in seconds", example=0.002),
+        description="Lag percentiles",
+    )
+    stall_count = fields.Int(
+        description="Number of stalls since the last reset", example=1
+    )
+    stall_total = fields.Int(description="Number of stalls since startup", example=1)
+    stalls = fields.List(fields.Nested(LoopStallSchema), description="Recent stalls")
+
+
 class AdminStatusLivelinessSchema(Schema):
     """Schema for the liveliness endpoint."""
 
@@ -202,6 +246,12 @@ class AdminServer(BaseAdminServer):
         self.webhook_targets = {}
         self.websocket_queues = {}
         self.site = None
+        # when set, the server is not ready once started until mark_ready is called
+        self.ready_gate = False
+        # with a plugin manifest, the OpenAPI spec is built on first request
+        self.deferred_swagger = bool(context.settings.get("plugin_manifest"))
+        self.swagger_built = False
+        self.swagger_lock = asyncio.Lock()
 
         self.context = context.start_scope("admin")
         self.responder = AdminResponder(
@@ -227,6 +277,19 @@ class AdminServer(BaseAdminServer):
                 "/ws",  # ws handler checks authentication
             ] or path.startswith("/static/swagger/")
 
+        # Build the OpenAPI spec on the first request for it
+        if self.deferred_swagger:
+
+            @web.middleware
+            async def build_swagger(request, handler):
+                if request.path == "/api/docs/swagger.json" and not self.swagger_built:
+                    async with self.swagger_lock:
+                        if not self.swagger_built:
+                            await self.build_swagger(request.app)
+                return await handler(request)
+
+            middlewares.append(build_swagger)
+
         # If admin_api_key is None, then admin_insecure_mode must be set so
         # we can safely enable the admin server with no security
         if self.admin_api_key:
@@ -270,9 +333,15 @@ class AdminServer(BaseAdminServer):
         app.add_routes(
             [
                 web.get("/", self.redirect_handler, allow_head=False),
+                web.get("/metrics", self.metrics_handler, allow_head=False),
                 web.get("/plugins", self.plugins_handler, allow_head=False),
                 web.get("/status", self.status_handler, allow_head=False),
                 web.post("/status/reset", self.status_reset_handler),
+                web.get("/status/timing", self.status_timing_handler, allow_head=False),
+                web.get("/status/loop", self.status_loop_handler, allow_head=False),
+                web.get(
+                    "/status/startup", self.status_startup_handler, allow_head=False
+                ),
                 web.get("/status/live", self.liveliness_handler, allow_head=False),
                 web.get("/status/ready", self.readiness_handler, allow_head=False),
                 web.get("/shutdown", self.shutdown_handler, allow_head=False),
@@ -326,26 +395,14 @@ class AdminServer(BaseAdminServer):
         runner = web.AppRunner(self.app)
         await runner.setup()
 
-        plugin_registry: PluginRegistry = await self.context.inject(
-            PluginRegistry, required=False
-        )
-        if plugin_registry:
-            plugin_registry.post_process_routes(self.app)
-
-        # order tags alphabetically, parameters deterministically and pythonically
-        swagger_dict = self.app._state["swagger_dict"]
-        swagger_dict.get("tags", []).sort(key=lambda t: t["name"])
-        for path in swagger_dict["paths"].values():
-            for method_spec in path.values():
-                method_spec["parameters"].sort(
-                    key=lambda p: (p["in"], not p["required"], p["name"])
-                )
+        if not self.deferred_swagger:
+            await self.post_process_swagger(self.app)
 
         self.site = web.TCPSite(runner, host=self.host, port=self.port)
 
         try:
             await self.site.start()
-            self.app._state["ready"] = True
+            self.app._state["ready"] = not self.ready_gate
             self.app._state["alive"] = True
         except OSError:
             raise AdminSetupError(
@@ -371,6 +428,53 @@ class AdminServer(BaseAdminServer):
             }
             swagger["security"] = [{"ApiKeyHeader": []}]
 
+    async def post_process_swagger(self, app: web.Application):
+        """Apply the OpenAPI fixups of plugins and order the spec."""
+        plugin_registry: PluginRegistry = await self.context.inject(
+            PluginRegistry, required=False
+        )
+        if plugin_registry:
+            plugin_registry.post_process_routes(app)
+
+        # order tags alphabetically, parameters deterministically and pythonically
+        swagger_dict = app._state["swagger_dict"]
+        swagger_dict.get("tags", []).sort(key=lambda t: t["name"])
+        for path in swagger_dict["paths"].values():
+            for method_spec in path.values():
+                method_spec["parameters"].sort(
+                    key=lambda p: (p["in"], not p["required"], p["name"])
+                )
+
+    async def build_swagger(self, app: web.Application):
+        """
+        Build the OpenAPI spec of all routes, deferred from startup.
+
+        The handlers of routes registered from the plugin manifest are loaded
+        for their OpenAPI attributes, then the spec built at startup, without
+        them, is replaced.
+        """
+        startup_timer = (
+            await self.context.inject(StartupTimer, required=False) or StartupTimer()
+        )
+        with startup_timer.phase("admin.openapi"):
+            for route in app.router.routes():
+                load_handler = getattr(route.handler, "load_handler", None)
+                if load_handler:
+                    load_handler()
+            with warnings.catch_warnings():
+                # the spec of the running application is replaced
+                warnings.simplefilter("ignore", DeprecationWarning)
+                AiohttpApiSpec(
+                    url=None,
+                    app=app,
+                    in_place=True,
+                    title=self.context.settings.get("default_label"),
+                    version=f"v{__version__}",
+                )
+            await self.on_startup(app)
+            await self.post_process_swagger(app)
+        self.swagger_built = True
+
     @docs(tags=["server"], summary="Fetch the list of loaded plugins")
     @response_schema(AdminModulesSchema(), 200)
     async def plugins_handler(self, request: web.BaseRequest):
@@ -428,8 +532,101 @@ class AdminServer(BaseAdminServer):
         collector: Collector = await self.context.inject(Collector, required=False)
         if collector:
             collector.reset()
+        loop_monitor: LoopMonitor = await self.context.inject(
+            LoopMonitor, required=False
+        )
+        if loop_monitor:
+            loop_monitor.reset()
         return web.json_response({})
 
+    @docs(
+        tags=["server"],
+        summary="Fetch timing statistics with percentiles, as text metrics",
+        produces=["text/plain"],
+    )
+    async def status_timing_handler(self, request: web.BaseRequest):
+        """
+        Request handler for the timing statistics in a text metrics format.
+
+        Args:
+            request: aiohttp request object
+
+        Returns:
+            The web response
+
+        """
+        collector: Collector = await self.context.inject(Collector, required=False)
+        if not collector:
+            raise web.HTTPNotFound(reason="Timing statistics are not enabled")
+        return web.Response(
+            text=collector.to_text(), content_type="text/plain", charset="utf-8"
+        )
+
+    @docs(tags=["server"], summary="Fetch event loop lag and recent stalls")
+    @response_schema(AdminStatusLoopSchema(), 200)
+    async def status_loop_handler(self, request: web.BaseRequest):
+        """
+        Request handler for the event loop lag and the calls blocking the loop.
+
+        Args:
+            request: aiohttp request object
+
+        Returns:
+            The web response
+
+        """
+        loop_monitor: LoopMonitor = await self.context.inject(
+            LoopMonitor, required=False
+        )
+        if not loop_monitor:
+            raise web.HTTPNotFound(reason="Event loop monitoring is not enabled")
+        return web.json_response(loop_monitor.status())
+
+    @docs(tags=["server"], summary="Fetch the time taken by each phase of startup")
+    @response_schema(AdminStatusSchema(), 200)
+    async def status_startup_handler(self, request: web.BaseRequest):
+        """
+        Request handler for the startup timing report.
+
+        Args:
+            request: aiohttp request object
+
+        Returns:
+            The web response
+
+        """
+        startup_timer: StartupTimer = await self.context.inject(
+            StartupTimer, required=False
+        )
+        if not startup_timer:
+            raise web.HTTPNotFound(reason="Startup timing is not available")
+        return web.json_response(startup_timer.report())
+
+    @docs(
+        tags=["server"],
+        summary="Fetch metrics in the Prometheus text exposition format",
+        produces=["text/plain"],
+    )
+    async def metrics_handler(self, request: web.BaseRequest):
+        """
+        Request handler for the agent metrics.
+
+        Args:
+            request: aiohttp request object
+
+        Returns:
+            The web response
+
+        """
+        metrics: Metrics = await self.context.inject(Metrics, required=False)
+        if not metrics:
+            raise web.HTTPNotFound(reason="Metrics are not enabled")
+        collector: Collector = await self.context.inject(Collector, required=False)
+        return web.Response(
+            text=await metrics.to_text(collector),
+            headers={"Content-Type": "text/plain; version=0.0.4; charset=utf-8"},
+        )
+
     async def redirect_handler(self, request: web.BaseRequest):
         """Perform redirect to documentation."""
         raise web.HTTPFound("/api/doc")
@@ -490,6 +687,13 @@ class AdminServer(BaseAdminServer):
 
         return web.json_response({})
 
+    def mark_ready(self):
+        """Open the readiness gate, once the rest of the agent is started."""
+        self.ready_gate = False
+        # not if failed to start or since notified of a fatal error
+        if self.app and self.app._state.get("alive"):
+            self.app._state["ready"] = True
+
     def notify_fatal_error(self):
         """Set our readiness flags to force a restart (openshift)."""
         LOGGER.error("Received shutdown request notify_fatal_error()")
@@ -12,6 +12,9 @@ from ...config.provider import ClassProvider
 from ...core.plugin_registry import PluginRegistry
 from ...core.protocol_registry import ProtocolRegistry
 from ...transport.outbound.message import OutboundMessage
+from ...utils.loop_monitor import LoopMonitor
+from ...utils.metrics import Metrics
+from ...utils.startup_timer import StartupTimer
 from ...utils.stats import Collector
 from ...utils.task_queue import TaskQueue
 
@@ -217,6 +220,136 @@ class TestAdminServer(AsyncTestCase):
 
         await server.stop()
 
+    async def test_visit_metrics(self):
+        server = self.get_admin_server({"admin.admin_insecure_mode": True})
+        await server.start()
+
+        async with self.client_session.get(
+            f"http://127.0.0.1:{self.port}/metrics", headers={}
+        ) as response:
+            assert response.status == 404
+
+        metrics = Metrics()
+        metrics.inbound_sessions.set(2)
+        server.context.injector.bind_instance(Metrics, metrics)
+        collector = await server.context.inject(Collector)
+        collector.log("handle", 0.25)
+        async with self.client_session.get(
+            f"http://127.0.0.1:{self.port}/metrics", headers={}
+        ) as response:
+            assert response.status == 200
+            assert response.content_type == "text/plain"
+            text = await response.text()
+            assert "\nacapy_inbound_sessions 2\n" in text
+            assert 'acapy_timing_seconds_count{name="handle"} 1' in text
+
+        await server.stop()
+
+    async def test_visit_status_timing(self):
+        server = self.get_admin_server({"admin.admin_insecure_mode": True})
+        await server.start()
+        collector = await server.context.inject(Collector)
+        collector.log("handle", 0.25)
+
+        async with self.client_session.get(
+            f"http://127.0.0.1:{self.port}/status", headers={}
+        ) as response:
+            result = await response.json()
+            assert result["timing"]["p99"] == {"handle": 0.25}
+
+        async with self.client_session.get(
+            f"http://127.0.0.1:{self.port}/status/timing", headers={}
+        ) as response:
+            assert response.status == 200
+            assert response.content_type == "text/plain"
+            text = await response.text()
+            assert 'acapy_timing_seconds_count{name="handle"} 1' in text
+
+        server.context.injector.clear_binding(Collector)
+        async with self.client_session.get(
+            f"http://127.0.0.1:{self.port}/status/timing", headers={}
+        ) as response:
+            assert response.status == 404
+
+        await server.stop()
+
+    async def test_visit_status_loop(self):
+        server = self.get_admin_server({"admin.admin_insecure_mode": True})
+        await server.start()
+
+        async with self.client_session.get(
+            f"http://127.0.0.1:{self.port}/status/loop", headers={}
+        ) as response:
+            assert response.status == 404
+
+        loop_monitor = LoopMonitor(0.5)
+        loop_monitor.record(0.75)
+        server.context.injector.bind_instance(LoopMonitor, loop_monitor)
+        async with self.client_session.get(
+            f"http://127.0.0.1:{self.port}/status/loop", headers={}
+        ) as response:
+            assert response.status == 200
+            result = await response.json()
+            assert result["stall_count"] == 1
+            assert result["stalls"][0]["lag"] == 0.75
+
+        async with self.client_session.post(
+            f"http://127.0.0.1:{self.port}/status/reset", headers={}
+        ) as response:
+            assert response.status == 200
+        assert loop_monitor.stall_count == 0
+        assert loop_monitor.stall_total == 1
+
+        await server.stop()
+
+    async def test_visit_startup_timing(self):
+        server = self.get_admin_server({"admin.admin_insecure_mode": True})
+        await server.start()
+
+        async with self.client_session.get(
+            f"http://127.0.0.1:{self.port}/status/startup", headers={}
+        ) as response:
+            assert response.status == 404
+
+        startup_timer = StartupTimer()
+        with startup_timer.phase("wallet"):
+            pass
+        startup_timer.finish()
+        server.context.injector.bind_instance(StartupTimer, startup_timer)
+        async with self.client_session.get(
+            f"http://127.0.0.1:{self.port}/status/startup", headers={}
+        ) as response:
+            assert response.status == 200
+            result = await response.json()
+            assert result == startup_timer.report()
+
+        await server.stop()
+
+    async def test_deferred_swagger(self):
+        server = self.get_admin_server(
+            {"admin.admin_api_key": "test-api-key", "plugin_manifest": "manifest"}
+        )
+        startup_timer = StartupTimer()
+        server.context.injector.bind_instance(StartupTimer, startup_timer)
+        await server.start()
+        plugin_registry = await server.context.inject(test_module.PluginRegistry)
+        plugin_registry.post_process_routes.assert_not_called()
+        assert not server.swagger_built
+
+        for _ in range(2):
+            async with self.client_session.get(
+                f"http://127.0.0.1:{self.port}/api/docs/swagger.json", headers={}
+            ) as response:
+                assert response.status == 200
+                swagger = await response.json()
+                assert "/status/startup" in swagger["paths"]
+                assert "ApiKeyHeader" in swagger["securityDefinitions"]
+        assert server.swagger_built
+        plugin_registry.post_process_routes.assert_called_once_with(server.app)
+        assert [name for (name, _) in startup_timer.phases] == ["admin.openapi"]
+
+        await server.stop()
+
     async def test_visit_secure_mode(self):
         settings = {
             "admin.admin_insecure_mode": False,
@@ -267,6 +400,29 @@ class TestAdminServer(AsyncTestCase):
             assert response.status == 200
         await server.stop()
 
+    async def test_server_ready_gate(self):
+        server = self.get_admin_server({"admin.admin_insecure_mode": True})
+        server.ready_gate = True
+        await server.start()
+
+        async with self.client_session.get(
+            f"http://127.0.0.1:{self.port}/status/ready", headers={}
+        ) as response:
+            assert response.status == 503
+
+        server.mark_ready()
+        async with self.client_session.get(
+            f"http://127.0.0.1:{self.port}/status/ready", headers={}
+        ) as response:
+            assert response.status == 200
+            assert (await response.json())["ready"]
+
+        # not ready again once notified of a fatal error
+        server.notify_fatal_error()
+        server.mark_ready()
+        assert not server.app._state["ready"]
+        await server.stop()
+
     async def test_server_health_state(self):
         settings = {
             "admin.admin_insecure_mode": True,
@@ -17,6 +17,9 @@ class BaseCache(ABC):
     def __init__(self):
         """Initialize the cache instance."""
         self._key_locks = {}
+        # lookup counters, maintained by implementations which support them
+        self.hits = 0
+        self.misses = 0
 
     @abstractmethod
     async def get(self, key: Text):
@@ -165,3 +165,10 @@ class TestBasicCache:
     @pytest.mark.asyncio
     async def test_repr(self, cache):
         assert isinstance(repr(cache), str)
+
+    @pytest.mark.asyncio
+    async def test_hit_counts(self, cache):
+        await cache.get("valid key")
+        await cache.get("valid key")
+        await cache.get("doesn't exist")
+        assert (cache.hits, cache.misses) == (2, 1)
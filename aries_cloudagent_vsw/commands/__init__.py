@@ -8,6 +8,7 @@ def available_commands():
     """Index available commands."""
     return [
         {"name": "help", "summary": "Print available commands"},
+        {"name": "migrate", "summary": "Back-fill the record tags of a wallet"},
         {"name": "provision", "summary": "Provision an agent"},
         {"name": "start", "summary": "Start a new agent process"},
     ]
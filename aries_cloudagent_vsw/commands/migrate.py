@@ -0,0 +1,57 @@
+"""Migrate command for back-filling the record tags of an existing wallet."""
+
+import asyncio
+from argparse import ArgumentParser
+from typing import Sequence
+
+from ..config import argparse as arg
+from ..config.base import BaseError
+from ..config.default_context import DefaultContextBuilder
+from ..config.record_tags import record_tags_config
+from ..config.util import common_config
+
+
+class MigrateError(BaseError):
+    """Base exception for migration errors."""
+
+
+def init_argument_parser(parser: ArgumentParser):
+    """Initialize an argument parser with the module's arguments."""
+    return arg.load_argument_groups(
+        parser, *arg.group.get_registered(arg.CAT_PROVISION)
+    )
+
+
+async def migrate(settings: dict):
+    """Back-fill the tags of the records of each record class."""
+    context_builder = DefaultContextBuilder(settings)
+    context = await context_builder.build()
+
+    try:
+        updated = await record_tags_config(context, force=True)
+    except BaseError as e:
+        raise MigrateError("Error during migration") from e
+    for (record_type, count) in updated.items():
+        print(f"Updated tags of {count} {record_type} records")
+
+
+def execute(argv: Sequence[str] = None):
+    """Entrypoint."""
+    parser = ArgumentParser()
+    parser.prog += " migrate"
+    get_settings = init_argument_parser(parser)
+    args = parser.parse_args(argv)
+    settings = get_settings(args)
+    common_config(settings)
+
+    loop = asyncio.get_event_loop()
+    loop.run_until_complete(migrate(settings))
+
+
+def main():
+    """Execute the main line."""
+    if __name__ == "__main__":
+        execute()
+
+
+main()
@@ -0,0 +1,47 @@
+from asynctest import TestCase as AsyncTestCase
+from asynctest import mock as async_mock
+
+from ...config.base import ConfigError
+from ...connections.models.connection_record import ConnectionRecord
+
+from .. import migrate as command
+
+
+class TestMigrate(AsyncTestCase):
+    def test_bad_calls(self):
+        with self.assertRaises(SystemExit):
+            command.execute(["bad"])
+
+    async def test_migrate(self):
+        with async_mock.patch.object(
+            command,
+            "record_tags_config",
+            async_mock.CoroutineMock(return_value={"connection": 1}),
+        ) as mock_record_tags:
+            await command.migrate({})
+            assert mock_record_tags.call_args[1] == {"force": True}
+
+    async def test_migrate_x(self):
+        with async_mock.patch.object(
+            ConnectionRecord,
+            "migrate_tags",
+            async_mock.CoroutineMock(side_effect=ConfigError("no wallet")),
+        ):
+            with self.assertRaises(command.MigrateError):
+                await command.migrate({})
+
+    def test_execute(self):
+        with async_mock.patch.object(
+            command, "migrate", async_mock.CoroutineMock()
+        ) as mock_migrate:
+            command.execute([])
+            mock_migrate.assert_awaited_once()
+
+    def test_main(self):
+        with async_mock.patch.object(
+            command, "__name__", "__main__"
+        ) as mock_name, async_mock.patch.object(
+            command, "execute", async_mock.MagicMock()
+        ) as mock_execute:
+            command.main()
+            mock_execute.assert_called_once()
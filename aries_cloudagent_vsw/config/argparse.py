@@ -370,6 +370,17 @@ class GeneralGroup(ArgumentGroup):
             help="Load <module> as external plugin module. Multiple\
             instances of this parameter can be specified.",
         )
+        parser.add_argument(
+            "--plugin-manifest",
+            type=str,
+            metavar="<path>",
+            help="Start up from a manifest of the plugins, registering their\
+            message types and admin routes without importing their modules:\
+            the module of an admin route is imported on its first request, and\
+            the OpenAPI spec is built on the first request for it. The manifest\
+            is written to <path> if missing, or out of date with the version\
+            or external plugins.",
+        )
         parser.add_argument(
             "--storage-type",
             type=str,
@@ -418,12 +429,66 @@ class GeneralGroup(ArgumentGroup):
             metavar="<tails-server-base-url>",
             help="Sets the base url of the tails server in use.",
         )
+        parser.add_argument(
+            "--revocation-publish-interval",
+            type=float,
+            metavar="<seconds>",
+            help="Publish revocations in batches: credentials revoked with\
+            publication requested are marked pending, and published as one\
+            registry delta per revocation registry at this interval.\
+            Default: publish each revocation immediately.",
+        )
+        parser.add_argument(
+            "--revocation-publish-batch-size",
+            type=int,
+            metavar="<count>",
+            help="With --revocation-publish-interval, publish a revocation\
+            registry's pending revocations as soon as this many accumulate.",
+        )
+        parser.add_argument(
+            "--revocation-registry-pool-depth",
+            type=int,
+            metavar="<count>",
+            help="Keep this many revocation registries generated, published and\
+            with tails files uploaded, ready for each revocable credential\
+            definition, so that issuance does not wait when a registry fills.\
+            Default: stage one registry after each rollover.",
+        )
+        parser.add_argument(
+            "--revocation-registry-pool-workers",
+            type=int,
+            metavar="<count>",
+            help="The maximum number of revocation registries to generate\
+            concurrently for the registry pool. Default: 1.",
+        )
+        parser.add_argument(
+            "--connection-cache-warm-rate",
+            type=float,
+            metavar="<per-second>",
+            help="At startup, populate the connection resolution caches for\
+            ready connections at up to this many connections per second, and\
+            keep them populated as connections change state, so that the first\
+            message from each peer after a restart is not delayed.\
+            Default: populate caches on first message.",
+        )
+        parser.add_argument(
+            "--record-cache-size",
+            type=int,
+            metavar="<count>",
+            help="Keep the stored values of up to this many connection and\
+            exchange records in memory, written through as they are saved.\
+            Cached values do not expire: only enable for an agent process\
+            which does not share its wallet with other agent processes.\
+            Default: 0 (disabled).",
+        )
 
     def get_settings(self, args: Namespace) -> dict:
         """Extract general settings."""
         settings = {}
         if args.external_plugins:
             settings["external_plugins"] = args.external_plugins
+        if args.plugin_manifest:
+            settings["plugin_manifest"] = args.plugin_manifest
         if args.storage_type:
             settings["storage_type"] = args.storage_type
         if args.endpoint:
@@ -437,6 +502,33 @@ class GeneralGroup(ArgumentGroup):
             settings["read_only_ledger"] = True
         if args.tails_server_base_url:
             settings["tails_server_base_url"] = args.tails_server_base_url
+        if args.revocation_publish_interval:
+            settings["revocation.publish_interval"] = args.revocation_publish_interval
+            if args.revocation_publish_batch_size:
+                settings[
+                    "revocation.publish_batch_size"
+                ] = args.revocation_publish_batch_size
+        elif args.revocation_publish_batch_size:
+            raise ArgsParseError(
+                "Parameter --revocation-publish-batch-size requires"
+                " --revocation-publish-interval"
+            )
+        if args.revocation_registry_pool_depth:
+            settings[
+                "revocation.registry_pool_depth"
+            ] = args.revocation_registry_pool_depth
+        if args.revocation_registry_pool_workers:
+            settings[
+                "revocation.registry_pool_workers"
+            ] = args.revocation_registry_pool_workers
+        if args.connection_cache_warm_rate:
+            settings["connections.cache_warm_rate"] = args.connection_cache_warm_rate
+        if args.record_cache_size is not None:
+            if args.record_cache_size < 0:
+                raise ArgsParseError(
+                    "Parameter --record-cache-size must not be negative"
+                )
+            settings["records.cache_size"] = args.record_cache_size
         return settings
 
 
@@ -481,6 +573,69 @@ class LedgerGroup(ArgumentGroup):
             the URL might be 'http://localhost:9000/genesis'.\
             Genesis transactions URLs are available for the Sovrin test/main networks.",
         )
+        parser.add_argument(
+            "--ledger-did-cache-ttl",
+            type=int,
+            metavar="<seconds>",
+            help="Specifies how long, in seconds, verkeys and endpoints looked up\
+            for public DIDs on the ledger remain cached. Default: 600.",
+        )
+        parser.add_argument(
+            "--ledger-did-negative-cache-ttl",
+            type=int,
+            metavar="<seconds>",
+            help="Specifies how long, in seconds, the absence of a DID on the\
+            ledger remains cached. Default: 30.",
+        )
+        parser.add_argument(
+            "--ledger-artifact-cache",
+            type=str,
+            dest="ledger_artifact_cache",
+            metavar="<directory>",
+            help="Specifies a directory in which to persist schemas, credential\
+            definitions and revocation registry definitions fetched from the\
+            ledger, so that they need not be fetched again after a restart.",
+        )
+        parser.add_argument(
+            "--ledger-artifact-bundle",
+            type=str,
+            dest="ledger_artifact_bundle",
+            metavar="<bundle-file>",
+            help="Specifies a JSON file of schemas, credential definitions and\
+            revocation registry definitions to preload into the ledger artifact\
+            cache at startup. Requires --ledger-artifact-cache.",
+        )
+        parser.add_argument(
+            "--ledger-type",
+            type=str,
+            choices=("indy", "memory"),
+            metavar="<ledger-type>",
+            help="Specifies the type of ledger to use: 'indy' (the default), or\
+            'memory' for a ledger kept in memory, standing in for an indy pool in\
+            load tests and when running without a ledger. Agents in one process\
+            share the memory ledger of the same pool name.",
+        )
+        parser.add_argument(
+            "--ledger-memory-file",
+            type=str,
+            metavar="<file>",
+            help="Specifies a file in which to persist the memory ledger, so that\
+            its transactions survive restarts. Requires --ledger-type memory.",
+        )
+        parser.add_argument(
+            "--ledger-memory-read-latency",
+            type=float,
+            metavar="<milliseconds>",
+            help="Specifies the simulated duration of each read from the memory\
+            ledger. Requires --ledger-type memory. Default: 0.",
+        )
+        parser.add_argument(
+            "--ledger-memory-write-latency",
+            type=float,
+            metavar="<milliseconds>",
+            help="Specifies the simulated duration of each write to the memory\
+            ledger. Requires --ledger-type memory. Default: 0.",
+        )
 
     def get_settings(self, args: Namespace) -> dict:
         """Extract ledger settings."""
@@ -493,6 +648,38 @@ class LedgerGroup(ArgumentGroup):
             settings["ledger.genesis_transactions"] = args.genesis_transactions
         if args.ledger_pool_name:
             settings["ledger.pool_name"] = args.ledger_pool_name
+        if args.ledger_did_cache_ttl is not None:
+            settings["ledger.did_cache_ttl"] = args.ledger_did_cache_ttl
+        if args.ledger_did_negative_cache_ttl is not None:
+            settings[
+                "ledger.did_negative_cache_ttl"
+            ] = args.ledger_did_negative_cache_ttl
+        if args.ledger_artifact_cache:
+            settings["ledger.artifact_cache_dir"] = args.ledger_artifact_cache
+            if args.ledger_artifact_bundle:
+                settings["ledger.artifact_bundle"] = args.ledger_artifact_bundle
+        elif args.ledger_artifact_bundle:
+            raise ArgsParseError(
+                "Parameter --ledger-artifact-bundle requires --ledger-artifact-cache"
+            )
+        if args.ledger_type:
+            settings["ledger.type"] = args.ledger_type
+        memory_args = {
+            "file": args.ledger_memory_file,
+            "read_latency": args.ledger_memory_read_latency,
+            "write_latency": args.ledger_memory_write_latency,
+        }
+        for (name, value) in memory_args.items():
+            if value is None:
+                continue
+            flag = "--ledger-memory-" + name.replace("_", "-")
+            if args.ledger_type != "memory":
+                raise ArgsParseError(f"Parameter {flag} requires --ledger-type memory")
+            if name.endswith("latency"):
+                if value < 0:
+                    raise ArgsParseError(f"Parameter {flag} must not be negative")
+                value /= 1000
+            settings["ledger.memory_" + name] = value
         return settings
 
 
@@ -586,6 +773,30 @@ class ProtocolGroup(ArgumentGroup):
             metavar="<log-path>",
             help="Write timing information to a given log file.",
         )
+        parser.add_argument(
+            "--timing-window",
+            type=float,
+            metavar="<seconds>",
+            help="Report timing percentiles over the values logged in the last\
+            one to two periods of this length, rather than since the last reset\
+            of the statistics. Default: since the last reset.",
+        )
+        parser.add_argument(
+            "--monitor-loop-lag",
+            type=float,
+            metavar="<milliseconds>",
+            help="Measure the scheduling lag of the event loop, and log the stack\
+            of any call blocking the loop for longer than this threshold. The lag\
+            and recent stalls are reported by the /status/loop admin endpoint and\
+            in the metrics.",
+        )
+        parser.add_argument(
+            "--monitor-loop-interval",
+            type=float,
+            metavar="<milliseconds>",
+            help="Interval between measurements of the event loop lag.\
+            Default: 100.",
+        )
         parser.add_argument(
             "--trace", action="store_true", help="Generate tracing events.",
         )
@@ -607,6 +818,21 @@ class ProtocolGroup(ArgumentGroup):
             metavar="<trace-label>",
             help="Label (agent name) used logging events.",
         )
+        parser.add_argument(
+            "--trace-spans-sample-rate",
+            type=float,
+            metavar="<fraction>",
+            help="Record latency spans, from receipt to delivery, for this fraction\
+            of inbound messages, between 0 and 1. Requires --trace-spans-target.",
+        )
+        parser.add_argument(
+            "--trace-spans-target",
+            type=str,
+            metavar="<path-or-url>",
+            help="Export latency spans in the OTLP JSON format, appending them to\
+            the given file or posting them to the given HTTP endpoint, such as\
+            http://localhost:4318/v1/traces for an OpenTelemetry collector.",
+        )
         parser.add_argument(
             "--preserve-exchange-records",
             action="store_true",
@@ -628,6 +854,22 @@ class ProtocolGroup(ArgumentGroup):
             settings["timing.enabled"] = True
         if args.timing_log:
             settings["timing.log_file"] = args.timing_log
+        if args.timing_window:
+            settings["timing.window"] = args.timing_window
+        if args.monitor_loop_lag is not None:
+            if args.monitor_loop_lag <= 0:
+                raise ArgsParseError("Parameter --monitor-loop-lag must be positive")
+            settings["monitor.loop_lag"] = args.monitor_loop_lag / 1000
+            if args.monitor_loop_interval is not None:
+                if args.monitor_loop_interval <= 0:
+                    raise ArgsParseError(
+                        "Parameter --monitor-loop-interval must be positive"
+                    )
+                settings["monitor.loop_interval"] = args.monitor_loop_interval / 1000
+        elif args.monitor_loop_interval is not None:
+            raise ArgsParseError(
+                "Parameter --monitor-loop-interval requires --monitor-loop-lag"
+            )
         # note that you can configure tracing without actually enabling it
         # this is to allow message- or exchange-specific tracing (vs global)
         settings["trace.target"] = "log"
@@ -658,6 +900,17 @@ class ProtocolGroup(ArgumentGroup):
                 )
             except Exception as e:
                 raise ArgsParseError("Error writing trace event " + str(e))
+        if args.trace_spans_sample_rate is not None:
+            if not 0 < args.trace_spans_sample_rate <= 1:
+                raise ArgsParseError(
+                    "Parameter --trace-spans-sample-rate must be between 0 and 1"
+                )
+            if not args.trace_spans_target:
+                raise ArgsParseError(
+                    "Parameter --trace-spans-sample-rate requires --trace-spans-target"
+                )
+            settings["trace.spans.sample_rate"] = args.trace_spans_sample_rate
+            settings["trace.spans.target"] = args.trace_spans_target
         if args.preserve_exchange_records:
             settings["preserve_exchange_records"] = True
         return settings
@@ -683,7 +936,8 @@ class TransportGroup(ArgumentGroup):
             help="REQUIRED. Defines the inbound transport(s) on which the agent\
             listens for receiving messages from other agents. This parameter can\
             be specified multiple times to create multiple interfaces.\
-            Built-in inbound transport types include 'http' and 'ws'.\
+            Built-in inbound transport types include 'http' and 'ws', and\
+            'loopback' for agents running in the same process.\
             However, other transports can be loaded by specifying an absolute\
             module path.",
         )
@@ -698,7 +952,7 @@ class TransportGroup(ArgumentGroup):
             help="REQUIRED. Defines the outbound transport(s) on which the agent\
             will send outgoing messages to other agents. This parameter can be passed\
             multiple times to supoort multiple transport types. Supported outbound\
-            transport types are 'http' and 'ws'.",
+            transport types are 'http', 'ws' and 'loopback'.",
         )
         parser.add_argument(
             "-l",
@@ -838,6 +1092,15 @@ class WalletGroup(ArgumentGroup):
             and the '--seed' parameter specifies a new DID, the agent will use\
             the new DID in place of the existing DID. Default: false.",
         )
+        parser.add_argument(
+            "--wallet-key-pool-size",
+            type=int,
+            metavar="<count>",
+            help="Keep this many pairwise DIDs, and as many invitation keys,\
+            created in the wallet ahead of demand, refilling in the background,\
+            so that setting up a connection does not wait on key generation.\
+            Default: create keys on demand.",
+        )
 
     def get_settings(self, args: Namespace) -> dict:
         """Extract wallet settings."""
@@ -862,4 +1125,6 @@ class WalletGroup(ArgumentGroup):
             settings["wallet.storage_creds"] = args.wallet_storage_creds
         if args.replace_public_did:
             settings["wallet.replace_public_did"] = True
+        if args.wallet_key_pool_size:
+            settings["wallet.key_pool_size"] = args.wallet_key_pool_size
         return settings
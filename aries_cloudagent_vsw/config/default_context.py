@@ -6,12 +6,16 @@ from .provider import CachedProvider, ClassProvider, StatsProvider
 
 from ..cache.base import BaseCache
 from ..cache.basic import BasicCache
+from ..connections.did_doc_cache import DIDDocCache
+from ..core.plugin_manifest import read_manifest, write_manifest, STANDARD_PLUGINS
 from ..core.plugin_registry import PluginRegistry
 from ..core.protocol_registry import ProtocolRegistry
 from ..ledger.base import BaseLedger
 from ..ledger.provider import LedgerProvider
+from ..messaging.models.record_cache import RecordCache
 from ..issuer.base import BaseIssuer
 from ..holder.base import BaseHolder
+from ..holder.witness_cache import RevocationWitnessCache
 from ..verifier.base import BaseVerifier
 from ..tails.base import BaseTailsServer
 
@@ -23,6 +27,8 @@ from ..protocols.introduction.v0_1.demo_service import DemoIntroductionService
 from ..storage.base import BaseStorage
 from ..storage.provider import StorageProvider
 from ..transport.wire_format import BaseWireFormat
+from ..utils.metrics import Metrics
+from ..utils.startup_timer import StartupTimer
 from ..utils.stats import Collector
 from ..wallet.base import BaseWallet
 from ..wallet.provider import WalletProvider
@@ -36,19 +42,30 @@ class DefaultContextBuilder(ContextBuilder):
         context = InjectionContext(settings=self.settings)
         context.settings.set_default("default_label", "Aries Cloud Agent")
 
+        # Report of the time taken by each phase of startup
+        startup_timer = StartupTimer()
+        context.injector.bind_instance(StartupTimer, startup_timer)
+
         if context.settings.get("timing.enabled"):
             timing_log = context.settings.get("timing.log_file")
-            collector = Collector(log_path=timing_log)
+            collector = Collector(
+                log_path=timing_log, window=context.settings.get("timing.window")
+            )
             context.injector.bind_instance(Collector, collector)
 
         # Shared in-memory cache
         context.injector.bind_instance(BaseCache, BasicCache())
 
+        # Metrics reported through the admin server
+        context.injector.bind_instance(Metrics, Metrics())
+
         # Global protocol registry
         context.injector.bind_instance(ProtocolRegistry, ProtocolRegistry())
 
-        await self.bind_providers(context)
-        await self.load_plugins(context)
+        with startup_timer.phase("providers"):
+            await self.bind_providers(context)
+        with startup_timer.phase("plugins"):
+            await self.load_plugins(context)
 
         return context
 
@@ -113,6 +130,11 @@ class DefaultContextBuilder(ContextBuilder):
                 ("get_credential", "store_credential", "create_credential_request"),
             ),
         )
+        context.injector.bind_instance(RevocationWitnessCache, RevocationWitnessCache())
+        context.injector.bind_instance(DIDDocCache, DIDDocCache())
+        record_cache_size = context.settings.get("records.cache_size")
+        if record_cache_size:
+            context.injector.bind_instance(RecordCache, RecordCache(record_cache_size))
         context.injector.bind_provider(
             BaseVerifier,
             ClassProvider(
@@ -122,7 +144,11 @@ class DefaultContextBuilder(ContextBuilder):
         )
         context.injector.bind_provider(
             BaseTailsServer,
-            ClassProvider("aries_cloudagent_vsw.tails.indy_tails_server.IndyTailsServer",),
+            CachedProvider(
+                ClassProvider(
+                    "aries_cloudagent_vsw.tails.indy_tails_server.IndyTailsServer",
+                )
+            ),
         )
 
         # Register default pack format
@@ -152,8 +178,29 @@ class DefaultContextBuilder(ContextBuilder):
         plugin_registry = PluginRegistry()
         context.injector.bind_instance(PluginRegistry, plugin_registry)
 
+        # Register plugins from the manifest, if any, without importing them
+        manifest_path = self.settings.get("plugin_manifest")
+        external_plugins = self.settings.get("external_plugins", [])
+        manifest = manifest_path and read_manifest(manifest_path, external_plugins)
+        if manifest:
+            plugin_registry.load_manifest(manifest)
+        else:
+            self.register_plugins(plugin_registry)
+            if manifest_path:
+                write_manifest(
+                    manifest_path,
+                    await plugin_registry.build_manifest(),
+                    external_plugins,
+                )
+
+        # Register message protocols
+        await plugin_registry.init_context(context)
+
+    def register_plugins(self, plugin_registry: PluginRegistry):
+        """Import and register the standard and external plugins."""
+
         # Register standard protocol plugins
-        plugin_registry.register_package("aries_cloudagent_vsw.protocols")
+        plugin_registry.register_package(STANDARD_PLUGINS)
 
         # Currently providing admin routes only
         plugin_registry.register_plugin("aries_cloudagent_vsw.holder")
@@ -168,6 +215,3 @@ class DefaultContextBuilder(ContextBuilder):
         # Register external plugins
         for plugin_path in self.settings.get("external_plugins", []):
             plugin_registry.register_plugin(plugin_path)
-
-        # Register message protocols
-        await plugin_registry.init_context(context)
@@ -33,12 +33,8 @@ async def fetch_genesis_transactions(genesis_url: str) -> str:
         raise ConfigError("Error retrieving ledger genesis transactions") from e
 
 
-async def ledger_config(
-    context: InjectionContext, public_did: str, provision: bool = False
-) -> bool:
-    """Perform Indy ledger configuration."""
-
-    # Fetch genesis transactions if necessary
+async def load_genesis_transactions(context: InjectionContext):
+    """Fetch or read the genesis transactions into the settings, if necessary."""
     if not context.settings.get("ledger.genesis_transactions"):
         if context.settings.get("ledger.genesis_url"):
             context.settings[
@@ -55,11 +51,20 @@ async def ledger_config(
             except IOError as e:
                 raise ConfigError("Error reading genesis transactions") from e
 
+
+async def ledger_config(
+    context: InjectionContext, public_did: str, provision: bool = False
+) -> bool:
+    """Perform Indy ledger configuration."""
+
+    # Fetch genesis transactions if necessary
+    await load_genesis_transactions(context)
+
     ledger: BaseLedger = await context.inject(BaseLedger, required=False)
     if not ledger:
         LOGGER.info("Ledger instance not provided")
         return False
-    elif ledger.type != "indy":
+    elif ledger.type not in ("indy", "memory"):
         LOGGER.info("Non-indy ledger provided")
         return False
 
@@ -80,10 +85,18 @@ async def ledger_config(
         endpoint = context.settings.get("default_endpoint")
         if public_did:
             wallet: BaseWallet = await context.inject(BaseWallet)
-            if wallet.type != "indy":
+            if ledger.type == "memory":
+                # a memory ledger has no steward: agents register their own DIDs
+                public_info = await wallet.get_public_did()
+                if await ledger.get_key_for_did(public_did) != public_info.verkey:
+                    await ledger.register_nym(public_did, public_info.verkey)
+            elif wallet.type != "indy":
                 raise ConfigError("Cannot provision a non-Indy wallet type")
             try:
                 await wallet.set_did_endpoint(public_did, endpoint, ledger)
+                if wallet.type != "indy":
+                    # only the indy wallet sends the endpoint to the ledger
+                    await ledger.update_endpoint_for_did(public_did, endpoint)
             except LedgerError as x_ledger:
                 raise ConfigError(x_ledger.message) from x_ledger  # e.g., read-only
 
@@ -1,5 +1,7 @@
 """Service provider implementations."""
 
+import asyncio
+
 from typing import Sequence, Union
 
 from ..utils.classloader import ClassLoader
@@ -75,12 +77,18 @@ class CachedProvider(BaseProvider):
         if not provider:
             raise ValueError("Cache provider input must not be empty.")
         self._instance = None
+        self._lock: asyncio.Lock = None
         self._provider = provider
 
     async def provide(self, config: BaseSettings, injector: BaseInjector):
         """Provide the object instance given a config and injector."""
         if not self._instance:
-            self._instance = await self._provider.provide(config, injector)
+            # concurrent injections wait on the first rather than provide anew
+            if not self._lock:
+                self._lock = asyncio.Lock()
+            async with self._lock:
+                if not self._instance:
+                    self._instance = await self._provider.provide(config, injector)
         return self._instance
 
 
@@ -0,0 +1,49 @@
+"""Record tag configuration."""
+
+import logging
+
+from typing import Mapping
+
+from ..utils.classloader import ClassLoader
+
+from .injection_context import InjectionContext
+
+LOGGER = logging.getLogger(__name__)
+
+# record classes with value fields declared as tags since records were stored
+RECORD_CLASSES = (
+    "aries_cloudagent_vsw.connections.models.connection_record.ConnectionRecord",
+    "aries_cloudagent_vsw.protocols.issue_credential.v1_0.models."
+    "credential_exchange.V10CredentialExchange",
+    "aries_cloudagent_vsw.protocols.present_proof.v1_0.models."
+    "presentation_exchange.V10PresentationExchange",
+)
+
+
+async def record_tags_config(
+    context: InjectionContext, force: bool = False
+) -> Mapping[str, int]:
+    """
+    Back-fill the tags of the records of each record class, where needed.
+
+    The records of a class are only scanned when some of its declared tags are
+    not known to be back-filled, unless forced.
+
+    Returns:
+        The number of records updated, by the record type of each class updated
+
+    """
+    updated = {}
+    for class_path in RECORD_CLASSES:
+        record_cls = ClassLoader.load_class(class_path)
+        if not force and await record_cls.get_indexed_tags(context) == set(
+            record_cls.get_tag_map()
+        ):
+            continue
+        updated[record_cls.RECORD_TYPE] = await record_cls.migrate_tags(context)
+        LOGGER.info(
+            "Updated tags of %d %s records",
+            updated[record_cls.RECORD_TYPE],
+            record_cls.RECORD_TYPE,
+        )
+    return updated
@@ -54,6 +54,177 @@ class TestArgParse(AsyncTestCase):
         assert settings.get("transport.outbound_configs") == ["http"]
         assert result.max_outbound_retry == 5
 
+    async def test_revocation_publish_settings(self):
+        """Test batched revocation publication argument parsing."""
+
+        parser = ArgumentParser()
+        group = argparse.GeneralGroup()
+        group.add_arguments(parser)
+
+        result = parser.parse_args(
+            [
+                "--revocation-publish-interval",
+                "30",
+                "--revocation-publish-batch-size",
+                "100",
+            ]
+        )
+        settings = group.get_settings(result)
+        assert settings.get("revocation.publish_interval") == 30.0
+        assert settings.get("revocation.publish_batch_size") == 100
+
+        result = parser.parse_args(["--revocation-publish-batch-size", "100"])
+        with self.assertRaises(argparse.ArgsParseError):
+            group.get_settings(result)
+
+    async def test_connection_cache_warm_settings(self):
+        """Test connection cache warming argument parsing."""
+
+        parser = ArgumentParser()
+        group = argparse.GeneralGroup()
+        group.add_arguments(parser)
+
+        result = parser.parse_args(["--connection-cache-warm-rate", "20"])
+        settings = group.get_settings(result)
+        assert settings.get("connections.cache_warm_rate") == 20.0
+
+    async def test_record_cache_settings(self):
+        """Test record cache argument parsing."""
+
+        parser = ArgumentParser()
+        group = argparse.GeneralGroup()
+        group.add_arguments(parser)
+
+        result = parser.parse_args(["--record-cache-size", "0"])
+        settings = group.get_settings(result)
+        assert settings.get("records.cache_size") == 0
+
+        result = parser.parse_args(["--record-cache-size", "-1"])
+        with self.assertRaises(argparse.ArgsParseError):
+            group.get_settings(result)
+
+    async def test_plugin_manifest_settings(self):
+        """Test plugin manifest argument parsing."""
+
+        parser = ArgumentParser()
+        group = argparse.GeneralGroup()
+        group.add_arguments(parser)
+
+        result = parser.parse_args(["--plugin-manifest", "/tmp/manifest.json"])
+        settings = group.get_settings(result)
+        assert settings.get("plugin_manifest") == "/tmp/manifest.json"
+
+        result = parser.parse_args([])
+        settings = group.get_settings(result)
+        assert "plugin_manifest" not in settings
+
+    async def test_wallet_key_pool_settings(self):
+        """Test wallet key pool argument parsing."""
+
+        parser = ArgumentParser()
+        group = argparse.WalletGroup()
+        group.add_arguments(parser)
+
+        result = parser.parse_args(["--wallet-key-pool-size", "50"])
+        settings = group.get_settings(result)
+        assert settings.get("wallet.key_pool_size") == 50
+
+    async def test_timing_window_settings(self):
+        """Test timing window argument parsing."""
+
+        parser = ArgumentParser()
+        group = argparse.ProtocolGroup()
+        group.add_arguments(parser)
+
+        result = parser.parse_args(["--timing", "--timing-window", "60"])
+        result.label = None
+        settings = group.get_settings(result)
+        assert settings.get("timing.enabled")
+        assert settings.get("timing.window") == 60.0
+
+    async def test_trace_spans_settings(self):
+        """Test latency span argument parsing."""
+
+        parser = ArgumentParser()
+        group = argparse.ProtocolGroup()
+        group.add_arguments(parser)
+
+        result = parser.parse_args(
+            ["--trace-spans-sample-rate", "0.1", "--trace-spans-target", "spans.json"]
+        )
+        result.label = None
+        settings = group.get_settings(result)
+        assert settings.get("trace.spans.sample_rate") == 0.1
+        assert settings.get("trace.spans.target") == "spans.json"
+
+        for args in (
+            ["--trace-spans-sample-rate", "0.1"],
+            ["--trace-spans-sample-rate", "2", "--trace-spans-target", "spans.json"],
+        ):
+            result = parser.parse_args(args)
+            result.label = None
+            with self.assertRaises(argparse.ArgsParseError):
+                group.get_settings(result)
+
+    async def test_monitor_loop_settings(self):
+        """Test event loop monitor argument parsing."""
+
+        parser = ArgumentParser()
+        group = argparse.ProtocolGroup()
+        group.add_arguments(parser)
+
+        result = parser.parse_args(
+            ["--monitor-loop-lag", "50", "--monitor-loop-interval", "250"]
+        )
+        result.label = None
+        settings = group.get_settings(result)
+        assert settings.get("monitor.loop_lag") == 0.05
+        assert settings.get("monitor.loop_interval") == 0.25
+
+        for args in (
+            ["--monitor-loop-lag", "0"],
+            ["--monitor-loop-lag", "50", "--monitor-loop-interval", "-1"],
+            ["--monitor-loop-interval", "250"],
+        ):
+            result = parser.parse_args(args)
+            result.label = None
+            with self.assertRaises(argparse.ArgsParseError):
+                group.get_settings(result)
+
+    async def test_memory_ledger_settings(self):
+        """Test memory ledger argument parsing."""
+
+        parser = ArgumentParser()
+        group = argparse.LedgerGroup()
+        group.add_arguments(parser)
+
+        result = parser.parse_args(
+            [
+                "--ledger-type",
+                "memory",
+                "--ledger-memory-file",
+                "ledger.json",
+                "--ledger-memory-read-latency",
+                "20",
+                "--ledger-memory-write-latency",
+                "500",
+            ]
+        )
+        settings = group.get_settings(result)
+        assert settings.get("ledger.type") == "memory"
+        assert settings.get("ledger.memory_file") == "ledger.json"
+        assert settings.get("ledger.memory_read_latency") == 0.02
+        assert settings.get("ledger.memory_write_latency") == 0.5
+
+        for args in (
+            ["--ledger-memory-file", "ledger.json"],
+            ["--ledger-type", "indy", "--ledger-memory-read-latency", "20"],
+            ["--ledger-type", "memory", "--ledger-memory-write-latency", "-1"],
+        ):
+            result = parser.parse_args(args)
+            with self.assertRaises(argparse.ArgsParseError):
+                group.get_settings(result)
+
     def test_bytesize(self):
         bs = ByteSize()
         with self.assertRaises(ArgumentTypeError):
@@ -1,10 +1,16 @@
-from tempfile import NamedTemporaryFile
+import json
+import os
+
+from tempfile import NamedTemporaryFile, TemporaryDirectory
 
 from asynctest import TestCase as AsyncTestCase
 
+from ...core.plugin_registry import PluginRegistry
 from ...core.protocol_registry import ProtocolRegistry
+from ...messaging.models.record_cache import RecordCache
 from ...storage.base import BaseStorage
 from ...transport.wire_format import BaseWireFormat
+from ...utils.startup_timer import StartupTimer
 from ...wallet.base import BaseWallet
 
 from ..default_context import DefaultContextBuilder
@@ -12,6 +18,17 @@ from ..injection_context import InjectionContext
 
 
 class TestDefaultContext(AsyncTestCase):
+    async def test_build_context_record_cache(self):
+        """Test context init with the record cache enabled."""
+
+        builder = DefaultContextBuilder(settings={"records.cache_size": 10})
+        result = await builder.build()
+        assert (await result.inject(RecordCache)).max_items == 10
+
+        builder = DefaultContextBuilder(settings={"records.cache_size": 0})
+        result = await builder.build()
+        assert not await result.inject(RecordCache, required=False)
+
     async def test_build_context(self):
         """Test context init."""
 
@@ -24,8 +41,11 @@ class TestDefaultContext(AsyncTestCase):
             ProtocolRegistry,
             BaseWallet,
             BaseStorage,
+            StartupTimer,
         ):
             assert isinstance(await result.inject(cls), cls)
+        # opt-in: cached values do not expire
+        assert not await result.inject(RecordCache, required=False)
 
         builder = DefaultContextBuilder(
             settings={
@@ -35,3 +55,26 @@ class TestDefaultContext(AsyncTestCase):
         )
         result = await builder.build()
         assert isinstance(result, InjectionContext)
+
+    async def test_build_context_plugin_manifest(self):
+        """Test plugins are registered from a manifest written on first build."""
+
+        with TemporaryDirectory() as manifest_dir:
+            manifest_path = os.path.join(manifest_dir, "manifest.json")
+            settings = {"plugin_manifest": manifest_path}
+
+            first = await DefaultContextBuilder(settings=settings).build()
+            assert os.path.exists(manifest_path)
+            with open(manifest_path) as manifest_file:
+                assert json.load(manifest_file)["external_plugins"] == []
+
+            second = await DefaultContextBuilder(settings=settings).build()
+            first_plugins = await first.inject(PluginRegistry)
+            second_plugins = await second.inject(PluginRegistry)
+            assert not second_plugins.plugins  # none imported
+            assert second_plugins.plugin_names == first_plugins.plugin_names
+
+            first_protocols = await first.inject(ProtocolRegistry)
+            second_protocols = await second.inject(ProtocolRegistry)
+            assert second_protocols.message_types == first_protocols.message_types
+            assert second_protocols.controllers == first_protocols.controllers
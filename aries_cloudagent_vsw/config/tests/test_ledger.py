@@ -5,7 +5,9 @@ from asynctest import TestCase as AsyncTestCase, mock as async_mock
 
 from ...ledger.base import BaseLedger
 from ...ledger.error import LedgerError
+from ...ledger.memory import MEMORY_POOLS, MemoryLedger
 from ...wallet.base import BaseWallet
+from ...wallet.basic import BasicWallet
 
 from .. import ledger as test_module
 from ..injection_context import InjectionContext
@@ -30,6 +32,23 @@ class TestLedger(AsyncTestCase):
                     "http://1.2.3.4:9000/genesis"
                 )
 
+    async def test_load_genesis_transactions(self):
+        context = InjectionContext(
+            settings={"ledger.genesis_url": "http://1.2.3.4:9000/genesis"},
+            enforce_typing=False,
+        )
+        with async_mock.patch.object(
+            test_module,
+            "fetch_genesis_transactions",
+            async_mock.CoroutineMock(return_value="genesis"),
+        ) as mock_fetch:
+            await test_module.load_genesis_transactions(context)
+            assert context.settings["ledger.genesis_transactions"] == "genesis"
+
+            # already loaded
+            await test_module.load_genesis_transactions(context)
+            mock_fetch.assert_awaited_once_with("http://1.2.3.4:9000/genesis")
+
     async def test_ledger_config_genesis_url(self):
         settings = {
             "ledger.genesis_url": "00000000000000000000000000000000",
@@ -290,6 +309,27 @@ class TestLedger(AsyncTestCase):
             with self.assertRaises(test_module.ConfigError):
                 await test_module.ledger_config(context, TEST_DID, provision=True)
 
+    async def test_ledger_config_memory_ledger(self):
+        settings = {"default_endpoint": "http://1.2.3.4:8051"}
+        wallet = BasicWallet()
+        public_did = (await wallet.create_public_did()).did
+        ledger = MemoryLedger("config", wallet)
+
+        context = InjectionContext(settings=settings, enforce_typing=False)
+        context.injector.bind_instance(BaseLedger, ledger)
+        context.injector.bind_instance(BaseWallet, wallet)
+
+        try:
+            assert await test_module.ledger_config(context, public_did)
+            assert await ledger.get_endpoint_for_did(public_did) == (
+                "http://1.2.3.4:8051"
+            )
+            assert (await wallet.get_local_did(public_did)).metadata["endpoint"] == (
+                "http://1.2.3.4:8051"
+            )
+        finally:
+            MEMORY_POOLS.clear()
+
     @async_mock.patch("sys.stdout")
     async def test_ledger_accept_taa_not_tty(self, mock_stdout):
         mock_stdout.isatty = async_mock.MagicMock(return_value=False)
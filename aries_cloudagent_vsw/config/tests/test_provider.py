@@ -1,3 +1,5 @@
+import asyncio
+
 from tempfile import NamedTemporaryFile
 
 from asynctest import TestCase as AsyncTestCase, mock as async_mock
@@ -8,7 +10,7 @@ from ...wallet.base import BaseWallet
 from ...wallet.basic import BasicWallet
 
 from ..injection_context import InjectionContext
-from ..provider import StatsProvider
+from ..provider import CachedProvider, StatsProvider
 from ..settings import Settings
 
 
@@ -34,3 +36,19 @@ class TestProvider(AsyncTestCase):
         context.injector.bind_instance(BaseWallet, wallet)
 
         await stats_provider.provide(Settings(settings), context.injector)
+
+    async def test_cached_provider_concurrent(self):
+        """Concurrent injections share the one instance provided."""
+
+        async def provide(config, injector):
+            await asyncio.sleep(0.01)
+            return object()
+
+        provider = async_mock.MagicMock(provide=async_mock.CoroutineMock())
+        provider.provide.side_effect = provide
+        cached = CachedProvider(provider)
+        instances = await asyncio.gather(
+            cached.provide(Settings(), None), cached.provide(Settings(), None)
+        )
+        assert instances[0] is instances[1]
+        provider.provide.assert_awaited_once()
@@ -0,0 +1,52 @@
+import json
+
+from asynctest import TestCase as AsyncTestCase
+from asynctest import mock as async_mock
+
+from ...connections.models.connection_record import ConnectionRecord
+from ...storage.base import BaseStorage
+from ...storage.basic import BasicStorage
+from ...storage.record import StorageRecord
+
+from .. import record_tags as test_module
+from ..injection_context import InjectionContext
+
+
+class TestRecordTags(AsyncTestCase):
+    async def setUp(self):
+        self.context = InjectionContext(enforce_typing=False)
+        self.storage = BasicStorage()
+        self.context.injector.bind_instance(BaseStorage, self.storage)
+
+    async def test_record_tags_config(self):
+        # stored before the state was declared a tag
+        await self.storage.add_record(
+            StorageRecord(
+                ConnectionRecord.RECORD_TYPE,
+                json.dumps({"state": "invitation", "invitation_key": "key"}),
+                {"invitation_key": "key"},
+                "legacy",
+            )
+        )
+        updated = await test_module.record_tags_config(self.context)
+        assert updated == {
+            ConnectionRecord.RECORD_TYPE: 1,
+            "credential_exchange_v10": 0,
+            "presentation_exchange_v10": 0,
+        }
+        stored = await self.storage.get_record(ConnectionRecord.RECORD_TYPE, "legacy")
+        assert stored.tags["state"] == "invitation"
+
+        # the records of each type are only scanned once
+        assert await test_module.record_tags_config(self.context) == {}
+        assert len(
+            await test_module.record_tags_config(self.context, force=True)
+        ) == len(test_module.RECORD_CLASSES)
+
+    async def test_record_tags_config_new_tag(self):
+        await test_module.record_tags_config(self.context)
+        with async_mock.patch.object(
+            ConnectionRecord, "TAG_NAMES", ConnectionRecord.TAG_NAMES | {"new_tag"}
+        ):
+            updated = await test_module.record_tags_config(self.context)
+        assert updated == {ConnectionRecord.RECORD_TYPE: 0}
@@ -0,0 +1,85 @@
+"""Cache of parsed DID documents."""
+
+from collections import OrderedDict
+from typing import Optional, Tuple
+
+from ..storage.record import StorageRecord
+
+from .models.diddoc import DIDDoc
+
+
+class DIDDocCache:
+    """
+    Cache of DID documents parsed from storage, keyed by DID.
+
+    Parsing a stored DID document builds its public keys and services anew on
+    every read, while connection targets are resolved for each outbound message.
+    Parsed documents are shared by readers and must not be modified; a document
+    is replaced by storing it again, which invalidates its cache entry. Readers
+    pass the count of `changes` from before reading storage, so that a document
+    read while one is stored is not cached.
+    """
+
+    def __init__(self, max_items: int = 4096):
+        """
+        Initialize a `DIDDocCache` instance.
+
+        Args:
+            max_items: The maximum number of DID documents held
+
+        """
+        self.max_items = max_items
+        self.hits = 0
+        self.misses = 0
+        self.changes = 0
+        self._docs = OrderedDict()
+
+    def get(self, did: str) -> Optional[Tuple[DIDDoc, StorageRecord]]:
+        """
+        Look up a parsed DID document.
+
+        Args:
+            did: The DID of the document
+
+        Returns:
+            A tuple of the DID document and its storage record, or `None`
+
+        """
+        entry = self._docs.get(did)
+        if entry:
+            self._docs.move_to_end(did)
+            self.hits += 1
+        else:
+            self.misses += 1
+        return entry
+
+    def set(
+        self, did: str, did_doc: DIDDoc, record: StorageRecord, changes: int = None
+    ):
+        """
+        Add a parsed DID document, evicting the least recently used when full.
+
+        Args:
+            did: The DID of the document
+            did_doc: The parsed DID document
+            record: The storage record holding the DID document
+            changes: The count of changes before the document was read
+
+        """
+        if changes is not None and changes != self.changes:
+            # a document was stored while read: the one read may be outdated
+            return
+        self._docs[did] = (did_doc, record)
+        self._docs.move_to_end(did)
+        while len(self._docs) > self.max_items:
+            self._docs.popitem(last=False)
+
+    def invalidate(self, did: str):
+        """Discard the cached DID document for a DID."""
+        self.changes += 1
+        self._docs.pop(did, None)
+
+    def clear(self):
+        """Discard all cached DID documents."""
+        self.changes += 1
+        self._docs.clear()
@@ -26,7 +26,16 @@ class ConnectionRecord(BaseRecord):  # lgtm[py/missing-equals]
     WEBHOOK_TOPIC = "connections"
     LOG_STATE_FLAG = "debug.connections"
     CACHE_ENABLED = True
-    TAG_NAMES = {"my_did", "their_did", "request_id", "invitation_key"}
+    RECORD_CACHE_ENABLED = True
+    TAG_NAMES = {
+        "my_did",
+        "their_did",
+        "request_id",
+        "invitation_key",
+        "state",
+        "initiator",
+        "their_role",
+    }
 
     RECORD_TYPE = "connection"
     RECORD_TYPE_INVITATION = "connection_invitation"
@@ -261,6 +270,13 @@ class ConnectionRecord(BaseRecord):  # lgtm[py/missing-equals]
         cache_key = self.cache_key(self.connection_id, "connection_target")
         await self.clear_cached_key(context, cache_key)
 
+        # imported here, as the warmer depends on the connection manager
+        from ...protocols.connections.v1_0.cache_warmer import ConnectionCacheWarmer
+
+        warmer = await context.inject(ConnectionCacheWarmer, required=False)
+        if warmer:
+            warmer.notify(self)
+
 
 class ConnectionRecordSchema(BaseRecordSchema):
     """Schema to allow serialization/deserialization of connection records."""
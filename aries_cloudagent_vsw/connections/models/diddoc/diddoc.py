@@ -41,6 +41,8 @@ class DIDDoc:
 
     CONTEXT = "https://w3id.org/did/v1"
 
+    __slots__ = ("_did", "_pubkey", "_service")
+
     def __init__(self, did: str = None) -> None:
         """
         Initialize the DIDDoc instance.
@@ -101,6 +101,8 @@ class PublicKey:
     everything else as URIs (oriented toward W3C-facing operations).
     """
 
+    __slots__ = ("_did", "_id", "_value", "_type", "_controller", "_authn")
+
     def __init__(
         self,
         did: str,
@@ -32,6 +32,16 @@ class Service:
     everything else as URIs (oriented toward W3C-facing operations).
     """
 
+    __slots__ = (
+        "_did",
+        "_id",
+        "_type",
+        "_recip_keys",
+        "_routing_keys",
+        "_endpoint",
+        "_priority",
+    )
+
     def __init__(
         self,
         did: str,
@@ -0,0 +1,49 @@
+from asynctest import TestCase as AsyncTestCase
+
+from ...storage.record import StorageRecord
+
+from ..did_doc_cache import DIDDocCache
+from ..models.diddoc import DIDDoc
+
+DID = "LjgpST2rjsoxYegQDRm7EL"
+
+
+class TestDIDDocCache(AsyncTestCase):
+    def test_get_set(self):
+        cache = DIDDocCache()
+        assert cache.get(DID) is None
+        did_doc = DIDDoc(DID)
+        record = StorageRecord("did_doc", did_doc.to_json(), {"did": DID})
+        cache.set(DID, did_doc, record)
+        assert cache.get(DID) == (did_doc, record)
+        assert (cache.hits, cache.misses) == (1, 1)
+
+        cache.invalidate(DID)
+        assert cache.get(DID) is None
+        cache.set(DID, did_doc, record)
+        cache.clear()
+        assert cache.get(DID) is None
+
+    def test_set_changed(self):
+        cache = DIDDocCache()
+        changes = cache.changes
+        cache.invalidate(DID)  # stored while read
+        cache.set(DID, DIDDoc(DID), None, changes)
+        assert cache.get(DID) is None
+        cache.set(DID, DIDDoc(DID), None, cache.changes)
+        assert cache.get(DID)
+
+    def test_evict(self):
+        cache = DIDDocCache(max_items=2)
+        for did in ("did-0", "did-1"):
+            cache.set(did, DIDDoc(), None)
+        cache.get("did-0")
+        cache.set("did-2", DIDDoc(), None)
+        assert len(cache._docs) == 2
+        assert cache.get("did-1") is None
+        assert cache.get("did-0")
+
+    def test_slots(self):
+        did_doc = DIDDoc(DID)
+        with self.assertRaises(AttributeError):
+            did_doc.extra = True
@@ -13,25 +13,40 @@ import logging
 
 from ..admin.base_server import BaseAdminServer
 from ..admin.server import AdminServer
+from ..cache.base import BaseCache
 from ..config.default_context import ContextBuilder
 from ..config.injection_context import InjectionContext
-from ..config.ledger import ledger_config
+from ..config.ledger import ledger_config, load_genesis_transactions
+from ..config.record_tags import record_tags_config
 from ..config.logging import LoggingConfigurator
 from ..config.wallet import wallet_config, BaseWallet
+from ..connections.did_doc_cache import DIDDocCache
+from ..ledger.base import BaseLedger
 from ..ledger.error import LedgerConfigError, LedgerTransactionError
+from ..messaging.models.record_cache import RecordCache
 from ..messaging.responder import BaseResponder
+from ..protocols.connections.v1_0.cache_warmer import ConnectionCacheWarmer
 from ..protocols.connections.v1_0.manager import (
     ConnectionManager,
     ConnectionManagerError,
 )
+from ..revocation.pool import RevocationRegistryPool
+from ..revocation.publisher import RevocationPublisher
+from ..tails.base import BaseTailsServer
 from ..transport.inbound.manager import InboundTransportManager
 from ..transport.inbound.message import InboundMessage
 from ..transport.outbound.base import OutboundDeliveryError
 from ..transport.outbound.manager import OutboundTransportManager, QueuedOutboundMessage
 from ..transport.outbound.message import OutboundMessage
 from ..transport.wire_format import BaseWireFormat
+from ..utils.loop_monitor import LoopMonitor
+from ..utils.metrics import Metrics
+from ..utils.spans import SpanTracer
+from ..utils.startup_timer import StartupTimer
+from ..utils.task_graph import TaskGraph
 from ..utils.task_queue import CompletedTask, TaskQueue
 from ..utils.stats import Collector
+from ..wallet.key_pool import WalletKeyPool
 
 from .dispatcher import Dispatcher
 
@@ -62,37 +77,106 @@ class Conductor:
         self.dispatcher: Dispatcher = None
         self.inbound_transport_manager: InboundTransportManager = None
         self.outbound_transport_manager: OutboundTransportManager = None
+        self.revocation_publisher: RevocationPublisher = None
+        self.revocation_registry_pool: RevocationRegistryPool = None
+        self.wallet_key_pool: WalletKeyPool = None
+        self.connection_cache_warmer: ConnectionCacheWarmer = None
+        self.span_tracer: SpanTracer = None
+        self.loop_monitor: LoopMonitor = None
+        self.startup_timer: StartupTimer = None
 
     async def setup(self):
         """Initialize the global request context."""
 
         context = await self.context_builder.build()
 
-        self.dispatcher = Dispatcher(context)
-        await self.dispatcher.setup()
-
-        wire_format = await context.inject(BaseWireFormat, required=False)
-        if wire_format and hasattr(wire_format, "task_queue"):
-            wire_format.task_queue = self.dispatcher.task_queue
-
-        # Register all inbound transports
-        self.inbound_transport_manager = InboundTransportManager(
-            context, self.inbound_message_router, self.handle_not_returned
+        # Time each phase of startup, continuing from the context build
+        self.startup_timer = (
+            await context.inject(StartupTimer, required=False) or StartupTimer()
         )
-        await self.inbound_transport_manager.setup()
-
-        # Register all outbound transports
-        self.outbound_transport_manager = OutboundTransportManager(
-            context, self.handle_not_delivered
+        timer = self.startup_timer
+
+        # Sampled latency spans of messages, from receipt to delivery
+        span_sample_rate = context.settings.get("trace.spans.sample_rate")
+        if span_sample_rate:
+            self.span_tracer = SpanTracer(
+                span_sample_rate,
+                context.settings["trace.spans.target"],
+                service_name=context.settings.get("trace.label") or "aca-py",
+            )
+            context.injector.bind_instance(SpanTracer, self.span_tracer)
+
+        # Set up each part of the agent once the parts it depends on are:
+        # the genesis transactions are fetched and the ledger pool opened while
+        # the wallet is opened and the transports are set up
+        open_ledgers = []
+
+        async def open_ledger_pool():
+            ledger = await self.open_ledger(context)
+            if ledger:
+                open_ledgers.append(ledger)
+            return ledger
+
+        setup = TaskGraph(timer)
+        setup.add("dispatcher", lambda: self.setup_dispatcher(context))
+        setup.add("inbound_transports", lambda: self.setup_inbound_transports(context))
+        setup.add(
+            "outbound_transports", lambda: self.setup_outbound_transports(context)
         )
-        await self.outbound_transport_manager.setup()
+        setup.add("genesis", lambda: load_genesis_transactions(context))
+        setup.add("wallet", lambda: wallet_config(context))
+        setup.add("ledger_pool", open_ledger_pool, after=("genesis",))
+        # records stored by earlier releases lack the tags declared since
+        setup.add("record_tags", lambda: record_tags_config(context), after=("wallet",))
+        try:
+            results = await setup.run()
+            with timer.phase("ledger"):
+                if not results["ledger_pool"] or not await ledger_config(
+                    context, results["wallet"]
+                ):
+                    LOGGER.warning("No ledger configured")
+        finally:
+            # the pool stays open from the time it is opened to the end of setup
+            for ledger in open_ledgers:
+                await ledger.__aexit__(None, None, None)
+
+        # Batched revocation publication
+        publish_interval = context.settings.get("revocation.publish_interval")
+        if publish_interval:
+            self.revocation_publisher = RevocationPublisher(
+                context,
+                publish_interval,
+                context.settings.get("revocation.publish_batch_size"),
+            )
+            context.injector.bind_instance(
+                RevocationPublisher, self.revocation_publisher
+            )
 
-        # Configure the wallet
-        public_did = await wallet_config(context)
+        # Revocation registries generated ahead of demand
+        pool_depth = context.settings.get("revocation.registry_pool_depth")
+        if pool_depth:
+            self.revocation_registry_pool = RevocationRegistryPool(
+                context,
+                pool_depth,
+                context.settings.get("revocation.registry_pool_workers") or 1,
+            )
+            context.injector.bind_instance(
+                RevocationRegistryPool, self.revocation_registry_pool
+            )
 
-        # Configure the ledger
-        if not await ledger_config(context, public_did):
-            LOGGER.warning("No ledger configured")
+        # Pairwise DIDs and invitation keys created ahead of demand
+        key_pool_size = context.settings.get("wallet.key_pool_size")
+        if key_pool_size:
+            self.wallet_key_pool = WalletKeyPool(context, key_pool_size)
+            context.injector.bind_instance(WalletKeyPool, self.wallet_key_pool)
+
+        # Connection resolution caches populated ahead of messages
+        warm_rate = context.settings.get("connections.cache_warm_rate")
+        if warm_rate:
+            self.connection_cache_warmer = ConnectionCacheWarmer(context, warm_rate)
+            context.injector.bind_instance(
+                ConnectionCacheWarmer, self.connection_cache_warmer
+            )
 
         # Admin API
         if context.settings.get("admin.enabled"):
@@ -109,6 +193,8 @@ class Conductor:
                     self.dispatcher.task_queue,
                     self.get_stats,
                 )
+                # not ready until the conductor is started
+                self.admin_server.ready_gate = True
                 webhook_urls = context.settings.get("admin.webhook_urls")
                 if webhook_urls:
                     for url in webhook_urls:
@@ -142,21 +228,79 @@ class Conductor:
                 ),
             )
 
+        # Report the state of the conductor in the metrics
+        metrics = await context.inject(Metrics, required=False)
+        if metrics:
+            metrics.add_collector(self.collect_metrics)
+
+        # Event loop lag and the calls blocking the loop
+        loop_lag = context.settings.get("monitor.loop_lag")
+        if loop_lag:
+            self.loop_monitor = LoopMonitor(
+                loop_lag,
+                context.settings.get("monitor.loop_interval") or 0.1,
+                metrics=metrics,
+            )
+            context.injector.bind_instance(LoopMonitor, self.loop_monitor)
+
         self.context = context
 
+    async def setup_dispatcher(self, context: InjectionContext):
+        """Set up the dispatcher, running the tasks of the wire format too."""
+        self.dispatcher = Dispatcher(context)
+        await self.dispatcher.setup()
+
+        wire_format = await context.inject(BaseWireFormat, required=False)
+        if wire_format and hasattr(wire_format, "task_queue"):
+            wire_format.task_queue = self.dispatcher.task_queue
+
+    async def setup_inbound_transports(self, context: InjectionContext):
+        """Register all inbound transports."""
+        self.inbound_transport_manager = InboundTransportManager(
+            context, self.inbound_message_router, self.handle_not_returned
+        )
+        await self.inbound_transport_manager.setup()
+
+    async def setup_outbound_transports(self, context: InjectionContext):
+        """Register all outbound transports."""
+        self.outbound_transport_manager = OutboundTransportManager(
+            context, self.handle_not_delivered
+        )
+        await self.outbound_transport_manager.setup()
+
+    async def open_ledger(self, context: InjectionContext) -> BaseLedger:
+        """
+        Open the ledger pool, to be closed by the caller.
+
+        Returns:
+            The opened ledger, or `None` if no ledger to configure is provided
+
+        """
+        ledger: BaseLedger = await context.inject(BaseLedger, required=False)
+        if not ledger:
+            LOGGER.info("Ledger instance not provided")
+            return None
+        if ledger.type not in ("indy", "memory"):
+            LOGGER.info("Non-indy ledger provided")
+            return None
+        return await ledger.__aenter__()
+
     async def start(self) -> None:
         """Start the agent."""
 
         context = self.context
+        timer = self.startup_timer
 
         # Start up transports
         try:
-            await self.inbound_transport_manager.start()
+            with timer.phase("inbound_transports.start"):
+                await self.inbound_transport_manager.start()
         except Exception:
             LOGGER.exception("Unable to start inbound transports")
             raise
         try:
-            await self.outbound_transport_manager.start()
+            with timer.phase("outbound_transports.start"):
+                await self.outbound_transport_manager.start()
         except Exception:
             LOGGER.exception("Unable to start outbound transports")
             raise
@@ -164,7 +308,8 @@ class Conductor:
         # Start up Admin server
         if self.admin_server:
             try:
-                await self.admin_server.start()
+                with timer.phase("admin.start"):
+                    await self.admin_server.start()
             except Exception:
                 LOGGER.exception("Unable to start administration API")
             # Make admin responder available during message parsing
@@ -172,6 +317,19 @@ class Conductor:
             # for example
             context.injector.bind_instance(BaseResponder, self.admin_server.responder)
 
+        if self.revocation_publisher:
+            await self.revocation_publisher.start()
+        if self.revocation_registry_pool:
+            await self.revocation_registry_pool.start()
+        if self.wallet_key_pool:
+            await self.wallet_key_pool.start()
+        if self.connection_cache_warmer:
+            await self.connection_cache_warmer.start()
+        if self.span_tracer:
+            await self.span_tracer.start()
+        if self.loop_monitor:
+            await self.loop_monitor.start()
+
         # Get agent label
         default_label = context.settings.get("default_label")
 
@@ -187,6 +345,8 @@ class Conductor:
             public_did.did if public_did else None,
             self.admin_server,
         )
+        timer.finish()
+        LOGGER.info(timer.format())
 
         # Create a static connection for use by the test-suite
         if context.settings.get("debug.test_suite_endpoint"):
@@ -222,6 +382,10 @@ class Conductor:
             except Exception:
                 LOGGER.exception("Error creating invitation")
 
+        # Ready to take work through the admin API
+        if self.admin_server:
+            self.admin_server.mark_ready()
+
     async def stop(self, timeout=1.0):
         """Stop the agent."""
         shutdown = TaskQueue()
@@ -233,6 +397,24 @@ class Conductor:
             shutdown.run(self.inbound_transport_manager.stop())
         if self.outbound_transport_manager:
             shutdown.run(self.outbound_transport_manager.stop())
+        if self.revocation_publisher:
+            shutdown.run(self.revocation_publisher.stop())
+        if self.revocation_registry_pool:
+            shutdown.run(self.revocation_registry_pool.stop())
+        if self.wallet_key_pool:
+            shutdown.run(self.wallet_key_pool.stop())
+        if self.connection_cache_warmer:
+            shutdown.run(self.connection_cache_warmer.stop())
+        if self.span_tracer:
+            shutdown.run(self.span_tracer.stop())
+        if self.loop_monitor:
+            shutdown.run(self.loop_monitor.stop())
+        if self.context:
+            tails_server: BaseTailsServer = await self.context.inject(
+                BaseTailsServer, required=False
+            )
+            if tails_server:
+                shutdown.run(tails_server.close())
         await shutdown.complete(timeout)
 
     def inbound_message_router(
@@ -311,6 +493,72 @@ class Conductor:
                 stats["out_deliver"] += 1
         return stats
 
+    async def collect_metrics(self, metrics: Metrics):
+        """Update the metrics reporting the current state of the conductor."""
+        for (name, queue) in (
+            ("dispatcher", self.dispatcher.task_queue),
+            ("outbound", self.outbound_transport_manager.task_queue),
+        ):
+            metrics.task_queue.set(queue.current_active, name, "active")
+            metrics.task_queue.set(queue.current_pending, name, "pending")
+            metrics.task_queue_completed.set(queue.total_done, name, "done")
+            metrics.task_queue_completed.set(queue.total_failed, name, "failed")
+
+        buffered = dict.fromkeys(
+            (
+                QueuedOutboundMessage.STATE_NEW,
+                QueuedOutboundMessage.STATE_PENDING,
+                QueuedOutboundMessage.STATE_ENCODE,
+                QueuedOutboundMessage.STATE_DELIVER,
+                QueuedOutboundMessage.STATE_RETRY,
+                QueuedOutboundMessage.STATE_DONE,
+            ),
+            0,
+        )
+        for queued in self.outbound_transport_manager.outbound_buffer:
+            buffered[queued.state] += 1
+        for (state, count) in buffered.items():
+            metrics.outbound_buffer.set(count, state)
+
+        metrics.inbound_sessions.set(len(self.inbound_transport_manager.sessions))
+
+        cache: BaseCache = await self.context.inject(BaseCache, required=False)
+        if cache:
+            metrics.set_cache("shared", cache.hits, cache.misses)
+        doc_cache: DIDDocCache = await self.context.inject(DIDDocCache, required=False)
+        if doc_cache:
+            metrics.set_cache("did_doc", doc_cache.hits, doc_cache.misses)
+        record_cache: RecordCache = await self.context.inject(
+            RecordCache, required=False
+        )
+        if record_cache:
+            metrics.set_cache("record", record_cache.hits, record_cache.misses)
+
+        if self.wallet_key_pool:
+            pool_status = self.wallet_key_pool.status()
+            metrics.wallet_key_pool.set(pool_status["dids"], "did")
+            metrics.wallet_key_pool.set(pool_status["keys"], "key")
+            metrics.set_cache(
+                "wallet_key_pool", pool_status["hit_count"], pool_status["miss_count"]
+            )
+
+        if self.connection_cache_warmer:
+            warmer_status = self.connection_cache_warmer.status()
+            metrics.connection_cache_warmed.set(warmer_status["warmed_count"], "warmed")
+            metrics.connection_cache_warmed.set(warmer_status["failed_count"], "failed")
+            metrics.connection_cache_warming.set(int(warmer_status["warming"]))
+
+        tails_server: BaseTailsServer = await self.context.inject(
+            BaseTailsServer, required=False
+        )
+        tails_status = tails_server and tails_server.status()
+        if tails_status:
+            metrics.tails_uploads.set(tails_status["uploaded_count"], "uploaded")
+            metrics.tails_uploads.set(tails_status["failed_count"], "failed")
+            metrics.tails_upload_retries.set(tails_status["retry_count"])
+            metrics.tails_uploaded_bytes.set(tails_status["bytes_uploaded"])
+            metrics.tails_uploads_in_progress.set(len(tails_status["in_progress"]))
+
     async def outbound_message_router(
         self,
         context: InjectionContext,
@@ -26,10 +26,11 @@ from ..protocols.problem_report.v1_0.message import ProblemReport
 
 from ..transport.inbound.message import InboundMessage
 from ..transport.outbound.message import OutboundMessage
+from ..utils.spans import MessageTrace
 from ..utils.stats import Collector
 from ..utils.task_queue import CompletedTask, PendingTask, TaskQueue
 
-from ..utils.tracing import trace_event, get_timer
+from ..utils.tracing import trace_event, get_timer, tracing_enabled
 
 LOGGER = logging.getLogger(__name__)
 
@@ -104,10 +105,25 @@ class Dispatcher:
             A pending task instance resolving to the handler task
 
         """
+        spans = inbound_message.receipt.spans
+        if spans:
+            spans.handoff = spans.start("dispatch.queue")
+            complete = self.complete_spans(spans, complete)
         return self.put_task(
             self.handle_message(inbound_message, send_outbound, send_webhook), complete
         )
 
+    @staticmethod
+    def complete_spans(spans: MessageTrace, complete: Callable = None) -> Callable:
+        """Wrap a task completion callback to end the trace of a sampled message."""
+
+        def completed(task: CompletedTask):
+            spans.root.finish(error=True if task.exc_info else None)
+            if complete:
+                complete(task)
+
+        return completed
+
     async def handle_message(
         self,
         inbound_message: InboundMessage,
@@ -127,6 +143,12 @@ class Dispatcher:
 
         """
         r_time = get_timer()
+        spans = inbound_message.receipt.spans
+        if spans:
+            if spans.handoff:
+                spans.handoff.finish()
+                spans.handoff = None
+            span = spans.start("dispatch.resolve_connection")
 
         connection_mgr = ConnectionManager(self.context)
         connection = await connection_mgr.find_inbound_connection(
@@ -134,6 +156,9 @@ class Dispatcher:
         )
         if connection:
             inbound_message.connection_id = connection.connection_id
+        if spans:
+            span.finish(connection_id=inbound_message.connection_id)
+            span = spans.start("dispatch.deserialize")
 
         error_result = None
         try:
@@ -144,10 +169,21 @@ class Dispatcher:
             if inbound_message.receipt.thread_id:
                 error_result.assign_thread_id(inbound_message.receipt.thread_id)
             message = None
-
-        trace_event(
-            self.context.settings, message, outcome="Dispatcher.handle_message.START",
-        )
+        if spans:
+            span.finish(error=True if error_result else None)
+            spans.root.attributes["message_type"] = message and message._type
+
+        # decided as the message is parsed by the wire format
+        trace = inbound_message.receipt.trace
+        if trace is None:
+            trace = tracing_enabled(self.context.settings, message)
+        if trace:
+            trace_event(
+                self.context.settings,
+                message,
+                outcome="Dispatcher.handle_message.START",
+                force_trace=True,
+            )
 
         context = RequestContext(base_context=self.context)
         context.message = message
@@ -175,14 +211,23 @@ class Dispatcher:
         handler = handler_cls().handle
         if self.collector:
             handler = self.collector.wrap_coro(handler, [handler.__qualname__])
-        await handler(context, responder)
-
-        trace_event(
-            self.context.settings,
-            context.message,
-            outcome="Dispatcher.handle_message.END",
-            perf_counter=r_time,
-        )
+        if spans:
+            span = spans.start("dispatch.handler")
+            try:
+                await handler(context, responder)
+            finally:
+                span.finish()
+        else:
+            await handler(context, responder)
+
+        if trace:
+            trace_event(
+                self.context.settings,
+                context.message,
+                outcome="Dispatcher.handle_message.END",
+                perf_counter=r_time,
+                force_trace=True,
+            )
 
     async def make_message(self, parsed_msg: dict) -> AgentMessage:
         """
@@ -287,7 +332,16 @@ class DispatcherResponder(BaseResponder):
         Args:
             message: The `OutboundMessage` to be sent
         """
-        await self._send(self._context, message, self._inbound_message)
+        spans = self._inbound_message.receipt.spans
+        if not spans:
+            await self._send(self._context, message, self._inbound_message)
+            return
+        message.spans = spans
+        span = spans.start("outbound.route")
+        try:
+            await self._send(self._context, message, self._inbound_message)
+        finally:
+            span.finish()
 
     async def send_webhook(self, topic: str, payload: dict):
         """
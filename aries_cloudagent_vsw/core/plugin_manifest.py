@@ -0,0 +1,189 @@
+"""
+Manifest of plugins, to start up without importing every plugin module.
+
+The manifest is written once from the plugins imported as usual. Later starts
+read it to register message types and admin routes without importing the
+message types, definition or routes modules of each plugin: the module of a
+route handler is imported on the first request to one of its routes. The
+manifest is written anew when the source files of the plugins change.
+"""
+
+import hashlib
+import importlib.util
+import json
+import logging
+import os
+import tempfile
+
+from typing import Callable, Sequence
+
+from aiohttp import web
+from aiohttp_apispec import validation_middleware
+
+from ..utils.classloader import ClassLoader
+from ..version import __version__
+
+LOGGER = logging.getLogger(__name__)
+
+
+class RouteRecorder:
+    """Stand-in for an application, recording the routes a module registers."""
+
+    def __init__(self):
+        """Initialize a `RouteRecorder` instance."""
+        self.routes = []
+
+    def add_routes(self, routes: Sequence):
+        """Record routes added to the application."""
+        self.routes.extend(routes)
+
+    def manifest(self, mod) -> Sequence[dict]:
+        """
+        Describe the recorded routes.
+
+        Returns:
+            The method, path, handler path and options of each route, or `None`
+            if a route cannot be registered without importing its module: its
+            handler is not a function of a module or its options are not plain
+            values
+
+        """
+        described = []
+        for route in self.routes:
+            handler = getattr(route, "handler", None)
+            name = getattr(handler, "__qualname__", "")
+            if (
+                not isinstance(route, web.RouteDef)
+                or "." in name
+                or getattr(ClassLoader.load_module(handler.__module__), name, None)
+                is not handler
+            ):
+                LOGGER.debug("Routes of %s cannot be registered lazily", mod.__name__)
+                return None
+            try:
+                kwargs = json.loads(json.dumps(route.kwargs))
+            except TypeError:
+                return None
+            described.append(
+                {
+                    "method": route.method,
+                    "path": route.path,
+                    "handler": f"{handler.__module__}.{name}",
+                    "kwargs": kwargs,
+                }
+            )
+        return described
+
+
+def lazy_route_handler(handler_path: str) -> Callable:
+    """
+    Build a route handler importing the actual handler on first use.
+
+    The OpenAPI attributes of the actual handler are copied to the lazy handler
+    once loaded, for the request validation middleware and the OpenAPI spec.
+    Requests which reached the handler before it was loaded are validated here.
+    """
+    (module_name, name) = handler_path.rsplit(".", 1)
+
+    def load_handler() -> Callable:
+        actual = getattr(ClassLoader.load_module(module_name), name)
+        for attr in ("__apispec__", "__schemas__"):
+            if hasattr(actual, attr) and not hasattr(handler, attr):
+                setattr(handler, attr, getattr(actual, attr))
+        handler.load_handler = lambda: actual
+        return actual
+
+    async def handler(request: web.BaseRequest):
+        actual = handler.load_handler()
+        if (
+            hasattr(actual, "__schemas__")
+            and request.app["_apispec_request_data_name"] not in request
+        ):
+            return await validation_middleware(request, actual)
+        return await actual(request)
+
+    handler.load_handler = load_handler
+    handler.__qualname__ = handler.__name__ = name
+    handler.__module__ = module_name
+    return handler
+
+
+STANDARD_PLUGINS = "aries_cloudagent_vsw.protocols"
+
+
+def plugin_fingerprint(external_plugins: Sequence[str]) -> str:
+    """
+    Fingerprint the source files of the standard and external plugins.
+
+    The plugins are located without importing them, only the parent packages
+    of a dotted name. The path, size and modification time of each of their
+    python source files are hashed.
+    """
+    digest = hashlib.sha256()
+    for name in (STANDARD_PLUGINS, *external_plugins):
+        try:
+            spec = importlib.util.find_spec(name)
+        except (ImportError, ValueError):
+            spec = None
+        if not spec or not spec.origin:
+            digest.update(f"{name}: not found\n".encode())
+            continue
+        if spec.submodule_search_locations:
+            paths = []
+            for location in spec.submodule_search_locations:
+                for (dir_path, dir_names, file_names) in os.walk(location):
+                    dir_names[:] = sorted(d for d in dir_names if d != "__pycache__")
+                    paths.extend(
+                        os.path.join(dir_path, file_name)
+                        for file_name in sorted(file_names)
+                        if file_name.endswith(".py")
+                    )
+        else:
+            paths = [spec.origin]
+        for file_path in paths:
+            stat = os.stat(file_path)
+            digest.update(f"{file_path}:{stat.st_size}:{stat.st_mtime_ns}\n".encode())
+    return digest.hexdigest()
+
+
+def read_manifest(path: str, external_plugins: Sequence[str]) -> dict:
+    """
+    Read a plugin manifest.
+
+    Returns:
+        The manifest, or `None` if it does not exist or was written for another
+        version, other external plugins or other plugin source files, and so
+        must be written anew
+
+    """
+    try:
+        with open(path, "r") as manifest_file:
+            manifest = json.load(manifest_file)
+    except FileNotFoundError:
+        return None
+    except ValueError:
+        LOGGER.warning("Ignoring invalid plugin manifest: %s", path)
+        return None
+    if manifest.get("version") != __version__ or manifest.get(
+        "external_plugins"
+    ) != list(external_plugins):
+        LOGGER.info("Plugin manifest is out of date: %s", path)
+        return None
+    if manifest.get("fingerprint") != plugin_fingerprint(external_plugins):
+        LOGGER.info("Plugin modules changed since manifest was written: %s", path)
+        return None
+    return manifest
+
+
+def write_manifest(path: str, manifest: dict, external_plugins: Sequence[str]):
+    """Write a plugin manifest, replacing any previous one atomically."""
+    manifest = dict(
+        manifest,
+        external_plugins=list(external_plugins),
+        fingerprint=plugin_fingerprint(external_plugins),
+    )
+    with tempfile.NamedTemporaryFile(
+        "w", dir=os.path.dirname(os.path.abspath(path)), delete=False
+    ) as manifest_file:
+        json.dump(manifest, manifest_file, indent=2)
+    os.replace(manifest_file.name, path)
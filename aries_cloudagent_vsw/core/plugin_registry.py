@@ -3,13 +3,17 @@
 import logging
 from collections import OrderedDict
 from types import ModuleType
-from typing import Sequence
+from typing import Iterator, Sequence, Tuple
+
+from aiohttp import web
 
 from .error import ProtocolDefinitionValidationError
 
 from ..config.injection_context import InjectionContext
 from ..utils.classloader import ClassLoader, ModuleLoadError
+from ..version import __version__
 
+from .plugin_manifest import lazy_route_handler, RouteRecorder
 from .protocol_registry import ProtocolRegistry
 
 LOGGER = logging.getLogger(__name__)
@@ -21,11 +25,12 @@ class PluginRegistry:
     def __init__(self):
         """Initialize a `PluginRegistry` instance."""
         self._plugins = OrderedDict()
+        self._manifest_plugins = OrderedDict()
 
     @property
     def plugin_names(self) -> Sequence[str]:
         """Accessor for a list of all plugin modules."""
-        return list(self._plugins.keys())
+        return list(self._plugins.keys()) + list(self._manifest_plugins.keys())
 
     @property
     def plugins(self) -> Sequence[ModuleType]:
@@ -193,6 +198,20 @@ class PluginRegistry:
             else:
                 await self.load_protocols(context, plugin)
 
+        # Register the protocols of plugins loaded from a manifest
+        if self._manifest_plugins:
+            registry = await context.inject(ProtocolRegistry)
+            for entry in self._manifest_plugins.values():
+                for protocol in entry["protocols"]:
+                    registry.register_message_types(
+                        protocol["message_types"],
+                        version_definition=protocol["version_definition"],
+                    )
+                    registry.register_controllers(
+                        protocol["controllers"],
+                        version_definition=protocol["version_definition"],
+                    )
+
     async def load_protocol_version(
         self,
         context: InjectionContext,
@@ -211,8 +230,8 @@ class PluginRegistry:
                 mod.CONTROLLERS, version_definition=version_definition
             )
 
-    async def load_protocols(self, context: InjectionContext, plugin: ModuleType):
-        """For modules that don't implement setup, register protocols manually."""
+    def protocol_modules(self, plugin: ModuleType) -> Iterator[Tuple[ModuleType, dict]]:
+        """Find the message types modules of a plugin, with their version definition."""
 
         # If this module contains message_types, then assume that
         # this is a valid module of the old style (not versioned)
@@ -223,7 +242,7 @@ class PluginRegistry:
             return
 
         if mod:
-            await self.load_protocol_version(context, mod)
+            yield (mod, None)
         else:
             # Otherwise, try check for definition.py for versioned
             # protocol packages
@@ -240,63 +259,132 @@ class PluginRegistry:
                             f"{plugin.__name__}.{protocol_version['path']}"
                             + ".message_types"
                         )
-                        await self.load_protocol_version(context, mod, protocol_version)
-
                     except ModuleLoadError as e:
                         LOGGER.error("Error loading plugin module message types: %s", e)
                         return
+                    yield (mod, protocol_version)
 
-    async def register_admin_routes(self, app):
-        """Call route registration methods on the current context."""
-        for plugin in self._plugins.values():
-            definition = ClassLoader.load_module("definition", plugin.__name__)
-            if definition:
-                # Load plugin routes that are in a versioned package.
-                for plugin_version in definition.versions:
-                    try:
-                        mod = ClassLoader.load_module(
-                            f"{plugin.__name__}.{plugin_version['path']}.routes"
-                        )
-                    except ModuleLoadError as e:
-                        LOGGER.error("Error loading admin routes: %s", e)
-                        continue
-                    if mod and hasattr(mod, "register"):
-                        await mod.register(app)
-            else:
-                # Load plugin routes that aren't in a versioned package.
+    async def load_protocols(self, context: InjectionContext, plugin: ModuleType):
+        """For modules that don't implement setup, register protocols manually."""
+        for (mod, version_definition) in self.protocol_modules(plugin):
+            await self.load_protocol_version(context, mod, version_definition)
+
+    def routes_modules(self, plugin: ModuleType) -> Iterator[ModuleType]:
+        """Find the admin routes modules of a plugin."""
+        definition = ClassLoader.load_module("definition", plugin.__name__)
+        if definition:
+            # Load plugin routes that are in a versioned package.
+            for plugin_version in definition.versions:
                 try:
-                    mod = ClassLoader.load_module(f"{plugin.__name__}.routes")
+                    mod = ClassLoader.load_module(
+                        f"{plugin.__name__}.{plugin_version['path']}.routes"
+                    )
                 except ModuleLoadError as e:
                     LOGGER.error("Error loading admin routes: %s", e)
                     continue
-                if mod and hasattr(mod, "register"):
+                if mod:
+                    yield mod
+        else:
+            # Load plugin routes that aren't in a versioned package.
+            try:
+                mod = ClassLoader.load_module(f"{plugin.__name__}.routes")
+            except ModuleLoadError as e:
+                LOGGER.error("Error loading admin routes: %s", e)
+                return
+            if mod:
+                yield mod
+
+    async def register_admin_routes(self, app):
+        """Call route registration methods on the current context."""
+        for plugin in self._plugins.values():
+            for mod in self.routes_modules(plugin):
+                if hasattr(mod, "register"):
                     await mod.register(app)
 
+        # Register the routes of plugins loaded from a manifest, importing
+        # the modules of their handlers on first use
+        for entry in self._manifest_plugins.values():
+            for routes in entry["routes"]:
+                if routes["routes"] is None:
+                    await ClassLoader.load_module(routes["module"]).register(app)
+                    continue
+                app.add_routes(
+                    [
+                        web.route(
+                            route["method"],
+                            route["path"],
+                            lazy_route_handler(route["handler"]),
+                            **route["kwargs"],
+                        )
+                        for route in routes["routes"]
+                    ]
+                )
+
     def post_process_routes(self, app):
         """Call route binary file response OpenAPI fixups if applicable."""
         for plugin in self._plugins.values():
-            definition = ClassLoader.load_module("definition", plugin.__name__)
-            if definition:
-                # Set binary file responses for routes that are in a versioned package.
-                for plugin_version in definition.versions:
+            for mod in self.routes_modules(plugin):
+                if hasattr(mod, "post_process_routes"):
+                    mod.post_process_routes(app)
+
+        for entry in self._manifest_plugins.values():
+            for routes in entry["routes"]:
+                if routes["post_process"]:
+                    ClassLoader.load_module(routes["module"]).post_process_routes(app)
+
+    async def build_manifest(self) -> dict:
+        """
+        Describe the registered plugins, to be loaded without importing them.
+
+        The manifest lists the message types and controllers of each plugin and
+        the method, path and handler of each of its admin routes. Plugins with
+        a setup method are listed to be imported and set up as usual.
+        """
+        plugins = []
+        for (name, plugin) in self._plugins.items():
+            if hasattr(plugin, "setup"):
+                plugins.append({"name": name, "setup": True})
+                continue
+            protocols = [
+                {
+                    "message_types": dict(getattr(mod, "MESSAGE_TYPES", {})),
+                    "controllers": dict(getattr(mod, "CONTROLLERS", {})),
+                    "version_definition": version_definition,
+                }
+                for (mod, version_definition) in self.protocol_modules(plugin)
+            ]
+            routes = []
+            for mod in self.routes_modules(plugin):
+                if hasattr(mod, "register"):
+                    recorder = RouteRecorder()
                     try:
-                        mod = ClassLoader.load_module(
-                            f"{plugin.__name__}.{plugin_version['path']}.routes"
+                        await mod.register(recorder)
+                        described = recorder.manifest(mod)
+                    except AttributeError:
+                        # registered other than with add_routes, as on app.router
+                        LOGGER.debug(
+                            "Routes of %s cannot be registered lazily", mod.__name__
                         )
-                    except ModuleLoadError as e:
-                        LOGGER.error("Error loading admin routes: %s", e)
-                        continue
-                    if mod and hasattr(mod, "post_process_routes"):
-                        mod.post_process_routes(app)
+                        described = None
+                    routes.append(
+                        {
+                            "module": mod.__name__,
+                            "routes": described,
+                            "post_process": hasattr(mod, "post_process_routes"),
+                        }
+                    )
+            plugins.append(
+                {"name": name, "setup": False, "protocols": protocols, "routes": routes}
+            )
+        return {"version": __version__, "plugins": plugins}
+
+    def load_manifest(self, manifest: dict):
+        """Register the plugins of a manifest, importing only those with setup."""
+        for entry in manifest["plugins"]:
+            if entry["setup"]:
+                self.register_plugin(entry["name"])
             else:
-                # Set binary file responses for routes not in a versioned package.
-                try:
-                    mod = ClassLoader.load_module(f"{plugin.__name__}.routes")
-                except ModuleLoadError as e:
-                    LOGGER.error("Error loading admin routes: %s", e)
-                    continue
-                if mod and hasattr(mod, "post_process_routes"):
-                    mod.post_process_routes(app)
+                self._manifest_plugins[entry["name"]] = entry
 
     def __repr__(self) -> str:
         """Return a string representation for this class."""
@@ -5,8 +5,12 @@ from asynctest import mock as async_mock
 
 from .. import conductor as test_module
 from ...admin.base_server import BaseAdminServer
+from ...cache.base import BaseCache
+from ...cache.basic import BasicCache
 from ...config.base_context import ContextBuilder
+from ...config.base import BaseProvider
 from ...config.injection_context import InjectionContext
+from ...config.provider import CachedProvider
 from ...connections.models.connection_record import ConnectionRecord
 from ...connections.models.connection_target import ConnectionTarget
 from ...connections.models.diddoc import (
@@ -16,10 +20,15 @@ from ...connections.models.diddoc import (
     Service,
 )
 from ...core.protocol_registry import ProtocolRegistry
+from ...ledger.provider import LedgerProvider
+from ...messaging.models.record_cache import RecordCache
 
+from ...protocols.connections.v1_0.cache_warmer import ConnectionCacheWarmer
 from ...protocols.connections.v1_0.manager import ConnectionManager
 from ...storage.base import BaseStorage
 from ...storage.basic import BasicStorage
+from ...tails.base import BaseTailsServer
+from ...tails.indy_tails_server import IndyTailsServer
 from ...transport.inbound.base import InboundTransportConfiguration
 from ...transport.inbound.message import InboundMessage
 from ...transport.inbound.receipt import MessageReceipt
@@ -28,9 +37,11 @@ from ...transport.outbound.manager import QueuedOutboundMessage
 from ...transport.outbound.message import OutboundMessage
 from ...transport.wire_format import BaseWireFormat
 from ...transport.pack_format import PackWireFormat
+from ...utils.metrics import Metrics
 from ...utils.stats import Collector
 from ...wallet.base import BaseWallet
 from ...wallet.basic import BasicWallet
+from ...wallet.key_pool import WalletKeyPool
 
 
 class Config:
@@ -127,6 +138,60 @@ class TestConductor(AsyncTestCase, Config, TestDIDs):
             mock_inbound_mgr.return_value.stop.assert_awaited_once_with()
             mock_outbound_mgr.return_value.stop.assert_awaited_once_with()
 
+    async def test_startup_span_tracer(self):
+        builder: ContextBuilder = StubContextBuilder(self.test_settings)
+        builder.update_settings(
+            {"trace.spans.sample_rate": 0.5, "trace.spans.target": "spans.json"}
+        )
+        conductor = test_module.Conductor(builder)
+
+        with async_mock.patch.object(
+            test_module, "InboundTransportManager", autospec=True
+        ) as mock_inbound_mgr, async_mock.patch.object(
+            test_module, "OutboundTransportManager", autospec=True
+        ) as mock_outbound_mgr, async_mock.patch.object(
+            test_module, "LoggingConfigurator", autospec=True
+        ), async_mock.patch.object(
+            test_module, "SpanTracer", autospec=True
+        ) as mock_tracer:
+            await conductor.setup()
+            mock_tracer.assert_called_once_with(
+                0.5, "spans.json", service_name="aca-py"
+            )
+            assert conductor.span_tracer is mock_tracer.return_value
+
+            mock_inbound_mgr.return_value.registered_transports = {}
+            mock_outbound_mgr.return_value.registered_transports = {}
+            await conductor.start()
+            mock_tracer.return_value.start.assert_awaited_once_with()
+            await conductor.stop()
+            mock_tracer.return_value.stop.assert_awaited_once_with()
+
+    async def test_startup_loop_monitor(self):
+        builder: ContextBuilder = StubContextBuilder(self.test_settings)
+        builder.update_settings({"monitor.loop_lag": 0.05})
+        conductor = test_module.Conductor(builder)
+
+        with async_mock.patch.object(
+            test_module, "InboundTransportManager", autospec=True
+        ) as mock_inbound_mgr, async_mock.patch.object(
+            test_module, "OutboundTransportManager", autospec=True
+        ) as mock_outbound_mgr, async_mock.patch.object(
+            test_module, "LoggingConfigurator", autospec=True
+        ):
+            await conductor.setup()
+            loop_monitor = await conductor.context.inject(test_module.LoopMonitor)
+            assert loop_monitor is conductor.loop_monitor
+            assert loop_monitor.threshold == 0.05
+            assert loop_monitor.interval == 0.1
+
+            mock_inbound_mgr.return_value.registered_transports = {}
+            mock_outbound_mgr.return_value.registered_transports = {}
+            await conductor.start()
+            assert loop_monitor._task
+            await conductor.stop()
+            assert not loop_monitor._task
+
     async def test_startup_no_public_did(self):
         builder: ContextBuilder = StubContextBuilder(self.test_settings)
         conductor = test_module.Conductor(builder)
@@ -194,6 +259,168 @@ class TestConductor(AsyncTestCase, Config, TestDIDs):
                 ]
             )
 
+    async def test_collect_metrics(self):
+        builder: ContextBuilder = StubContextBuilder(self.test_settings)
+        conductor = test_module.Conductor(builder)
+        metrics = Metrics()
+
+        with async_mock.patch.object(
+            test_module, "InboundTransportManager", autospec=True
+        ) as mock_inbound_mgr, async_mock.patch.object(
+            test_module, "OutboundTransportManager", autospec=True
+        ) as mock_outbound_mgr, async_mock.patch.object(
+            builder, "build", autospec=True
+        ) as mock_build:
+            context = await StubContextBuilder.build(builder)
+            context.injector.bind_instance(Metrics, metrics)
+            context.injector.bind_instance(BaseCache, BasicCache())
+            context.injector.bind_instance(RecordCache, RecordCache())
+            tails_server = IndyTailsServer()
+            tails_server.uploaded_count = 2
+            tails_server.bytes_uploaded = 1024
+            context.injector.bind_instance(BaseTailsServer, tails_server)
+            mock_build.return_value = context
+
+            mock_inbound_mgr.return_value.sessions = ["dummy"]
+            mock_outbound_mgr.return_value.task_queue = test_module.TaskQueue()
+            mock_outbound_mgr.return_value.outbound_buffer = [
+                async_mock.MagicMock(state=QueuedOutboundMessage.STATE_ENCODE),
+                async_mock.MagicMock(state=QueuedOutboundMessage.STATE_ENCODE),
+                async_mock.MagicMock(state=QueuedOutboundMessage.STATE_DELIVER),
+            ]
+
+            await conductor.setup()
+            cache = await context.inject(BaseCache)
+            # the record tag schemas are looked up on setup
+            cache.misses = 0
+            await cache.get("missing")
+            (await context.inject(RecordCache)).get("connection", "missing")
+            conductor.wallet_key_pool = WalletKeyPool(context, 2)
+            await conductor.wallet_key_pool.create_local_did()
+            conductor.connection_cache_warmer = ConnectionCacheWarmer(context, 10)
+            conductor.connection_cache_warmer.failed_count = 1
+
+            text = await metrics.to_text()
+            assert "\nacapy_inbound_sessions 1\n" in text
+            assert 'acapy_outbound_buffer_messages{state="encode"} 2\n' in text
+            assert 'acapy_outbound_buffer_messages{state="retry"} 0\n' in text
+            assert 'acapy_task_queue_tasks{queue="dispatcher",state="active"} 0' in text
+            assert 'acapy_task_queue_tasks{queue="outbound",state="pending"} 0' in text
+            assert 'acapy_cache_misses_total{cache="shared"} 1\n' in text
+            assert 'acapy_cache_misses_total{cache="record"} 1\n' in text
+            assert 'acapy_tails_uploads_total{result="uploaded"} 2\n' in text
+            assert "\nacapy_tails_uploaded_bytes_total 1024\n" in text
+            assert "\nacapy_tails_uploads_in_progress 0\n" in text
+            assert 'acapy_wallet_key_pool_items{kind="key"}' in text
+            assert 'acapy_cache_misses_total{cache="wallet_key_pool"} 1\n' in text
+            assert 'acapy_connection_cache_warmed_total{result="failed"} 1\n' in text
+            assert "\nacapy_connection_cache_warming 0\n" in text
+            await conductor.wallet_key_pool.stop()
+
+    async def test_stop_tails_server_closed(self):
+        builder: ContextBuilder = StubContextBuilder(self.test_settings)
+        conductor = test_module.Conductor(builder)
+
+        with async_mock.patch.object(
+            test_module, "InboundTransportManager", autospec=True
+        ), async_mock.patch.object(
+            test_module, "OutboundTransportManager", autospec=True
+        ):
+            await conductor.setup()
+            tails_server = IndyTailsServer()
+            conductor.context.injector.bind_instance(BaseTailsServer, tails_server)
+            session = tails_server._get_session()
+
+            await conductor.stop()
+            assert session.closed
+            assert not tails_server._session
+
+    @async_mock.patch("indy.pool.list_pools")
+    @async_mock.patch("indy.pool.set_protocol_version")
+    @async_mock.patch("indy.pool.open_pool_ledger")
+    @async_mock.patch("indy.pool.close_pool_ledger")
+    async def test_setup_ledger_pool_before_wallet(
+        self, mock_close_pool, mock_open_pool, mock_set_proto, mock_list_pools
+    ):
+        builder: ContextBuilder = StubContextBuilder(
+            {"wallet.type": "indy", "ledger.keepalive": 0}
+        )
+        conductor = test_module.Conductor(builder)
+        opened = []
+        mock_list_pools.return_value = [{"pool": "default"}]
+        mock_open_pool.side_effect = lambda *args: opened.append("pool")
+        mock_wallet = async_mock.MagicMock(type="indy")
+
+        class SlowWalletProvider(BaseProvider):
+            async def provide(self, settings, injector):
+                await asyncio.sleep(0.05)
+                opened.append("wallet")
+                return mock_wallet
+
+        async def wallet_config(context):
+            await context.inject(BaseWallet)
+
+        with async_mock.patch.object(
+            test_module, "InboundTransportManager", autospec=True
+        ), async_mock.patch.object(
+            test_module, "OutboundTransportManager", autospec=True
+        ), async_mock.patch.object(
+            test_module, "wallet_config", wallet_config
+        ), async_mock.patch.object(
+            test_module, "ledger_config", async_mock.CoroutineMock(return_value=True)
+        ), async_mock.patch.object(
+            builder, "build", async_mock.CoroutineMock()
+        ) as mock_build:
+            context = await StubContextBuilder.build(builder)
+            context.injector.bind_provider(
+                BaseWallet, CachedProvider(SlowWalletProvider())
+            )
+            context.injector.bind_provider(
+                test_module.BaseLedger, CachedProvider(LedgerProvider())
+            )
+            mock_build.return_value = context
+
+            await conductor.setup()
+            assert opened == ["pool", "wallet"]
+            ledger = await context.inject(test_module.BaseLedger)
+            assert ledger.wallet is mock_wallet
+            mock_close_pool.assert_called_once()
+
+    async def test_setup_x_ledger_closed(self):
+        builder: ContextBuilder = StubContextBuilder(self.test_settings)
+        conductor = test_module.Conductor(builder)
+        mock_ledger = async_mock.MagicMock(
+            type="memory",
+            __aenter__=async_mock.CoroutineMock(),
+            __aexit__=async_mock.CoroutineMock(return_value=None),
+        )
+        mock_ledger.__aenter__.return_value = mock_ledger
+
+        async def wallet_config(context):
+            # fail once the pool is open
+            while not mock_ledger.__aenter__.await_count:
+                await asyncio.sleep(0)
+            raise ValueError("no wallet")
+
+        with async_mock.patch.object(
+            test_module, "InboundTransportManager", autospec=True
+        ), async_mock.patch.object(
+            test_module, "OutboundTransportManager", autospec=True
+        ), async_mock.patch.object(
+            test_module, "load_genesis_transactions", async_mock.CoroutineMock()
+        ), async_mock.patch.object(
+            test_module, "wallet_config", wallet_config
+        ), async_mock.patch.object(
+            builder, "build", async_mock.CoroutineMock()
+        ) as mock_build:
+            context = await StubContextBuilder.build(builder)
+            context.injector.bind_instance(test_module.BaseLedger, mock_ledger)
+            mock_build.return_value = context
+
+            with self.assertRaises(ValueError):
+                await conductor.setup()
+            mock_ledger.__aexit__.assert_awaited_once()
+
     async def test_setup_x(self):
         builder: ContextBuilder = StubContextBuilder(self.test_settings)
         builder.update_settings(
@@ -479,6 +706,7 @@ class TestConductor(AsyncTestCase, Config, TestDIDs):
         await conductor.setup()
         admin = await conductor.context.inject(BaseAdminServer)
         assert admin is conductor.admin_server
+        assert admin.ready_gate
 
         wallet = await conductor.context.inject(BaseWallet)
         await wallet.create_public_did()
@@ -490,6 +718,7 @@ class TestConductor(AsyncTestCase, Config, TestDIDs):
         ) as admin_stop:
             await conductor.start()
             admin_start.assert_awaited_once_with()
+            assert not admin.ready_gate
 
             await conductor.stop()
             admin_stop.assert_awaited_once_with()
@@ -523,6 +752,87 @@ class TestConductor(AsyncTestCase, Config, TestDIDs):
             await conductor.stop()
             admin_stop.assert_awaited_once_with()
 
+    async def test_setup_ledger(self):
+        builder: ContextBuilder = StubContextBuilder(self.test_settings)
+        conductor = test_module.Conductor(builder)
+        mock_ledger = async_mock.MagicMock(
+            type="memory",
+            __aenter__=async_mock.CoroutineMock(),
+            __aexit__=async_mock.CoroutineMock(return_value=None),
+        )
+        mock_ledger.__aenter__.return_value = mock_ledger
+
+        async def ledger_config(context, public_did):
+            # the pool is open while the ledger is configured
+            mock_ledger.__aenter__.assert_awaited_once()
+            mock_ledger.__aexit__.assert_not_awaited()
+            return True
+
+        with async_mock.patch.object(
+            test_module, "InboundTransportManager", autospec=True
+        ), async_mock.patch.object(
+            test_module, "OutboundTransportManager", autospec=True
+        ), async_mock.patch.object(
+            test_module, "load_genesis_transactions", async_mock.CoroutineMock()
+        ) as mock_genesis, async_mock.patch.object(
+            test_module, "ledger_config", async_mock.CoroutineMock()
+        ) as mock_ledger_config, async_mock.patch.object(
+            builder, "build", async_mock.CoroutineMock()
+        ) as mock_build:
+            context = await StubContextBuilder.build(builder)
+            context.injector.bind_instance(test_module.BaseLedger, mock_ledger)
+            mock_build.return_value = context
+            mock_ledger_config.side_effect = ledger_config
+
+            await conductor.setup()
+            mock_genesis.assert_awaited_once_with(context)
+            mock_ledger_config.assert_awaited_once_with(context, None)
+            mock_ledger.__aexit__.assert_awaited_once()
+            phases = [name for (name, _) in conductor.startup_timer.phases]
+            assert phases.index("ledger") > phases.index("ledger_pool")
+            assert phases.index("ledger_pool") > phases.index("genesis")
+            assert phases.index("record_tags") > phases.index("wallet")
+
+    async def test_setup_ledger_non_indy(self):
+        builder: ContextBuilder = StubContextBuilder(self.test_settings)
+        conductor = test_module.Conductor(builder)
+        mock_ledger = async_mock.MagicMock(type="fabric")
+
+        with async_mock.patch.object(
+            test_module, "InboundTransportManager", autospec=True
+        ), async_mock.patch.object(
+            test_module, "OutboundTransportManager", autospec=True
+        ), async_mock.patch.object(
+            test_module, "ledger_config", async_mock.CoroutineMock()
+        ) as mock_ledger_config, async_mock.patch.object(
+            builder, "build", async_mock.CoroutineMock()
+        ) as mock_build:
+            context = await StubContextBuilder.build(builder)
+            context.injector.bind_instance(test_module.BaseLedger, mock_ledger)
+            mock_build.return_value = context
+
+            await conductor.setup()
+            mock_ledger_config.assert_not_awaited()
+
+    async def test_setup_x(self):
+        builder: ContextBuilder = StubContextBuilder(self.test_settings)
+        conductor = test_module.Conductor(builder)
+
+        with async_mock.patch.object(
+            test_module, "InboundTransportManager", autospec=True
+        ), async_mock.patch.object(
+            test_module, "OutboundTransportManager", autospec=True
+        ), async_mock.patch.object(
+            test_module,
+            "wallet_config",
+            async_mock.CoroutineMock(side_effect=ValueError("no wallet")),
+        ), async_mock.patch.object(
+            test_module, "ledger_config", async_mock.CoroutineMock()
+        ) as mock_ledger_config:
+            with self.assertRaises(ValueError):
+                await conductor.setup()
+            mock_ledger_config.assert_not_awaited()
+
     async def test_setup_collector(self):
         builder: ContextBuilder = StubCollectorContextBuilder(self.test_settings)
         conductor = test_module.Conductor(builder)
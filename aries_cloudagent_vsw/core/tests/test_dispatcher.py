@@ -17,6 +17,7 @@ from ...protocols.problem_report.v1_0.message import ProblemReport
 from ...transport.inbound.message import InboundMessage
 from ...transport.inbound.receipt import MessageReceipt
 from ...transport.outbound.message import OutboundMessage
+from ...utils.spans import SpanTracer
 
 from .. import dispatcher as test_module
 
@@ -115,6 +116,100 @@ class TestDispatcher(AsyncTestCase):
                 handler_mock.call_args[0][2], test_module.DispatcherResponder
             )
 
+    async def test_dispatch_trace(self):
+        context = make_context()
+        context.enforce_typing = False
+        registry = await context.inject(ProtocolRegistry)
+        registry.register_message_types(
+            {StubAgentMessage.Meta.message_type: StubAgentMessage}
+        )
+        dispatcher = test_module.Dispatcher(context)
+        await dispatcher.setup()
+        rcv = Receiver()
+        message = {"@type": StubAgentMessage.Meta.message_type}
+
+        with async_mock.patch.object(
+            test_module, "ConnectionManager", autospec=True
+        ) as conn_mgr_mock, async_mock.patch.object(
+            test_module, "trace_event", async_mock.MagicMock()
+        ) as mock_trace, async_mock.patch.object(
+            test_module, "tracing_enabled", async_mock.MagicMock()
+        ) as mock_enabled:
+            conn_mgr_mock.return_value = async_mock.MagicMock(
+                find_inbound_connection=async_mock.CoroutineMock(return_value=None)
+            )
+            inbound = make_inbound(message)
+            inbound.receipt.trace = False
+            await dispatcher.handle_message(inbound, rcv.send)
+            mock_enabled.assert_not_called()
+            mock_trace.assert_not_called()
+
+            inbound.receipt.trace = True
+            await dispatcher.handle_message(inbound, rcv.send)
+            assert [call[1]["outcome"] for call in mock_trace.call_args_list] == [
+                "Dispatcher.handle_message.START",
+                "Dispatcher.handle_message.END",
+            ]
+
+            # undecided, as for messages not parsed by a wire format
+            mock_trace.reset_mock()
+            mock_enabled.return_value = False
+            await dispatcher.handle_message(make_inbound(message), rcv.send)
+            mock_enabled.assert_called_once()
+            mock_trace.assert_not_called()
+
+    async def test_dispatch_spans(self):
+        context = make_context()
+        context.enforce_typing = False
+        registry = await context.inject(ProtocolRegistry)
+        registry.register_message_types(
+            {StubAgentMessage.Meta.message_type: StubAgentMessage}
+        )
+        dispatcher = test_module.Dispatcher(context)
+        await dispatcher.setup()
+        rcv = Receiver()
+        inbound = make_inbound({"@type": StubAgentMessage.Meta.message_type})
+        tracer = SpanTracer(1.0, "unused")
+        inbound.receipt.spans = tracer.sample("inbound_message")
+        outbound = OutboundMessage(payload="{}")
+        complete = async_mock.MagicMock()
+
+        async def handle(handler, context, responder):
+            await responder.send_outbound(outbound)
+
+        with async_mock.patch.object(
+            StubAgentMessageHandler, "handle", autospec=True
+        ) as handler_mock, async_mock.patch.object(
+            test_module, "ConnectionManager", autospec=True
+        ) as conn_mgr_mock, async_mock.patch.object(
+            tracer, "record", autospec=True
+        ) as mock_record:
+            handler_mock.side_effect = handle
+            conn_mgr_mock.return_value = async_mock.MagicMock(
+                find_inbound_connection=async_mock.CoroutineMock(
+                    return_value=async_mock.MagicMock(connection_id="dummy")
+                )
+            )
+            await dispatcher.queue_message(inbound, rcv.send, complete=complete)
+            await dispatcher.task_queue
+            complete.assert_called_once()
+
+            spans = [call[0][0] for call in mock_record.call_args_list]
+            assert [span.name for span in spans] == [
+                "dispatch.queue",
+                "dispatch.resolve_connection",
+                "dispatch.deserialize",
+                "outbound.route",
+                "dispatch.handler",
+                "inbound_message",
+            ]
+            assert spans[1].attributes["connection_id"] == "dummy"
+            assert spans[-1].attributes["message_type"] == (
+                StubAgentMessage.Meta.message_type
+            )
+            assert "error" not in spans[-1].attributes
+            assert outbound.spans is inbound.receipt.spans
+
     async def test_dispatch_versioned_message(self):
         context = make_context()
         context.enforce_typing = False
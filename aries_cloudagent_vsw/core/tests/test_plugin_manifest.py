@@ -0,0 +1,146 @@
+import json
+import os
+import sys
+
+from tempfile import TemporaryDirectory
+
+from aiohttp import web
+from aiohttp_apispec import docs, querystring_schema
+from asynctest import TestCase as AsyncTestCase, mock as async_mock
+from marshmallow import fields, Schema
+
+from ...protocols.basicmessage.v1_0 import routes as basicmessage_routes
+from ...version import __version__
+
+from .. import plugin_manifest as test_module
+from ..plugin_manifest import (
+    lazy_route_handler,
+    plugin_fingerprint,
+    read_manifest,
+    RouteRecorder,
+    write_manifest,
+)
+
+
+class QuerySchema(Schema):
+    value = fields.Str()
+
+
+@docs(tags=["test"], summary="Test handler")
+@querystring_schema(QuerySchema())
+async def handler_with_schema(request: web.BaseRequest):
+    return web.json_response(request["data"])
+
+
+async def handler_without_schema(request: web.BaseRequest):
+    return web.json_response({})
+
+
+class TestRouteRecorder(AsyncTestCase):
+    async def test_manifest(self):
+        recorder = RouteRecorder()
+        await basicmessage_routes.register(recorder)
+        described = recorder.manifest(basicmessage_routes)
+        assert described == [
+            {
+                "method": "POST",
+                "path": "/connections/{conn_id}/send-message",
+                "handler": (f"{basicmessage_routes.__name__}.connections_send_message"),
+                "kwargs": {},
+            }
+        ]
+
+    async def test_manifest_not_lazy(self):
+        recorder = RouteRecorder()
+        recorder.add_routes([web.get("/test", lambda request: None)])
+        assert recorder.manifest(basicmessage_routes) is None
+
+        recorder = RouteRecorder()
+        recorder.add_routes([web.static("/static", os.getcwd())])
+        assert recorder.manifest(basicmessage_routes) is None
+
+        recorder = RouteRecorder()
+        recorder.add_routes(
+            [web.get("/test", handler_without_schema, expect_handler=object())]
+        )
+        assert recorder.manifest(basicmessage_routes) is None
+
+
+class TestLazyRouteHandler(AsyncTestCase):
+    async def test_load_handler(self):
+        handler = lazy_route_handler(f"{__name__}.handler_with_schema")
+        assert handler.__name__ == "handler_with_schema"
+        assert not hasattr(handler, "__apispec__")
+
+        assert handler.load_handler() is handler_with_schema
+        assert handler.__apispec__ is handler_with_schema.__apispec__
+        assert handler.__schemas__ is handler_with_schema.__schemas__
+
+    async def test_call(self):
+        request = async_mock.MagicMock(
+            app={"_apispec_request_data_name": "data"},
+            __contains__=lambda _, key: key == "data",
+        )
+        handler = lazy_route_handler(f"{__name__}.handler_without_schema")
+        response = await handler(request)
+        assert json.loads(response.body) == {}
+
+        handler = lazy_route_handler(f"{__name__}.handler_with_schema")
+        with async_mock.patch.object(
+            test_module, "validation_middleware", async_mock.CoroutineMock()
+        ) as mock_validation:
+            # validated by the middleware of the application
+            request.__getitem__ = lambda _, key: {"value": "test"}
+            response = await handler(request)
+            assert json.loads(response.body) == {"value": "test"}
+            mock_validation.assert_not_called()
+
+            # reached the handler before it was loaded: validated here
+            request.__contains__ = lambda _, key: False
+            await handler(request)
+            mock_validation.assert_awaited_once_with(request, handler_with_schema)
+
+
+class TestManifestFile(AsyncTestCase):
+    async def test_write_read(self):
+        with TemporaryDirectory() as manifest_dir:
+            path = os.path.join(manifest_dir, "manifest.json")
+            assert read_manifest(path, []) is None
+
+            manifest = {"version": __version__, "plugins": []}
+            write_manifest(path, manifest, ["external"])
+            assert read_manifest(path, ["external"]) == dict(
+                manifest,
+                external_plugins=["external"],
+                fingerprint=plugin_fingerprint(["external"]),
+            )
+            assert read_manifest(path, []) is None
+
+            write_manifest(path, dict(manifest, version="0.0.0"), [])
+            assert read_manifest(path, []) is None
+
+            with open(path, "w") as manifest_file:
+                manifest_file.write("{")
+            assert read_manifest(path, []) is None
+
+    async def test_read_plugin_changed(self):
+        with TemporaryDirectory() as plugin_dir:
+            package_dir = os.path.join(plugin_dir, "fingerprint_plugin")
+            os.mkdir(package_dir)
+            module_path = os.path.join(package_dir, "__init__.py")
+            with open(module_path, "w") as module_file:
+                module_file.write("")
+            path = os.path.join(plugin_dir, "manifest.json")
+            manifest = {"version": __version__, "plugins": []}
+
+            sys.path.insert(0, plugin_dir)
+            try:
+                write_manifest(path, manifest, ["fingerprint_plugin"])
+                assert read_manifest(path, ["fingerprint_plugin"])
+
+                stat = os.stat(module_path)
+                os.utime(module_path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 10 ** 9))
+                assert read_manifest(path, ["fingerprint_plugin"]) is None
+            finally:
+                sys.path.remove(plugin_dir)
+            assert "fingerprint_plugin" not in sys.modules  # not imported
@@ -1,6 +1,7 @@
 import pytest
 from unittest.mock import call
 
+from aiohttp import web
 from asynctest import TestCase as AsyncTestCase, mock as async_mock, call
 
 from ...config.injection_context import InjectionContext
@@ -548,5 +549,99 @@ class TestPluginRegistry(AsyncTestCase):
             await self.registry.load_protocols(self.context, mock_plugin)
             assert load_module.call_count == 4
 
+    async def test_manifest(self):
+        plugin_name = "aries_cloudagent_vsw.protocols.basicmessage"
+        self.registry.register_plugin(plugin_name)
+        manifest = await self.registry.build_manifest()
+        assert manifest["plugins"][0]["name"] == plugin_name
+        (routes,) = manifest["plugins"][0]["routes"]
+        assert routes["module"] == f"{plugin_name}.v1_0.routes"
+        assert routes["post_process"]
+
+        setup_plugin = async_mock.MagicMock(__name__="setup_mod")
+        self.registry._plugins["setup_mod"] = setup_plugin
+        manifest = await self.registry.build_manifest()
+        assert manifest["plugins"][1] == {"name": "setup_mod", "setup": True}
+
+        registry = PluginRegistry()
+        with async_mock.patch.object(
+            registry, "register_plugin", async_mock.MagicMock()
+        ) as mock_register:
+            registry.load_manifest(manifest)
+            mock_register.assert_called_once_with("setup_mod")
+        assert registry.plugin_names == [plugin_name]
+        assert not registry.plugins
+
+        await registry.init_context(self.context)
+        (protocol,) = manifest["plugins"][0]["protocols"]
+        self.proto_registry.register_message_types.assert_called_once_with(
+            protocol["message_types"],
+            version_definition=protocol["version_definition"],
+        )
+        assert protocol["version_definition"]["path"] == "v1_0"
+
+        app = web.Application()
+        with async_mock.patch.object(
+            ClassLoader, "load_module", async_mock.MagicMock()
+        ) as load_module:
+            await registry.register_admin_routes(app)
+            load_module.assert_not_called()
+        (route,) = app.router.routes()
+        assert route.method == "POST"
+        assert route.handler.__name__ == "connections_send_message"
+
+        app = async_mock.MagicMock()
+        registry.post_process_routes(app)
+        assert app._state["swagger_dict"]["tags"].append.call_count == 1
+
+    async def test_manifest_routes_app_router(self):
+        async def register(app):
+            app.router.add_get("/test", async_mock.CoroutineMock())
+
+        mod = async_mock.MagicMock(__name__="test_mod.routes", register=register)
+        del mod.post_process_routes
+        self.registry._plugins["test_mod"] = async_mock.MagicMock(__name__="test_mod")
+        del self.registry._plugins["test_mod"].setup
+        with async_mock.patch.object(
+            self.registry, "protocol_modules", async_mock.MagicMock(return_value=[])
+        ), async_mock.patch.object(
+            self.registry, "routes_modules", async_mock.MagicMock(return_value=[mod])
+        ):
+            manifest = await self.registry.build_manifest()
+        assert manifest["plugins"][0]["routes"] == [
+            {"module": "test_mod.routes", "routes": None, "post_process": False}
+        ]
+
+    async def test_register_manifest_routes_not_lazy(self):
+        mod = async_mock.MagicMock(register=async_mock.CoroutineMock())
+        self.registry.load_manifest(
+            {
+                "plugins": [
+                    {
+                        "name": "test_mod",
+                        "setup": False,
+                        "protocols": [],
+                        "routes": [
+                            {
+                                "module": "test_mod.routes",
+                                "routes": None,
+                                "post_process": False,
+                            }
+                        ],
+                    }
+                ]
+            }
+        )
+        app = async_mock.MagicMock()
+        with async_mock.patch.object(
+            ClassLoader, "load_module", async_mock.MagicMock(return_value=mod)
+        ) as load_module:
+            await self.registry.register_admin_routes(app)
+            load_module.assert_called_once_with("test_mod.routes")
+            mod.register.assert_awaited_once_with(app)
+
+            self.registry.post_process_routes(app)
+            load_module.assert_called_once()
+
     def test_repr(self):
         assert type(repr(self.registry)) is str
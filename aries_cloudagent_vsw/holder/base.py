@@ -146,3 +146,32 @@ class BaseHolder(ABC, metaclass=ABCMeta):
             the revocation state
 
         """
+
+    async def update_revocation_state(
+        self,
+        cred_rev_id: str,
+        rev_reg_def: dict,
+        rev_reg_delta: dict,
+        timestamp: int,
+        tails_file_path: str,
+        rev_state: str,
+    ) -> str:
+        """
+        Update an existing revocation state for a received credential.
+
+        Holders which cannot update a revocation state raise `NotImplementedError`,
+        for callers to create the revocation state anew.
+
+        Args:
+            cred_rev_id: credential revocation id in revocation registry
+            rev_reg_def: revocation registry definition
+            rev_reg_delta: revocation delta since the timestamp of the existing state
+            timestamp: delta timestamp
+            tails_file_path: path to the local tails file
+            rev_state: the existing revocation state
+
+        Returns:
+            the updated revocation state
+
+        """
+        raise NotImplementedError()
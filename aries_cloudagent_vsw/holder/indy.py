@@ -412,3 +412,44 @@ class IndyHolder(BaseHolder):
             )
 
         return rev_state_json
+
+    async def update_revocation_state(
+        self,
+        cred_rev_id: str,
+        rev_reg_def: dict,
+        rev_reg_delta: dict,
+        timestamp: int,
+        tails_file_path: str,
+        rev_state: str,
+    ) -> str:
+        """
+        Update an existing revocation state for a received credential.
+
+        Only the changes in the delta are applied to the witness, which avoids
+        reading the tails file for every credential issued in the registry.
+
+        Args:
+            cred_rev_id: credential revocation id in revocation registry
+            rev_reg_def: revocation registry definition
+            rev_reg_delta: revocation delta since the timestamp of the existing state
+            timestamp: delta timestamp
+            tails_file_path: path to the local tails file
+            rev_state: the existing revocation state
+
+        Returns:
+            the updated revocation state
+
+        """
+
+        with IndyErrorHandler("Error when updating revocation state", HolderError):
+            tails_file_reader = await create_tails_reader(tails_file_path)
+            rev_state_json = await indy.anoncreds.update_revocation_state(
+                tails_file_reader,
+                rev_state_json=rev_state,
+                rev_reg_def_json=json.dumps(rev_reg_def),
+                rev_reg_delta_json=json.dumps(rev_reg_delta),
+                timestamp=timestamp,
+                cred_rev_id=cred_rev_id,
+            )
+
+        return rev_state_json
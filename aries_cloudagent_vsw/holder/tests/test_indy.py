@@ -459,3 +459,44 @@ class TestIndyHolder(AsyncTestCase):
                 rev_reg_delta_json=json.dumps(rev_reg_delta),
                 timestamp=timestamp,
             )
+
+    async def test_update_revocation_state(self):
+        rr_state = {
+            "witness": {"omega": "2 ..."},
+            "rev_reg": {"accum": "22 ..."},
+            "timestamp": 1234567890,
+        }
+        holder = IndyHolder("wallet")
+
+        with async_mock.patch.object(
+            test_module, "create_tails_reader", async_mock.CoroutineMock()
+        ) as mock_create_tails_reader, async_mock.patch.object(
+            indy.anoncreds, "update_revocation_state", async_mock.CoroutineMock()
+        ) as mock_update_rr_state:
+            mock_update_rr_state.return_value = json.dumps(rr_state)
+
+            cred_rev_id = "1"
+            rev_reg_def = {"def": 1}
+            rev_reg_delta = {"delta": 1}
+            timestamp = 1234567890
+            tails_path = "/tmp/some.tails"
+            prior_state = json.dumps({"witness": {"omega": "1 ..."}})
+
+            result = await holder.update_revocation_state(
+                cred_rev_id,
+                rev_reg_def,
+                rev_reg_delta,
+                timestamp,
+                tails_path,
+                prior_state,
+            )
+            assert json.loads(result) == rr_state
+
+            mock_update_rr_state.assert_awaited_once_with(
+                mock_create_tails_reader.return_value,
+                rev_state_json=prior_state,
+                rev_reg_def_json=json.dumps(rev_reg_def),
+                rev_reg_delta_json=json.dumps(rev_reg_delta),
+                timestamp=timestamp,
+                cred_rev_id=cred_rev_id,
+            )
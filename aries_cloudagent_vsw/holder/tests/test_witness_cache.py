@@ -0,0 +1,92 @@
+import asyncio
+
+from asynctest import TestCase as AsyncTestCase
+
+from ...storage.basic import BasicStorage
+
+from ..witness_cache import RevocationWitnessCache
+
+RR_ID = "NcYxiDXkpYi6ov5FcYDi1e:4:NcYxiDXkpYi6ov5FcYDi1e:3:CL:12:tag1:CL_ACCUM:0"
+
+
+class TestRevocationWitnessCache(AsyncTestCase):
+    def setUp(self):
+        self.storage = BasicStorage()
+        self.cache = RevocationWitnessCache(max_items=2, max_stored_per_credential=2)
+
+    async def test_get_put(self):
+        assert await self.cache.get(self.storage, RR_ID, "1", 1000) is None
+        await self.cache.put(self.storage, RR_ID, 1, 1000, "state-1000")
+        assert await self.cache.get(self.storage, RR_ID, "1", 1000) == "state-1000"
+        assert await self.cache.get(self.storage, RR_ID, "2", 1000) is None
+
+        # persisted beyond memory
+        self.cache.clear()
+        assert await self.cache.get(self.storage, RR_ID, "1", 1000) == "state-1000"
+
+        # putting the same state again does not duplicate the record
+        await self.cache.put(self.storage, RR_ID, "1", 1000, "state-1000")
+        records = await self.storage.search_records(
+            RevocationWitnessCache.RECORD_TYPE
+        ).fetch_all()
+        assert len(records) == 1
+
+    async def test_put_concurrent(self):
+        search = self.cache._search
+
+        async def interleaved_search(*args):
+            records = await search(*args)
+            await asyncio.sleep(0)  # both find no record before either adds
+            return records
+
+        self.cache._search = interleaved_search
+        await asyncio.gather(
+            self.cache.put(self.storage, RR_ID, "1", 1000, "state-1000"),
+            RevocationWitnessCache().put(self.storage, RR_ID, "1", 1000, "state-1000"),
+        )
+        records = await self.storage.search_records(
+            RevocationWitnessCache.RECORD_TYPE
+        ).fetch_all()
+        assert len(records) == 1
+
+    async def test_get_latest(self):
+        assert await self.cache.get_latest(self.storage, RR_ID, "1", 3000) is None
+        await self.cache.put(self.storage, RR_ID, "1", 1000, "state-1000")
+        await self.cache.put(self.storage, RR_ID, "1", 2000, "state-2000")
+        assert await self.cache.get_latest(self.storage, RR_ID, "1", 3000) == (
+            "state-2000",
+            2000,
+        )
+        assert await self.cache.get_latest(self.storage, RR_ID, "1", 2000) == (
+            "state-1000",
+            1000,
+        )
+        assert await self.cache.get_latest(self.storage, RR_ID, "1", 1000) is None
+
+        self.cache.clear()
+        assert await self.cache.get_latest(self.storage, RR_ID, "1", 3000) == (
+            "state-2000",
+            2000,
+        )
+
+    async def test_eviction(self):
+        for timestamp in (1000, 2000, 3000):
+            await self.cache.put(
+                self.storage, RR_ID, "1", timestamp, f"state-{timestamp}"
+            )
+        await self.cache.put(self.storage, RR_ID, "2", 1000, "other")
+
+        # memory holds the most recently used
+        assert len(self.cache._states) == 2
+        assert (RR_ID, "2", 1000) in self.cache._states
+        assert (RR_ID, "1", 3000) in self.cache._states
+
+        # storage keeps the newest states per credential
+        records = await self.storage.search_records(
+            RevocationWitnessCache.RECORD_TYPE, {"cred_rev_id": "1"}
+        ).fetch_all()
+        assert sorted(int(record.tags["timestamp"]) for record in records) == [
+            2000,
+            3000,
+        ]
+        assert await self.cache.get(self.storage, RR_ID, "1", 1000) is None
@@ -0,0 +1,173 @@
+"""Cache of holder revocation states (non-revocation witnesses)."""
+
+from collections import OrderedDict
+from typing import Optional, Tuple
+
+from ..storage.base import BaseStorage
+from ..storage.error import StorageDuplicateError, StorageNotFoundError
+from ..storage.record import StorageRecord
+
+WitnessKey = Tuple[str, str, int]
+
+
+class RevocationWitnessCache:
+    """
+    Cache of revocation states created for held credentials.
+
+    A revocation state depends only on the revocation registry, the credential
+    revocation id and the ledger timestamp of the registry delta it was built
+    from, so it may be reused for any presentation against the same registry
+    state. States are kept in holder storage to survive restarts, with the most
+    recently used held in memory. Older states for a credential are retained as
+    the starting point for an incremental update from a newer delta.
+    """
+
+    RECORD_TYPE = "revocation_state"
+
+    def __init__(self, max_items: int = 512, max_stored_per_credential: int = 2):
+        """
+        Initialize a `RevocationWitnessCache` instance.
+
+        Args:
+            max_items: The maximum number of revocation states held in memory
+            max_stored_per_credential: The maximum number of revocation states
+                kept in storage for each credential, newest first
+
+        """
+        self.max_items = max_items
+        self.max_stored_per_credential = max_stored_per_credential
+        self._states = OrderedDict()
+
+    @staticmethod
+    def record_id(rev_reg_id: str, cred_rev_id: str, timestamp: int) -> str:
+        """Get the storage record identifier for a revocation state."""
+        return f"{rev_reg_id}::{cred_rev_id}::{timestamp}"
+
+    def _remember(self, key: WitnessKey, state: str):
+        """Hold a revocation state in memory, evicting the least recently used."""
+        self._states[key] = state
+        self._states.move_to_end(key)
+        while len(self._states) > self.max_items:
+            self._states.popitem(last=False)
+
+    async def get(
+        self, storage: BaseStorage, rev_reg_id: str, cred_rev_id: str, timestamp: int
+    ) -> Optional[str]:
+        """
+        Look up the revocation state for a credential as of a registry delta.
+
+        Args:
+            storage: The holder storage instance
+            rev_reg_id: The revocation registry identifier
+            cred_rev_id: The credential revocation identifier
+            timestamp: The ledger timestamp of the registry delta
+
+        Returns:
+            The revocation state JSON, or `None`
+
+        """
+        key = (rev_reg_id, str(cred_rev_id), int(timestamp))
+        state = self._states.get(key)
+        if state is None:
+            try:
+                record = await storage.get_record(
+                    self.RECORD_TYPE, self.record_id(*key)
+                )
+            except StorageNotFoundError:
+                return None
+            state = record.value
+        self._remember(key, state)
+        return state
+
+    async def get_latest(
+        self, storage: BaseStorage, rev_reg_id: str, cred_rev_id: str, before: int
+    ) -> Optional[Tuple[str, int]]:
+        """
+        Find the newest revocation state for a credential older than a timestamp.
+
+        Args:
+            storage: The holder storage instance
+            rev_reg_id: The revocation registry identifier
+            cred_rev_id: The credential revocation identifier
+            before: The ledger timestamp the state must precede
+
+        Returns:
+            A tuple of the revocation state JSON and its timestamp, or `None`
+
+        """
+        cred_rev_id = str(cred_rev_id)
+        latest = None
+        for (key, state) in self._states.items():
+            if key[:2] == (rev_reg_id, cred_rev_id) and key[2] < before:
+                if not latest or key[2] > latest[1]:
+                    latest = (state, key[2])
+        if latest:
+            return latest
+
+        records = await self._search(storage, rev_reg_id, cred_rev_id)
+        for record in records:
+            timestamp = int(record.tags["timestamp"])
+            if timestamp < before:
+                return (record.value, timestamp)
+        return None
+
+    async def put(
+        self,
+        storage: BaseStorage,
+        rev_reg_id: str,
+        cred_rev_id: str,
+        timestamp: int,
+        state: str,
+    ):
+        """
+        Add a revocation state, discarding the oldest stored for the credential.
+
+        Args:
+            storage: The holder storage instance
+            rev_reg_id: The revocation registry identifier
+            cred_rev_id: The credential revocation identifier
+            timestamp: The ledger timestamp of the registry delta
+            state: The revocation state JSON
+
+        """
+        key = (rev_reg_id, str(cred_rev_id), int(timestamp))
+        self._remember(key, state)
+        records = await self._search(storage, rev_reg_id, key[1])
+        if any(int(record.tags["timestamp"]) == key[2] for record in records):
+            return
+        try:
+            await storage.add_record(
+                StorageRecord(
+                    self.RECORD_TYPE,
+                    state,
+                    {
+                        "rev_reg_id": rev_reg_id,
+                        "cred_rev_id": key[1],
+                        "timestamp": str(key[2]),
+                    },
+                    self.record_id(*key),
+                )
+            )
+        except StorageDuplicateError:
+            return  # stored concurrently
+        keep = self.max_stored_per_credential - 1
+        for record in records[keep:]:
+            try:
+                await storage.delete_record(record)
+            except StorageNotFoundError:
+                pass  # removed concurrently
+
+    async def _search(
+        self, storage: BaseStorage, rev_reg_id: str, cred_rev_id: str
+    ) -> list:
+        """Fetch the stored revocation states for a credential, newest first."""
+        records = await storage.search_records(
+            self.RECORD_TYPE, {"rev_reg_id": rev_reg_id, "cred_rev_id": cred_rev_id}
+        ).fetch_all()
+        return sorted(
+            records, key=lambda record: int(record.tags["timestamp"]), reverse=True
+        )
+
+    def clear(self):
+        """Discard the revocation states held in memory."""
+        self._states.clear()
@@ -0,0 +1,147 @@
+"""Persistent store for immutable ledger artifacts."""
+
+import asyncio
+import json
+import logging
+import os
+
+from hashlib import sha256
+from tempfile import NamedTemporaryFile
+from typing import Mapping
+
+from .error import LedgerConfigError
+
+LOGGER = logging.getLogger(__name__)
+
+ARTIFACT_SCHEMA = "schema"
+ARTIFACT_CRED_DEF = "credential_definition"
+ARTIFACT_REVOC_REG_DEF = "revocation_registry_definition"
+
+ARTIFACT_TYPES = (ARTIFACT_SCHEMA, ARTIFACT_CRED_DEF, ARTIFACT_REVOC_REG_DEF)
+
+# bundle file section for each artifact type
+BUNDLE_SECTIONS = {
+    ARTIFACT_SCHEMA: "schemas",
+    ARTIFACT_CRED_DEF: "credential_definitions",
+    ARTIFACT_REVOC_REG_DEF: "revocation_registry_definitions",
+}
+
+
+class LedgerArtifactStore:
+    """
+    On-disk store for schemas, credential definitions and rev reg definitions.
+
+    These artifacts never change once written to the ledger, so they may be kept
+    indefinitely. Files are addressed by the hash of the artifact identifier,
+    under a directory per ledger type and pool name.
+    """
+
+    def __init__(self, base_dir: str, ledger_type: str, pool_name: str):
+        """
+        Initialize a `LedgerArtifactStore` instance.
+
+        Args:
+            base_dir: The root directory of the store
+            ledger_type: The ledger type, such as "indy"
+            pool_name: The ledger pool name
+
+        """
+        self.base_dir = base_dir
+        self.ledger_type = ledger_type
+        self.pool_name = pool_name
+        self.dir = os.path.join(base_dir, ledger_type, pool_name)
+
+    def artifact_path(self, artifact_type: str, artifact_id: str) -> str:
+        """Get the file path for an artifact."""
+        if artifact_type not in ARTIFACT_TYPES:
+            raise LedgerConfigError(
+                f"Unsupported ledger artifact type: {artifact_type}"
+            )
+        digest = sha256(artifact_id.encode("utf-8")).hexdigest()
+        return os.path.join(self.dir, artifact_type, digest + ".json")
+
+    def _read(self, artifact_type: str, artifact_id: str) -> dict:
+        """Read an artifact from disk, returning None if absent or unreadable."""
+        path = self.artifact_path(artifact_type, artifact_id)
+        try:
+            with open(path, "r") as artifact_file:
+                stored = json.load(artifact_file)
+        except FileNotFoundError:
+            return None
+        except (OSError, ValueError) as err:
+            LOGGER.warning("Ignoring unreadable ledger artifact %s: %s", path, err)
+            return None
+        if stored.get("id") != artifact_id:
+            return None
+        return stored.get("value")
+
+    def _write(self, artifact_type: str, artifact_id: str, value: dict):
+        """Write an artifact to disk atomically."""
+        path = self.artifact_path(artifact_type, artifact_id)
+        dir_name = os.path.dirname(path)
+        os.makedirs(dir_name, exist_ok=True)
+        with NamedTemporaryFile("w", dir=dir_name, delete=False) as tmp_file:
+            json.dump({"id": artifact_id, "value": value}, tmp_file)
+        os.replace(tmp_file.name, path)
+
+    async def get(self, artifact_type: str, artifact_id: str) -> dict:
+        """
+        Fetch an artifact from the store.
+
+        Args:
+            artifact_type: The type of artifact
+            artifact_id: The ledger identifier of the artifact
+
+        Returns:
+            The stored artifact, or `None`
+
+        """
+        return await asyncio.get_event_loop().run_in_executor(
+            None, self._read, artifact_type, artifact_id
+        )
+
+    async def put(self, artifact_type: str, artifact_id: str, value: dict):
+        """
+        Add an artifact to the store.
+
+        Args:
+            artifact_type: The type of artifact
+            artifact_id: The ledger identifier of the artifact
+            value: The artifact as fetched from the ledger
+
+        """
+        await asyncio.get_event_loop().run_in_executor(
+            None, self._write, artifact_type, artifact_id, value
+        )
+
+    async def load_bundle(self, bundle_path: str) -> int:
+        """
+        Preload the store from a bundle file.
+
+        The bundle is a JSON object with optional "schemas",
+        "credential_definitions" and "revocation_registry_definitions"
+        sections, each mapping artifact identifiers to artifacts.
+
+        Args:
+            bundle_path: Path to the bundle file
+
+        Returns:
+            The number of artifacts loaded
+
+        """
+        try:
+            with open(bundle_path, "r") as bundle_file:
+                bundle = json.load(bundle_file)
+        except (OSError, ValueError) as err:
+            raise LedgerConfigError(
+                f"Error loading ledger artifact bundle {bundle_path}: {err}"
+            ) from err
+
+        count = 0
+        for artifact_type, section in BUNDLE_SECTIONS.items():
+            artifacts: Mapping[str, dict] = bundle.get(section) or {}
+            for artifact_id, value in artifacts.items():
+                await self.put(artifact_type, artifact_id, value)
+                count += 1
+        LOGGER.info("Loaded %d ledger artifacts from %s", count, bundle_path)
+        return count
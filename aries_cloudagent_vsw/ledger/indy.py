@@ -9,9 +9,10 @@ from datetime import datetime, date
 from enum import Enum
 from hashlib import sha256
 from os import path
-from time import time
-from typing import Sequence, Tuple, Union
+from time import perf_counter, time
+from typing import Any, Awaitable, Callable, Sequence, Tuple, Union
 
+import indy.anoncreds
 import indy.ledger
 import indy.pool
 from indy.error import IndyError, ErrorCode
@@ -24,8 +25,15 @@ from ..messaging.schemas.util import SCHEMA_SENT_RECORD_TYPE
 from ..storage.base import StorageRecord
 from ..storage.indy import IndyStorage
 from ..utils import sentinel
+from ..utils.metrics import Metrics
 from ..wallet.base import BaseWallet, DIDInfo
 
+from .artifacts import (
+    ARTIFACT_CRED_DEF,
+    ARTIFACT_REVOC_REG_DEF,
+    ARTIFACT_SCHEMA,
+    LedgerArtifactStore,
+)
 from .base import BaseLedger
 from .endpoint_type import EndpointType
 from .error import (
@@ -35,6 +43,7 @@ from .error import (
     LedgerError,
     LedgerTransactionError,
 )
+from .revocation_cache import RevocationStateCache
 from .util import TAA_ACCEPTED_RECORD_TYPE
 
 GENESIS_TRANSACTION_PATH = tempfile.gettempdir()
@@ -42,6 +51,28 @@ GENESIS_TRANSACTION_PATH = path.join(
     GENESIS_TRANSACTION_PATH, "indy_genesis_transactions.txt"
 )
 
+# names of ledger request types, by transaction type code
+REQUEST_TYPES = {
+    "1": "NYM",
+    "3": "GET_TXN",
+    "4": "TXN_AUTHOR_AGREEMENT",
+    "5": "TXN_AUTHOR_AGREEMENT_AML",
+    "6": "GET_TXN_AUTHOR_AGREEMENT",
+    "7": "GET_TXN_AUTHOR_AGREEMENT_AML",
+    "100": "ATTRIB",
+    "101": "SCHEMA",
+    "102": "CRED_DEF",
+    "104": "GET_ATTR",
+    "105": "GET_NYM",
+    "107": "GET_SCHEMA",
+    "108": "GET_CRED_DEF",
+    "113": "REVOC_REG_DEF",
+    "114": "REVOC_REG_ENTRY",
+    "115": "GET_REVOC_REG_DEF",
+    "116": "GET_REVOC_REG",
+    "117": "GET_REVOC_REG_DELTA",
+}
+
 
 class Role(Enum):
     """Enum for indy roles."""
@@ -100,20 +131,34 @@ class IndyLedger(BaseLedger):
         pool_name: str,
         wallet: BaseWallet,
         *,
+        resolve_wallet: Callable[[], Awaitable[BaseWallet]] = None,
         keepalive: int = 0,
         cache: BaseCache = None,
         cache_duration: int = 600,
+        did_cache_duration: int = 600,
+        did_negative_cache_duration: int = 30,
+        artifact_store: LedgerArtifactStore = None,
+        revocation_cache: RevocationStateCache = None,
         read_only: bool = False,
+        metrics: Metrics = None,
     ):
         """
         Initialize an IndyLedger instance.
 
         Args:
             pool_name: The Indy pool ledger configuration name
-            wallet: IndyWallet instance
+            wallet: IndyWallet instance, or `None` to resolve it on first entry
+            resolve_wallet: Coroutine function resolving the wallet, awaited
+                once the pool is open
             keepalive: How many seconds to keep the ledger open
             cache: The cache instance to use
             cache_duration: The TTL for ledger cache entries
+            did_cache_duration: The TTL for cached DID verkeys and endpoints
+            did_negative_cache_duration: The TTL for cached DID lookup misses
+            artifact_store: Persistent store for immutable ledger artifacts
+            revocation_cache: Cache for revocation registry entries and deltas
+            read_only: Whether to reject ledger writes
+            metrics: Metrics to record the duration of ledger requests in
         """
         self.logger = logging.getLogger(__name__)
 
@@ -124,13 +169,25 @@ class IndyLedger(BaseLedger):
         self.close_task: asyncio.Future = None
         self.cache = cache
         self.cache_duration = cache_duration
+        self.did_cache_duration = did_cache_duration
+        self.did_negative_cache_duration = did_negative_cache_duration
+        self.artifact_store = artifact_store
+        self.revocation_cache = revocation_cache or RevocationStateCache()
         self.wallet = wallet
+        self.resolve_wallet = resolve_wallet
         self.pool_handle = None
         self.pool_name = pool_name
         self.taa_acceptance = None
         self.taa_cache = None
         self.read_only = read_only
+        self.metrics = metrics
 
+        if wallet:
+            self._check_wallet(wallet)
+
+    @staticmethod
+    def _check_wallet(wallet: BaseWallet):
+        """Check the wallet is an indy wallet."""
         if wallet.type != "indy":
             raise LedgerConfigError("Wallet type is not 'indy'")
 
@@ -249,6 +306,15 @@ class IndyLedger(BaseLedger):
         """
         await super().__aenter__()
         await self._context_open()
+        if not self.wallet:
+            # the pool is opened without waiting on the wallet
+            try:
+                wallet = await self.resolve_wallet()
+                self._check_wallet(wallet)
+            except BaseException:
+                await self._context_close()
+                raise
+            self.wallet = wallet
         return self
 
     async def __aexit__(self, exc_type, exc, tb):
@@ -310,10 +376,19 @@ class IndyLedger(BaseLedger):
         else:
             submit_op = indy.ledger.submit_request(self.pool_handle, request_json)
 
-        with IndyErrorHandler(
-            "Exception raised by ledger transaction", LedgerTransactionError
-        ):
-            request_result_json = await submit_op
+        start = perf_counter()
+        try:
+            with IndyErrorHandler(
+                "Exception raised by ledger transaction", LedgerTransactionError
+            ):
+                request_result_json = await submit_op
+        finally:
+            if self.metrics:
+                request_type = json.loads(request_json).get("operation", {}).get("type")
+                self.metrics.ledger_latency.observe(
+                    perf_counter() - start,
+                    REQUEST_TYPES.get(request_type, request_type),
+                )
 
         request_result = json.loads(request_result_json)
 
@@ -448,21 +523,76 @@ class IndyLedger(BaseLedger):
                 )
             return fetch_schema_id, schema
 
-    async def get_schema(self, schema_id: str) -> dict:
+    async def get_cached_artifact(
+        self, artifact_type: str, artifact_id: str, cache_key: str
+    ) -> dict:
         """
-        Get a schema from the cache if available, otherwise fetch from the ledger.
+        Look up an immutable ledger artifact in the cache, then the artifact store.
+
+        Artifacts found in the store are added to the cache.
 
         Args:
-            schema_id: The schema id (or stringified sequence number) to retrieve
+            artifact_type: The type of artifact
+            artifact_id: The ledger identifier of the artifact
+            cache_key: The cache key for the artifact
 
         """
         if self.cache:
-            result = await self.cache.get(f"schema::{schema_id}")
+            result = await self.cache.get(cache_key)
             if result:
                 return result
 
+        if self.artifact_store:
+            result = await self.artifact_store.get(artifact_type, artifact_id)
+            if result:
+                if self.cache:
+                    await self.cache.set(cache_key, result, self.cache_duration)
+                return result
+
+    async def cache_artifact(
+        self,
+        artifact_type: str,
+        artifact_ids: Sequence[str],
+        cache_keys: Sequence[str],
+        value: dict,
+    ):
+        """
+        Add an immutable ledger artifact to the cache and the artifact store.
+
+        Args:
+            artifact_type: The type of artifact
+            artifact_ids: The ledger identifiers of the artifact
+            cache_keys: The cache keys for the artifact
+            value: The artifact
+
+        """
+        if self.cache:
+            await self.cache.set(cache_keys, value, self.cache_duration)
+        if self.artifact_store:
+            for artifact_id in artifact_ids:
+                await self.artifact_store.put(artifact_type, artifact_id, value)
+
+    async def get_schema(self, schema_id: str) -> dict:
+        """
+        Get a schema from the cache if available, otherwise fetch from the ledger.
+
+        Args:
+            schema_id: The schema id (or stringified sequence number) to retrieve
+
+        """
+        result = await self.get_cached_artifact(
+            ARTIFACT_SCHEMA, schema_id, f"schema::{schema_id}"
+        )
+        if result:
+            return result
+
         if schema_id.isdigit():
-            return await self.fetch_schema_by_seq_no(int(schema_id))
+            result = await self.fetch_schema_by_seq_no(int(schema_id))
+            if result:
+                await self.cache_artifact(
+                    ARTIFACT_SCHEMA, [schema_id], [f"schema::{schema_id}"], result
+                )
+            return result
         else:
             return await self.fetch_schema_by_id(schema_id)
 
@@ -498,11 +628,13 @@ class IndyLedger(BaseLedger):
             )
 
         parsed_response = json.loads(parsed_schema_json)
-        if parsed_response and self.cache:
-            await self.cache.set(
-                [f"schema::{schema_id}", f"schema::{response['result']['seqNo']}"],
+        if parsed_response:
+            seq_no = str(response["result"]["seqNo"])
+            await self.cache_artifact(
+                ARTIFACT_SCHEMA,
+                [schema_id, seq_no],
+                [f"schema::{schema_id}", f"schema::{seq_no}"],
                 parsed_response,
-                self.cache_duration,
             )
 
         return parsed_response
@@ -665,12 +797,13 @@ class IndyLedger(BaseLedger):
             credential_definition_id: The schema id of the schema to fetch cred def for
 
         """
-        if self.cache:
-            result = await self.cache.get(
-                f"credential_definition::{credential_definition_id}"
-            )
-            if result:
-                return result
+        result = await self.get_cached_artifact(
+            ARTIFACT_CRED_DEF,
+            credential_definition_id,
+            f"credential_definition::{credential_definition_id}",
+        )
+        if result:
+            return result
 
         return await self.fetch_credential_definition(credential_definition_id)
 
@@ -706,11 +839,12 @@ class IndyLedger(BaseLedger):
                 else:
                     raise
 
-        if parsed_response and self.cache:
-            await self.cache.set(
-                f"credential_definition::{credential_definition_id}",
+        if parsed_response:
+            await self.cache_artifact(
+                ARTIFACT_CRED_DEF,
+                [credential_definition_id],
+                [f"credential_definition::{credential_definition_id}"],
                 parsed_response,
-                self.cache_duration,
             )
 
         return parsed_response
@@ -733,12 +867,69 @@ class IndyLedger(BaseLedger):
         seq_no = tokens[3]
         return (await self.get_schema(seq_no))["id"]
 
+    def did_cache_key(self, kind: str, did: str) -> str:
+        """Assemble the cache key for a DID lookup.
+
+        Args:
+            kind: The type of data cached, such as "did_key" or "did_endpoints"
+            did: The DID looked up
+        """
+        return f"{kind}::{self.pool_name}::{self.did_to_nym(did)}"
+
+    async def clear_did_cache(self, did: str):
+        """Clear any cached verkey and endpoints for a ledger DID.
+
+        Args:
+            did: The DID to clear
+        """
+        if self.cache:
+            await self.cache.clear(self.did_cache_key("did_key", did))
+            await self.cache.clear(self.did_cache_key("did_endpoints", did))
+
+    async def _cached_did_lookup(self, kind: str, did: str, fetch) -> Any:
+        """Perform a DID lookup, caching both found and missing results.
+
+        Concurrent identical lookups wait on the first one through the cache key lock.
+
+        Args:
+            kind: The type of data to look up
+            did: The DID to look up
+            fetch: Coroutine function fetching the data from the ledger
+        """
+        if not self.cache:
+            return await fetch()
+
+        async with self.cache.acquire(self.did_cache_key(kind, did)) as entry:
+            if entry.result:
+                return entry.result["value"]
+            value = await fetch()
+            ttl = (
+                self.did_negative_cache_duration
+                if value is None
+                else self.did_cache_duration
+            )
+            # a TTL of 0 disables caching, where the cache would never expire it
+            if ttl:
+                # wrap the result so that a missing DID is cached too
+                await entry.set_result({"value": value}, ttl)
+        return value
+
     async def get_key_for_did(self, did: str) -> str:
         """Fetch the verkey for a ledger DID.
 
         Args:
             did: The DID to look up on the ledger or in the cache
         """
+        return await self._cached_did_lookup(
+            "did_key", did, lambda: self.fetch_key_for_did(did)
+        )
+
+    async def fetch_key_for_did(self, did: str) -> str:
+        """Fetch the verkey for a ledger DID from the ledger.
+
+        Args:
+            did: The DID to look up on the ledger
+        """
         nym = self.did_to_nym(did)
         public_info = await self.wallet.get_public_did()
         public_did = public_info.did if public_info else None
@@ -754,6 +945,18 @@ class IndyLedger(BaseLedger):
         Args:
             did: The DID to look up on the ledger or in the cache
         """
+        endpoints = await self._cached_did_lookup(
+            "did_endpoints", did, lambda: self.fetch_all_endpoints_for_did(did)
+        )
+        # callers may update the result, so never hand out the cached instance
+        return dict(endpoints) if endpoints else endpoints
+
+    async def fetch_all_endpoints_for_did(self, did: str) -> dict:
+        """Fetch all endpoints for a ledger DID from the ledger.
+
+        Args:
+            did: The DID to look up on the ledger
+        """
         nym = self.did_to_nym(did)
         public_info = await self.wallet.get_public_did()
         public_did = public_info.did if public_info else None
@@ -783,22 +986,8 @@ class IndyLedger(BaseLedger):
 
         if not endpoint_type:
             endpoint_type = EndpointType.ENDPOINT
-        nym = self.did_to_nym(did)
-        public_info = await self.wallet.get_public_did()
-        public_did = public_info.did if public_info else None
-        with IndyErrorHandler("Exception when building attribute request", LedgerError):
-            request_json = await indy.ledger.build_get_attrib_request(
-                public_did, nym, "endpoint", None, None
-            )
-        response_json = await self._submit(request_json, sign_did=public_info)
-        data_json = json.loads(response_json)["result"]["data"]
-        if data_json:
-            endpoint = json.loads(data_json).get("endpoint", None)
-            address = endpoint.get(endpoint_type.indy, None) if endpoint else None
-        else:
-            address = None
-
-        return address
+        endpoints = await self.get_all_endpoints_for_did(did)
+        return endpoints.get(endpoint_type.indy, None) if endpoints else None
 
     async def update_endpoint_for_did(
         self, did: str, endpoint: str, endpoint_type: EndpointType = None
@@ -813,6 +1002,8 @@ class IndyLedger(BaseLedger):
         if not endpoint_type:
             endpoint_type = EndpointType.ENDPOINT
 
+        # compare against the ledger state rather than a possibly stale cache entry
+        await self.clear_did_cache(did)
         all_exist_endpoints = await self.get_all_endpoints_for_did(did)
         exist_endpoint_of_type = (
             all_exist_endpoints.get(endpoint_type.indy, None)
@@ -841,6 +1032,7 @@ class IndyLedger(BaseLedger):
                     nym, nym, None, attr_json, None
                 )
             await self._submit(request_json, True, True)
+            await self.clear_did_cache(did)
             return True
         return False
 
@@ -869,6 +1061,7 @@ class IndyLedger(BaseLedger):
             )
 
         await self._submit(request_json)
+        await self.clear_did_cache(did)
 
     async def get_nym_role(self, did: str) -> Role:
         """
@@ -940,6 +1133,7 @@ class IndyLedger(BaseLedger):
 
         # update wallet
         await self.wallet.rotate_did_keypair_apply(public_did)
+        await self.clear_did_cache(public_did)
 
     async def get_txn_author_agreement(self, reload: bool = False) -> dict:
         """Get the current transaction author agreement, fetching it if necessary."""
@@ -1038,7 +1232,17 @@ class IndyLedger(BaseLedger):
         return acceptance
 
     async def get_revoc_reg_def(self, revoc_reg_id: str) -> dict:
-        """Get revocation registry definition by ID."""
+        """Get revocation registry definition by ID, from the cache if available."""
+        result = await self.get_cached_artifact(
+            ARTIFACT_REVOC_REG_DEF, revoc_reg_id, f"revoc_reg_def::{revoc_reg_id}"
+        )
+        if result:
+            return result
+
+        return await self.fetch_revoc_reg_def(revoc_reg_id)
+
+    async def fetch_revoc_reg_def(self, revoc_reg_id: str) -> dict:
+        """Fetch revocation registry definition by ID from the ledger."""
         public_info = await self.wallet.get_public_did()
         try:
             fetch_req = await indy.ledger.build_get_revoc_reg_def_request(
@@ -1057,10 +1261,32 @@ class IndyLedger(BaseLedger):
             raise e
 
         assert found_id == revoc_reg_id
-        return json.loads(found_def_json)
+        revoc_reg_def = json.loads(found_def_json)
+        await self.cache_artifact(
+            ARTIFACT_REVOC_REG_DEF,
+            [revoc_reg_id],
+            [f"revoc_reg_def::{revoc_reg_id}"],
+            revoc_reg_def,
+        )
+        return revoc_reg_def
 
     async def get_revoc_reg_entry(self, revoc_reg_id: str, timestamp: int):
         """Get revocation registry entry by revocation registry ID and timestamp."""
+        cached = self.revocation_cache.get_entry(revoc_reg_id, timestamp)
+        if cached:
+            return cached
+
+        fetched_at = int(time())
+        (found_reg, ledger_timestamp) = await self.fetch_revoc_reg_entry(
+            revoc_reg_id, timestamp
+        )
+        self.revocation_cache.set_entry(
+            revoc_reg_id, timestamp, found_reg, ledger_timestamp, fetched_at
+        )
+        return found_reg, ledger_timestamp
+
+    async def fetch_revoc_reg_entry(self, revoc_reg_id: str, timestamp: int):
+        """Fetch revocation registry entry by ID and timestamp from the ledger."""
         public_info = await self.wallet.get_public_did()
         fetch_req = await indy.ledger.build_get_revoc_reg_request(
             public_info and public_info.did, revoc_reg_id, timestamp
@@ -1078,7 +1304,10 @@ class IndyLedger(BaseLedger):
         self, revoc_reg_id: str, timestamp_from=0, timestamp_to=None
     ) -> (dict, int):
         """
-        Look up a revocation registry delta by ID.
+        Look up a revocation registry delta by ID, from the cache if available.
+
+        A delta may also be produced by merging two cached deltas covering
+        the requested interval.
 
         :param revoc_reg_id revocation registry id
         :param timestamp_from from time. a total number of seconds from Unix Epoch
@@ -1088,6 +1317,55 @@ class IndyLedger(BaseLedger):
         """
         if timestamp_to is None:
             timestamp_to = int(time())
+
+        cached = self.revocation_cache.get_delta(
+            revoc_reg_id, timestamp_from, timestamp_to
+        )
+        if cached:
+            return cached
+
+        parts = self.revocation_cache.find_delta_parts(
+            revoc_reg_id, timestamp_from, timestamp_to
+        )
+        if parts:
+            ((first, _), (second, delta_timestamp)) = parts
+            with IndyErrorHandler(
+                "Exception when merging revocation registry deltas", LedgerError
+            ):
+                delta = json.loads(
+                    await indy.anoncreds.issuer_merge_revocation_registry_deltas(
+                        json.dumps(first), json.dumps(second)
+                    )
+                )
+            fetched_at = None
+        else:
+            fetched_at = int(time())
+            (delta, delta_timestamp) = await self.fetch_revoc_reg_delta(
+                revoc_reg_id, timestamp_from, timestamp_to
+            )
+
+        self.revocation_cache.set_delta(
+            revoc_reg_id,
+            timestamp_from,
+            timestamp_to,
+            delta,
+            delta_timestamp,
+            fetched_at,
+        )
+        return delta, delta_timestamp
+
+    async def fetch_revoc_reg_delta(
+        self, revoc_reg_id: str, timestamp_from: int, timestamp_to: int
+    ) -> (dict, int):
+        """
+        Fetch a revocation registry delta by ID from the ledger.
+
+        :param revoc_reg_id revocation registry id
+        :param timestamp_from from time. a total number of seconds from Unix Epoch
+        :param timestamp_to to time. a total number of seconds from Unix Epoch
+
+        :returns delta response, delta timestamp
+        """
         public_info = await self.wallet.get_public_did()
         fetch_req = await indy.ledger.build_get_revoc_reg_delta_request(
             public_info and public_info.did, revoc_reg_id, timestamp_from, timestamp_to
@@ -1137,3 +1415,4 @@ class IndyLedger(BaseLedger):
             did_info.did, revoc_reg_id, revoc_def_type, json.dumps(revoc_reg_entry)
         )
         await self._submit(request_json, True, True, did_info)
+        self.revocation_cache.clear(revoc_reg_id)
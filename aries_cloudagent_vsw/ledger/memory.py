@@ -0,0 +1,661 @@
+"""Ledger kept in memory, standing in for an indy pool."""
+
+import asyncio
+import json
+import logging
+import os
+
+from tempfile import NamedTemporaryFile
+from time import perf_counter, time
+from typing import Sequence, Tuple
+
+from ..issuer.base import BaseIssuer, IssuerError, DEFAULT_CRED_DEF_TAG
+from ..messaging.credential_definitions.util import CRED_DEF_SENT_RECORD_TYPE
+from ..messaging.schemas.util import SCHEMA_SENT_RECORD_TYPE
+from ..storage.base import BaseStorage, StorageRecord
+from ..utils.metrics import Metrics
+from ..wallet.base import BaseWallet
+
+from .base import BaseLedger
+from .endpoint_type import EndpointType
+from .error import (
+    BadLedgerRequestError,
+    LedgerConfigError,
+    LedgerError,
+    LedgerTransactionError,
+)
+from .indy import Role
+
+LOGGER = logging.getLogger(__name__)
+
+# memory ledger pools in this process, by name
+MEMORY_POOLS = {}
+
+
+class MemoryLedgerPool:
+    """
+    The transactions of a memory ledger pool.
+
+    All ledgers opened on a pool of the same name in one process share its
+    transactions, as agents do those of an indy pool. When given a file, the
+    pool is loaded from it on creation and saved to it after each write.
+    """
+
+    SECTIONS = (
+        "nyms",
+        "attribs",
+        "schemas",
+        "schema_ids",
+        "cred_defs",
+        "revoc_reg_defs",
+        "revoc_reg_entries",
+    )
+
+    def __init__(self, name: str, path: str = None):
+        """
+        Initialize a `MemoryLedgerPool` instance.
+
+        Args:
+            name: The pool name
+            path: The file in which to persist the transactions, if any
+
+        """
+        self.name = name
+        self.path = path
+        self.seq_no = 0
+        self.nyms = {}
+        self.attribs = {}
+        self.schemas = {}
+        self.schema_ids = {}
+        self.cred_defs = {}
+        self.revoc_reg_defs = {}
+        # revocation registry entries as lists of [timestamp, entry], in order
+        self.revoc_reg_entries = {}
+        self._save_lock: asyncio.Lock = None
+
+    def next_seq_no(self) -> int:
+        """Assign the sequence number of a new transaction."""
+        self.seq_no += 1
+        return self.seq_no
+
+    def to_json(self) -> str:
+        """Serialize the transactions of the pool."""
+        state = {section: getattr(self, section) for section in self.SECTIONS}
+        state["seq_no"] = self.seq_no
+        return json.dumps(state)
+
+    def load(self):
+        """Load the transactions of the pool from its file, if it exists."""
+        try:
+            with open(self.path, "r") as pool_file:
+                state = json.load(pool_file)
+        except FileNotFoundError:
+            return
+        except (OSError, ValueError) as err:
+            raise LedgerConfigError(
+                f"Error loading memory ledger pool {self.name} from {self.path}: {err}"
+            ) from err
+        self.seq_no = state.get("seq_no", 0)
+        for section in self.SECTIONS:
+            setattr(self, section, state.get(section) or {})
+
+    def _write(self, data: str):
+        """Write the serialized transactions to the pool file atomically."""
+        dir_name = os.path.dirname(os.path.abspath(self.path))
+        with NamedTemporaryFile("w", dir=dir_name, delete=False) as tmp_file:
+            tmp_file.write(data)
+        os.replace(tmp_file.name, self.path)
+
+    async def save(self):
+        """Save the transactions of the pool to its file, if any."""
+        if not self.path:
+            return
+        if not self._save_lock:
+            self._save_lock = asyncio.Lock()
+        # serialize under the lock, so that the last write saves the latest state
+        async with self._save_lock:
+            await asyncio.get_event_loop().run_in_executor(
+                None, self._write, self.to_json()
+            )
+
+
+def get_memory_pool(name: str, path: str = None) -> MemoryLedgerPool:
+    """
+    Get the memory ledger pool of a name, creating it if necessary.
+
+    Args:
+        name: The pool name
+        path: The file in which to persist the transactions, if any
+
+    """
+    pool = MEMORY_POOLS.get(name)
+    if pool:
+        if path and pool.path != path:
+            raise LedgerConfigError(
+                f"Memory ledger pool {name} is already open with file {pool.path}"
+            )
+        return pool
+    pool = MemoryLedgerPool(name, path)
+    if path:
+        pool.load()
+    MEMORY_POOLS[name] = pool
+    return pool
+
+
+class MemoryLedger(BaseLedger):
+    """
+    Ledger kept in memory, for load testing and operation without an indy pool.
+
+    Transactions are accepted from any DID, as on a permissionless ledger, and
+    take effect once each request has waited for its configured latency. As
+    with the cache in front of an indy ledger, immutable artifacts are only
+    requested once by each ledger instance.
+    """
+
+    LEDGER_TYPE = "memory"
+
+    def __init__(
+        self,
+        pool_name: str,
+        wallet: BaseWallet,
+        *,
+        path: str = None,
+        read_latency: float = 0.0,
+        write_latency: float = 0.0,
+        storage: BaseStorage = None,
+        read_only: bool = False,
+        metrics: Metrics = None,
+    ):
+        """
+        Initialize a `MemoryLedger` instance.
+
+        Args:
+            pool_name: The name of the memory pool to open
+            wallet: The wallet holding the public DID
+            path: The file in which to persist the pool, if any
+            read_latency: The simulated duration of read requests, in seconds
+            write_latency: The simulated duration of write requests, in seconds
+            storage: The storage to record sent schemas and cred defs in
+            read_only: Whether to reject ledger writes
+            metrics: Metrics to record the duration of ledger requests in
+        """
+        self.pool_name = pool_name
+        self.pool = get_memory_pool(pool_name, path)
+        self.wallet = wallet
+        self.read_latency = read_latency
+        self.write_latency = write_latency
+        self.storage = storage
+        self.read_only = read_only
+        self.metrics = metrics
+        self.fetched = set()
+
+    @property
+    def type(self) -> str:
+        """Accessor for the ledger type."""
+        return MemoryLedger.LEDGER_TYPE
+
+    async def _submit(self, request_type: str, write: bool = False):
+        """
+        Wait for the simulated round trip of a request to the pool.
+
+        Args:
+            request_type: The indy name of the request type, such as "GET_NYM"
+            write: Whether the request is a write
+
+        """
+        if write and self.read_only:
+            raise LedgerError(
+                f"Error cannot write {request_type} when ledger is in read only mode"
+            )
+        start = perf_counter()
+        latency = self.write_latency if write else self.read_latency
+        if latency:
+            await asyncio.sleep(latency)
+        if self.metrics:
+            self.metrics.ledger_latency.observe(perf_counter() - start, request_type)
+
+    async def _fetch_artifact(
+        self, request_type: str, artifacts: dict, artifact_id: str
+    ) -> dict:
+        """Fetch an immutable artifact, only waiting on the pool the first time."""
+        if artifact_id not in self.fetched:
+            await self._submit(request_type)
+        artifact = artifacts.get(artifact_id)
+        if artifact:
+            self.fetched.add(artifact_id)
+        return artifact
+
+    async def _public_did(self, purpose: str) -> str:
+        """Get the public DID of the wallet, which is required to write."""
+        public_info = await self.wallet.get_public_did()
+        if not public_info:
+            raise BadLedgerRequestError(
+                f"Cannot publish {purpose} without a public DID"
+            )
+        return public_info.did
+
+    async def _record_sent(self, record_type: str, value: str, tags: dict):
+        """Record a schema or cred def sent to the ledger, as the indy ledger does."""
+        if self.storage:
+            tags["epoch"] = str(int(time()))
+            await self.storage.add_record(StorageRecord(record_type, value, tags))
+
+    async def get_key_for_did(self, did: str) -> str:
+        """Fetch the verkey for a ledger DID.
+
+        Args:
+            did: The DID to look up on the ledger
+        """
+        await self._submit("GET_NYM")
+        nym = self.pool.nyms.get(self.did_to_nym(did))
+        return nym["verkey"] if nym else None
+
+    async def get_all_endpoints_for_did(self, did: str) -> dict:
+        """Fetch all endpoints for a ledger DID.
+
+        Args:
+            did: The DID to look up on the ledger
+        """
+        await self._submit("GET_ATTR")
+        endpoints = self.pool.attribs.get(self.did_to_nym(did), {}).get("endpoint")
+        return dict(endpoints) if endpoints else None
+
+    async def get_endpoint_for_did(
+        self, did: str, endpoint_type: EndpointType = None
+    ) -> str:
+        """Fetch the endpoint for a ledger DID.
+
+        Args:
+            did: The DID to look up on the ledger
+            endpoint_type: The type of the endpoint (default 'endpoint')
+        """
+        if not endpoint_type:
+            endpoint_type = EndpointType.ENDPOINT
+        endpoints = await self.get_all_endpoints_for_did(did)
+        return endpoints.get(endpoint_type.indy) if endpoints else None
+
+    async def update_endpoint_for_did(
+        self, did: str, endpoint: str, endpoint_type: EndpointType = None
+    ) -> bool:
+        """Check and update the endpoint on the ledger.
+
+        Args:
+            did: The ledger DID
+            endpoint: The endpoint address
+            endpoint_type: The type of the endpoint (default 'endpoint')
+        """
+        if not endpoint_type:
+            endpoint_type = EndpointType.ENDPOINT
+        endpoints = await self.get_all_endpoints_for_did(did) or {}
+        if endpoints.get(endpoint_type.indy) == endpoint:
+            return False
+
+        nym = self.did_to_nym(did)
+        await self._submit("ATTRIB", True)
+        if nym not in self.pool.nyms:
+            raise LedgerTransactionError(
+                f"Ledger rejected transaction request: DID {did} is not public"
+            )
+        endpoints[endpoint_type.indy] = endpoint
+        self.pool.attribs.setdefault(nym, {})["endpoint"] = endpoints
+        self.pool.next_seq_no()
+        await self.pool.save()
+        return True
+
+    async def register_nym(
+        self, did: str, verkey: str, alias: str = None, role: str = None
+    ):
+        """
+        Register a nym on the ledger, keeping any alias and role not given.
+
+        Args:
+            did: DID to register on the ledger.
+            verkey: The verification key of the keypair.
+            alias: Human-friendly alias to assign to the DID.
+            role: What role the DID should have, such as "ENDORSER".
+        """
+        nym = self.did_to_nym(did)
+        existing = self.pool.nyms.get(nym) or {}
+        if role is None:
+            role = existing.get("role")
+        else:
+            found = Role.get(role or None)  # an empty role resets to a user
+            if not found:
+                raise BadLedgerRequestError(f"Unknown role: {role}")
+            role = found.to_indy_num_str()
+
+        await self._submit("NYM", True)
+        self.pool.nyms[nym] = {
+            "dest": nym,
+            "verkey": verkey,
+            "alias": existing.get("alias") if alias is None else alias,
+            "role": role,
+            "seqNo": self.pool.next_seq_no(),
+        }
+        await self.pool.save()
+
+    async def get_nym_role(self, did: str) -> Role:
+        """
+        Return the role of the input public DID's NYM on the ledger.
+
+        Args:
+            did: DID to query for role on the ledger.
+        """
+        await self._submit("GET_NYM")
+        nym = self.pool.nyms.get(self.did_to_nym(did))
+        if not nym:
+            raise BadLedgerRequestError(f"DID {did} is not public")
+        return Role.get(nym["role"])
+
+    def nym_to_did(self, nym: str) -> str:
+        """Format a nym with the ledger's DID prefix."""
+        if nym:
+            # remove any existing prefix
+            nym = self.did_to_nym(nym)
+            return f"did:sov:{nym}"
+
+    async def rotate_public_did_keypair(self, next_seed: str = None) -> None:
+        """
+        Rotate keypair for public DID: create new key, submit to ledger, update wallet.
+
+        Args:
+            next_seed: seed for incoming ed25519 keypair (default random)
+        """
+        public_info = await self.wallet.get_public_did()
+        public_did = public_info.did
+        await self._submit("GET_NYM")
+        if self.did_to_nym(public_did) not in self.pool.nyms:
+            raise BadLedgerRequestError(
+                f"Ledger has no public DID for wallet {self.wallet.name}"
+            )
+        verkey = await self.wallet.rotate_did_keypair_start(public_did, next_seed)
+        await self.register_nym(public_did, verkey)
+        await self.wallet.rotate_did_keypair_apply(public_did)
+
+    async def get_txn_author_agreement(self, reload: bool = False) -> dict:
+        """Get the transaction author agreement, which a memory ledger never has."""
+        return {"aml_record": None, "taa_record": None, "taa_required": False}
+
+    async def create_and_send_schema(
+        self,
+        issuer: BaseIssuer,
+        schema_name: str,
+        schema_version: str,
+        attribute_names: Sequence[str],
+    ) -> Tuple[str, dict]:
+        """
+        Send schema to ledger.
+
+        Args:
+            issuer: The issuer instance creating the schema
+            schema_name: The schema name
+            schema_version: The schema version
+            attribute_names: A list of schema attributes
+
+        """
+        public_did = await self._public_did("schema")
+        schema_id = f"{public_did}:2:{schema_name}:{schema_version}"
+        schema_def = await self.get_schema(schema_id)
+        if schema_def:
+            if sorted(schema_def["attrNames"]) != sorted(attribute_names):
+                raise LedgerTransactionError(
+                    "Schema already exists on ledger, but attributes do not match: "
+                    + f"{schema_name}:{schema_version} {sorted(schema_def['attrNames'])}"
+                    + f" != {sorted(attribute_names)}"
+                )
+            LOGGER.warning("Schema already exists on ledger. Returning details.")
+            return schema_id, schema_def
+
+        try:
+            schema_id, schema_json = await issuer.create_and_store_schema(
+                public_did, schema_name, schema_version, attribute_names
+            )
+        except IssuerError as err:
+            raise LedgerError(err.message) from err
+        schema_def = json.loads(schema_json)
+
+        await self._submit("SCHEMA", True)
+        if schema_id in self.pool.schemas:
+            # sent concurrently by another agent
+            return schema_id, self.pool.schemas[schema_id]
+        schema_def["seqNo"] = self.pool.next_seq_no()
+        self.pool.schemas[schema_id] = schema_def
+        self.pool.schema_ids[str(schema_def["seqNo"])] = schema_id
+        await self.pool.save()
+
+        await self._record_sent(
+            SCHEMA_SENT_RECORD_TYPE,
+            schema_id,
+            {
+                "schema_id": schema_id,
+                "schema_issuer_did": public_did,
+                "schema_name": schema_name,
+                "schema_version": schema_version,
+            },
+        )
+        return schema_id, schema_def
+
+    async def get_schema(self, schema_id: str) -> dict:
+        """
+        Get a schema from the ledger.
+
+        Args:
+            schema_id: The schema id (or stringified sequence number) to retrieve
+
+        """
+        if schema_id.isdigit():
+            schema_id = self.pool.schema_ids.get(schema_id, schema_id)
+        return await self._fetch_artifact("GET_SCHEMA", self.pool.schemas, schema_id)
+
+    async def create_and_send_credential_definition(
+        self,
+        issuer: BaseIssuer,
+        schema_id: str,
+        signature_type: str = None,
+        tag: str = None,
+        support_revocation: bool = False,
+    ) -> Tuple[str, dict, bool]:
+        """
+        Send credential definition to ledger and store relevant key matter in wallet.
+
+        Args:
+            issuer: The issuer instance to use for credential definition creation
+            schema_id: The schema id of the schema to create cred def for
+            signature_type: The signature type to use on the credential definition
+            tag: Optional tag to distinguish multiple credential definitions
+            support_revocation: Optional flag to enable revocation for this cred def
+
+        Returns:
+            Tuple with cred def id, cred def structure, and whether it's novel
+
+        """
+        public_did = await self._public_did("credential definition")
+        schema = await self.get_schema(schema_id)
+        if not schema:
+            raise LedgerError(f"Ledger {self.pool_name} has no schema {schema_id}")
+
+        # check if cred def is on ledger already
+        for test_tag in [tag] if tag else ["tag", DEFAULT_CRED_DEF_TAG]:
+            cred_def_id = issuer.make_credential_definition_id(
+                public_did, schema, signature_type, test_tag
+            )
+            cred_def = await self.get_credential_definition(cred_def_id)
+            if cred_def:
+                LOGGER.warning(
+                    "Credential definition %s already exists on ledger %s",
+                    cred_def_id,
+                    self.pool_name,
+                )
+                try:
+                    in_wallet = await issuer.credential_definition_in_wallet(
+                        cred_def_id
+                    )
+                except IssuerError as err:
+                    raise LedgerError(err.message) from err
+                if not in_wallet:
+                    raise LedgerError(
+                        f"Credential definition {cred_def_id} is on ledger "
+                        f"{self.pool_name} but not in wallet {self.wallet.name}"
+                    )
+                return cred_def_id, cred_def, False
+
+        try:
+            (
+                cred_def_id,
+                cred_def_json,
+            ) = await issuer.create_and_store_credential_definition(
+                public_did, schema, signature_type, tag, support_revocation
+            )
+        except IssuerError as err:
+            raise LedgerError(err.message) from err
+        cred_def = json.loads(cred_def_json)
+
+        await self._submit("CRED_DEF", True)
+        self.pool.cred_defs[cred_def_id] = cred_def
+        self.pool.next_seq_no()
+        await self.pool.save()
+
+        schema_id_parts = schema_id.split(":")
+        await self._record_sent(
+            CRED_DEF_SENT_RECORD_TYPE,
+            cred_def_id,
+            {
+                "schema_id": schema_id,
+                "schema_issuer_did": schema_id_parts[0],
+                "schema_name": schema_id_parts[-2],
+                "schema_version": schema_id_parts[-1],
+                "issuer_did": public_did,
+                "cred_def_id": cred_def_id,
+            },
+        )
+        return cred_def_id, cred_def, True
+
+    async def get_credential_definition(self, credential_definition_id: str) -> dict:
+        """
+        Get a credential definition from the ledger.
+
+        Args:
+            credential_definition_id: The cred def id of the cred def to fetch
+
+        """
+        return await self._fetch_artifact(
+            "GET_CRED_DEF", self.pool.cred_defs, credential_definition_id
+        )
+
+    async def credential_definition_id2schema_id(self, credential_definition_id):
+        """
+        From a credential definition, get the identifier for its schema.
+
+        Args:
+            credential_definition_id: The identifier of the credential definition
+                from which to identify a schema
+        """
+        tokens = credential_definition_id.split(":")
+        if len(tokens) == 8:  # cred def id has 5 or 8 tokens
+            return ":".join(tokens[3:7])  # schema id spans 0-based positions 3-6
+        return (await self.get_schema(tokens[3]))["id"]
+
+    async def _issuer_did(self, issuer_did: str, purpose: str) -> str:
+        """Get the DID writing a revocation registry transaction."""
+        if issuer_did:
+            did_info = await self.wallet.get_local_did(issuer_did)
+        else:
+            did_info = await self.wallet.get_public_did()
+        if not did_info:
+            raise LedgerTransactionError(f"No issuer DID found for {purpose}")
+        return did_info.did
+
+    async def get_revoc_reg_def(self, revoc_reg_id: str) -> dict:
+        """Get revocation registry definition by ID."""
+        revoc_reg_def = await self._fetch_artifact(
+            "GET_REVOC_REG_DEF", self.pool.revoc_reg_defs, revoc_reg_id
+        )
+        if not revoc_reg_def:
+            raise LedgerError(f"Ledger has no revocation registry {revoc_reg_id}")
+        return revoc_reg_def
+
+    async def send_revoc_reg_def(self, revoc_reg_def: dict, issuer_did: str = None):
+        """Publish a revocation registry definition to the ledger."""
+        await self._issuer_did(issuer_did, "revocation registry definition")
+        await self._submit("REVOC_REG_DEF", True)
+        self.pool.revoc_reg_defs[revoc_reg_def["id"]] = revoc_reg_def
+        self.pool.next_seq_no()
+        await self.pool.save()
+
+    async def send_revoc_reg_entry(
+        self,
+        revoc_reg_id: str,
+        revoc_def_type: str,
+        revoc_reg_entry: dict,
+        issuer_did: str = None,
+    ):
+        """Publish a revocation registry entry to the ledger."""
+        await self._issuer_did(issuer_did, "revocation registry entry")
+        if revoc_reg_id not in self.pool.revoc_reg_defs:
+            raise LedgerTransactionError(
+                f"Ledger rejected transaction request: no revocation registry"
+                f" {revoc_reg_id}"
+            )
+        await self._submit("REVOC_REG_ENTRY", True)
+        self.pool.revoc_reg_entries.setdefault(revoc_reg_id, []).append(
+            [int(time()), revoc_reg_entry]
+        )
+        self.pool.next_seq_no()
+        await self.pool.save()
+
+    def _entries_to(self, revoc_reg_id: str, timestamp: int) -> list:
+        """Get the entries of a revocation registry written up to a time."""
+        entries = [
+            (entry_time, entry)
+            for (entry_time, entry) in self.pool.revoc_reg_entries.get(revoc_reg_id, ())
+            if entry_time <= timestamp
+        ]
+        if not entries:
+            raise LedgerError(
+                f"Ledger has no entry for revocation registry {revoc_reg_id}"
+                f" at {timestamp}"
+            )
+        return entries
+
+    async def get_revoc_reg_entry(self, revoc_reg_id: str, timestamp: int):
+        """Get revocation registry entry by revocation registry ID and timestamp."""
+        await self._submit("GET_REVOC_REG")
+        (entry_time, entry) = self._entries_to(revoc_reg_id, timestamp)[-1]
+        return (
+            {"ver": "1.0", "value": {"accum": entry["value"]["accum"]}},
+            entry_time,
+        )
+
+    async def get_revoc_reg_delta(
+        self, revoc_reg_id: str, timestamp_from=0, timestamp_to=None
+    ) -> (dict, int):
+        """
+        Look up a revocation registry delta by ID.
+
+        :param revoc_reg_id revocation registry id
+        :param timestamp_from from time. a total number of seconds from Unix Epoch
+        :param timestamp_to to time. a total number of seconds from Unix Epoch
+
+        :returns delta response, delta timestamp
+        """
+        if timestamp_to is None:
+            timestamp_to = int(time())
+        await self._submit("GET_REVOC_REG_DELTA")
+        entries = self._entries_to(revoc_reg_id, timestamp_to)
+
+        value = {}
+        issued = set()
+        revoked = set()
+        for (entry_time, entry) in entries:
+            if timestamp_from and entry_time <= timestamp_from:
+                value["prevAccum"] = entry["value"]["accum"]
+                continue
+            issued.update(entry["value"].get("issued") or ())
+            revoked.difference_update(entry["value"].get("issued") or ())
+            revoked.update(entry["value"].get("revoked") or ())
+            issued.difference_update(entry["value"].get("revoked") or ())
+        (delta_timestamp, last) = entries[-1]
+        value.update(
+            accum=last["value"]["accum"], issued=sorted(issued), revoked=sorted(revoked)
+        )
+        return {"ver": "1.0", "value": value}, delta_timestamp
@@ -0,0 +1,93 @@
+"""Concurrent, deduplicated ledger reads."""
+
+import asyncio
+
+from typing import Any, Hashable, Iterable, Mapping, Tuple
+from weakref import WeakKeyDictionary
+
+from .base import BaseLedger
+
+# requests are tuples of (ledger method name, *args)
+LedgerRequest = Tuple[Hashable, ...]
+
+
+class LedgerPrefetcher:
+    """
+    Fetch sets of ledger artifacts concurrently.
+
+    Requests are bounded to a maximum number in flight, and identical requests
+    already in flight (from this or any other caller sharing the prefetcher)
+    are awaited rather than submitted again.
+    """
+
+    DEFAULT_MAX_CONCURRENCY = 8
+
+    _instances: Mapping[BaseLedger, "LedgerPrefetcher"] = WeakKeyDictionary()
+
+    def __init__(self, ledger: BaseLedger, max_concurrency: int = None):
+        """
+        Initialize a `LedgerPrefetcher` instance.
+
+        Args:
+            ledger: The ledger instance to read from
+            max_concurrency: The maximum number of ledger requests in flight
+
+        """
+        self.ledger = ledger
+        self.max_concurrency = max_concurrency or self.DEFAULT_MAX_CONCURRENCY
+        self._limit = asyncio.Semaphore(self.max_concurrency)
+        self._pending = {}
+
+    @classmethod
+    def for_ledger(cls, ledger: BaseLedger) -> "LedgerPrefetcher":
+        """Get the prefetcher shared by all callers of a ledger instance."""
+        instance = cls._instances.get(ledger)
+        if not instance:
+            instance = cls(ledger)
+            cls._instances[ledger] = instance
+        return instance
+
+    @property
+    def pending_count(self) -> int:
+        """Accessor for the number of distinct requests in flight."""
+        return len(self._pending)
+
+    async def _perform(self, request: LedgerRequest) -> Any:
+        """Perform a single ledger request under the concurrency limit."""
+        method, *args = request
+        async with self._limit:
+            async with self.ledger:
+                return await getattr(self.ledger, method)(*args)
+
+    async def fetch(self, method: str, *args) -> Any:
+        """
+        Perform a ledger read, joining an identical request if one is in flight.
+
+        Args:
+            method: The name of the ledger method
+            args: The positional arguments to the ledger method
+
+        """
+        request = (method, *args)
+        task = self._pending.get(request)
+        if not task:
+            task = asyncio.ensure_future(self._perform(request))
+            self._pending[request] = task
+            task.add_done_callback(lambda _: self._pending.pop(request, None))
+        # shield the shared request from cancellation of any one waiter
+        return await asyncio.shield(task)
+
+    async def fetch_all(self, requests: Iterable[LedgerRequest]) -> dict:
+        """
+        Perform a set of ledger reads concurrently.
+
+        Args:
+            requests: Tuples of (ledger method name, *args); duplicates are ignored
+
+        Returns:
+            A dictionary of results indexed by request tuple
+
+        """
+        distinct = list(dict.fromkeys(requests))
+        results = await asyncio.gather(*(self.fetch(*req) for req in distinct))
+        return dict(zip(distinct, results))
@@ -4,8 +4,13 @@ import logging
 
 from ..cache.base import BaseCache
 from ..config.base import BaseProvider, BaseInjector, BaseSettings
+from ..storage.base import BaseStorage
 from ..utils.classloader import ClassLoader
+from ..utils.metrics import Metrics
 from ..wallet.base import BaseWallet
+from ..wallet.provider import WalletProvider
+
+from .artifacts import LedgerArtifactStore
 
 LOGGER = logging.getLogger(__name__)
 
@@ -13,7 +18,10 @@ LOGGER = logging.getLogger(__name__)
 class LedgerProvider(BaseProvider):
     """Provider for the default ledger implementation."""
 
-    LEDGER_CLASSES = {"indy": "aries_cloudagent_vsw.ledger.indy.IndyLedger"}
+    LEDGER_CLASSES = {
+        "indy": "aries_cloudagent_vsw.ledger.indy.IndyLedger",
+        "memory": "aries_cloudagent_vsw.ledger.memory.MemoryLedger",
+    }
 
     async def provide(self, settings: BaseSettings, injector: BaseInjector):
         """Create and open the ledger instance."""
@@ -23,14 +31,51 @@ class LedgerProvider(BaseProvider):
         read_only = bool(settings.get("ledger.read_only", False))
         if read_only:
             LOGGER.error("Note: setting ledger to read-only mode")
-        wallet = await injector.inject(BaseWallet)
+        wallet_type = (settings.get("wallet.type") or "basic").lower()
         ledger = None
 
-        if wallet.type == "indy":
+        if settings.get("ledger.type") == "memory":
+            MemoryLedger = ClassLoader.load_class(self.LEDGER_CLASSES["memory"])
+            ledger = MemoryLedger(
+                pool_name,
+                await injector.inject(BaseWallet),
+                path=settings.get("ledger.memory_file"),
+                read_latency=settings.get("ledger.memory_read_latency", 0.0),
+                write_latency=settings.get("ledger.memory_write_latency", 0.0),
+                storage=await injector.inject(BaseStorage),
+                read_only=read_only,
+                metrics=await injector.inject(Metrics, required=False),
+            )
+        elif (
+            WalletProvider.WALLET_TYPES.get(wallet_type, wallet_type)
+            == WalletProvider.WALLET_TYPES["indy"]
+        ):
             IndyLedger = ClassLoader.load_class(self.LEDGER_CLASSES["indy"])
             cache = await injector.inject(BaseCache, required=False)
+            artifact_store = None
+            artifact_dir = settings.get("ledger.artifact_cache_dir")
+            if artifact_dir:
+                artifact_store = LedgerArtifactStore(
+                    artifact_dir, IndyLedger.LEDGER_TYPE, pool_name
+                )
+                artifact_bundle = settings.get("ledger.artifact_bundle")
+                if artifact_bundle:
+                    await artifact_store.load_bundle(artifact_bundle)
+            # the wallet is resolved once the pool is open, so that opening
+            # the pool does not wait on opening the wallet
             ledger = IndyLedger(
-                pool_name, wallet, keepalive=keepalive, cache=cache, read_only=read_only
+                pool_name,
+                None,
+                resolve_wallet=lambda: injector.inject(BaseWallet),
+                keepalive=keepalive,
+                cache=cache,
+                did_cache_duration=int(settings.get("ledger.did_cache_ttl", 600)),
+                did_negative_cache_duration=int(
+                    settings.get("ledger.did_negative_cache_ttl", 30)
+                ),
+                artifact_store=artifact_store,
+                read_only=read_only,
+                metrics=await injector.inject(Metrics, required=False),
             )
 
             genesis_transactions = settings.get("ledger.genesis_transactions")
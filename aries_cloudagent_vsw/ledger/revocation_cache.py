@@ -0,0 +1,249 @@
+"""Bounded cache of revocation registry entries and deltas."""
+
+from collections import OrderedDict
+from time import time
+from typing import Optional, Tuple
+
+
+class CachedRevocationState:
+    """A revocation registry entry or delta, as of a ledger timestamp."""
+
+    __slots__ = ("timestamp_from", "timestamp", "valid_to", "value")
+
+    def __init__(self, timestamp_from: int, timestamp: int, valid_to: int, value: dict):
+        """
+        Initialize a `CachedRevocationState` instance.
+
+        Args:
+            timestamp_from: The start of the delta interval, or `None` for an entry
+            timestamp: The ledger timestamp of the latest registry entry included
+            valid_to: The latest time at which the registry is known to be unchanged
+            value: The entry or delta as returned by the ledger
+
+        """
+        self.timestamp_from = timestamp_from
+        self.timestamp = timestamp
+        self.valid_to = valid_to
+        self.value = value
+
+    def covers(self, timestamp_to: int) -> bool:
+        """Check whether the registry state at a point in time is known."""
+        return self.timestamp <= timestamp_to <= self.valid_to
+
+
+class RevocationRegistryStateCache:
+    """Cached entries and deltas for a single revocation registry."""
+
+    def __init__(self, max_items: int):
+        """Initialize a `RevocationRegistryStateCache` instance."""
+        self.max_items = max_items
+        self.entries = OrderedDict()
+        self.deltas = OrderedDict()
+
+    def _add(self, items: OrderedDict, key, state: CachedRevocationState):
+        """Add an item, evicting the least recently used when full."""
+        items[key] = state
+        items.move_to_end(key)
+        while len(items) > self.max_items:
+            items.popitem(last=False)
+
+    def _find(self, items: OrderedDict, key, test) -> CachedRevocationState:
+        """Find the item for a key, or else any item, satisfying a test."""
+        if not (key in items and test(items[key])):
+            key = next((k for (k, item) in items.items() if test(item)), None)
+            if key is None:
+                return None
+        items.move_to_end(key)
+        return items[key]
+
+
+class RevocationStateCache:
+    """
+    Cache of revocation registry entries and deltas fetched from the ledger.
+
+    The ledger reports, with each entry or delta, the timestamp of the latest
+    registry entry at or before the requested time. The registry is then known
+    to be unchanged from that timestamp up to the requested time, so any request
+    inside that window has the same answer. Deltas adjoining in this way may also
+    be merged to answer a request spanning both.
+
+    Memory is bounded by evicting the least recently used registries, and the
+    least recently used entries and deltas of each registry.
+    """
+
+    def __init__(self, max_registries: int = 256, max_items_per_registry: int = 64):
+        """
+        Initialize a `RevocationStateCache` instance.
+
+        Args:
+            max_registries: The maximum number of registries with cached state
+            max_items_per_registry: The maximum number of entries, and of deltas,
+                cached per registry
+
+        """
+        self.max_registries = max_registries
+        self.max_items_per_registry = max_items_per_registry
+        self._registries = OrderedDict()
+
+    def _registry(self, rev_reg_id: str, create: bool = False):
+        """Fetch the cached state for a registry, marking it as recently used."""
+        registry = self._registries.get(rev_reg_id)
+        if registry:
+            self._registries.move_to_end(rev_reg_id)
+        elif create:
+            registry = RevocationRegistryStateCache(self.max_items_per_registry)
+            self._registries[rev_reg_id] = registry
+            while len(self._registries) > self.max_registries:
+                self._registries.popitem(last=False)
+        return registry
+
+    @staticmethod
+    def _valid_to(requested_to: int, fetched_at: int = None) -> int:
+        """Registry entries cannot yet exist beyond the time of the ledger read."""
+        return min(requested_to, int(time()) if fetched_at is None else fetched_at)
+
+    def get_entry(self, rev_reg_id: str, timestamp: int) -> Optional[Tuple[dict, int]]:
+        """
+        Look up a revocation registry entry.
+
+        Args:
+            rev_reg_id: The revocation registry identifier
+            timestamp: The requested time
+
+        Returns:
+            A tuple of the entry and its ledger timestamp, or `None`
+
+        """
+        registry = self._registry(rev_reg_id)
+        found = registry and registry._find(
+            registry.entries, timestamp, lambda item: item.covers(timestamp)
+        )
+        return (found.value, found.timestamp) if found else None
+
+    def set_entry(
+        self,
+        rev_reg_id: str,
+        timestamp: int,
+        entry: dict,
+        entry_timestamp: int,
+        fetched_at: int = None,
+    ):
+        """
+        Add a revocation registry entry fetched from the ledger.
+
+        Args:
+            rev_reg_id: The revocation registry identifier
+            timestamp: The requested time
+            entry: The entry returned by the ledger
+            entry_timestamp: The ledger timestamp of the entry
+            fetched_at: The time of the ledger read, default now
+
+        """
+        registry = self._registry(rev_reg_id, True)
+        registry._add(
+            registry.entries,
+            timestamp,
+            CachedRevocationState(
+                None, entry_timestamp, self._valid_to(timestamp, fetched_at), entry
+            ),
+        )
+
+    def get_delta(
+        self, rev_reg_id: str, timestamp_from: int, timestamp_to: int
+    ) -> Optional[Tuple[dict, int]]:
+        """
+        Look up a revocation registry delta.
+
+        Args:
+            rev_reg_id: The revocation registry identifier
+            timestamp_from: The start of the requested interval
+            timestamp_to: The end of the requested interval
+
+        Returns:
+            A tuple of the delta and its ledger timestamp, or `None`
+
+        """
+        registry = self._registry(rev_reg_id)
+        found = registry and registry._find(
+            registry.deltas,
+            (timestamp_from, timestamp_to),
+            lambda item: item.timestamp_from == timestamp_from
+            and item.covers(timestamp_to),
+        )
+        return (found.value, found.timestamp) if found else None
+
+    def find_delta_parts(
+        self, rev_reg_id: str, timestamp_from: int, timestamp_to: int
+    ) -> Optional[Tuple[Tuple[dict, int], Tuple[dict, int]]]:
+        """
+        Find two cached deltas that merge into the requested interval.
+
+        The first delta must start at the requested time, and the second must
+        start while the registry is known to be unchanged after the first.
+
+        Args:
+            rev_reg_id: The revocation registry identifier
+            timestamp_from: The start of the requested interval
+            timestamp_to: The end of the requested interval
+
+        Returns:
+            A pair of (delta, ledger timestamp) tuples to merge in order, or `None`
+
+        """
+        registry = self._registry(rev_reg_id)
+        if not registry:
+            return None
+        for first in registry.deltas.values():
+            if first.timestamp_from != timestamp_from:
+                continue
+            for second in registry.deltas.values():
+                if (
+                    second is not first
+                    and first.covers(second.timestamp_from)
+                    and second.covers(timestamp_to)
+                ):
+                    return (
+                        (first.value, first.timestamp),
+                        (second.value, second.timestamp),
+                    )
+        return None
+
+    def set_delta(
+        self,
+        rev_reg_id: str,
+        timestamp_from: int,
+        timestamp_to: int,
+        delta: dict,
+        delta_timestamp: int,
+        fetched_at: int = None,
+    ):
+        """
+        Add a revocation registry delta.
+
+        Args:
+            rev_reg_id: The revocation registry identifier
+            timestamp_from: The start of the requested interval
+            timestamp_to: The end of the requested interval
+            delta: The delta returned by the ledger, or merged from cached deltas
+            delta_timestamp: The ledger timestamp of the delta
+            fetched_at: The time of the ledger read, default now
+
+        """
+        registry = self._registry(rev_reg_id, True)
+        registry._add(
+            registry.deltas,
+            (timestamp_from, timestamp_to),
+            CachedRevocationState(
+                timestamp_from,
+                delta_timestamp,
+                self._valid_to(timestamp_to, fetched_at),
+                delta,
+            ),
+        )
+
+    def clear(self, rev_reg_id: str = None):
+        """Discard the cached state of one registry, or of all registries."""
+        if rev_reg_id:
+            self._registries.pop(rev_reg_id, None)
+        else:
+            self._registries.clear()
@@ -0,0 +1,74 @@
+import json
+import os
+
+from tempfile import TemporaryDirectory
+
+from asynctest import TestCase as AsyncTestCase
+
+from ..artifacts import (
+    ARTIFACT_CRED_DEF,
+    ARTIFACT_REVOC_REG_DEF,
+    ARTIFACT_SCHEMA,
+    LedgerArtifactStore,
+)
+from ..error import LedgerConfigError
+
+SCHEMA_ID = "55GkHamhTU1ZbTbV2ab9DE:2:schema_name:1.0"
+CRED_DEF_ID = "55GkHamhTU1ZbTbV2ab9DE:3:CL:19:tag"
+REV_REG_ID = f"55GkHamhTU1ZbTbV2ab9DE:4:{CRED_DEF_ID}:CL_ACCUM:0"
+
+
+class TestLedgerArtifactStore(AsyncTestCase):
+    def setUp(self):
+        self.tmp_dir = TemporaryDirectory()
+        self.store = LedgerArtifactStore(self.tmp_dir.name, "indy", "pool")
+
+    def tearDown(self):
+        self.tmp_dir.cleanup()
+
+    async def test_put_get(self):
+        assert await self.store.get(ARTIFACT_SCHEMA, SCHEMA_ID) is None
+
+        await self.store.put(ARTIFACT_SCHEMA, SCHEMA_ID, {"id": SCHEMA_ID})
+        assert await self.store.get(ARTIFACT_SCHEMA, SCHEMA_ID) == {"id": SCHEMA_ID}
+        assert await self.store.get(ARTIFACT_CRED_DEF, SCHEMA_ID) is None
+
+        other = LedgerArtifactStore(self.tmp_dir.name, "indy", "other-pool")
+        assert await other.get(ARTIFACT_SCHEMA, SCHEMA_ID) is None
+
+        with self.assertRaises(LedgerConfigError):
+            await self.store.get("nonsense", SCHEMA_ID)
+
+    async def test_get_unreadable(self):
+        path = self.store.artifact_path(ARTIFACT_SCHEMA, SCHEMA_ID)
+        os.makedirs(os.path.dirname(path))
+        with open(path, "w") as bad_file:
+            bad_file.write("{not json")
+        assert await self.store.get(ARTIFACT_SCHEMA, SCHEMA_ID) is None
+
+        with open(path, "w") as other_file:
+            json.dump({"id": "other", "value": {}}, other_file)
+        assert await self.store.get(ARTIFACT_SCHEMA, SCHEMA_ID) is None
+
+    async def test_load_bundle(self):
+        bundle_path = os.path.join(self.tmp_dir.name, "bundle.json")
+        with open(bundle_path, "w") as bundle_file:
+            json.dump(
+                {
+                    "schemas": {SCHEMA_ID: {"id": SCHEMA_ID}},
+                    "credential_definitions": {CRED_DEF_ID: {"id": CRED_DEF_ID}},
+                    "revocation_registry_definitions": {REV_REG_ID: {"id": REV_REG_ID}},
+                },
+                bundle_file,
+            )
+
+        assert await self.store.load_bundle(bundle_path) == 3
+        assert await self.store.get(ARTIFACT_CRED_DEF, CRED_DEF_ID) == {
+            "id": CRED_DEF_ID
+        }
+        assert await self.store.get(ARTIFACT_REVOC_REG_DEF, REV_REG_ID) == {
+            "id": REV_REG_ID
+        }
+
+        with self.assertRaises(LedgerConfigError):
+            await self.store.load_bundle(os.path.join(self.tmp_dir.name, "missing"))
@@ -2,11 +2,14 @@ import asyncio
 import json
 import pytest
 
+from tempfile import TemporaryDirectory
+
 from asynctest import TestCase as AsyncTestCase
 from asynctest import mock as async_mock
 
 from ...cache.basic import BasicCache
 from ...issuer.base import BaseIssuer, IssuerError
+from ...ledger.artifacts import LedgerArtifactStore
 from ...ledger.endpoint_type import EndpointType
 from ...ledger.indy import (
     BadLedgerRequestError,
@@ -24,6 +27,7 @@ from ...ledger.indy import (
 )
 from ...storage.indy import IndyStorage
 from ...storage.record import StorageRecord
+from ...utils.metrics import Metrics
 from ...wallet.base import DIDInfo
 
 
@@ -159,6 +163,34 @@ class TestIndyLedger(AsyncTestCase):
         mock_close_pool.assert_called_once()
         assert ledger.pool_handle == None
 
+    @async_mock.patch("indy.pool.set_protocol_version")
+    @async_mock.patch("indy.pool.open_pool_ledger")
+    @async_mock.patch("indy.pool.close_pool_ledger")
+    async def test_aenter_resolve_wallet(
+        self, mock_close_pool, mock_open_ledger, mock_set_proto
+    ):
+        mock_wallet = async_mock.MagicMock()
+        mock_wallet.type = "indy"
+
+        async def resolve_wallet():
+            # the pool is open before the wallet is resolved
+            mock_open_ledger.assert_called_once()
+            return mock_wallet
+
+        ledger = IndyLedger("name", None, resolve_wallet=resolve_wallet)
+        async with ledger:
+            assert ledger.wallet is mock_wallet
+        mock_close_pool.assert_called_once()
+
+        mock_wallet.type = "non-indy"
+        ledger = IndyLedger("name", None, resolve_wallet=resolve_wallet)
+        mock_open_ledger.reset_mock()
+        with self.assertRaises(LedgerConfigError):
+            async with ledger:
+                pass
+        assert mock_close_pool.call_count == 2
+        assert not ledger.wallet
+
     @async_mock.patch("indy.pool.set_protocol_version")
     @async_mock.patch("indy.pool.open_pool_ledger")
     @async_mock.patch("indy.pool.close_pool_ledger")
@@ -346,6 +378,35 @@ class TestIndyLedger(AsyncTestCase):
 
             mock_submit.assert_called_once_with(ledger.pool_handle, "{}")
 
+    @async_mock.patch("indy.pool.set_protocol_version")
+    @async_mock.patch("indy.pool.create_pool_ledger_config")
+    @async_mock.patch("indy.pool.open_pool_ledger")
+    @async_mock.patch("indy.pool.close_pool_ledger")
+    @async_mock.patch("indy.ledger.submit_request")
+    async def test_submit_metrics(
+        self,
+        mock_submit,
+        mock_close_pool,
+        mock_open_ledger,
+        mock_create_config,
+        mock_set_proto,
+    ):
+        mock_submit.side_effect = ['{"op": "REPLY"}', '{"op": "REJECT", "reason": ""}']
+
+        mock_wallet = async_mock.MagicMock()
+        mock_wallet.type = "indy"
+
+        metrics = Metrics()
+        ledger = IndyLedger("name", mock_wallet, metrics=metrics)
+
+        async with ledger:
+            await ledger._submit(json.dumps({"operation": {"type": "105"}}), False)
+            with self.assertRaises(LedgerTransactionError):
+                await ledger._submit(json.dumps({"operation": {"type": "999"}}), False)
+
+        assert metrics.ledger_latency.get("GET_NYM")["count"] == 1
+        assert metrics.ledger_latency.get("999")["count"] == 1
+
     @async_mock.patch("indy.pool.set_protocol_version")
     @async_mock.patch("indy.pool.create_pool_ledger_config")
     @async_mock.patch("indy.pool.open_pool_ledger")
@@ -1920,6 +1981,105 @@ class TestIndyLedger(AsyncTestCase):
             )
             assert response is None
 
+    @async_mock.patch("aries_cloudagent_vsw.ledger.indy.IndyLedger._context_open")
+    @async_mock.patch("aries_cloudagent_vsw.ledger.indy.IndyLedger._context_close")
+    @async_mock.patch("indy.ledger.build_get_nym_request")
+    @async_mock.patch("aries_cloudagent_vsw.ledger.indy.IndyLedger._submit")
+    async def test_get_key_for_did_cached(
+        self, mock_submit, mock_build_get_nym_req, mock_close, mock_open
+    ):
+        mock_wallet = async_mock.MagicMock()
+        mock_wallet.type = "indy"
+        mock_wallet.get_public_did = async_mock.CoroutineMock(
+            return_value=self.test_did_info
+        )
+
+        async def slow_submit(*args, **kwargs):
+            await asyncio.sleep(0.01)
+            return json.dumps(
+                {"result": {"data": json.dumps({"verkey": self.test_verkey})}}
+            )
+
+        mock_submit.side_effect = slow_submit
+        ledger = IndyLedger("name", mock_wallet, cache=BasicCache())
+
+        async with ledger:
+            responses = await asyncio.gather(
+                *[ledger.get_key_for_did(self.test_did) for _ in range(3)]
+            )
+            assert responses == [self.test_verkey] * 3
+            assert await ledger.get_key_for_did(self.test_did) == self.test_verkey
+            assert mock_submit.call_count == 1
+
+            await ledger.clear_did_cache(self.test_did)
+            assert await ledger.get_key_for_did(self.test_did) == self.test_verkey
+            assert mock_submit.call_count == 2
+
+    @async_mock.patch("aries_cloudagent_vsw.ledger.indy.IndyLedger._context_open")
+    @async_mock.patch("aries_cloudagent_vsw.ledger.indy.IndyLedger._context_close")
+    @async_mock.patch("indy.ledger.build_get_nym_request")
+    @async_mock.patch("aries_cloudagent_vsw.ledger.indy.IndyLedger._submit")
+    async def test_get_key_for_did_negative_cache_disabled(
+        self, mock_submit, mock_build_get_nym_req, mock_close, mock_open
+    ):
+        mock_wallet = async_mock.MagicMock()
+        mock_wallet.type = "indy"
+        mock_wallet.get_public_did = async_mock.CoroutineMock(
+            return_value=self.test_did_info
+        )
+
+        mock_submit.return_value = json.dumps({"result": {"data": None}})
+        ledger = IndyLedger(
+            "name", mock_wallet, cache=BasicCache(), did_negative_cache_duration=0
+        )
+
+        async with ledger:
+            assert await ledger.get_key_for_did(self.test_did) is None
+            assert await ledger.get_key_for_did(self.test_did) is None
+            assert mock_submit.call_count == 2
+
+    @async_mock.patch("aries_cloudagent_vsw.ledger.indy.IndyLedger._context_open")
+    @async_mock.patch("aries_cloudagent_vsw.ledger.indy.IndyLedger._context_close")
+    @async_mock.patch("indy.ledger.build_get_attrib_request")
+    @async_mock.patch("aries_cloudagent_vsw.ledger.indy.IndyLedger._submit")
+    async def test_get_endpoint_for_did_cached_missing(
+        self, mock_submit, mock_build_get_attrib_req, mock_close, mock_open
+    ):
+        mock_wallet = async_mock.MagicMock()
+        mock_wallet.type = "indy"
+        mock_wallet.get_public_did = async_mock.CoroutineMock(
+            return_value=self.test_did_info
+        )
+
+        mock_submit.return_value = json.dumps({"result": {"data": None}})
+        ledger = IndyLedger(
+            "name", mock_wallet, cache=BasicCache(), did_negative_cache_duration=0.05
+        )
+
+        async with ledger:
+            assert await ledger.get_endpoint_for_did(self.test_did) is None
+            assert await ledger.get_all_endpoints_for_did(self.test_did) is None
+            assert mock_submit.call_count == 1
+
+            await asyncio.sleep(0.1)
+            endpoints = {"endpoint": "http://aries.ca", "profile": "http://a.ca/me"}
+            mock_submit.return_value = json.dumps(
+                {"result": {"data": json.dumps({"endpoint": endpoints})}}
+            )
+            assert (
+                await ledger.get_endpoint_for_did(self.test_did)
+                == endpoints["endpoint"]
+            )
+            found = await ledger.get_all_endpoints_for_did(self.test_did)
+            assert found == endpoints
+            found["endpoint"] = "http://mutated.ca"
+            assert (
+                await ledger.get_endpoint_for_did(self.test_did, EndpointType.ENDPOINT)
+                == endpoints["endpoint"]
+            )
+            assert mock_submit.call_count == 2
+
+
     @async_mock.patch("aries_cloudagent_vsw.ledger.indy.IndyLedger._context_open")
     @async_mock.patch("aries_cloudagent_vsw.ledger.indy.IndyLedger._context_close")
     @async_mock.patch("indy.ledger.build_get_attrib_request")
@@ -2448,6 +2608,50 @@ class TestIndyLedger(AsyncTestCase):
             result = await ledger.get_revoc_reg_def("rr-id")
             assert result == {"hello": "world"}
 
+    @async_mock.patch("aries_cloudagent_vsw.ledger.indy.IndyLedger._context_open")
+    @async_mock.patch("aries_cloudagent_vsw.ledger.indy.IndyLedger._context_close")
+    @async_mock.patch("aries_cloudagent_vsw.ledger.indy.IndyLedger._submit")
+    @async_mock.patch("indy.ledger.build_get_revoc_reg_def_request")
+    @async_mock.patch("indy.ledger.parse_get_revoc_reg_def_response")
+    async def test_get_revoc_reg_def_artifact_store(
+        self,
+        mock_indy_parse_get_rrdef_resp,
+        mock_indy_build_get_rrdef_req,
+        mock_submit,
+        mock_close,
+        mock_open,
+    ):
+        mock_wallet = async_mock.MagicMock()
+        mock_wallet.type = "indy"
+        mock_wallet.get_public_did = async_mock.CoroutineMock(
+            return_value=self.test_did_info
+        )
+        mock_indy_parse_get_rrdef_resp.return_value = ("rr-id", '{"hello": "world"}')
+
+        with TemporaryDirectory() as tmp_dir:
+            ledger = IndyLedger(
+                "name",
+                mock_wallet,
+                cache=BasicCache(),
+                artifact_store=LedgerArtifactStore(tmp_dir, "indy", "name"),
+            )
+            async with ledger:
+                assert await ledger.get_revoc_reg_def("rr-id") == {"hello": "world"}
+                assert await ledger.get_revoc_reg_def("rr-id") == {"hello": "world"}
+                assert mock_submit.call_count == 1
+
+            # as after a restart: nothing in memory, artifact found on disk
+            ledger = IndyLedger(
+                "name",
+                mock_wallet,
+                cache=BasicCache(),
+                artifact_store=LedgerArtifactStore(tmp_dir, "indy", "name"),
+            )
+            async with ledger:
+                assert await ledger.get_revoc_reg_def("rr-id") == {"hello": "world"}
+                assert await ledger.cache.get("revoc_reg_def::rr-id")
+                assert mock_submit.call_count == 1
+
     @async_mock.patch("aries_cloudagent_vsw.ledger.indy.IndyLedger._context_open")
     @async_mock.patch("aries_cloudagent_vsw.ledger.indy.IndyLedger._context_close")
     @async_mock.patch("aries_cloudagent_vsw.ledger.indy.IndyLedger._submit")
@@ -2535,6 +2739,94 @@ class TestIndyLedger(AsyncTestCase):
             (result, _) = await ledger.get_revoc_reg_delta("rr-id")
             assert result == {"hello": "world"}
 
+    @async_mock.patch("aries_cloudagent_vsw.ledger.indy.IndyLedger._context_open")
+    @async_mock.patch("aries_cloudagent_vsw.ledger.indy.IndyLedger._context_close")
+    @async_mock.patch("aries_cloudagent_vsw.ledger.indy.IndyLedger._submit")
+    @async_mock.patch("indy.ledger.build_get_revoc_reg_request")
+    @async_mock.patch("indy.ledger.parse_get_revoc_reg_response")
+    async def test_get_revoc_reg_entry_cached(
+        self,
+        mock_indy_parse_get_rr_resp,
+        mock_indy_build_get_rr_req,
+        mock_submit,
+        mock_close,
+        mock_open,
+    ):
+        mock_wallet = async_mock.MagicMock()
+        mock_wallet.type = "indy"
+        mock_wallet.get_public_did = async_mock.CoroutineMock(
+            return_value=self.test_did_info
+        )
+        mock_indy_parse_get_rr_resp.return_value = (
+            "rr-id",
+            '{"hello": "world"}',
+            1234567800,
+        )
+
+        ledger = IndyLedger("name", mock_wallet)
+        async with ledger:
+            for timestamp in (1234567890, 1234567890, 1234567850):
+                (result, ledger_timestamp) = await ledger.get_revoc_reg_entry(
+                    "rr-id", timestamp
+                )
+                assert result == {"hello": "world"}
+                assert ledger_timestamp == 1234567800
+            assert mock_submit.call_count == 1
+
+            await ledger.get_revoc_reg_entry("rr-id", 1234567900)
+            assert mock_submit.call_count == 2
+
+    @async_mock.patch("aries_cloudagent_vsw.ledger.indy.IndyLedger._context_open")
+    @async_mock.patch("aries_cloudagent_vsw.ledger.indy.IndyLedger._context_close")
+    @async_mock.patch("aries_cloudagent_vsw.ledger.indy.IndyLedger._submit")
+    @async_mock.patch("indy.ledger.build_get_revoc_reg_delta_request")
+    @async_mock.patch("indy.ledger.parse_get_revoc_reg_delta_response")
+    @async_mock.patch("indy.anoncreds.issuer_merge_revocation_registry_deltas")
+    async def test_get_revoc_reg_delta_cached(
+        self,
+        mock_indy_merge,
+        mock_indy_parse_get_rrd_resp,
+        mock_indy_build_get_rrd_req,
+        mock_submit,
+        mock_close,
+        mock_open,
+    ):
+        mock_wallet = async_mock.MagicMock()
+        mock_wallet.type = "indy"
+        mock_wallet.get_public_did = async_mock.CoroutineMock(
+            return_value=self.test_did_info
+        )
+        mock_indy_parse_get_rrd_resp.side_effect = [
+            ("rr-id", '{"issued": [1]}', 1000),
+            ("rr-id", '{"issued": [2]}', 1500),
+        ]
+        mock_indy_merge.return_value = '{"issued": [1, 2]}'
+
+        ledger = IndyLedger("name", mock_wallet)
+        async with ledger:
+            assert await ledger.get_revoc_reg_delta("rr-id", 0, 1200) == (
+                {"issued": [1]},
+                1000,
+            )
+            assert await ledger.get_revoc_reg_delta("rr-id", 0, 1100) == (
+                {"issued": [1]},
+                1000,
+            )
+            assert await ledger.get_revoc_reg_delta("rr-id", 1200, 1600) == (
+                {"issued": [2]},
+                1500,
+            )
+            assert mock_submit.call_count == 2
+
+            assert await ledger.get_revoc_reg_delta("rr-id", 0, 1600) == (
+                {"issued": [1, 2]},
+                1500,
+            )
+            mock_indy_merge.assert_called_once_with(
+                '{"issued": [1]}', '{"issued": [2]}'
+            )
+            assert mock_submit.call_count == 2
+
     @async_mock.patch("aries_cloudagent_vsw.ledger.indy.IndyLedger._context_open")
     @async_mock.patch("aries_cloudagent_vsw.ledger.indy.IndyLedger._context_close")
     @async_mock.patch("aries_cloudagent_vsw.ledger.indy.IndyLedger._submit")
@@ -0,0 +1,273 @@
+import json
+
+from os import path
+from tempfile import TemporaryDirectory
+
+from asynctest import TestCase as AsyncTestCase
+from asynctest import mock as async_mock
+
+from ...issuer.base import BaseIssuer, IssuerError
+from ...messaging.credential_definitions.util import CRED_DEF_SENT_RECORD_TYPE
+from ...messaging.schemas.util import SCHEMA_SENT_RECORD_TYPE
+from ...storage.basic import BasicStorage
+from ...utils.metrics import Metrics
+from ...wallet.basic import BasicWallet
+
+from .. import memory as test_module
+from ..endpoint_type import EndpointType
+from ..error import BadLedgerRequestError, LedgerError, LedgerTransactionError
+from ..indy import Role
+from ..memory import MEMORY_POOLS, MemoryLedger, get_memory_pool
+
+SCHEMA_ID = "{}:2:schema_name:1.0"
+CRED_DEF_ID = "{}:3:CL:{}:default"
+REV_REG_ID = "{}:4:{}:CL_ACCUM:0"
+
+
+class TestMemoryLedger(AsyncTestCase):
+    async def setUp(self):
+        self.wallet = BasicWallet()
+        self.public = await self.wallet.create_public_did()
+        self.storage = BasicStorage()
+        self.ledger = MemoryLedger("test", self.wallet, storage=self.storage)
+
+    async def tearDown(self):
+        MEMORY_POOLS.clear()
+
+    def mock_issuer(self) -> BaseIssuer:
+        did = self.public.did
+        return async_mock.MagicMock(
+            create_and_store_schema=async_mock.CoroutineMock(
+                return_value=(
+                    SCHEMA_ID.format(did),
+                    json.dumps(
+                        {
+                            "ver": "1.0",
+                            "id": SCHEMA_ID.format(did),
+                            "name": "schema_name",
+                            "version": "1.0",
+                            "attrNames": ["a", "b"],
+                        }
+                    ),
+                )
+            ),
+            make_credential_definition_id=async_mock.MagicMock(
+                side_effect=lambda did, schema, sig, tag: CRED_DEF_ID.format(
+                    did, schema["seqNo"]
+                ).replace("default", tag)
+            ),
+            credential_definition_in_wallet=async_mock.CoroutineMock(
+                return_value=False
+            ),
+            create_and_store_credential_definition=async_mock.CoroutineMock(
+                side_effect=lambda did, schema, sig, tag, rev: (
+                    CRED_DEF_ID.format(did, schema["seqNo"]),
+                    json.dumps({"id": CRED_DEF_ID.format(did, schema["seqNo"])}),
+                )
+            ),
+        )
+
+    async def test_nym(self):
+        did = self.public.did
+        assert self.ledger.type == "memory"
+        assert await self.ledger.get_key_for_did(did) is None
+        with self.assertRaises(BadLedgerRequestError):
+            await self.ledger.get_nym_role(did)
+        with self.assertRaises(LedgerTransactionError):
+            await self.ledger.update_endpoint_for_did(did, "http://1.2.3.4")
+
+        await self.ledger.register_nym(did, self.public.verkey, "alias", "ENDORSER")
+        assert await self.ledger.get_key_for_did(f"did:sov:{did}") == (
+            self.public.verkey
+        )
+        assert await self.ledger.get_nym_role(did) == Role.ENDORSER
+        await self.ledger.register_nym(did, self.public.verkey)
+        assert self.ledger.pool.nyms[did]["alias"] == "alias"
+        assert await self.ledger.get_nym_role(did) == Role.ENDORSER
+        await self.ledger.register_nym(did, self.public.verkey, role="")
+        assert await self.ledger.get_nym_role(did) == Role.USER
+        with self.assertRaises(BadLedgerRequestError):
+            await self.ledger.register_nym(did, self.public.verkey, role="KING")
+        assert self.ledger.nym_to_did(did) == f"did:sov:{did}"
+
+    async def test_endpoint(self):
+        did = self.public.did
+        await self.ledger.register_nym(did, self.public.verkey)
+        assert await self.ledger.get_endpoint_for_did(did) is None
+        assert await self.ledger.update_endpoint_for_did(did, "http://1.2.3.4")
+        assert not await self.ledger.update_endpoint_for_did(did, "http://1.2.3.4")
+        assert await self.ledger.update_endpoint_for_did(
+            did, "http://profile", EndpointType.PROFILE
+        )
+        assert await self.ledger.get_endpoint_for_did(did) == "http://1.2.3.4"
+        assert (
+            await self.ledger.get_endpoint_for_did(did, EndpointType.PROFILE)
+            == "http://profile"
+        )
+
+        # ledgers of the same pool share its transactions
+        other = MemoryLedger("test", BasicWallet())
+        assert await other.get_endpoint_for_did(did) == "http://1.2.3.4"
+        assert other.pool is self.ledger.pool
+        assert await MemoryLedger("other", BasicWallet()).get_key_for_did(did) is None
+
+    async def test_rotate_public_did_keypair(self):
+        with self.assertRaises(BadLedgerRequestError):
+            await self.ledger.rotate_public_did_keypair()
+        await self.ledger.register_nym(self.public.did, self.public.verkey, "alias")
+        await self.ledger.rotate_public_did_keypair()
+        verkey = (await self.wallet.get_public_did()).verkey
+        assert verkey != self.public.verkey
+        assert await self.ledger.get_key_for_did(self.public.did) == verkey
+        assert self.ledger.pool.nyms[self.public.did]["alias"] == "alias"
+
+    async def test_schema_cred_def(self):
+        did = self.public.did
+        issuer = self.mock_issuer()
+        with self.assertRaises(BadLedgerRequestError):
+            await MemoryLedger("test", BasicWallet()).create_and_send_schema(
+                issuer, "schema_name", "1.0", ["a", "b"]
+            )
+
+        (schema_id, schema) = await self.ledger.create_and_send_schema(
+            issuer, "schema_name", "1.0", ["b", "a"]
+        )
+        assert schema_id == SCHEMA_ID.format(did)
+        seq_no = schema["seqNo"]
+        assert await self.ledger.get_schema(str(seq_no)) is schema
+        assert await self.ledger.create_and_send_schema(
+            issuer, "schema_name", "1.0", ["a", "b"]
+        ) == (schema_id, schema)
+        issuer.create_and_store_schema.assert_called_once()
+        with self.assertRaises(LedgerTransactionError):
+            await self.ledger.create_and_send_schema(
+                issuer, "schema_name", "1.0", ["a"]
+            )
+        [record] = await self.storage.search_records(
+            SCHEMA_SENT_RECORD_TYPE, {"schema_id": schema_id}
+        ).fetch_all()
+        assert record.tags["schema_issuer_did"] == did
+
+        with self.assertRaises(LedgerError):
+            await self.ledger.create_and_send_credential_definition(
+                issuer, SCHEMA_ID.format("other")
+            )
+        (
+            cred_def_id,
+            cred_def,
+            novel,
+        ) = await self.ledger.create_and_send_credential_definition(issuer, schema_id)
+        assert novel
+        assert cred_def_id == CRED_DEF_ID.format(did, seq_no)
+        assert await self.ledger.get_credential_definition(cred_def_id) is cred_def
+        assert await self.ledger.credential_definition_id2schema_id(cred_def_id) == (
+            schema_id
+        )
+        [record] = await self.storage.search_records(
+            CRED_DEF_SENT_RECORD_TYPE, {"cred_def_id": cred_def_id}
+        ).fetch_all()
+        assert record.tags["schema_name"] == "schema_name"
+
+        with self.assertRaises(LedgerError):
+            await self.ledger.create_and_send_credential_definition(issuer, schema_id)
+        issuer.credential_definition_in_wallet.return_value = True
+        assert await self.ledger.create_and_send_credential_definition(
+            issuer, schema_id
+        ) == (cred_def_id, cred_def, False)
+        issuer.credential_definition_in_wallet.side_effect = IssuerError()
+        with self.assertRaises(LedgerError):
+            await self.ledger.create_and_send_credential_definition(issuer, schema_id)
+
+    async def test_revocation(self):
+        rev_reg_id = REV_REG_ID.format(self.public.did, "cred_def")
+        with self.assertRaises(LedgerError):
+            await self.ledger.get_revoc_reg_def(rev_reg_id)
+        with self.assertRaises(LedgerTransactionError):
+            await self.ledger.send_revoc_reg_entry(rev_reg_id, "CL_ACCUM", {})
+        with self.assertRaises(LedgerTransactionError):
+            await MemoryLedger("test", BasicWallet()).send_revoc_reg_def(
+                {"id": rev_reg_id}
+            )
+
+        await self.ledger.send_revoc_reg_def({"id": rev_reg_id}, self.public.did)
+        assert await self.ledger.get_revoc_reg_def(rev_reg_id) == {"id": rev_reg_id}
+
+        with async_mock.patch.object(
+            test_module, "time", async_mock.MagicMock()
+        ) as mock_time:
+            for (timestamp, value) in (
+                (100, {"accum": "1"}),
+                (200, {"prevAccum": "1", "accum": "2", "revoked": [1, 2]}),
+                (300, {"prevAccum": "2", "accum": "3", "revoked": [3]}),
+                (400, {"prevAccum": "3", "accum": "4", "issued": [2]}),
+            ):
+                mock_time.return_value = timestamp
+                await self.ledger.send_revoc_reg_entry(
+                    rev_reg_id, "CL_ACCUM", {"ver": "1.0", "value": value}
+                )
+
+        with self.assertRaises(LedgerError):
+            await self.ledger.get_revoc_reg_entry(rev_reg_id, 50)
+        assert await self.ledger.get_revoc_reg_entry(rev_reg_id, 250) == (
+            {"ver": "1.0", "value": {"accum": "2"}},
+            200,
+        )
+        assert await self.ledger.get_revoc_reg_delta(rev_reg_id, 0, 350) == (
+            {"ver": "1.0", "value": {"accum": "3", "issued": [], "revoked": [1, 2, 3]}},
+            300,
+        )
+        assert await self.ledger.get_revoc_reg_delta(rev_reg_id, 250) == (
+            {
+                "ver": "1.0",
+                "value": {
+                    "prevAccum": "2",
+                    "accum": "4",
+                    "issued": [2],
+                    "revoked": [3],
+                },
+            },
+            400,
+        )
+
+    async def test_latency(self):
+        metrics = Metrics()
+        ledger = MemoryLedger(
+            "test", self.wallet, read_latency=0.01, write_latency=0.02, metrics=metrics
+        )
+        issuer = self.mock_issuer()
+        with async_mock.patch.object(
+            test_module.asyncio, "sleep", async_mock.CoroutineMock()
+        ) as mock_sleep:
+            await ledger.create_and_send_schema(issuer, "schema_name", "1.0", ["a"])
+            # the schema is read once, when it is not yet on the ledger
+            assert mock_sleep.call_args_list == [((0.01,),), ((0.02,),)]
+            await ledger.get_schema(SCHEMA_ID.format(self.public.did))
+            await ledger.get_schema(SCHEMA_ID.format(self.public.did))
+            assert mock_sleep.call_count == 3
+        assert metrics.ledger_latency.get("SCHEMA")["count"] == 1
+        assert metrics.ledger_latency.get("GET_SCHEMA")["count"] == 2
+
+    async def test_read_only(self):
+        ledger = MemoryLedger("test", self.wallet, read_only=True)
+        with self.assertRaises(LedgerError):
+            await ledger.register_nym(self.public.did, self.public.verkey)
+        assert not ledger.pool.nyms
+
+    async def test_persist(self):
+        with TemporaryDirectory() as tmp_dir:
+            pool_path = path.join(tmp_dir, "pool.json")
+            ledger = MemoryLedger("persisted", self.wallet, path=pool_path)
+            await ledger.register_nym(self.public.did, self.public.verkey)
+            with self.assertRaises(test_module.LedgerConfigError):
+                get_memory_pool("persisted", path.join(tmp_dir, "other.json"))
+
+            MEMORY_POOLS.clear()
+            pool = get_memory_pool("persisted", pool_path)
+            assert pool.nyms[self.public.did]["verkey"] == self.public.verkey
+            assert pool.seq_no == 1
+
+            with open(pool_path, "w") as pool_file:
+                pool_file.write("{")
+            MEMORY_POOLS.clear()
+            with self.assertRaises(test_module.LedgerConfigError):
+                get_memory_pool("persisted", pool_path)
@@ -0,0 +1,58 @@
+import asyncio
+
+from asynctest import TestCase as AsyncTestCase
+from asynctest import mock as async_mock
+
+from ..base import BaseLedger
+from ..prefetch import LedgerPrefetcher
+
+
+class TestLedgerPrefetcher(AsyncTestCase):
+    def setUp(self):
+        self.in_flight = 0
+        self.max_in_flight = 0
+
+        async def get_schema(schema_id):
+            self.in_flight += 1
+            self.max_in_flight = max(self.max_in_flight, self.in_flight)
+            await asyncio.sleep(0.01)
+            self.in_flight -= 1
+            return {"id": schema_id}
+
+        self.ledger = async_mock.MagicMock(BaseLedger, autospec=True)
+        self.ledger.get_schema = async_mock.CoroutineMock(side_effect=get_schema)
+        self.ledger.get_credential_definition = async_mock.CoroutineMock(
+            side_effect=ValueError("no cred def")
+        )
+
+    async def test_for_ledger(self):
+        prefetcher = LedgerPrefetcher.for_ledger(self.ledger)
+        assert LedgerPrefetcher.for_ledger(self.ledger) is prefetcher
+        assert prefetcher.max_concurrency == LedgerPrefetcher.DEFAULT_MAX_CONCURRENCY
+
+    async def test_fetch_all_bounded(self):
+        prefetcher = LedgerPrefetcher(self.ledger, max_concurrency=2)
+        requests = [("get_schema", f"schema-{i}") for i in range(5)]
+        result = await prefetcher.fetch_all(requests + requests)
+
+        assert result == {req: {"id": req[1]} for req in requests}
+        assert self.ledger.get_schema.call_count == 5
+        assert self.max_in_flight == 2
+        assert prefetcher.pending_count == 0
+
+    async def test_fetch_deduplicated(self):
+        prefetcher = LedgerPrefetcher(self.ledger)
+        results = await asyncio.gather(
+            prefetcher.fetch_all([("get_schema", "a"), ("get_schema", "b")]),
+            prefetcher.fetch_all([("get_schema", "b")]),
+            prefetcher.fetch("get_schema", "a"),
+        )
+        assert results[1] == {("get_schema", "b"): {"id": "b"}}
+        assert results[2] == {"id": "a"}
+        assert self.ledger.get_schema.call_count == 2
+
+    async def test_fetch_x(self):
+        prefetcher = LedgerPrefetcher(self.ledger)
+        with self.assertRaises(ValueError):
+            await prefetcher.fetch_all([("get_credential_definition", "cd")])
+        assert prefetcher.pending_count == 0
@@ -7,6 +7,8 @@ import pytest
 from ...config.injection_context import InjectionContext
 from ...ledger.base import BaseLedger
 from ...ledger.indy import GENESIS_TRANSACTION_PATH, IndyLedger
+from ...ledger.memory import MEMORY_POOLS, MemoryLedger
+from ...storage.base import BaseStorage
 from ...wallet.base import BaseWallet
 
 from ..provider import LedgerProvider
@@ -37,6 +39,7 @@ class TestProvider(AsyncTestCase):
                 "ledger.pool_name": "name",
                 "ledger.genesis_transactions": "dummy",
                 "ledger.read_only": True,
+                "wallet.type": "indy",
             },
             injector=context.injector,
         )
@@ -57,6 +60,31 @@ class TestProvider(AsyncTestCase):
         context.injector.bind_instance(BaseWallet, mock_wallet)
 
         result = await provider.provide(
-            settings={"ledger.pool_name": "name",}, injector=context.injector
+            settings={"ledger.pool_name": "name", "wallet.type": "indy"},
+            injector=context.injector,
         )
         assert result is None
+
+    async def test_provide_memory(self):
+        provider = LedgerProvider()
+
+        context = InjectionContext(enforce_typing=False)
+        mock_wallet = async_mock.MagicMock()
+        mock_wallet.type = "basic"
+        context.injector.bind_instance(BaseWallet, mock_wallet)
+        mock_storage = async_mock.MagicMock()
+        context.injector.bind_instance(BaseStorage, mock_storage)
+
+        result = await provider.provide(
+            settings={
+                "ledger.type": "memory",
+                "ledger.pool_name": "name",
+                "ledger.memory_read_latency": 0.02,
+            },
+            injector=context.injector,
+        )
+        MEMORY_POOLS.clear()
+        assert isinstance(result, MemoryLedger)
+        assert result.pool_name == "name"
+        assert result.read_latency == 0.02
+        assert result.storage is mock_storage
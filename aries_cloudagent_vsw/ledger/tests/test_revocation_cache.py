@@ -0,0 +1,62 @@
+from asynctest import TestCase as AsyncTestCase
+
+from ..revocation_cache import RevocationStateCache
+
+RR_ID = "55GkHamhTU1ZbTbV2ab9DE:4:55GkHamhTU1ZbTbV2ab9DE:3:CL:19:tag:CL_ACCUM:0"
+
+
+class TestRevocationStateCache(AsyncTestCase):
+    def setUp(self):
+        self.cache = RevocationStateCache(max_registries=2, max_items_per_registry=2)
+
+    async def test_entry(self):
+        assert self.cache.get_entry(RR_ID, 1000) is None
+
+        self.cache.set_entry(RR_ID, 1000, {"accum": "a"}, 900, fetched_at=2000)
+        assert self.cache.get_entry(RR_ID, 1000) == ({"accum": "a"}, 900)
+        assert self.cache.get_entry(RR_ID, 950) == ({"accum": "a"}, 900)
+        assert self.cache.get_entry(RR_ID, 899) is None
+        assert self.cache.get_entry(RR_ID, 1001) is None
+
+        # registry may still change after the time of the ledger read
+        self.cache.set_entry(RR_ID, 3000, {"accum": "b"}, 1500, fetched_at=2000)
+        assert self.cache.get_entry(RR_ID, 2000) == ({"accum": "b"}, 1500)
+        assert self.cache.get_entry(RR_ID, 3000) is None
+
+    async def test_delta(self):
+        self.cache.set_delta(RR_ID, 0, 1000, {"accum": "a"}, 900, fetched_at=2000)
+        assert self.cache.get_delta(RR_ID, 0, 1000) == ({"accum": "a"}, 900)
+        assert self.cache.get_delta(RR_ID, 0, 920) == ({"accum": "a"}, 900)
+        assert self.cache.get_delta(RR_ID, 10, 920) is None
+        assert self.cache.get_delta(RR_ID, 0, 1200) is None
+        assert self.cache.find_delta_parts(RR_ID, 0, 1200) is None
+
+        self.cache.set_delta(RR_ID, 950, 1300, {"accum": "b"}, 1100, fetched_at=2000)
+        assert self.cache.find_delta_parts(RR_ID, 0, 1200) == (
+            ({"accum": "a"}, 900),
+            ({"accum": "b"}, 1100),
+        )
+        assert self.cache.find_delta_parts(RR_ID, 0, 1050) is None
+        assert self.cache.find_delta_parts(RR_ID, 5, 1200) is None
+
+    async def test_bounded(self):
+        self.cache.set_entry(RR_ID, 1000, {"accum": "a"}, 1000, fetched_at=2000)
+        self.cache.set_entry(RR_ID, 1100, {"accum": "b"}, 1100, fetched_at=2000)
+        assert self.cache.get_entry(RR_ID, 1000)  # most recently used
+        self.cache.set_entry(RR_ID, 1200, {"accum": "c"}, 1200, fetched_at=2000)
+        assert self.cache.get_entry(RR_ID, 1000)
+        assert self.cache.get_entry(RR_ID, 1100) is None
+
+        self.cache.set_entry("other-1", 1000, {}, 900, fetched_at=2000)
+        self.cache.set_entry("other-2", 1000, {}, 900, fetched_at=2000)
+        assert self.cache.get_entry(RR_ID, 1000) is None
+        assert self.cache.get_entry("other-1", 1000)
+
+    async def test_clear(self):
+        self.cache.set_entry(RR_ID, 1000, {"accum": "a"}, 900, fetched_at=2000)
+        self.cache.set_entry("other", 1000, {"accum": "a"}, 900, fetched_at=2000)
+        self.cache.clear(RR_ID)
+        assert self.cache.get_entry(RR_ID, 1000) is None
+        assert self.cache.get_entry("other", 1000)
+        self.cache.clear()
+        assert self.cache.get_entry("other", 1000) is None
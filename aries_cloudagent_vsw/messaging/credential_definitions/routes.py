@@ -23,6 +23,7 @@ from ..valid import INDY_CRED_DEF_ID, INDY_SCHEMA_ID, INDY_VERSION
 
 from ...revocation.error import RevocationError, RevocationNotSupportedError
 from ...revocation.indy import IndyRevocation
+from ...revocation.pool import RevocationRegistryPool
 
 from ...ledger.error import LedgerError
 
@@ -178,21 +179,34 @@ async def credential_definitions_send_credential_definition(request: web.BaseReq
 
             tails_server: BaseTailsServer = await context.inject(BaseTailsServer)
             upload_success, reason = await tails_server.upload_tails_file(
-                context, registry_record.revoc_reg_id, registry_record.tails_local_path
+                context,
+                registry_record.revoc_reg_id,
+                registry_record.tails_local_path,
+                registry_record.tails_hash,
             )
             if not upload_success:
                 raise web.HTTPInternalServerError(
                     reason=f"Tails file failed to upload: {reason}"
                 )
 
-            pending_registry_record = await revoc.init_issuer_registry(
-                registry_record.cred_def_id,
-                registry_record.issuer_did,
-                max_cred_num=registry_record.max_cred_num,
-            )
-            ensure_future(
-                pending_registry_record.stage_pending_registry_definition(context)
+            registry_pool: RevocationRegistryPool = await context.inject(
+                RevocationRegistryPool, required=False
             )
+            if registry_pool:
+                await registry_pool.replenish(
+                    registry_record.cred_def_id,
+                    registry_record.issuer_did,
+                    registry_record.max_cred_num,
+                )
+            else:
+                pending_registry_record = await revoc.init_issuer_registry(
+                    registry_record.cred_def_id,
+                    registry_record.issuer_did,
+                    max_cred_num=registry_record.max_cred_num,
+                )
+                ensure_future(
+                    pending_registry_record.stage_pending_registry_definition(context)
+                )
 
         except RevocationError as e:
             raise web.HTTPBadRequest(reason=e.message) from e
@@ -1,11 +1,12 @@
 """Classes for BaseStorage-based record management."""
 
 import json
+import logging
 import sys
 import uuid
 
 from datetime import datetime
-from typing import Any, Mapping, Sequence, Union
+from typing import Any, Collection, Mapping, Sequence, Set, Tuple, Union
 
 from marshmallow import fields
 
@@ -15,10 +16,16 @@ from ...storage.base import BaseStorage, StorageDuplicateError, StorageNotFoundE
 from ...storage.record import StorageRecord
 
 from .base import BaseModel, BaseModelSchema
+from .record_cache import RecordCache
 from ..responder import BaseResponder
 from ..util import datetime_to_str, time_now
 from ..valid import INDY_ISO8601_DATETIME
 
+LOGGER = logging.getLogger(__name__)
+
+# the stored record of the tag names back-filled on the records of a type
+TAG_SCHEMA_RECORD_TYPE = "record_tag_schema"
+
 
 def match_post_filter(record: dict, post_filter: dict, positive: bool = True) -> bool:
     """Determine if a record value matches the post-filter.
@@ -49,6 +56,7 @@ class BaseRecord(BaseModel):
     LOG_STATE_FLAG = None
     CACHE_TTL = 60
     CACHE_ENABLED = False
+    RECORD_CACHE_ENABLED = False
     TAG_NAMES = {"state"}
 
     def __init__(
@@ -68,6 +76,8 @@ class BaseRecord(BaseModel):
             )
         self._id = id
         self._last_state = state
+        # the version of the cached record value this record was read from
+        self._version: int = None
         self.state = state
         self.created_at = datetime_to_str(created_at)
         self.updated_at = datetime_to_str(updated_at)
@@ -186,6 +196,29 @@ class BaseRecord(BaseModel):
         if cache:
             await cache.clear(cache_key)
 
+    @classmethod
+    async def get_record_cache(cls, context: InjectionContext) -> RecordCache:
+        """Get the write-through record cache, if enabled for this record class.
+
+        Args:
+            context: The injection context to use
+        """
+        if cls.RECORD_CACHE_ENABLED:
+            return await context.inject(RecordCache, required=False)
+
+    @classmethod
+    def from_cached(cls, record_id: str, version: int, value: str) -> "BaseRecord":
+        """Initialize a record from a value of the record cache.
+
+        Args:
+            record_id: The unique record identifier
+            version: The version of the cached value
+            value: The cached value JSON
+        """
+        record = cls.from_storage(record_id, json.loads(value))
+        record._version = version
+        return record
+
     async def clear_cached(self, context: InjectionContext):
         """Clear the cached value of this record, if any."""
         await self.clear_cached_key(context, self.cache_key(self._id))
@@ -201,6 +234,23 @@ class BaseRecord(BaseModel):
             record_id: The ID of the record to find
             cached: Whether to check the cache for this record
         """
+        record_cache = await cls.get_record_cache(context)
+        if record_cache:
+            entry = cached and record_cache.get(cls.RECORD_TYPE, record_id)
+            if entry:
+                return cls.from_cached(record_id, *entry)
+            changes = record_cache.changes
+            storage: BaseStorage = await context.inject(BaseStorage)
+            result = await storage.get_record(
+                cls.RECORD_TYPE, record_id, {"retrieveTags": False}
+            )
+            vals = json.loads(result.value)
+            record = cls.from_storage(record_id, vals)
+            record._version = record_cache.load(
+                cls.RECORD_TYPE, record_id, result.value, vals.get("thread_id"), changes
+            )
+            return record
+
         cache_key = cls.cache_key(record_id)
         vals = None
 
@@ -229,17 +279,42 @@ class BaseRecord(BaseModel):
             tag_filter: The filter dictionary to apply
             post_filter: Additional value filters to apply after retrieval
         """
+        record_cache = await cls.get_record_cache(context)
+        thread_id = None
+        if record_cache:
+            found = cls.find_cached_thread(record_cache, tag_filter, post_filter)
+            if found:
+                return found
+            thread_id = cls.get_filter_thread_id(tag_filter)
+            changes = record_cache.changes
+
+        if thread_id:
+            # read the whole thread, for the cache to find its records after
+            search_filter = {"thread_id": thread_id}
+            value_filters = (tag_filter, post_filter)
+        else:
+            (search_filter, value_filter) = (tag_filter, post_filter)
+            if post_filter:
+                (search_filter, value_filter) = cls.route_post_filter(
+                    tag_filter,
+                    post_filter,
+                    tag_names=await cls.get_indexed_tags(context),
+                )
+            value_filters = (value_filter,)
         storage: BaseStorage = await context.inject(BaseStorage)
         query = storage.search_records(
             cls.RECORD_TYPE,
-            cls.prefix_tag_filter(tag_filter),
+            cls.prefix_tag_filter(search_filter),
             None,
             {"retrieveTags": False},
         )
         found = None
+        thread_values = []
         async for record in query:
             vals = json.loads(record.value)
-            if match_post_filter(vals, post_filter):
+            if thread_id:
+                thread_values.append((record.id, record.value))
+            if all(match_post_filter(vals, value) for value in value_filters):
                 if found:
                     raise StorageDuplicateError(
                         "Multiple {} records located for {}{}".format(
@@ -249,14 +324,63 @@ class BaseRecord(BaseModel):
                         )
                     )
                 found = cls.from_storage(record.id, vals)
+                found_value = (record.value, vals.get("thread_id"))
+        if thread_id:
+            record_cache.load_thread(cls.RECORD_TYPE, thread_id, thread_values, changes)
         if not found:
             raise StorageNotFoundError(
                 "{} record not found for {}{}".format(
                     cls.__name__, tag_filter, f", {post_filter}" if post_filter else ""
                 )
             )
+        if record_cache:
+            found._version = record_cache.load(
+                cls.RECORD_TYPE, found._id, *found_value, changes
+            )
         return found
 
+    @classmethod
+    def find_cached_thread(
+        cls, record_cache: RecordCache, tag_filter: dict, post_filter: dict = None
+    ) -> "BaseRecord":
+        """Find the one cached record of a thread matching a tag filter, if any.
+
+        Only a tag filter on a thread ID and plain values is matched against
+        cached values, and only once all the records of the thread are cached.
+
+        Args:
+            record_cache: The record cache
+            tag_filter: The filter dictionary to apply
+            post_filter: Additional value filters to apply
+        """
+        thread_id = cls.get_filter_thread_id(tag_filter)
+        if not thread_id or not record_cache.is_thread_complete(
+            cls.RECORD_TYPE, thread_id
+        ):
+            return None
+        matched = []
+        for (record_id, version, value) in record_cache.find_thread(
+            cls.RECORD_TYPE, thread_id
+        ):
+            vals = json.loads(value)
+            if match_post_filter(vals, tag_filter) and match_post_filter(
+                vals, post_filter
+            ):
+                matched.append((record_id, version, vals))
+        if len(matched) != 1:
+            return None  # left to storage to report
+        (record_id, version, vals) = matched[0]
+        record = cls.from_storage(record_id, vals)
+        record._version = version
+        return record
+
+    @classmethod
+    def get_filter_thread_id(cls, tag_filter: dict) -> str:
+        """Get the thread ID of a tag filter on a thread ID and plain values."""
+        thread_id = (tag_filter or {}).get("thread_id")
+        if isinstance(thread_id, str) and not any(k[0] == "$" for k in tag_filter):
+            return thread_id
+
     @classmethod
     async def query(
         cls,
@@ -273,6 +397,14 @@ class BaseRecord(BaseModel):
             post_filter_positive: Additional value filters to apply matching positively
             post_filter_negative: Additional value filters to apply matching negatively
         """
+        if post_filter_positive or post_filter_negative:
+            indexed = await cls.get_indexed_tags(context)
+            (tag_filter, post_filter_positive) = cls.route_post_filter(
+                tag_filter, post_filter_positive, tag_names=indexed
+            )
+            (tag_filter, post_filter_negative) = cls.route_post_filter(
+                tag_filter, post_filter_negative, False, tag_names=indexed
+            )
         storage: BaseStorage = await context.inject(BaseStorage)
         query = storage.search_records(
             cls.RECORD_TYPE,
@@ -289,6 +421,77 @@ class BaseRecord(BaseModel):
                 result.append(cls.from_storage(record.id, vals))
         return result
 
+    @classmethod
+    async def migrate_tags(cls, context: InjectionContext) -> int:
+        """Back-fill the tags of stored records, as for records saved anew.
+
+        Records saved before a value field was declared in `TAG_NAMES` lack
+        its tag, and would not be found by a filter routed to it. Once all are
+        updated, the tag names are stored as indexed for the record type.
+
+        Args:
+            context: The injection context to use
+
+        Returns:
+            The number of records whose tags were updated
+
+        """
+        storage: BaseStorage = await context.inject(BaseStorage)
+        updates = []
+        query = storage.search_records(
+            cls.RECORD_TYPE, None, None, {"retrieveTags": True}
+        )
+        async for record in query:
+            expected = cls.from_storage(record.id, json.loads(record.value)).tags
+            tags = dict(record.tags or {}, **expected)
+            if tags != record.tags:
+                updates.append((record, tags))
+        # update once the search is done, rather than while iterating over it
+        for (record, tags) in updates:
+            await storage.update_record_tags(record, tags)
+
+        tag_names = sorted(cls.get_tag_map())
+        try:
+            schema = await storage.get_record(
+                TAG_SCHEMA_RECORD_TYPE, cls.RECORD_TYPE, {"retrieveTags": False}
+            )
+        except StorageNotFoundError:
+            await storage.add_record(
+                StorageRecord(
+                    TAG_SCHEMA_RECORD_TYPE, json.dumps(tag_names), {}, cls.RECORD_TYPE
+                )
+            )
+        else:
+            await storage.update_record_value(schema, json.dumps(tag_names))
+        await cls.set_cached_key(
+            context, cls.cache_key(cls.RECORD_TYPE, TAG_SCHEMA_RECORD_TYPE), tag_names
+        )
+        return len(updates)
+
+    @classmethod
+    async def get_indexed_tags(cls, context: InjectionContext) -> Set[str]:
+        """Get the names of the tags known to be stored on every record.
+
+        A tag declared in `TAG_NAMES` is only known to be on records saved
+        before it was declared once `migrate_tags` has back-filled it.
+
+        Args:
+            context: The injection context to use
+        """
+        cache_key = cls.cache_key(cls.RECORD_TYPE, TAG_SCHEMA_RECORD_TYPE)
+        tag_names = await cls.get_cached_key(context, cache_key)
+        if tag_names is None:
+            storage: BaseStorage = await context.inject(BaseStorage)
+            try:
+                schema = await storage.get_record(
+                    TAG_SCHEMA_RECORD_TYPE, cls.RECORD_TYPE, {"retrieveTags": False}
+                )
+                tag_names = json.loads(schema.value)
+            except StorageNotFoundError:
+                tag_names = []
+            await cls.set_cached_key(context, cache_key, tag_names)
+        return set(tag_names).intersection(cls.get_tag_map())
+
     async def save(
         self,
         context: InjectionContext,
@@ -308,10 +511,19 @@ class BaseRecord(BaseModel):
         """
         new_record = None
         log_reason = reason or ("Updated record" if self._id else "Created record")
+        record_cache = await self.get_record_cache(context)
         try:
             self.updated_at = time_now()
             storage: BaseStorage = await context.inject(BaseStorage)
             if self._id:
+                if record_cache and record_cache.is_stale(
+                    self.RECORD_TYPE, self._id, self._version
+                ):
+                    LOGGER.warning(
+                        "Saving %s record %s over changes saved since it was read",
+                        self.RECORD_TYPE,
+                        self._id,
+                    )
                 record = self.storage_record
                 await storage.update_record_value(record, record.value)
                 await storage.update_record_tags(record, record.tags)
@@ -319,9 +531,21 @@ class BaseRecord(BaseModel):
             else:
                 self._id = str(uuid.uuid4())
                 self.created_at = self.updated_at
-                await storage.add_record(self.storage_record)
+                record = self.storage_record
+                await storage.add_record(record)
                 new_record = True
+            if record_cache:
+                self._version = record_cache.save(
+                    self.RECORD_TYPE,
+                    self._id,
+                    record.value,
+                    getattr(self, "thread_id", None),
+                    base_version=self._version,
+                )
         finally:
+            if record_cache and new_record is None and self._id:
+                # the stored value is not known
+                record_cache.remove(self.RECORD_TYPE, self._id)
             params = {self.RECORD_TYPE: self.serialize()}
             if log_params:
                 params.update(log_params)
@@ -368,6 +592,9 @@ class BaseRecord(BaseModel):
         if self._id:
             storage: BaseStorage = await context.inject(BaseStorage)
             await storage.delete_record(self.storage_record)
+            record_cache = await self.get_record_cache(context)
+            if record_cache:
+                record_cache.remove(self.RECORD_TYPE, self._id)
         # FIXME - update state and send webhook?
 
     @property
@@ -441,6 +668,56 @@ class BaseRecord(BaseModel):
                     ret[tag_map.get(k, k)] = v
         return ret
 
+    @classmethod
+    def route_post_filter(
+        cls,
+        tag_filter: dict,
+        post_filter: dict,
+        positive: bool = True,
+        *,
+        tag_names: Collection[str] = None,
+    ) -> Tuple[dict, dict]:
+        """Route the clauses of a post-filter on tagged value fields to the tag filter.
+
+        Records are then found by tag rather than by decoding and matching the
+        value of every candidate. Clauses on other fields or on values other
+        than strings are left to match after retrieval, as are all clauses of
+        a negative filter unless each can be routed.
+
+        Args:
+            tag_filter: The tag filter
+            post_filter: The value filter to apply after retrieval
+            positive: Whether the value filter matches positively or negatively
+            tag_names: The names of the tags to route to, defaulting to all
+
+        Returns:
+            The tag filter and the value filter left to apply after retrieval
+
+        """
+        if not post_filter:
+            return (tag_filter, post_filter)
+        if tag_names is None:
+            tag_names = cls.get_tag_map()
+        routed = {
+            k: v
+            for (k, v) in post_filter.items()
+            if k in tag_names and isinstance(v, str) and k not in (tag_filter or {})
+        }
+        if not routed:
+            return (tag_filter, post_filter)
+        if not positive and (
+            len(routed) < len(post_filter) or "$not" in (tag_filter or {})
+        ):
+            # a negative filter excludes the records matching all its clauses
+            return (tag_filter, post_filter)
+        tag_filter = dict(tag_filter or {})
+        if positive:
+            tag_filter.update(routed)
+        else:
+            tag_filter["$not"] = routed
+        remaining = {k: v for (k, v) in post_filter.items() if k not in routed}
+        return (tag_filter, remaining or None)
+
     def __eq__(self, other: Any) -> bool:
         """Comparison between records."""
         if type(other) is type(self):
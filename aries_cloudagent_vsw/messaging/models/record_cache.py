@@ -0,0 +1,243 @@
+"""Write-through cache of stored record values."""
+
+from collections import OrderedDict
+from typing import Optional, Sequence, Tuple
+
+
+class RecordCache:
+    """
+    Cache of the stored values of records, keyed by record type and identifier.
+
+    Records are written through the cache as they are saved, so the cache holds
+    the stored value of each record it knows of for the agent process. Values
+    are held as the JSON stored, so each reader decodes a copy of its own.
+
+    Each record value has a version, counting the saves of the record while it
+    is cached: a record saved from an earlier version than the cached one
+    overwrites changes saved since it was read. Records with a thread ID are
+    also indexed by thread, to find the exchange records of a message: once all
+    the records of a thread are read from storage together, the thread is known
+    to be complete until one of them is evicted.
+
+    The methods do not await, so concurrent handlers of one event loop see the
+    cache change from one consistent state to the next. A value read from
+    storage while a record is saved or deleted may be out of date: readers pass
+    the count of `changes` from before the read, so that such a value is not
+    cached.
+    """
+
+    def __init__(self, max_items: int = 1024):
+        """
+        Initialize a `RecordCache` instance.
+
+        Args:
+            max_items: The maximum number of record values held
+
+        """
+        self.max_items = max_items
+        self.hits = 0
+        self.misses = 0
+        self.stale_writes = 0
+        self.changes = 0
+        # (record type, record ID): (version, value JSON, thread ID)
+        self._entries = OrderedDict()
+        # (record type, thread ID): set of record IDs
+        self._threads = {}
+        # (record type, thread ID) of the threads with all their records cached
+        self._complete_threads = set()
+
+    def get(self, record_type: str, record_id: str) -> Optional[Tuple[int, str]]:
+        """
+        Look up the value of a record.
+
+        Args:
+            record_type: The record type
+            record_id: The record identifier
+
+        Returns:
+            A tuple of the version and the value JSON of the record, or `None`
+
+        """
+        key = (record_type, record_id)
+        entry = self._entries.get(key)
+        if entry:
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return entry[:2]
+        self.misses += 1
+        return None
+
+    def version(self, record_type: str, record_id: str) -> Optional[int]:
+        """Get the version of a cached record value, if any."""
+        entry = self._entries.get((record_type, record_id))
+        return entry[0] if entry else None
+
+    def find_thread(
+        self, record_type: str, thread_id: str
+    ) -> Sequence[Tuple[str, int, str]]:
+        """
+        Look up the cached values of the records of a thread.
+
+        Records of the thread which are not cached are not found.
+
+        Returns:
+            A list of the identifier, version and value JSON of each record
+
+        """
+        found = []
+        for record_id in self._threads.get((record_type, thread_id), ()):
+            key = (record_type, record_id)
+            (version, value, _) = self._entries[key]
+            self._entries.move_to_end(key)
+            found.append((record_id, version, value))
+        return found
+
+    def is_thread_complete(self, record_type: str, thread_id: str) -> bool:
+        """Check whether all the stored records of a thread are cached."""
+        return (record_type, thread_id) in self._complete_threads
+
+    def load_thread(
+        self,
+        record_type: str,
+        thread_id: str,
+        values: Sequence[Tuple[str, str]],
+        changes: int = None,
+    ):
+        """
+        Add the values of all the stored records of a thread, as read from storage.
+
+        Args:
+            record_type: The record type
+            thread_id: The thread ID
+            values: The identifier and value JSON of each record of the thread
+            changes: The count of changes before the values were read
+
+        """
+        for (record_id, value) in values:
+            self.load(record_type, record_id, value, thread_id, changes)
+        key = (record_type, thread_id)
+        if (
+            (changes is None or changes == self.changes)
+            and values
+            and {record_id for (record_id, _) in values} == self._threads.get(key)
+        ):
+            self._complete_threads.add(key)
+
+    def load(
+        self,
+        record_type: str,
+        record_id: str,
+        value: str,
+        thread_id: str = None,
+        changes: int = None,
+    ) -> Optional[int]:
+        """
+        Add the value of a record as read from storage.
+
+        Args:
+            record_type: The record type
+            record_id: The record identifier
+            value: The value JSON of the record
+            thread_id: The thread ID of the record, if any
+            changes: The count of changes before the value was read
+
+        Returns:
+            The version of the record value read, or `None` if not known
+
+        """
+        key = (record_type, record_id)
+        entry = self._entries.get(key)
+        if entry:
+            # the cached value is the one last saved: one read otherwise is earlier
+            self._entries.move_to_end(key)
+            return entry[0] if entry[1] == value else entry[0] - 1
+        if changes is not None and changes != self.changes:
+            # a record was saved or deleted while read: the value may be outdated
+            return None
+        self._set(record_type, record_id, 1, value, thread_id)
+        return 1
+
+    def save(
+        self,
+        record_type: str,
+        record_id: str,
+        value: str,
+        thread_id: str = None,
+        *,
+        base_version: int = None,
+    ) -> int:
+        """
+        Add the value of a record as saved, as a new version.
+
+        Args:
+            record_type: The record type
+            record_id: The record identifier
+            value: The value JSON of the record
+            thread_id: The thread ID of the record, if any
+            base_version: The version of the record value the record was read
+                from, to count the save as stale when a later one is cached
+
+        Returns:
+            The new version of the record value
+
+        """
+        if self.is_stale(record_type, record_id, base_version):
+            self.stale_writes += 1
+        self.changes += 1
+        version = (self.version(record_type, record_id) or 0) + 1
+        self._set(record_type, record_id, version, value, thread_id)
+        return version
+
+    def is_stale(self, record_type: str, record_id: str, base_version: int) -> bool:
+        """Check whether a later version than the one read from is cached."""
+        current = self.version(record_type, record_id)
+        return bool(current and base_version and base_version != current)
+
+    def remove(self, record_type: str, record_id: str):
+        """Discard the value of a record, as deleted or failing to save."""
+        self.changes += 1
+        self._discard(record_type, record_id)
+
+    def clear(self):
+        """Discard all cached record values."""
+        self.changes += 1
+        self._entries.clear()
+        self._threads.clear()
+        self._complete_threads.clear()
+
+    def _set(
+        self,
+        record_type: str,
+        record_id: str,
+        version: int,
+        value: str,
+        thread_id: str,
+    ):
+        """Add a record value, evicting the least recently used when full."""
+        key = (record_type, record_id)
+        entry = self._entries.pop(key, None)
+        if entry and entry[2] != thread_id:
+            self._unindex(record_type, record_id, entry[2])
+        self._entries[key] = (version, value, thread_id)
+        if thread_id:
+            self._threads.setdefault((record_type, thread_id), set()).add(record_id)
+        while len(self._entries) > self.max_items:
+            ((evicted_type, evicted_id), entry) = self._entries.popitem(last=False)
+            self._unindex(evicted_type, evicted_id, entry[2])
+
+    def _discard(self, record_type: str, record_id: str):
+        """Discard the value of a record, if cached."""
+        entry = self._entries.pop((record_type, record_id), None)
+        if entry:
+            self._unindex(record_type, record_id, entry[2])
+
+    def _unindex(self, record_type: str, record_id: str, thread_id: str):
+        """Remove a record from the thread index."""
+        if thread_id:
+            # the record may still be stored, so the thread is no longer complete
+            self._complete_threads.discard((record_type, thread_id))
+            record_ids = self._threads.get((record_type, thread_id))
+            if record_ids:
+                record_ids.discard(record_id)
+                if not record_ids:
+                    del self._threads[(record_type, thread_id)]
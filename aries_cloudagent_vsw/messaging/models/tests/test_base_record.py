@@ -4,6 +4,7 @@ from asynctest import TestCase as AsyncTestCase, mock as async_mock
 from marshmallow import EXCLUDE, fields
 
 from ....cache.base import BaseCache
+from ....cache.basic import BasicCache
 from ....config.injection_context import InjectionContext
 from ....storage.base import BaseStorage, StorageDuplicateError, StorageRecord
 from ....storage.basic import BasicStorage
@@ -11,7 +12,9 @@ from ....storage.basic import BasicStorage
 from ...responder import BaseResponder, MockResponder
 from ...util import time_now
 
+from .. import base_record as test_module
 from ..base_record import BaseRecord, BaseRecordSchema
+from ..record_cache import RecordCache
 
 
 class BaseRecordImpl(BaseRecord):
@@ -59,6 +62,36 @@ class ARecordImplSchema(BaseRecordSchema):
     code = fields.Str()
 
 
+class ThreadRecordImpl(BaseRecord):
+    class Meta:
+        schema_class = "ThreadRecordImplSchema"
+
+    RECORD_TYPE = "thread-record"
+    RECORD_ID_NAME = "ident"
+    RECORD_CACHE_ENABLED = True
+    TAG_NAMES = {"thread_id", "connection_id"}
+
+    def __init__(self, *, ident=None, thread_id, connection_id, content=None, **kwargs):
+        super().__init__(ident, **kwargs)
+        self.thread_id = thread_id
+        self.connection_id = connection_id
+        self.content = content
+
+    @property
+    def record_value(self) -> dict:
+        return {"content": self.content}
+
+
+class ThreadRecordImplSchema(BaseRecordSchema):
+    class Meta:
+        model_class = ThreadRecordImpl
+        unknown = EXCLUDE
+
+    thread_id = fields.Str()
+    connection_id = fields.Str()
+    content = fields.Dict()
+
+
 class UnencTestImpl(BaseRecord):
     TAG_NAMES = {"~a", "~b", "c"}
 
@@ -275,3 +308,245 @@ class TestBaseRecord(AsyncTestCase):
         assert UnencTestImpl.prefix_tag_filter(tags) == {
             "$or": [{"~a": "x"}, {"c": "z"}]
         }
+
+    async def test_route_post_filter(self):
+        assert ARecordImpl.route_post_filter({"code": "one"}, None) == (
+            {"code": "one"},
+            None,
+        )
+        assert ARecordImpl.route_post_filter(None, {"code": "one", "a": "1"}) == (
+            {"code": "one"},
+            {"a": "1"},
+        )
+        assert ARecordImpl.route_post_filter({"b": "0"}, {"code": "one"}) == (
+            {"b": "0", "code": "one"},
+            None,
+        )
+        # not if the tag is filtered already or the value is not a string
+        assert ARecordImpl.route_post_filter({"code": "one"}, {"code": "two"}) == (
+            {"code": "one"},
+            {"code": "two"},
+        )
+        assert ARecordImpl.route_post_filter(None, {"code": []}) == (None, {"code": []})
+
+        # negative filters, only if every clause is routed
+        assert ARecordImpl.route_post_filter(None, {"code": "one"}, False) == (
+            {"$not": {"code": "one"}},
+            None,
+        )
+        assert ARecordImpl.route_post_filter(
+            None, {"code": "one", "a": "1"}, False
+        ) == (None, {"code": "one", "a": "1"})
+        assert ARecordImpl.route_post_filter(
+            {"$not": {"b": "0"}}, {"code": "one"}, False
+        ) == ({"$not": {"b": "0"}}, {"code": "one"})
+
+    async def test_query_routed(self):
+        context = InjectionContext(enforce_typing=False)
+        basic_storage = BasicStorage()
+        context.injector.bind_instance(BaseStorage, basic_storage)
+        for (i, code) in enumerate(("one", "one", "two")):
+            await ARecordImpl(a="1", b=str(i), code=code).save(context)
+
+        with async_mock.patch.object(
+            basic_storage, "search_records", wraps=basic_storage.search_records
+        ) as mock_search:
+            # not routed until the tags are known to be back-filled
+            found = await ARecordImpl.query(context, {}, {"code": "one"})
+            assert len(found) == 2
+            assert not mock_search.call_args[0][1]
+
+            await ARecordImpl.migrate_tags(context)
+            found = await ARecordImpl.query(context, {}, {"code": "one", "a": "1"})
+            assert sorted(record.b for record in found) == ["0", "1"]
+            assert mock_search.call_args[0][1] == {"code": "one"}
+
+            found = await ARecordImpl.query(context, None, None, {"code": "one"})
+            assert [record.b for record in found] == ["2"]
+            assert mock_search.call_args[0][1] == {"$not": {"code": "one"}}
+
+            found = await ARecordImpl.retrieve_by_tag_filter(
+                context, {}, {"code": "two"}
+            )
+            assert found.b == "2"
+
+    async def test_migrate_tags(self):
+        context = InjectionContext(enforce_typing=False)
+        basic_storage = BasicStorage()
+        context.injector.bind_instance(BaseStorage, basic_storage)
+        record = ARecordImpl(a="1", b="0", code="one")
+        await record.save(context)
+        # stored before the code was declared a tag
+        await basic_storage.add_record(
+            StorageRecord(
+                ARecordImpl.RECORD_TYPE,
+                json.dumps({"a": "1", "b": "1", "code": "two"}),
+                {"other": "tag"},
+                "legacy",
+            )
+        )
+
+        # a post-filter is not routed to the tag the legacy record lacks
+        assert await ARecordImpl.get_indexed_tags(context) == set()
+        assert (
+            await ARecordImpl.retrieve_by_tag_filter(context, {}, {"code": "two"})
+        ).b == "1"
+
+        assert await ARecordImpl.migrate_tags(context) == 1
+        stored = await basic_storage.get_record(ARecordImpl.RECORD_TYPE, "legacy")
+        assert stored.tags == {"other": "tag", "code": "two"}
+        assert (
+            await ARecordImpl.retrieve_by_tag_filter(context, {"code": "two"})
+        ).b == "1"
+        assert await ARecordImpl.get_indexed_tags(context) == {"code"}
+
+        assert await ARecordImpl.migrate_tags(context) == 0
+        schema = await basic_storage.get_record(
+            test_module.TAG_SCHEMA_RECORD_TYPE, ARecordImpl.RECORD_TYPE
+        )
+        assert json.loads(schema.value) == ["code"]
+
+    async def test_get_indexed_tags_cached(self):
+        context = InjectionContext(enforce_typing=False)
+        basic_storage = BasicStorage()
+        context.injector.bind_instance(BaseStorage, basic_storage)
+        context.injector.bind_instance(BaseCache, BasicCache())
+        await basic_storage.add_record(
+            StorageRecord(
+                test_module.TAG_SCHEMA_RECORD_TYPE,
+                json.dumps(["code", "retired"]),
+                {},
+                ARecordImpl.RECORD_TYPE,
+            )
+        )
+
+        with async_mock.patch.object(
+            basic_storage, "get_record", wraps=basic_storage.get_record
+        ) as mock_get:
+            assert await ARecordImpl.get_indexed_tags(context) == {"code"}
+            assert await ARecordImpl.get_indexed_tags(context) == {"code"}
+            assert mock_get.call_count == 1
+
+
+class TestRecordCache(AsyncTestCase):
+    async def setUp(self):
+        self.context = InjectionContext(enforce_typing=False)
+        self.storage = BasicStorage()
+        self.record_cache = RecordCache()
+        self.context.injector.bind_instance(BaseStorage, self.storage)
+        self.context.injector.bind_instance(RecordCache, self.record_cache)
+
+    async def test_write_through(self):
+        record = ThreadRecordImpl(thread_id="t1", connection_id="c1", content={"a": 1})
+        record_id = await record.save(self.context)
+        assert record._version == 1
+
+        with async_mock.patch.object(
+            self.storage, "get_record", async_mock.CoroutineMock()
+        ) as mock_get:
+            found = await ThreadRecordImpl.retrieve_by_id(self.context, record_id)
+            mock_get.assert_not_called()
+        assert found == record and found._version == 1
+        # readers decode copies of their own
+        found.content["a"] = 2
+        again = await ThreadRecordImpl.retrieve_by_id(self.context, record_id)
+        assert again.content == {"a": 1}
+
+        # uncached reads still go to storage
+        again = await ThreadRecordImpl.retrieve_by_id(self.context, record_id, False)
+        assert again == record and again._version == 1
+
+        await again.delete_record(self.context)
+        assert self.record_cache.get(ThreadRecordImpl.RECORD_TYPE, record_id) is None
+
+    async def test_retrieve_by_thread(self):
+        for connection_id in ("c1", "c2"):
+            await ThreadRecordImpl(thread_id="t1", connection_id=connection_id).save(
+                self.context
+            )
+        # records saved in this process may not be all those of the thread
+        assert not self.record_cache.is_thread_complete(
+            ThreadRecordImpl.RECORD_TYPE, "t1"
+        )
+        found = await ThreadRecordImpl.retrieve_by_tag_filter(
+            self.context, {"thread_id": "t1"}, {"connection_id": "c1"}
+        )
+        assert found.connection_id == "c1"
+        assert self.record_cache.is_thread_complete(ThreadRecordImpl.RECORD_TYPE, "t1")
+
+        with async_mock.patch.object(
+            self.storage, "search_records", async_mock.MagicMock()
+        ) as mock_search:
+            found = await ThreadRecordImpl.retrieve_by_tag_filter(
+                self.context, {"thread_id": "t1"}, {"connection_id": "c2"}
+            )
+            assert found.connection_id == "c2" and found._version == 1
+            mock_search.assert_not_called()
+
+        # several records of the thread: left to storage to report
+        with self.assertRaises(StorageDuplicateError):
+            await ThreadRecordImpl.retrieve_by_tag_filter(
+                self.context, {"thread_id": "t1"}
+            )
+
+    async def test_retrieve_by_thread_duplicate_uncached(self):
+        await ThreadRecordImpl(thread_id="t1", connection_id="c1").save(self.context)
+        # stored by another agent process
+        await self.storage.add_record(
+            ThreadRecordImpl(
+                ident="other", thread_id="t1", connection_id="c1"
+            ).storage_record
+        )
+
+        with self.assertRaises(StorageDuplicateError):
+            await ThreadRecordImpl.retrieve_by_tag_filter(
+                self.context, {"thread_id": "t1"}, {"connection_id": "c1"}
+            )
+        assert not self.record_cache.is_thread_complete(
+            ThreadRecordImpl.RECORD_TYPE, "t1"
+        )
+
+    async def test_retrieve_by_thread_uncached(self):
+        record = ThreadRecordImpl(thread_id="t1", connection_id="c1")
+        await record.save(self.context)
+        self.record_cache.clear()
+
+        found = await ThreadRecordImpl.retrieve_by_tag_filter(
+            self.context, {"thread_id": "t1"}
+        )
+        assert found == record and found._version == 1
+        assert self.record_cache.find_thread(ThreadRecordImpl.RECORD_TYPE, "t1")
+
+        found = await ThreadRecordImpl.retrieve_by_id(self.context, record._id)
+        assert self.record_cache.hits == 1
+
+    async def test_stale_write(self):
+        record = ThreadRecordImpl(thread_id="t1", connection_id="c1", content={})
+        record_id = await record.save(self.context)
+        first = await ThreadRecordImpl.retrieve_by_id(self.context, record_id)
+        second = await ThreadRecordImpl.retrieve_by_id(self.context, record_id)
+
+        first.content = {"first": True}
+        await first.save(self.context)
+        assert first._version == 2
+
+        second.content = {"second": True}
+        with async_mock.patch.object(
+            test_module.LOGGER, "warning", async_mock.MagicMock()
+        ) as mock_warning:
+            await second.save(self.context)
+            mock_warning.assert_called_once()
+        assert second._version == 3
+        assert self.record_cache.stale_writes == 1
+
+    async def test_save_x(self):
+        record = ThreadRecordImpl(thread_id="t1", connection_id="c1")
+        record_id = await record.save(self.context)
+        with async_mock.patch.object(
+            self.storage,
+            "update_record_value",
+            async_mock.CoroutineMock(side_effect=ZeroDivisionError()),
+        ):
+            with self.assertRaises(ZeroDivisionError):
+                await record.save(self.context)
+        assert self.record_cache.get(ThreadRecordImpl.RECORD_TYPE, record_id) is None
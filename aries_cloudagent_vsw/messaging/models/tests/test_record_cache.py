@@ -0,0 +1,76 @@
+from asynctest import TestCase as AsyncTestCase
+
+from ..record_cache import RecordCache
+
+
+class TestRecordCache(AsyncTestCase):
+    def test_load_get(self):
+        cache = RecordCache()
+        assert cache.get("exchange", "1") is None
+        assert cache.load("exchange", "1", '{"a": 1}', "thread") == 1
+        assert cache.get("exchange", "1") == (1, '{"a": 1}')
+        assert (cache.hits, cache.misses) == (1, 1)
+        assert cache.find_thread("exchange", "thread") == [("1", 1, '{"a": 1}')]
+        assert cache.find_thread("connection", "thread") == []
+
+    def test_save_versions(self):
+        cache = RecordCache()
+        assert cache.save("exchange", "1", '{"a": 1}', "thread") == 1
+        assert cache.save("exchange", "1", '{"a": 2}', "thread", base_version=1) == 2
+        assert not cache.stale_writes
+
+        # a save from a version overtaken by another save
+        assert cache.is_stale("exchange", "1", 1)
+        assert cache.save("exchange", "1", '{"a": 3}', "thread", base_version=1) == 3
+        assert cache.stale_writes == 1
+
+        # a value read from storage before the last save is earlier
+        assert cache.load("exchange", "1", '{"a": 3}') == 3
+        assert cache.load("exchange", "1", '{"a": 2}') == 2
+        assert cache.get("exchange", "1") == (3, '{"a": 3}')
+
+    def test_load_changed(self):
+        cache = RecordCache()
+        changes = cache.changes
+        cache.remove("exchange", "1")  # deleted while read
+        assert cache.load("exchange", "1", "{}", changes=changes) is None
+        assert cache.get("exchange", "1") is None
+        assert cache.load("exchange", "1", "{}", changes=cache.changes) == 1
+
+    def test_remove_evict(self):
+        cache = RecordCache(max_items=2)
+        cache.save("exchange", "1", "{}", "thread")
+        cache.save("exchange", "2", "{}", "thread")
+        cache.get("exchange", "1")
+        cache.save("exchange", "3", "{}", "other")
+        # least recently used evicted, with its thread index entry
+        assert cache.get("exchange", "2") is None
+        assert [found[0] for found in cache.find_thread("exchange", "thread")] == ["1"]
+
+        cache.remove("exchange", "1")
+        assert cache.find_thread("exchange", "thread") == []
+        assert cache._threads == {("exchange", "other"): {"3"}}
+
+        cache.clear()
+        assert cache.get("exchange", "3") is None
+        assert not cache._threads
+
+    def test_load_thread(self):
+        cache = RecordCache(max_items=2)
+        cache.save("exchange", "1", "{}", "thread")
+        assert not cache.is_thread_complete("exchange", "thread")
+
+        changes = cache.changes
+        cache.save("exchange", "2", "{}", "thread")  # saved while read
+        cache.load_thread("exchange", "thread", [("1", "{}")], changes)
+        assert not cache.is_thread_complete("exchange", "thread")
+
+        values = [("1", "{}"), ("2", "{}")]
+        cache.load_thread("exchange", "thread", values, cache.changes)
+        assert cache.is_thread_complete("exchange", "thread")
+        cache.save("exchange", "2", '{"a": 1}', "thread")
+        assert cache.is_thread_complete("exchange", "thread")
+
+        # a record of the thread evicted
+        cache.save("exchange", "3", "{}", "other")
+        assert not cache.is_thread_complete("exchange", "thread")
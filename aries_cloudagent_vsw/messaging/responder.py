@@ -52,9 +52,11 @@ class BaseResponder(ABC):
             enc_payload = None
             if not reply_thread_id:
                 reply_thread_id = message._thread_id
+            trace = bool(message._trace)
         else:
             payload = None
             enc_payload = message
+            trace = False
         return OutboundMessage(
             connection_id=connection_id,
             enc_payload=enc_payload,
@@ -65,6 +67,7 @@ class BaseResponder(ABC):
             target=target,
             target_list=target_list,
             to_session_only=to_session_only,
+            trace=trace,
         )
 
     async def send(self, message: Union[AgentMessage, str, bytes], **kwargs):
@@ -0,0 +1,156 @@
+"""Background warming of connection resolution caches."""
+
+import asyncio
+import json
+import logging
+
+from ....cache.base import BaseCache
+from ....config.injection_context import InjectionContext
+from ....connections.models.connection_record import ConnectionRecord
+from ....storage.base import BaseStorage
+from ....transport.inbound.receipt import MessageReceipt
+from ....wallet.base import BaseWallet
+
+from .manager import ConnectionManager
+
+LOGGER = logging.getLogger(__name__)
+
+
+class ConnectionCacheWarmer:
+    """
+    Populate the caches used to resolve connections ahead of their messages.
+
+    Inbound messages are matched to a connection through the
+    `connection_by_verkey` cache entry, and outbound messages are addressed
+    through the `connection_target` entry. Both are otherwise filled by the
+    first message on each connection, so that after a restart every peer's first
+    message pays for a full resolution. At startup, ready connections are read
+    from storage and warmed at a limited rate; afterwards, each connection is
+    warmed again as it is saved.
+    """
+
+    def __init__(self, context: InjectionContext, rate: float, ttl: int = 3600):
+        """
+        Initialize a `ConnectionCacheWarmer` instance.
+
+        Args:
+            context: The injection context to use
+            rate: The maximum number of connections warmed per second at startup
+            ttl: The time to live of the cache entries, in seconds
+
+        """
+        self.context = context
+        self.rate = rate
+        self.ttl = ttl
+        self.warmed_count = 0
+        self.failed_count = 0
+        self._task: asyncio.Future = None
+        self._pending = {}
+
+    async def start(self):
+        """Begin warming the caches for all ready connections."""
+        self._task = asyncio.ensure_future(self._warm_all())
+
+    async def stop(self):
+        """Stop warming the caches."""
+        tasks = list(self._pending.values())
+        if self._task:
+            tasks.append(self._task)
+            self._task = None
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+
+    async def _warm_all(self):
+        """Warm the caches for stored connections, at a limited rate."""
+        count = 0
+        try:
+            storage: BaseStorage = await self.context.inject(BaseStorage)
+            search = storage.search_records(
+                ConnectionRecord.RECORD_TYPE, {}, page_size=100
+            )
+            async for record in search:
+                connection = ConnectionRecord.from_storage(
+                    record.id, json.loads(record.value)
+                )
+                if not connection.is_ready or connection.connection_id in self._pending:
+                    continue
+                await self.warm(connection)
+                count += 1
+                await asyncio.sleep(1 / self.rate)
+        except asyncio.CancelledError:
+            raise
+        except Exception:
+            LOGGER.exception(
+                "Error warming connection caches after %d connections", count
+            )
+            return
+        LOGGER.info("Warmed connection caches for %d connections", count)
+
+    def notify(self, connection: ConnectionRecord):
+        """
+        Warm the caches for a connection after a change of state.
+
+        Args:
+            connection: The connection record saved
+
+        """
+        if not connection.is_ready or connection.connection_id in self._pending:
+            return
+        task = asyncio.ensure_future(self.warm(connection))
+        self._pending[connection.connection_id] = task
+        task.add_done_callback(
+            lambda _: self._pending.pop(connection.connection_id, None)
+        )
+
+    async def warm(self, connection: ConnectionRecord):
+        """
+        Populate the resolution cache entries for a connection.
+
+        Args:
+            connection: The connection record
+
+        """
+        cache: BaseCache = await self.context.inject(BaseCache, required=False)
+        if not cache or not connection.my_did or not connection.their_did:
+            return
+        try:
+            manager = ConnectionManager(self.context)
+            await manager.get_connection_targets(connection=connection)
+
+            wallet: BaseWallet = await self.context.inject(BaseWallet)
+            my_info = await wallet.get_local_did(connection.my_did)
+            (did_doc, _) = await manager.fetch_did_document(connection.their_did)
+            for key in did_doc.pubkey.values():
+                if key.controller == did_doc.did:
+                    receipt = MessageReceipt(
+                        sender_verkey=key.value,
+                        sender_did=connection.their_did,
+                        recipient_verkey=my_info.verkey,
+                        recipient_did=my_info.did,
+                        recipient_did_public=(
+                            True if my_info.metadata.get("public") is True else None
+                        ),
+                    )
+                    (cache_key, cache_val) = manager.inbound_cache_entry(
+                        receipt, connection.connection_id
+                    )
+                    await cache.set(cache_key, cache_val, self.ttl)
+        except asyncio.CancelledError:
+            raise
+        except Exception:
+            self.failed_count += 1
+            LOGGER.exception(
+                "Error warming caches for connection %s", connection.connection_id
+            )
+        else:
+            self.warmed_count += 1
+
+    def status(self) -> dict:
+        """Get the warming counters."""
+        return {
+            "rate": self.rate,
+            "warming": self._task is not None and not self._task.done(),
+            "warmed_count": self.warmed_count,
+            "failed_count": self.failed_count,
+        }
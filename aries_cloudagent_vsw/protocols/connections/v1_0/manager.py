@@ -5,6 +5,7 @@ import logging
 from typing import Sequence, Tuple
 
 from ....cache.base import BaseCache
+from ....connections.did_doc_cache import DIDDocCache
 from ....connections.models.connection_record import ConnectionRecord
 from ....connections.models.connection_target import ConnectionTarget
 from ....connections.models.diddoc import (
@@ -22,9 +23,10 @@ from ....storage.base import BaseStorage
 from ....storage.error import StorageError, StorageNotFoundError
 from ....storage.record import StorageRecord
 from ....transport.inbound.receipt import MessageReceipt
-from ....wallet.base import BaseWallet, DIDInfo
+from ....wallet.base import BaseWallet, DIDInfo, KeyInfo
 from ....wallet.crypto import create_keypair, seed_to_did
 from ....wallet.error import WalletNotFoundError
+from ....wallet.key_pool import WalletKeyPool
 from ....wallet.util import bytes_to_b58
 from ....protocols.routing.v1_0.manager import RoutingManager
 
@@ -66,6 +68,26 @@ class ConnectionManager:
         """
         return self._context
 
+    async def _create_local_did(self) -> DIDInfo:
+        """Create a local DID for a connection, taken from the key pool if any."""
+        key_pool: WalletKeyPool = await self.context.inject(
+            WalletKeyPool, required=False
+        )
+        if key_pool:
+            return await key_pool.create_local_did()
+        wallet: BaseWallet = await self.context.inject(BaseWallet)
+        return await wallet.create_local_did()
+
+    async def _create_signing_key(self) -> KeyInfo:
+        """Create an invitation key, taken from the key pool if any."""
+        key_pool: WalletKeyPool = await self.context.inject(
+            WalletKeyPool, required=False
+        )
+        if key_pool:
+            return await key_pool.create_signing_key()
+        wallet: BaseWallet = await self.context.inject(BaseWallet)
+        return await wallet.create_signing_key()
+
     async def create_invitation(
         self,
         my_label: str = None,
@@ -167,7 +189,7 @@ class ConnectionManager:
         )
 
         # Create and store new invitation key
-        connection_key = await wallet.create_signing_key()
+        connection_key = await self._create_signing_key()
 
         # Create connection record
         connection = ConnectionRecord(
@@ -289,7 +311,7 @@ class ConnectionManager:
             my_info = await wallet.get_local_did(connection.my_did)
         else:
             # Create new DID for connection
-            my_info = await wallet.create_local_did()
+            my_info = await self._create_local_did()
             connection.my_did = my_info.did
 
         # Create connection request message
@@ -365,8 +387,7 @@ class ConnectionManager:
             )
 
             if connection.is_multiuse_invitation:
-                wallet: BaseWallet = await self.context.inject(BaseWallet)
-                my_info = await wallet.create_local_did()
+                my_info = await self._create_local_did()
                 new_connection = ConnectionRecord(
                     initiator=ConnectionRecord.INITIATOR_MULTIUSE,
                     invitation_key=connection_key,
@@ -404,7 +425,7 @@ class ConnectionManager:
         elif not self.context.settings.get("public_invites"):
             raise ConnectionManagerError("Public invitations are not enabled")
         else:
-            my_info = await wallet.create_local_did()
+            my_info = await self._create_local_did()
             connection = ConnectionRecord(
                 initiator=ConnectionRecord.INITIATOR_EXTERNAL,
                 invitation_key=connection_key,
@@ -474,7 +495,7 @@ class ConnectionManager:
         if connection.my_did:
             my_info = await wallet.get_local_did(connection.my_did)
         else:
-            my_info = await wallet.create_local_did()
+            my_info = await self._create_local_did()
             connection.my_did = my_info.did
 
         # Create connection response message
@@ -721,10 +742,7 @@ class ConnectionManager:
         resolved = False
 
         if receipt.sender_verkey and receipt.recipient_verkey:
-            cache_key = (
-                f"connection_by_verkey::{receipt.sender_verkey}"
-                f"::{receipt.recipient_verkey}"
-            )
+            (cache_key, _) = self.inbound_cache_entry(receipt)
             cache: BaseCache = await self.context.inject(BaseCache, required=False)
             if cache:
                 async with cache.acquire(cache_key) as entry:
@@ -739,12 +757,9 @@ class ConnectionManager:
                     else:
                         connection = await self.resolve_inbound_connection(receipt)
                         if connection:
-                            cache_val = {
-                                "id": connection.connection_id,
-                                "sender_did": receipt.sender_did,
-                                "recipient_did": receipt.recipient_did,
-                                "recipient_did_public": receipt.recipient_did_public,
-                            }
+                            (_, cache_val) = self.inbound_cache_entry(
+                                receipt, connection.connection_id
+                            )
                             await entry.set_result(cache_val, 3600)
                         resolved = True
 
@@ -752,6 +767,34 @@ class ConnectionManager:
             connection = await self.resolve_inbound_connection(receipt)
         return connection
 
+    @staticmethod
+    def inbound_cache_entry(
+        receipt: MessageReceipt, connection_id: str = None
+    ) -> Tuple[str, dict]:
+        """
+        Build the cache entry matching inbound messages to their connection.
+
+        Args:
+            receipt: The message receipt, with the sender and recipient verkeys
+                and, to build the cached value, the resolved DIDs
+            connection_id: The identifier of the connection of the message
+
+        Returns:
+            The cache key, and the cached value if a connection is given
+
+        """
+        cache_key = (
+            f"connection_by_verkey::{receipt.sender_verkey}"
+            f"::{receipt.recipient_verkey}"
+        )
+        cache_val = connection_id and {
+            "id": connection_id,
+            "sender_did": receipt.sender_did,
+            "recipient_did": receipt.recipient_did,
+            "recipient_did_public": receipt.recipient_did_public,
+        }
+        return (cache_key, cache_val)
+
     async def resolve_inbound_connection(
         self, receipt: MessageReceipt
     ) -> ConnectionRecord:
@@ -885,14 +928,25 @@ class ConnectionManager:
     async def fetch_did_document(self, did: str) -> Tuple[DIDDoc, StorageRecord]:
         """Retrieve a DID Document for a given DID.
 
+        A cached DID Document is shared with other callers and must not be modified.
+
         Args:
             did: The DID to search for
         """
+        doc_cache: DIDDocCache = await self.context.inject(DIDDocCache, required=False)
+        if doc_cache:
+            cached = doc_cache.get(did)
+            if cached:
+                return cached
+            changes = doc_cache.changes
         storage: BaseStorage = await self.context.inject(BaseStorage)
         record = await storage.search_records(
             self.RECORD_TYPE_DID_DOC, {"did": did}
         ).fetch_single()
-        return DIDDoc.from_json(record.value), record
+        did_doc = DIDDoc.from_json(record.value)
+        if doc_cache:
+            doc_cache.set(did, did_doc, record, changes)
+        return did_doc, record
 
     async def store_did_document(self, did_doc: DIDDoc):
         """Store a DID document.
@@ -911,6 +965,9 @@ class ConnectionManager:
             await storage.add_record(record)
         else:
             await storage.update_record_value(record, did_doc.to_json())
+        doc_cache: DIDDocCache = await self.context.inject(DIDDocCache, required=False)
+        if doc_cache:
+            doc_cache.invalidate(did_doc.did)
         await self.remove_keys_for_did(did_doc.did)
         for key in did_doc.pubkey.values():
             if key.controller == did_doc.did:
@@ -1099,7 +1156,7 @@ class ConnectionManager:
             my_info = await wallet.get_local_did(connection.my_did)
         else:
             # Create new DID for connection
-            my_info = await wallet.create_local_did()
+            my_info = await self._create_local_did()
             connection.my_did = my_info.did
 
         try:
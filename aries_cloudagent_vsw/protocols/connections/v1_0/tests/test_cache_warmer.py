@@ -0,0 +1,117 @@
+from asynctest import TestCase as AsyncTestCase
+from asynctest import mock as async_mock
+
+from .....cache.base import BaseCache
+from .....cache.basic import BasicCache
+from .....config.injection_context import InjectionContext
+from .....connections.models.connection_record import ConnectionRecord
+from .....connections.models.diddoc import DIDDoc, PublicKey, PublicKeyType, Service
+from .....storage.base import BaseStorage
+from .....storage.basic import BasicStorage
+from .....transport.inbound.receipt import MessageReceipt
+from .....wallet.base import BaseWallet
+from .....wallet.basic import BasicWallet
+
+from .. import cache_warmer as test_module
+from ..cache_warmer import ConnectionCacheWarmer
+from ..manager import ConnectionManager
+
+
+class TestConnectionCacheWarmer(AsyncTestCase):
+    async def setUp(self):
+        self.context = InjectionContext(enforce_typing=False)
+        self.cache = BasicCache()
+        self.wallet = BasicWallet()
+        self.context.injector.bind_instance(BaseCache, self.cache)
+        self.context.injector.bind_instance(BaseStorage, BasicStorage())
+        self.context.injector.bind_instance(BaseWallet, self.wallet)
+        self.manager = ConnectionManager(self.context)
+
+        self.my_info = await self.wallet.create_local_did()
+        self.their_info = await self.wallet.create_local_did()
+        their_did = self.their_info.did
+        doc = DIDDoc(their_did)
+        pk = PublicKey(
+            their_did,
+            "1",
+            self.their_info.verkey,
+            PublicKeyType.ED25519_SIG_2018,
+            their_did,
+            True,
+        )
+        doc.set(pk)
+        doc.set(
+            Service(their_did, "indy", "IndyAgent", [pk], [], "http://localhost", 0)
+        )
+        await self.manager.store_did_document(doc)
+
+        self.warmer = ConnectionCacheWarmer(self.context, 1000)
+
+    async def make_connection(self, state=ConnectionRecord.STATE_ACTIVE):
+        connection = ConnectionRecord(
+            my_did=self.my_info.did, their_did=self.their_info.did, state=state
+        )
+        await connection.save(self.context)
+        return connection
+
+    def receipt(self):
+        return MessageReceipt(
+            sender_verkey=self.their_info.verkey, recipient_verkey=self.my_info.verkey,
+        )
+
+    async def test_warm_all(self):
+        connection = await self.make_connection()
+        await self.make_connection(ConnectionRecord.STATE_INVITATION)
+
+        await self.warmer.start()
+        await self.warmer._task
+        assert self.warmer.status()["warmed_count"] == 1
+
+        assert await self.cache.get(f"connection_target::{connection.connection_id}")
+        with async_mock.patch.object(
+            ConnectionManager, "resolve_inbound_connection", autospec=True
+        ) as mock_resolve:
+            receipt = self.receipt()
+            found = await self.manager.find_inbound_connection(receipt)
+            mock_resolve.assert_not_called()
+        assert found.connection_id == connection.connection_id
+        assert receipt.sender_did == self.their_info.did
+        assert receipt.recipient_did == self.my_info.did
+        await self.warmer.stop()
+
+    async def test_notify_on_save(self):
+        self.context.injector.bind_instance(ConnectionCacheWarmer, self.warmer)
+        connection = await self.make_connection(ConnectionRecord.STATE_REQUEST)
+        assert not self.warmer._pending
+
+        connection.state = ConnectionRecord.STATE_RESPONSE
+        await connection.save(self.context)
+        task = self.warmer._pending[connection.connection_id]
+        await task
+        assert self.warmer.warmed_count == 1
+
+        receipt = self.receipt()
+        cached = await self.cache.get(
+            f"connection_by_verkey::{receipt.sender_verkey}"
+            f"::{receipt.recipient_verkey}"
+        )
+        assert cached["id"] == connection.connection_id
+        await self.warmer.stop()
+
+    async def test_warm_error(self):
+        connection = await self.make_connection()
+        connection.their_did = "no-such-did"
+        await self.warmer.warm(connection)
+        assert self.warmer.failed_count == 1
+
+    async def test_warm_all_error(self):
+        storage = async_mock.MagicMock(search_records=async_mock.MagicMock())
+        storage.search_records.side_effect = ValueError("storage")
+        self.context.injector.bind_instance(BaseStorage, storage)
+        with async_mock.patch.object(
+            test_module.LOGGER, "exception", async_mock.MagicMock()
+        ) as mock_log:
+            await self.warmer.start()
+            await self.warmer._task
+            mock_log.assert_called_once()
+        assert not self.warmer.status()["warming"]
@@ -5,6 +5,7 @@ from aries_cloudagent_vsw.cache.base import BaseCache
 from aries_cloudagent_vsw.cache.basic import BasicCache
 from aries_cloudagent_vsw.config.base import InjectorError
 from aries_cloudagent_vsw.config.injection_context import InjectionContext
+from aries_cloudagent_vsw.connections.did_doc_cache import DIDDocCache
 from aries_cloudagent_vsw.connections.models.connection_record import ConnectionRecord
 from aries_cloudagent_vsw.connections.models.connection_target import ConnectionTarget
 from aries_cloudagent_vsw.connections.models.diddoc import (
@@ -21,6 +22,7 @@ from aries_cloudagent_vsw.storage.error import StorageNotFoundError
 from aries_cloudagent_vsw.transport.inbound.receipt import MessageReceipt
 from aries_cloudagent_vsw.wallet.base import BaseWallet, DIDInfo
 from aries_cloudagent_vsw.wallet.basic import BasicWallet
+from aries_cloudagent_vsw.wallet.key_pool import WalletKeyPool
 from aries_cloudagent_vsw.wallet.error import WalletNotFoundError
 
 from aries_cloudagent_vsw.protocols.routing.v1_0.manager import RoutingManager
@@ -238,6 +240,83 @@ class TestConnectionManager(AsyncTestCase, TestConfig):
         )
         assert conn_req
 
+    async def test_create_request_key_pool(self):
+        key_pool = WalletKeyPool(self.context, 2)
+        self.context.injector.bind_instance(WalletKeyPool, key_pool)
+        await key_pool.start()
+        await key_pool._refill_task
+        (pooled, _) = key_pool._dids
+
+        connection = ConnectionRecord(
+            initiator=ConnectionRecord.INITIATOR_EXTERNAL,
+            invitation_key=self.test_verkey,
+            their_label="Hello",
+        )
+        conn_req = await self.manager.create_request(connection)
+        assert connection.my_did == pooled.did
+        assert conn_req.connection.did == pooled.did
+        assert key_pool.hit_count == 1
+        await key_pool.stop()
+
+    async def test_fetch_did_document_cached(self):
+        doc_cache = DIDDocCache()
+        self.context.injector.bind_instance(DIDDocCache, doc_cache)
+        did_doc = self.make_did_doc(
+            did=self.test_target_did, verkey=self.test_target_verkey
+        )
+        await self.manager.store_did_document(did_doc)
+
+        with async_mock.patch.object(
+            self.storage, "search_records", wraps=self.storage.search_records
+        ) as mock_search:
+            (fetched, record) = await self.manager.fetch_did_document(
+                self.test_target_did
+            )
+            (cached, _) = await self.manager.fetch_did_document(self.test_target_did)
+            assert cached is fetched
+            assert mock_search.call_count == 1
+
+        await self.manager.store_did_document(
+            self.make_did_doc(did=self.test_target_did, verkey=self.test_verkey)
+        )
+        assert doc_cache.get(self.test_target_did) is None
+        (fetched, _) = await self.manager.fetch_did_document(self.test_target_did)
+        assert [pk.value for pk in fetched.pubkey.values()] == [self.test_verkey]
+
+    async def test_fetch_did_document_stored_while_read(self):
+        doc_cache = DIDDocCache()
+        self.context.injector.bind_instance(DIDDocCache, doc_cache)
+        await self.manager.store_did_document(
+            self.make_did_doc(did=self.test_target_did, verkey=self.test_target_verkey)
+        )
+        search_records = self.storage.search_records
+        searches = []
+
+        def search_and_store(*args, **kwargs):
+            search = search_records(*args, **kwargs)
+            if searches:
+                return search
+            searches.append(search)
+            fetch_single = search.fetch_single
+
+            async def fetch_then_store():
+                found = await fetch_single()
+                await self.manager.store_did_document(
+                    self.make_did_doc(did=self.test_target_did, verkey=self.test_verkey)
+                )
+                return found
+
+            search.fetch_single = fetch_then_store
+            return search
+
+        with async_mock.patch.object(
+            self.storage, "search_records", side_effect=search_and_store
+        ):
+            (fetched, _) = await self.manager.fetch_did_document(self.test_target_did)
+        assert [pk.value for pk in fetched.pubkey.values()] == [self.test_target_verkey]
+        # the document read before the store is not cached
+        assert doc_cache.get(self.test_target_did) is None
+
     async def test_create_request_my_endpoint(self):
         conn_req = await self.manager.create_request(
             ConnectionRecord(
@@ -704,6 +783,27 @@ class TestConnectionManager(AsyncTestCase, TestConfig):
             conn_rec = await self.manager.find_inbound_connection(receipt)
             assert conn_rec.id == mock_conn.id
 
+    def test_inbound_cache_entry(self):
+        receipt = MessageReceipt(
+            sender_verkey=self.test_verkey,
+            sender_did=self.test_did,
+            recipient_verkey=self.test_target_verkey,
+            recipient_did=self.test_target_did,
+        )
+        (key, value) = ConnectionManager.inbound_cache_entry(receipt)
+        assert key == (
+            f"connection_by_verkey::{self.test_verkey}::{self.test_target_verkey}"
+        )
+        assert value is None
+
+        (_, value) = ConnectionManager.inbound_cache_entry(receipt, "dummy")
+        assert value == {
+            "id": "dummy",
+            "sender_did": self.test_did,
+            "recipient_did": self.test_target_did,
+            "recipient_did_public": None,
+        }
+
     async def test_find_inbound_connection_no_cache(self):
         receipt = MessageReceipt(
             sender_verkey=self.test_verkey,
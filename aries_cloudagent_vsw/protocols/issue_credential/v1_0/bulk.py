@@ -0,0 +1,171 @@
+"""Pipelined issuance of credentials to many connections."""
+
+import asyncio
+import logging
+
+from typing import AsyncIterator, Callable, Mapping, Sequence
+
+from ....config.injection_context import InjectionContext
+from ....connections.models.connection_record import ConnectionRecord
+from ....messaging.models.base import BaseModelError
+from ....storage.error import StorageError
+from ....utils.tracing import trace_event
+
+from .manager import CredentialManager, CredentialManagerError
+from .messages.credential_proposal import CredentialProposal
+from .messages.inner.credential_preview import CredentialPreview
+from .models.credential_exchange import V10CredentialExchange
+
+LOGGER = logging.getLogger(__name__)
+
+
+class BulkCredentialIssuer:
+    """
+    Offer credentials on one credential definition to many connections.
+
+    The credential definition, its schema and the indy credential offer are
+    resolved once for the whole batch. Items are then offered by a bounded
+    number of workers, each exchange continuing to issue automatically on the
+    holder's request, and the outcome of each item is reported as it completes.
+    """
+
+    DEFAULT_CONCURRENCY = 16
+
+    def __init__(
+        self,
+        context: InjectionContext,
+        outbound_handler: Callable,
+        max_concurrency: int = None,
+    ):
+        """
+        Initialize a `BulkCredentialIssuer` instance.
+
+        Args:
+            context: The injection context to use
+            outbound_handler: The handler for sending outbound messages
+            max_concurrency: The maximum number of items in flight
+
+        """
+        self.context = context
+        self.outbound_handler = outbound_handler
+        self.max_concurrency = max_concurrency or self.DEFAULT_CONCURRENCY
+        self.manager = CredentialManager(context)
+        self.cred_def_id: str = None
+        self.schema: dict = None
+        self.credential_offer: dict = None
+
+    async def prepare(self, cred_def_tags: Mapping[str, str]):
+        """
+        Resolve the credential definition, schema and offer for the batch.
+
+        Args:
+            cred_def_tags: Tags identifying a credential definition sent to ledger
+
+        """
+        self.cred_def_id = await self.manager.match_sent_cred_def_id(cred_def_tags)
+        self.schema = await self.manager.get_offer_schema(self.cred_def_id)
+        self.credential_offer = await self.manager.get_credential_offer(
+            self.cred_def_id
+        )
+
+    async def run(
+        self,
+        items: Sequence[Mapping],
+        comment: str = None,
+        auto_remove: bool = None,
+        trace: bool = False,
+    ) -> AsyncIterator[dict]:
+        """
+        Offer a credential for each item, yielding the outcome of each.
+
+        Args:
+            items: Mappings of connection_id and credential_proposal (preview)
+            comment: optional human-readable comment to set in offer messages
+            auto_remove: Flag to automatically remove records on completion
+            trace: Flag to trace the credential exchanges
+
+        Returns:
+            Per-item results, in order of completion
+
+        """
+        if not self.credential_offer:
+            raise CredentialManagerError("Bulk issuance is not prepared")
+        if auto_remove is None:
+            auto_remove = not self.context.settings.get("preserve_exchange_records")
+
+        pending = iter(enumerate(items))
+        results = asyncio.Queue(maxsize=self.max_concurrency)
+
+        async def _work():
+            for (index, item) in pending:
+                await results.put(
+                    await self._issue(index, item, comment, auto_remove, trace)
+                )
+
+        workers = [
+            asyncio.ensure_future(_work())
+            for _ in range(min(self.max_concurrency, len(items)))
+        ]
+        try:
+            for _ in range(len(items)):
+                yield await results.get()
+        finally:
+            for worker in workers:
+                worker.cancel()
+            await asyncio.gather(*workers, return_exceptions=True)
+
+    async def _issue(
+        self, index: int, item: Mapping, comment: str, auto_remove: bool, trace: bool,
+    ) -> dict:
+        """Create, save and send the credential offer for one item."""
+        connection_id = item.get("connection_id")
+        result = {"index": index, "connection_id": connection_id}
+        try:
+            preview = CredentialPreview.deserialize(item.get("credential_proposal"))
+            connection_record = await ConnectionRecord.retrieve_by_id(
+                self.context, connection_id
+            )
+            if not connection_record.is_ready:
+                raise CredentialManagerError(f"Connection {connection_id} not ready")
+            self.manager.check_preview_attrs(self.schema, preview)
+
+            credential_proposal = CredentialProposal(
+                comment=comment,
+                credential_proposal=preview,
+                cred_def_id=self.cred_def_id,
+            )
+            credential_proposal.assign_trace_decorator(self.context.settings, trace)
+            cred_ex_record = V10CredentialExchange(
+                auto_issue=True,
+                auto_remove=auto_remove,
+                connection_id=connection_id,
+                initiator=V10CredentialExchange.INITIATOR_SELF,
+                role=V10CredentialExchange.ROLE_ISSUER,
+                credential_proposal_dict=credential_proposal.serialize(),
+                trace=trace,
+            )
+            credential_offer_message = await self.manager.offer_exchange(
+                cred_ex_record, preview, self.credential_offer, comment
+            )
+            await self.outbound_handler(
+                credential_offer_message, connection_id=connection_id
+            )
+            trace_event(
+                self.context.settings,
+                credential_offer_message,
+                outcome="BulkCredentialIssuer.issue.END",
+            )
+        except (StorageError, BaseModelError, CredentialManagerError) as err:
+            LOGGER.warning("Bulk credential offer %d failed: %s", index, err.roll_up)
+            result["error"] = err.roll_up
+            return result
+        except asyncio.CancelledError:
+            raise
+        except Exception as err:  # a failed item must not stall the batch
+            LOGGER.exception("Bulk credential offer %d failed", index)
+            result["error"] = str(err) or err.__class__.__name__
+            return result
+
+        result["credential_exchange_id"] = cred_ex_record.credential_exchange_id
+        result["state"] = cred_ex_record.state
+        return result
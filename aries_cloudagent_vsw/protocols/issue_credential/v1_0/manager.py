@@ -3,7 +3,7 @@
 import asyncio
 import json
 import logging
-from typing import Mapping, Sequence, Text, Tuple
+from typing import Awaitable, Callable, Mapping, Sequence, Text, Tuple
 
 from .messages.credential_ack import CredentialAck
 from .messages.credential_issue import CredentialIssue
@@ -26,6 +26,8 @@ from ....messaging.credential_definitions.util import (
 from ....revocation.indy import IndyRevocation
 from ....revocation.models.revocation_registry import RevocationRegistry
 from ....revocation.models.issuer_rev_reg_record import IssuerRevRegRecord
+from ....revocation.pool import RevocationRegistryPool
+from ....revocation.publisher import RevocationPublisher
 from ....storage.base import BaseStorage
 from ....storage.error import StorageNotFoundError
 
@@ -58,7 +60,7 @@ class CredentialManager:
         """
         return self._context
 
-    async def _match_sent_cred_def_id(self, tag_query: Mapping[str, str]) -> str:
+    async def match_sent_cred_def_id(self, tag_query: Mapping[str, str]) -> str:
         """Return most recent matching id of cred def that agent sent to ledger."""
 
         storage: BaseStorage = await self.context.inject(BaseStorage)
@@ -218,18 +220,13 @@ class CredentialManager:
 
         """
 
-        async def _create(cred_def_id):
-            issuer: BaseIssuer = await self.context.inject(BaseIssuer)
-            offer_json = await issuer.create_credential_offer(cred_def_id)
-            return json.loads(offer_json)
-
         credential_proposal_message = CredentialProposal.deserialize(
             cred_ex_record.credential_proposal_dict
         )
         credential_proposal_message.assign_trace_decorator(
             self.context.settings, cred_ex_record.trace
         )
-        cred_def_id = await self._match_sent_cred_def_id(
+        cred_def_id = await self.match_sent_cred_def_id(
             {
                 t: getattr(credential_proposal_message, t)
                 for t in CRED_DEF_TAGS
@@ -239,10 +236,42 @@ class CredentialManager:
         cred_preview = credential_proposal_message.credential_proposal
 
         # vet attributes
+        schema = await self.get_offer_schema(cred_def_id)
+        self.check_preview_attrs(schema, cred_preview)
+
+        credential_offer = await self.get_credential_offer(cred_def_id)
+
+        credential_offer_message = await self.offer_exchange(
+            cred_ex_record, cred_preview, credential_offer, comment
+        )
+        return (cred_ex_record, credential_offer_message)
+
+    async def get_offer_schema(self, cred_def_id: str) -> dict:
+        """
+        Fetch the schema of a credential definition from the ledger.
+
+        Args:
+            cred_def_id: The credential definition identifier
+
+        Returns:
+            The schema
+
+        """
         ledger: BaseLedger = await self.context.inject(BaseLedger)
         async with ledger:
             schema_id = await ledger.credential_definition_id2schema_id(cred_def_id)
-            schema = await ledger.get_schema(schema_id)
+            return await ledger.get_schema(schema_id)
+
+    @staticmethod
+    def check_preview_attrs(schema: dict, cred_preview: CredentialPreview):
+        """
+        Check that a credential preview has exactly the attributes of a schema.
+
+        Args:
+            schema: The schema
+            cred_preview: The credential preview
+
+        """
         schema_attrs = {attr for attr in schema["attrNames"]}
         preview_attrs = {attr for attr in cred_preview.attr_dict()}
         if preview_attrs != schema_attrs:
@@ -251,6 +280,25 @@ class CredentialManager:
                 f"mismatch corresponding schema attributes {schema_attrs}"
             )
 
+    async def get_credential_offer(self, cred_def_id: str) -> dict:
+        """
+        Get an indy credential offer for a credential definition.
+
+        Offers are cached for reuse across credential exchanges.
+
+        Args:
+            cred_def_id: The credential definition identifier
+
+        Returns:
+            The indy credential offer
+
+        """
+
+        async def _create(cred_def_id):
+            issuer: BaseIssuer = await self.context.inject(BaseIssuer)
+            offer_json = await issuer.create_credential_offer(cred_def_id)
+            return json.loads(offer_json)
+
         credential_offer = None
         cache_key = f"credential_offer::{cred_def_id}"
         cache: BaseCache = await self.context.inject(BaseCache, required=False)
@@ -263,7 +311,28 @@ class CredentialManager:
                     await entry.set_result(credential_offer, 3600)
         if not credential_offer:
             credential_offer = await _create(cred_def_id)
+        return credential_offer
+
+    async def offer_exchange(
+        self,
+        cred_ex_record: V10CredentialExchange,
+        cred_preview: CredentialPreview,
+        credential_offer: dict,
+        comment: str = None,
+    ) -> CredentialOffer:
+        """
+        Create the offer message for a credential exchange and save the record.
 
+        Args:
+            cred_ex_record: Credential exchange to create offer for
+            cred_preview: The credential preview
+            credential_offer: The indy credential offer
+            comment: optional human-readable comment to set in offer message
+
+        Returns:
+            The credential offer message
+
+        """
         credential_offer_message = CredentialOffer(
             comment=comment,
             credential_preview=cred_preview,
@@ -285,7 +354,7 @@ class CredentialManager:
 
         await cred_ex_record.save(self.context, reason="create credential offer")
 
-        return (cred_ex_record, credential_offer_message)
+        return credential_offer_message
 
     async def receive_offer(self) -> V10CredentialExchange:
         """
@@ -555,39 +624,46 @@ class CredentialManager:
                 if registry and registry.max_creds == int(
                     cred_ex_record.revocation_id  # monotonic "1"-based
                 ):
-                    # Check to see if we have a registry record staged and waiting
-                    pending_rev_regs = await IssuerRevRegRecord.query_by_cred_def_id(
-                        self.context,
-                        cred_ex_record.credential_definition_id,
-                        state=IssuerRevRegRecord.STATE_PUBLISHED,
+                    registry_pool: RevocationRegistryPool = await self.context.inject(
+                        RevocationRegistryPool, required=False
                     )
-                    if pending_rev_regs:
-                        pending_rev_reg = pending_rev_regs[0]
-                        pending_rev_reg.state = IssuerRevRegRecord.STATE_STAGED
-                        await pending_rev_reg.save(
-                            self.context, reason="revocation registry staged"
+                    if registry_pool:
+                        # Switch to a ready registry and generate its replacement
+                        await registry_pool.activate_next(active_reg)
+                    else:
+                        # Check to see if we have a registry record staged and waiting
+                        pending_rev_regs = await IssuerRevRegRecord.query_by_cred_def_id(
+                            self.context,
+                            cred_ex_record.credential_definition_id,
+                            state=IssuerRevRegRecord.STATE_PUBLISHED,
                         )
+                        if pending_rev_regs:
+                            pending_rev_reg = pending_rev_regs[0]
+                            pending_rev_reg.state = IssuerRevRegRecord.STATE_STAGED
+                            await pending_rev_reg.save(
+                                self.context, reason="revocation registry staged"
+                            )
 
-                        # Make it active
-                        await pending_rev_reg.publish_registry_entry(self.context)
-                        # Kick off a task to create and publish the next revocation
-                        # registry in the background. It is assumed that the size of
-                        # the registry is large enough so that this completes before
-                        # the current registry is full
-                        revoc = IndyRevocation(self.context)
-                        pending_registry_record = await revoc.init_issuer_registry(
-                            active_reg.cred_def_id,
-                            active_reg.issuer_did,
-                            max_cred_num=active_reg.max_cred_num,
-                        )
-                        asyncio.ensure_future(
-                            pending_registry_record.stage_pending_registry_definition(
-                                self.context
+                            # Make it active
+                            await pending_rev_reg.publish_registry_entry(self.context)
+                            # Kick off a task to create and publish the next revocation
+                            # registry in the background. It is assumed that the size of
+                            # the registry is large enough so that this completes before
+                            # the current registry is full
+                            revoc = IndyRevocation(self.context)
+                            pending_registry_record = await revoc.init_issuer_registry(
+                                active_reg.cred_def_id,
+                                active_reg.issuer_did,
+                                max_cred_num=active_reg.max_cred_num,
+                            )
+                            asyncio.ensure_future(
+                                pending_registry_record.stage_pending_registry_definition(
+                                    self.context
+                                )
                             )
-                        )
 
-                    # Make the current registry full
-                    await active_reg.mark_full(self.context)
+                        # Make the current registry full
+                        await active_reg.mark_full(self.context)
 
             except IssuerRevocationRegistryFullError:
                 active_rev_regs = await IssuerRevRegRecord.query_by_cred_def_id(
@@ -795,7 +871,8 @@ class CredentialManager:
             rev_reg_id: revocation registry id
             cred_rev_id: credential revocation id
             publish: whether to publish the resulting revocation registry delta,
-                along with any revocations pending against it
+                along with any revocations pending against it; deferred to the
+                next batch when a revocation publisher is configured
 
         """
         issuer: BaseIssuer = await self.context.inject(BaseIssuer)
@@ -807,7 +884,14 @@ class CredentialManager:
                 f"No revocation registry record found for id {rev_reg_id}"
             )
 
-        if publish:
+        publisher: RevocationPublisher = await self.context.inject(
+            RevocationPublisher, required=False
+        )
+        if publish and publisher:
+            # published with the next batch
+            await publisher.enqueue(rev_reg_id, cred_rev_id)
+
+        elif publish:
             rev_reg = await revoc.get_ledger_registry(rev_reg_id)
             await rev_reg.get_or_fetch_local_tails_path()
 
@@ -822,7 +906,37 @@ class CredentialManager:
                 await registry_record.clear_pending(self.context)
 
         else:
-            await registry_record.mark_pending(self.context, cred_rev_id)
+            await self._update_registry_record(
+                publisher,
+                registry_record,
+                lambda record: record.mark_pending(self.context, cred_rev_id),
+            )
+
+    async def _update_registry_record(
+        self,
+        publisher: RevocationPublisher,
+        registry_record: IssuerRevRegRecord,
+        update: Callable[[IssuerRevRegRecord], Awaitable],
+    ):
+        """
+        Update the revocations pending on a registry record.
+
+        When a revocation publisher is configured, the record is read anew and
+        updated under its lock for the registry, as the publisher may save it.
+
+        Returns:
+            The result of the update
+
+        """
+        if not publisher:
+            return await update(registry_record)
+        async with publisher.registry_lock(registry_record.revoc_reg_id):
+            registry_record = await IssuerRevRegRecord.retrieve_by_revoc_reg_id(
+                self.context, registry_record.revoc_reg_id
+            )
+            result = await update(registry_record)
+            publisher.track_pending(registry_record)
+        return result
 
     async def publish_pending_revocations(
         self, rrid2crid: Mapping[Text, Sequence[Text]] = None
@@ -852,9 +966,11 @@ class CredentialManager:
         """
         result = {}
         issuer: BaseIssuer = await self.context.inject(BaseIssuer)
+        publisher: RevocationPublisher = await self.context.inject(
+            RevocationPublisher, required=False
+        )
 
-        registry_records = await IssuerRevRegRecord.query_by_pending(self.context)
-        for registry_record in registry_records:
+        async def publish(registry_record: IssuerRevRegRecord):
             rrid = registry_record.revoc_reg_id
             crids = []
             if not rrid2crid:
@@ -877,6 +993,10 @@ class CredentialManager:
                 result[registry_record.revoc_reg_id] = published
                 await registry_record.clear_pending(self.context, published)
 
+        registry_records = await IssuerRevRegRecord.query_by_pending(self.context)
+        for registry_record in registry_records:
+            await self._update_registry_record(publisher, registry_record, publish)
+
         return result
 
     async def clear_pending_revocations(
@@ -910,11 +1030,18 @@ class CredentialManager:
 
         """
         result = {}
-        registry_records = await IssuerRevRegRecord.query_by_pending(self.context)
-        for registry_record in registry_records:
+        publisher: RevocationPublisher = await self.context.inject(
+            RevocationPublisher, required=False
+        )
+
+        async def clear(registry_record: IssuerRevRegRecord):
             rrid = registry_record.revoc_reg_id
             await registry_record.clear_pending(self.context, (purge or {}).get(rrid))
             if registry_record.pending_pub:
                 result[rrid] = registry_record.pending_pub
 
+        registry_records = await IssuerRevRegRecord.query_by_pending(self.context)
+        for registry_record in registry_records:
+            await self._update_registry_record(publisher, registry_record, clear)
+
         return result
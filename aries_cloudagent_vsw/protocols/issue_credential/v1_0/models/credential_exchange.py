@@ -20,7 +20,8 @@ class V10CredentialExchange(BaseExchangeRecord):
     RECORD_TYPE = "credential_exchange_v10"
     RECORD_ID_NAME = "credential_exchange_id"
     WEBHOOK_TOPIC = "issue_credential"
-    TAG_NAMES = {"thread_id"}
+    TAG_NAMES = {"thread_id", "connection_id", "role", "state"}
+    RECORD_CACHE_ENABLED = True
 
     INITIATOR_SELF = "self"
     INITIATOR_EXTERNAL = "external"
@@ -39,6 +39,7 @@ from ....utils.tracing import trace_event, get_timer, AdminAPIMessageTracingSche
 from ...problem_report.v1_0 import internal_error
 from ...problem_report.v1_0.message import ProblemReport
 
+from .bulk import BulkCredentialIssuer
 from .manager import CredentialManager, CredentialManagerError
 from .message_types import SPEC_URI
 from .messages.credential_proposal import CredentialProposal
@@ -99,6 +100,77 @@ class V10CredentialExchangeListResultSchema(OpenAPISchema):
     )
 
 
+class V10CredentialBulkItemSchema(OpenAPISchema):
+    """Schema for one connection and credential preview in a bulk send."""
+
+    connection_id = fields.UUID(
+        description="Connection identifier",
+        required=True,
+        example=UUIDFour.EXAMPLE,  # typically but not necessarily a UUID4
+    )
+    credential_proposal = fields.Nested(CredentialPreviewSchema, required=True)
+
+
+class V10CredentialBulkSendRequestSchema(AdminAPIMessageTracingSchema):
+    """Request schema for sending credentials to many connections."""
+
+    cred_def_id = fields.Str(
+        description="Credential definition identifier",
+        required=False,
+        **INDY_CRED_DEF_ID,
+    )
+    schema_id = fields.Str(
+        description="Schema identifier", required=False, **INDY_SCHEMA_ID
+    )
+    schema_issuer_did = fields.Str(
+        description="Schema issuer DID", required=False, **INDY_DID
+    )
+    schema_name = fields.Str(
+        description="Schema name", required=False, example="preferences"
+    )
+    schema_version = fields.Str(
+        description="Schema version", required=False, **INDY_VERSION
+    )
+    issuer_did = fields.Str(
+        description="Credential issuer DID", required=False, **INDY_DID
+    )
+    auto_remove = fields.Bool(
+        description=(
+            "Whether to remove the credential exchange records on completion "
+            "(overrides --preserve-exchange-records configuration setting)"
+        ),
+        required=False,
+    )
+    comment = fields.Str(
+        description="Human-readable comment", required=False, allow_none=True
+    )
+    max_concurrency = fields.Int(
+        description="Maximum number of credential offers in flight",
+        required=False,
+        strict=True,
+        **NATURAL_NUM,
+    )
+    items = fields.List(
+        fields.Nested(V10CredentialBulkItemSchema),
+        description="Connections and credential previews",
+        required=True,
+    )
+
+
+class V10CredentialBulkResultSchema(OpenAPISchema):
+    """Result schema for one item of a bulk send, streamed one per line."""
+
+    index = fields.Int(description="Position of item in request", example=0)
+    connection_id = fields.Str(
+        description="Connection identifier", example=UUIDFour.EXAMPLE
+    )
+    credential_exchange_id = fields.Str(
+        description="Credential exchange identifier", example=UUIDFour.EXAMPLE
+    )
+    state = fields.Str(description="Credential exchange state", example="offer_sent")
+    error = fields.Str(description="Reason item failed", required=False)
+
+
 class V10CredentialStoreRequestSchema(OpenAPISchema):
     """Request schema for sending a credential store admin message."""
 
@@ -554,6 +626,68 @@ async def credential_exchange_send(request: web.BaseRequest):
     return web.json_response(result)
 
 
+@docs(
+    tags=["issue-credential"],
+    summary=(
+        "Send credentials to many connections, "
+        "streaming per-item results as newline-delimited JSON"
+    ),
+)
+@request_schema(V10CredentialBulkSendRequestSchema())
+@response_schema(V10CredentialBulkResultSchema(), 200)
+async def credential_exchange_send_bulk(request: web.BaseRequest):
+    """
+    Request handler for sending credentials from issuer to many holders.
+
+    The credential definition, schema and credential offer are resolved once,
+    then offers go out with bounded concurrency. As for a single automated send,
+    each exchange proceeds to issue if the holder responds automatically.
+
+    Args:
+        request: aiohttp request object
+
+    Returns:
+        A stream of one result per item, as completed, then a summary line
+
+    """
+    context = request.app["request_context"]
+    outbound_handler = request.app["outbound_message_router"]
+
+    body = await request.json()
+
+    items = body.get("items")
+    if not items:
+        raise web.HTTPBadRequest(reason="items must be provided")
+
+    bulk_issuer = BulkCredentialIssuer(
+        context, outbound_handler, max_concurrency=body.get("max_concurrency")
+    )
+    try:
+        await bulk_issuer.prepare(
+            {t: body.get(t) for t in CRED_DEF_TAGS if body.get(t)}
+        )
+    except (StorageError, LedgerError, IssuerError, CredentialManagerError) as err:
+        raise web.HTTPBadRequest(reason=err.roll_up) from err
+
+    response = web.StreamResponse(
+        status=200, headers={"Content-Type": "application/x-ndjson"}
+    )
+    await response.prepare(request)
+
+    summary = {"total": len(items), "offered": 0, "failed": 0}
+    async for result in bulk_issuer.run(
+        items,
+        comment=body.get("comment"),
+        auto_remove=body.get("auto_remove"),
+        trace=body.get("trace"),
+    ):
+        summary["failed" if "error" in result else "offered"] += 1
+        await response.write(json.dumps(result).encode() + b"\n")
+    await response.write(json.dumps({"summary": summary}).encode() + b"\n")
+    await response.write_eof()
+    return response
+
+
 @docs(tags=["issue-credential"], summary="Send issuer a credential proposal")
 @request_schema(V10CredentialProposalRequestOptSchema())
 @response_schema(V10CredentialExchangeSchema(), 200)
@@ -1314,6 +1448,7 @@ async def register(app: web.Application):
             ),
             web.post("/issue-credential/create", credential_exchange_create),
             web.post("/issue-credential/send", credential_exchange_send),
+            web.post("/issue-credential/send-bulk", credential_exchange_send_bulk),
             web.post(
                 "/issue-credential/send-proposal", credential_exchange_send_proposal
             ),
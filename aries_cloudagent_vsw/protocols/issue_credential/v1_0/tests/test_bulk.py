@@ -0,0 +1,152 @@
+import asyncio
+import json
+
+from asynctest import TestCase as AsyncTestCase
+from asynctest import mock as async_mock
+from time import time
+
+from .....config.injection_context import InjectionContext
+from .....connections.models.connection_record import ConnectionRecord
+from .....issuer.base import BaseIssuer
+from .....ledger.base import BaseLedger
+from .....messaging.credential_definitions.util import CRED_DEF_SENT_RECORD_TYPE
+from .....messaging.request_context import RequestContext
+from .....storage.base import BaseStorage, StorageRecord
+from .....storage.basic import BasicStorage
+
+from ..bulk import BulkCredentialIssuer
+from ..manager import CredentialManagerError
+from ..messages.credential_offer import CredentialOffer
+from ..models.credential_exchange import V10CredentialExchange
+
+TEST_DID = "LjgpST2rjsoxYegQDRm7EL"
+SCHEMA_ID = f"{TEST_DID}:2:bc-reg:1.0"
+SCHEMA = {
+    "ver": "1.0",
+    "id": SCHEMA_ID,
+    "name": "bc-reg",
+    "version": "1.0",
+    "attrNames": ["legalName", "jurisdictionId"],
+    "seqNo": 12,
+}
+CRED_DEF_ID = f"{TEST_DID}:3:CL:12:tag1"
+CRED_OFFER = {"cred_def_id": CRED_DEF_ID, "schema_id": SCHEMA_ID}
+
+
+def preview(**attrs):
+    return {
+        "attributes": [{"name": name, "value": value} for name, value in attrs.items()]
+    }
+
+
+class TestBulkCredentialIssuer(AsyncTestCase):
+    async def setUp(self):
+        self.context = RequestContext(
+            base_context=InjectionContext(enforce_typing=False)
+        )
+        self.storage = BasicStorage()
+        self.context.injector.bind_instance(BaseStorage, self.storage)
+
+        self.ledger = async_mock.MagicMock()
+        self.ledger.__aenter__ = async_mock.CoroutineMock(return_value=self.ledger)
+        self.ledger.credential_definition_id2schema_id = async_mock.CoroutineMock(
+            return_value=SCHEMA_ID
+        )
+        self.ledger.get_schema = async_mock.CoroutineMock(return_value=SCHEMA)
+        self.context.injector.bind_instance(BaseLedger, self.ledger)
+
+        self.issuer = async_mock.MagicMock(BaseIssuer, autospec=True)
+        self.issuer.create_credential_offer = async_mock.CoroutineMock(
+            return_value=json.dumps(CRED_OFFER)
+        )
+        self.context.injector.bind_instance(BaseIssuer, self.issuer)
+
+        await self.storage.add_record(
+            StorageRecord(
+                CRED_DEF_SENT_RECORD_TYPE,
+                CRED_DEF_ID,
+                {"cred_def_id": CRED_DEF_ID, "epoch": str(int(time()))},
+            )
+        )
+        self.connection_ids = []
+        for state in (ConnectionRecord.STATE_ACTIVE, ConnectionRecord.STATE_INVITATION):
+            conn_record = ConnectionRecord(state=state)
+            await conn_record.save(self.context)
+            self.connection_ids.append(conn_record.connection_id)
+
+        self.outbound = async_mock.CoroutineMock()
+        self.bulk = BulkCredentialIssuer(self.context, self.outbound, 2)
+
+    async def test_run(self):
+        (ready, not_ready) = self.connection_ids
+        await self.bulk.prepare({"cred_def_id": CRED_DEF_ID})
+        items = [
+            {
+                "connection_id": ready,
+                "credential_proposal": preview(legalName="a", jurisdictionId="b"),
+            },
+            {
+                "connection_id": ready,
+                "credential_proposal": preview(legalName="c", jurisdictionId="d"),
+            },
+            {
+                "connection_id": not_ready,
+                "credential_proposal": preview(legalName="e", jurisdictionId="f"),
+            },
+            {"connection_id": ready, "credential_proposal": preview(legalName="g")},
+            {"connection_id": "missing", "credential_proposal": preview(x="y")},
+        ]
+        results = [result async for result in self.bulk.run(items)]
+
+        assert sorted(result["index"] for result in results) == list(range(5))
+        by_index = {result["index"]: result for result in results}
+        for index in (0, 1):
+            assert by_index[index]["state"] == V10CredentialExchange.STATE_OFFER_SENT
+            cred_ex = await V10CredentialExchange.retrieve_by_id(
+                self.context, by_index[index]["credential_exchange_id"]
+            )
+            assert cred_ex.auto_issue
+            assert cred_ex.credential_offer == CRED_OFFER
+        for index in (2, 3, 4):
+            assert "error" in by_index[index]
+
+        # schema and offer resolved once for the batch
+        self.ledger.get_schema.assert_called_once()
+        self.issuer.create_credential_offer.assert_called_once_with(CRED_DEF_ID)
+        assert self.outbound.call_count == 2
+        (message,) = self.outbound.call_args[0]
+        assert isinstance(message, CredentialOffer)
+        assert self.outbound.call_args[1] == {"connection_id": ready}
+
+    async def test_run_send_error(self):
+        await self.bulk.prepare({"cred_def_id": CRED_DEF_ID})
+        self.outbound.side_effect = ValueError("transport")
+        items = [
+            {
+                "connection_id": self.connection_ids[0],
+                "credential_proposal": preview(legalName="a", jurisdictionId="b"),
+            }
+        ]
+        results = [result async for result in self.bulk.run(items)]
+        assert results == [
+            {"index": 0, "connection_id": self.connection_ids[0], "error": "transport"}
+        ]
+
+    async def test_run_send_cancelled(self):
+        await self.bulk.prepare({"cred_def_id": CRED_DEF_ID})
+        self.outbound.side_effect = asyncio.CancelledError()
+        item = {
+            "connection_id": self.connection_ids[0],
+            "credential_proposal": preview(legalName="a", jurisdictionId="b"),
+        }
+        with self.assertRaises(asyncio.CancelledError):
+            await self.bulk._issue(0, item, None, True, False)
+
+    async def test_run_not_prepared(self):
+        with self.assertRaises(CredentialManagerError):
+            async for _ in self.bulk.run([{}]):
+                pass
+
+    async def test_prepare_no_cred_def(self):
+        with self.assertRaises(CredentialManagerError):
+            await self.bulk.prepare({"cred_def_id": "no-such-cred-def"})
@@ -934,6 +934,62 @@ class TestCredentialManager(AsyncTestCase):
             assert ret_existing_exchange == ret_exchange
             assert ret_existing_cred._thread_id == thread_id
 
+    async def test_issue_credential_rr_full_pool(self):
+        indy_offer = {"schema_id": SCHEMA_ID, "cred_def_id": CRED_DEF_ID, "nonce": "0"}
+        indy_cred_req = {"schema_id": SCHEMA_ID, "cred_def_id": CRED_DEF_ID}
+        stored_exchange = V10CredentialExchange(
+            credential_exchange_id="dummy-cxid",
+            connection_id="test_conn_id",
+            credential_definition_id=CRED_DEF_ID,
+            credential_offer=indy_offer,
+            credential_request=indy_cred_req,
+            credential_proposal_dict=CredentialProposal(
+                credential_proposal=CredentialPreview.deserialize(
+                    {"attributes": [{"name": "attr", "value": "value"}]}
+                ),
+                cred_def_id=CRED_DEF_ID,
+                schema_id=SCHEMA_ID,
+            ).serialize(),
+            initiator=V10CredentialExchange.INITIATOR_SELF,
+            role=V10CredentialExchange.ROLE_ISSUER,
+            state=V10CredentialExchange.STATE_REQUEST_RECEIVED,
+            thread_id="thread-id",
+        )
+
+        issuer = async_mock.MagicMock()
+        issuer.create_credential = async_mock.CoroutineMock(
+            return_value=(json.dumps({"indy": "credential"}), "1000")
+        )
+        self.context.injector.bind_instance(BaseIssuer, issuer)
+        registry_pool = async_mock.MagicMock(activate_next=async_mock.CoroutineMock())
+        self.context.injector.bind_instance(
+            test_module.RevocationRegistryPool, registry_pool
+        )
+        active_reg = async_mock.MagicMock(
+            get_registry=async_mock.CoroutineMock(
+                return_value=async_mock.MagicMock(
+                    tails_local_path="dummy-path", max_creds=1000
+                )
+            ),
+            mark_full=async_mock.CoroutineMock(),
+            revoc_reg_id=REV_REG_ID,
+        )
+
+        with async_mock.patch.object(
+            test_module, "IssuerRevRegRecord", autospec=True
+        ) as issuer_rr_rec, async_mock.patch.object(
+            test_module, "IndyRevocation", autospec=True
+        ) as revoc, async_mock.patch.object(
+            V10CredentialExchange, "save", autospec=True
+        ):
+            issuer_rr_rec.query_by_cred_def_id = async_mock.CoroutineMock(
+                side_effect=[[], [active_reg]]
+            )
+            await self.manager.issue_credential(stored_exchange, retries=1)
+
+            registry_pool.activate_next.assert_awaited_once_with(active_reg)
+            revoc.return_value.init_issuer_registry.assert_not_called()
+
     async def test_issue_credential_non_revocable(self):
         CRED_DEF_NR = deepcopy(CRED_DEF)
         CRED_DEF_NR["value"]["revocation"] = None
@@ -1521,6 +1577,25 @@ class TestCredentialManager(AsyncTestCase):
 
             await self.manager.revoke_credential(REV_REG_ID, CRED_REV_ID, True)
 
+    async def test_revoke_credential_publish_batched(self):
+        CRED_REV_ID = 1
+        publisher = async_mock.MagicMock(enqueue=async_mock.CoroutineMock())
+        self.context.injector.bind_instance(test_module.RevocationPublisher, publisher)
+        with async_mock.patch.object(
+            test_module, "IndyRevocation", autospec=True
+        ) as revoc:
+            revoc.return_value.get_issuer_rev_reg_record = async_mock.CoroutineMock(
+                return_value=async_mock.MagicMock()
+            )
+
+            issuer = async_mock.MagicMock(BaseIssuer, autospec=True)
+            issuer.revoke_credentials = async_mock.CoroutineMock()
+            self.context.injector.bind_instance(BaseIssuer, issuer)
+
+            await self.manager.revoke_credential(REV_REG_ID, CRED_REV_ID, True)
+            publisher.enqueue.assert_awaited_once_with(REV_REG_ID, CRED_REV_ID)
+            issuer.revoke_credentials.assert_not_called()
+
     async def test_revoke_credential_no_rev_reg_rec(self):
         CRED_REV_ID = 1
         exchange = V10CredentialExchange(
@@ -1564,6 +1639,38 @@ class TestCredentialManager(AsyncTestCase):
                 self.context, CRED_REV_ID
             )
 
+    async def test_revoke_credential_pend_publisher(self):
+        CRED_REV_ID = 1
+        publisher = async_mock.MagicMock(
+            registry_lock=async_mock.MagicMock(return_value=asyncio.Lock())
+        )
+        self.context.injector.bind_instance(test_module.RevocationPublisher, publisher)
+        current_record = async_mock.MagicMock(
+            revoc_reg_id=REV_REG_ID, mark_pending=async_mock.CoroutineMock()
+        )
+        with async_mock.patch.object(
+            test_module, "IndyRevocation", autospec=True
+        ) as revoc, async_mock.patch.object(
+            test_module.IssuerRevRegRecord,
+            "retrieve_by_revoc_reg_id",
+            async_mock.CoroutineMock(return_value=current_record),
+        ) as mock_retrieve:
+            revoc.return_value.get_issuer_rev_reg_record = async_mock.CoroutineMock(
+                return_value=async_mock.MagicMock(revoc_reg_id=REV_REG_ID)
+            )
+
+            issuer = async_mock.MagicMock(BaseIssuer, autospec=True)
+            self.context.injector.bind_instance(BaseIssuer, issuer)
+
+            await self.manager.revoke_credential(REV_REG_ID, CRED_REV_ID, False)
+            # read anew under the publisher's lock for the registry
+            publisher.registry_lock.assert_called_once_with(REV_REG_ID)
+            mock_retrieve.assert_awaited_once_with(self.context, REV_REG_ID)
+            current_record.mark_pending.assert_awaited_once_with(
+                self.context, CRED_REV_ID
+            )
+            publisher.track_pending.assert_called_once_with(current_record)
+
     async def test_publish_pending_revocations(self):
         deltas = [
             {
@@ -1,3 +1,5 @@
+import json
+
 from asynctest import TestCase as AsyncTestCase
 from asynctest import mock as async_mock
 
@@ -381,6 +383,82 @@ class TestCredentialRoutes(AsyncTestCase):
             with self.assertRaises(test_module.web.HTTPForbidden):
                 await test_module.credential_exchange_send(mock)
 
+    async def test_credential_exchange_send_bulk(self):
+        mock = async_mock.MagicMock()
+        mock.json = async_mock.CoroutineMock(
+            return_value={
+                "cred_def_id": "cred-def-id",
+                "max_concurrency": 4,
+                "items": [{"connection_id": "c0"}, {"connection_id": "c1"}],
+            }
+        )
+        context = RequestContext(base_context=InjectionContext(enforce_typing=False))
+        mock.app = {
+            "outbound_message_router": async_mock.CoroutineMock(),
+            "request_context": context,
+        }
+
+        async def run(items, **kwargs):
+            yield {"index": 1, "connection_id": "c1", "error": "not ready"}
+            yield {"index": 0, "connection_id": "c0", "state": "offer_sent"}
+
+        with async_mock.patch.object(
+            test_module, "BulkCredentialIssuer", autospec=True
+        ) as mock_bulk, async_mock.patch.object(
+            test_module.web, "StreamResponse", autospec=True
+        ) as mock_response:
+            mock_bulk.return_value.prepare = async_mock.CoroutineMock()
+            mock_bulk.return_value.run = run
+            mock_response.return_value.prepare = async_mock.CoroutineMock()
+            mock_response.return_value.write = async_mock.CoroutineMock()
+            mock_response.return_value.write_eof = async_mock.CoroutineMock()
+
+            result = await test_module.credential_exchange_send_bulk(mock)
+            assert result is mock_response.return_value
+            mock_bulk.assert_called_once_with(
+                context, mock.app["outbound_message_router"], max_concurrency=4
+            )
+            mock_bulk.return_value.prepare.assert_called_once_with(
+                {"cred_def_id": "cred-def-id"}
+            )
+            lines = [
+                json.loads(call[0][0])
+                for call in mock_response.return_value.write.call_args_list
+            ]
+            assert [line.get("index") for line in lines] == [1, 0, None]
+            assert lines[-1] == {"summary": {"total": 2, "offered": 1, "failed": 1}}
+            mock_response.return_value.write_eof.assert_called_once()
+
+    async def test_credential_exchange_send_bulk_no_items(self):
+        mock = async_mock.MagicMock()
+        mock.json = async_mock.CoroutineMock(return_value={"items": []})
+        mock.app = {
+            "outbound_message_router": async_mock.CoroutineMock(),
+            "request_context": async_mock.MagicMock(),
+        }
+
+        with self.assertRaises(test_module.web.HTTPBadRequest):
+            await test_module.credential_exchange_send_bulk(mock)
+
+    async def test_credential_exchange_send_bulk_no_cred_def(self):
+        mock = async_mock.MagicMock()
+        mock.json = async_mock.CoroutineMock(
+            return_value={"items": [{"connection_id": "c0"}]}
+        )
+        mock.app = {
+            "outbound_message_router": async_mock.CoroutineMock(),
+            "request_context": async_mock.MagicMock(),
+        }
+
+        with async_mock.patch.object(
+            test_module, "BulkCredentialIssuer", autospec=True
+        ) as mock_bulk:
+            mock_bulk.return_value.prepare = async_mock.CoroutineMock(
+                side_effect=test_module.CredentialManagerError()
+            )
+            with self.assertRaises(test_module.web.HTTPBadRequest):
+                await test_module.credential_exchange_send_bulk(mock)
+
     async def test_credential_exchange_send_proposal(self):
         conn_id = "connection-id"
         preview_spec = {"attributes": [{"name": "attr", "value": "value"}]}
@@ -8,9 +8,14 @@ from ....revocation.models.revocation_registry import RevocationRegistry
 from ....config.injection_context import InjectionContext
 from ....core.error import BaseError
 from ....holder.base import BaseHolder, HolderError
+from ....holder.witness_cache import RevocationWitnessCache
 from ....ledger.base import BaseLedger
+from ....ledger.prefetch import LedgerPrefetcher
 from ....messaging.decorators.attach_decorator import AttachDecorator
 from ....messaging.responder import BaseResponder
+from ....storage.base import BaseStorage
+from ....storage.error import StorageError
+from ....utils.stats import Collector
 from ....verifier.base import BaseVerifier
 
 from .models.presentation_exchange import V10PresentationExchange
@@ -50,6 +55,83 @@ class PresentationManager:
         """
         return self._context
 
+    async def _record_timing(self, stage: str, start: float) -> float:
+        """Record the duration of a presentation processing stage."""
+        duration = time.perf_counter() - start
+        collector: Collector = await self.context.inject(Collector, required=False)
+        if collector:
+            collector.log(f"PresentationManager.{stage}", duration)
+        self._logger.debug("Presentation stage %s took %.4fs", stage, duration)
+        return duration
+
+    async def _get_revocation_state(
+        self,
+        holder: BaseHolder,
+        ledger: BaseLedger,
+        rev_reg_id: str,
+        cred_rev_id: str,
+        rev_reg_def: dict,
+        rev_reg_delta: dict,
+        timestamp: int,
+        tails_file_path: str,
+    ) -> str:
+        """
+        Get the revocation state for a credential as of a registry delta.
+
+        Where a revocation witness cache is available, a cached state is reused,
+        or else a cached state for an earlier timestamp is brought up to date
+        from the delta since, and only failing that is a new state created.
+        """
+        witness_cache: RevocationWitnessCache = await self.context.inject(
+            RevocationWitnessCache, required=False
+        )
+        if not witness_cache:
+            return await holder.create_revocation_state(
+                cred_rev_id, rev_reg_def, rev_reg_delta, timestamp, tails_file_path
+            )
+
+        storage: BaseStorage = await self.context.inject(BaseStorage)
+        rev_state = await witness_cache.get(storage, rev_reg_id, cred_rev_id, timestamp)
+        if rev_state:
+            return rev_state
+
+        prior = await witness_cache.get_latest(
+            storage, rev_reg_id, cred_rev_id, timestamp
+        )
+        if prior:
+            (prior_state, prior_timestamp) = prior
+            async with ledger:
+                (update_delta, update_timestamp) = await ledger.get_revoc_reg_delta(
+                    rev_reg_id, prior_timestamp, timestamp
+                )
+            if update_timestamp == timestamp:
+                try:
+                    rev_state = await holder.update_revocation_state(
+                        cred_rev_id,
+                        rev_reg_def,
+                        update_delta,
+                        timestamp,
+                        tails_file_path,
+                        prior_state,
+                    )
+                except NotImplementedError:
+                    pass  # created anew
+        if not rev_state:
+            rev_state = await holder.create_revocation_state(
+                cred_rev_id, rev_reg_def, rev_reg_delta, timestamp, tails_file_path
+            )
+
+        try:
+            await witness_cache.put(
+                storage, rev_reg_id, cred_rev_id, timestamp, rev_state
+            )
+        except StorageError:
+            # the state is valid whether or not it could be cached
+            self._logger.exception(
+                "Failed to cache revocation state for %s::%s", rev_reg_id, cred_rev_id
+            )
+        return rev_state
+
     async def create_exchange_for_proposal(
         self,
         connection_id: str,
@@ -299,30 +381,38 @@ class PresentationManager:
 
         # Get all schema, credential definition, and revocation registry in use
         ledger: BaseLedger = await self.context.inject(BaseLedger)
+        prefetcher = LedgerPrefetcher.for_ledger(ledger)
+        ledger_start = time.perf_counter()
+        requests = []
+        for credential in credentials.values():
+            requests.append(("get_schema", credential["schema_id"]))
+            requests.append(("get_credential_definition", credential["cred_def_id"]))
+            if credential.get("rev_reg_id"):
+                requests.append(("get_revoc_reg_def", credential["rev_reg_id"]))
+
+        async with ledger:
+            fetched = await prefetcher.fetch_all(requests)
+
         schemas = {}
         credential_definitions = {}
         revocation_registries = {}
-
-        async with ledger:
-            for credential in credentials.values():
-                schema_id = credential["schema_id"]
-                if schema_id not in schemas:
-                    schemas[schema_id] = await ledger.get_schema(schema_id)
-
-                credential_definition_id = credential["cred_def_id"]
-                if credential_definition_id not in credential_definitions:
-                    credential_definitions[
-                        credential_definition_id
-                    ] = await ledger.get_credential_definition(credential_definition_id)
-
-                if credential.get("rev_reg_id"):
-                    revocation_registry_id = credential["rev_reg_id"]
-                    if revocation_registry_id not in revocation_registries:
-                        revocation_registries[
-                            revocation_registry_id
-                        ] = RevocationRegistry.from_definition(
-                            await ledger.get_revoc_reg_def(revocation_registry_id), True
-                        )
+        for credential in credentials.values():
+            schema_id = credential["schema_id"]
+            schemas[schema_id] = fetched[("get_schema", schema_id)]
+            credential_definition_id = credential["cred_def_id"]
+            credential_definitions[credential_definition_id] = fetched[
+                ("get_credential_definition", credential_definition_id)
+            ]
+            revocation_registry_id = credential.get("rev_reg_id")
+            if (
+                revocation_registry_id
+                and revocation_registry_id not in revocation_registries
+            ):
+                revocation_registries[
+                    revocation_registry_id
+                ] = RevocationRegistry.from_definition(
+                    fetched[("get_revoc_reg_def", revocation_registry_id)], True
+                )
 
         # Get delta with non-revocation interval defined in "non_revoked"
         # of the presentation request or attributes
@@ -333,42 +423,55 @@ class PresentationManager:
             presentation_exchange_record.presentation_request.get("non_revoked") or {}
         )
 
-        revoc_reg_deltas = {}
-        async with ledger:
-            for precis in requested_referents.values():  # cred_id, non-revoc interval
-                credential_id = precis["cred_id"]
-                if not credentials[credential_id].get("rev_reg_id"):
-                    continue
-                if "timestamp" in precis:
-                    continue
-                rev_reg_id = credentials[credential_id]["rev_reg_id"]
-                referent_non_revoc_interval = precis.get(
-                    "non_revoked", non_revoc_interval
-                )
-
-                if referent_non_revoc_interval:
-                    key = (
-                        f"{rev_reg_id}_{referent_non_revoc_interval.get('from', 0)}_"
-                        f"{referent_non_revoc_interval.get('to', epoch_now)}"
-                    )
-                    if key not in revoc_reg_deltas:
-                        (delta, delta_timestamp) = await ledger.get_revoc_reg_delta(
+        # often one cred satisfies many requested attrs/preds: the first referent
+        # with a non-revocation interval determines the delta for the credential
+        delta_requests = []
+        delta_cred_ids = set()
+        for precis in requested_referents.values():  # cred_id, non-revoc interval
+            credential_id = precis["cred_id"]
+            if not credentials[credential_id].get("rev_reg_id"):
+                continue
+            if "timestamp" in precis or credential_id in delta_cred_ids:
+                continue
+            rev_reg_id = credentials[credential_id]["rev_reg_id"]
+            referent_non_revoc_interval = precis.get("non_revoked", non_revoc_interval)
+
+            if referent_non_revoc_interval:
+                delta_cred_ids.add(credential_id)
+                delta_requests.append(
+                    (
+                        credential_id,
+                        (
+                            "get_revoc_reg_delta",
                             rev_reg_id,
                             referent_non_revoc_interval.get("from", 0),
                             referent_non_revoc_interval.get("to", epoch_now),
-                        )
-                        revoc_reg_deltas[key] = (
-                            rev_reg_id,
-                            credential_id,
-                            delta,
-                            delta_timestamp,
-                        )
-                    for stamp_me in requested_referents.values():
-                        # often one cred satisfies many requested attrs/preds
-                        if stamp_me["cred_id"] == credential_id:
-                            stamp_me["timestamp"] = revoc_reg_deltas[key][3]
+                        ),
+                    )
+                )
+
+        async with ledger:
+            fetched = await prefetcher.fetch_all(req for (_, req) in delta_requests)
+        await self._record_timing("create_presentation.ledger", ledger_start)
+
+        revoc_reg_deltas = {}
+        for (credential_id, request) in delta_requests:
+            (_, rev_reg_id, timestamp_from, timestamp_to) = request
+            key = f"{rev_reg_id}_{timestamp_from}_{timestamp_to}"
+            if key not in revoc_reg_deltas:
+                (delta, delta_timestamp) = fetched[request]
+                revoc_reg_deltas[key] = (
+                    rev_reg_id,
+                    credential_id,
+                    delta,
+                    delta_timestamp,
+                )
+            for stamp_me in requested_referents.values():
+                if stamp_me["cred_id"] == credential_id:
+                    stamp_me["timestamp"] = revoc_reg_deltas[key][3]
 
         # Get revocation states to prove non-revoked
+        revoc_state_start = time.perf_counter()
         revocation_states = {}
         for (
             rev_reg_id,
@@ -384,7 +487,10 @@ class PresentationManager:
 
             try:
                 revocation_states[rev_reg_id][delta_timestamp] = json.loads(
-                    await holder.create_revocation_state(
+                    await self._get_revocation_state(
+                        holder,
+                        ledger,
+                        rev_reg_id,
                         credentials[credential_id]["cred_rev_id"],
                         rev_reg.reg_def,
                         delta,
@@ -397,6 +503,9 @@ class PresentationManager:
                     f"Failed to create revocation state: {e.error_code}, {e.message}"
                 )
                 raise e
+        await self._record_timing(
+            "create_presentation.revocation_state", revoc_state_start
+        )
 
         for (referent, precis) in requested_referents.items():
             if "timestamp" not in precis:
@@ -410,6 +519,7 @@ class PresentationManager:
                     "timestamp"
                 ] = precis["timestamp"]
 
+        crypto_start = time.perf_counter()
         indy_proof_json = await holder.create_presentation(
             presentation_exchange_record.presentation_request,
             requested_credentials,
@@ -417,6 +527,7 @@ class PresentationManager:
             credential_definitions,
             revocation_states,
         )
+        await self._record_timing("create_presentation.crypto", crypto_start)
         indy_proof = json.loads(indy_proof_json)
 
         presentation_message = Presentation(
@@ -518,58 +629,47 @@ class PresentationManager:
         indy_proof_request = presentation_exchange_record.presentation_request
         indy_proof = presentation_exchange_record.presentation
 
-        schema_ids = []
-        credential_definition_ids = []
+        identifiers = indy_proof["identifiers"]
+        requests = []
+        for identifier in identifiers:
+            requests.append(("get_schema", identifier["schema_id"]))
+            requests.append(("get_credential_definition", identifier["cred_def_id"]))
+            if identifier.get("rev_reg_id"):
+                requests.append(("get_revoc_reg_def", identifier["rev_reg_id"]))
+                if identifier.get("timestamp"):
+                    requests.append(
+                        (
+                            "get_revoc_reg_entry",
+                            identifier["rev_reg_id"],
+                            identifier["timestamp"],
+                        )
+                    )
+
+        ledger: BaseLedger = await self.context.inject(BaseLedger)
+        ledger_start = time.perf_counter()
+        async with ledger:
+            fetched = await LedgerPrefetcher.for_ledger(ledger).fetch_all(requests)
+        await self._record_timing("verify_presentation.ledger", ledger_start)
 
         schemas = {}
         credential_definitions = {}
         rev_reg_defs = {}
         rev_reg_entries = {}
-
-        identifiers = indy_proof["identifiers"]
-        ledger: BaseLedger = await self.context.inject(BaseLedger)
-        async with ledger:
-            for identifier in identifiers:
-                schema_ids.append(identifier["schema_id"])
-                credential_definition_ids.append(identifier["cred_def_id"])
-
-                # Build schemas for anoncreds
-                if identifier["schema_id"] not in schemas:
-                    schemas[identifier["schema_id"]] = await ledger.get_schema(
-                        identifier["schema_id"]
-                    )
-
-                if identifier["cred_def_id"] not in credential_definitions:
-                    credential_definitions[
-                        identifier["cred_def_id"]
-                    ] = await ledger.get_credential_definition(
-                        identifier["cred_def_id"]
-                    )
-
-                if identifier.get("rev_reg_id"):
-                    if identifier["rev_reg_id"] not in rev_reg_defs:
-                        rev_reg_defs[
-                            identifier["rev_reg_id"]
-                        ] = await ledger.get_revoc_reg_def(identifier["rev_reg_id"])
-
-                    if identifier.get("timestamp"):
-                        rev_reg_entries.setdefault(identifier["rev_reg_id"], {})
-
-                        if (
-                            identifier["timestamp"]
-                            not in rev_reg_entries[identifier["rev_reg_id"]]
-                        ):
-                            (
-                                found_rev_reg_entry,
-                                _found_timestamp,
-                            ) = await ledger.get_revoc_reg_entry(
-                                identifier["rev_reg_id"], identifier["timestamp"]
-                            )
-                            rev_reg_entries[identifier["rev_reg_id"]][
-                                identifier["timestamp"]
-                            ] = found_rev_reg_entry
+        for request, result in fetched.items():
+            if request[0] == "get_schema":
+                schemas[request[1]] = result
+            elif request[0] == "get_credential_definition":
+                credential_definitions[request[1]] = result
+            elif request[0] == "get_revoc_reg_def":
+                rev_reg_defs[request[1]] = result
+            else:
+                (found_rev_reg_entry, _found_timestamp) = result
+                rev_reg_entries.setdefault(request[1], {})[
+                    request[2]
+                ] = found_rev_reg_entry
 
         verifier: BaseVerifier = await self.context.inject(BaseVerifier)
+        crypto_start = time.perf_counter()
         presentation_exchange_record.verified = json.dumps(  # tag: needs string value
             await verifier.verify_presentation(
                 indy_proof_request,
@@ -580,6 +680,7 @@ class PresentationManager:
                 rev_reg_entries,
             )
         )
+        await self._record_timing("verify_presentation.crypto", crypto_start)
         presentation_exchange_record.state = V10PresentationExchange.STATE_VERIFIED
 
         await presentation_exchange_record.save(
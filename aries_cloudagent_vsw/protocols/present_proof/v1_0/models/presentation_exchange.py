@@ -19,7 +19,8 @@ class V10PresentationExchange(BaseExchangeRecord):
     RECORD_TYPE = "presentation_exchange_v10"
     RECORD_ID_NAME = "presentation_exchange_id"
     WEBHOOK_TOPIC = "present_proof"
-    TAG_NAMES = {"thread_id"}
+    TAG_NAMES = {"thread_id", "connection_id", "role", "state"}
+    RECORD_CACHE_ENABLED = True
 
     INITIATOR_SELF = "self"
     INITIATOR_EXTERNAL = "external"
@@ -8,11 +8,15 @@ from asynctest import mock as async_mock
 from .....config.injection_context import InjectionContext
 from .....holder.base import BaseHolder
 from .....holder.indy import IndyHolder
+from .....holder.witness_cache import RevocationWitnessCache
 from .....issuer.base import BaseIssuer
 from .....ledger.base import BaseLedger
 from .....messaging.request_context import RequestContext
 from .....messaging.responder import BaseResponder, MockResponder
-from .....storage.error import StorageNotFoundError
+from .....storage.base import BaseStorage
+from .....storage.basic import BasicStorage
+from .....storage.error import StorageError, StorageNotFoundError
+from .....utils.stats import Collector
 from .....verifier.base import BaseVerifier
 from .....verifier.indy import IndyVerifier
 
@@ -332,6 +336,85 @@ class TestPresentationManager(AsyncTestCase):
             save_ex.assert_called_once()
             assert exchange_out.state == V10PresentationExchange.STATE_PRESENTATION_SENT
 
+    async def test_get_revocation_state_cached(self):
+        self.context.injector.bind_instance(BaseStorage, BasicStorage())
+        self.context.injector.bind_instance(
+            RevocationWitnessCache, RevocationWitnessCache()
+        )
+        self.holder.update_revocation_state = async_mock.CoroutineMock(
+            return_value="updated"
+        )
+        args = ({"def": 1}, {"delta": 1})
+
+        state = await self.manager._get_revocation_state(
+            self.holder, self.ledger, RR_ID, "1", *args, NOW - 10, "/tmp/tails"
+        )
+        assert state == self.holder.create_revocation_state.return_value
+        self.holder.create_revocation_state.assert_awaited_once()
+
+        # same delta timestamp: reused
+        again = await self.manager._get_revocation_state(
+            self.holder, self.ledger, RR_ID, "1", *args, NOW - 10, "/tmp/tails"
+        )
+        assert again == state
+        self.holder.create_revocation_state.assert_awaited_once()
+
+        # newer delta timestamp: updated from the delta since the cached state
+        updated = await self.manager._get_revocation_state(
+            self.holder, self.ledger, RR_ID, "1", *args, NOW, "/tmp/tails"
+        )
+        assert updated == "updated"
+        self.ledger.get_revoc_reg_delta.assert_awaited_once_with(RR_ID, NOW - 10, NOW)
+        self.holder.update_revocation_state.assert_awaited_once_with(
+            "1",
+            {"def": 1},
+            self.ledger.get_revoc_reg_delta.return_value[0],
+            NOW,
+            "/tmp/tails",
+            state,
+        )
+        self.holder.create_revocation_state.assert_awaited_once()
+
+    async def test_get_revocation_state_update_not_implemented(self):
+        self.context.injector.bind_instance(BaseStorage, BasicStorage())
+        self.context.injector.bind_instance(
+            RevocationWitnessCache, RevocationWitnessCache()
+        )
+        self.holder.update_revocation_state = async_mock.CoroutineMock(
+            side_effect=NotImplementedError()
+        )
+        args = ({"def": 1}, {"delta": 1})
+
+        await self.manager._get_revocation_state(
+            self.holder, self.ledger, RR_ID, "1", *args, NOW - 10, "/tmp/tails"
+        )
+        await self.manager._get_revocation_state(
+            self.holder, self.ledger, RR_ID, "1", *args, NOW, "/tmp/tails"
+        )
+        self.holder.update_revocation_state.assert_awaited_once()
+        assert self.holder.create_revocation_state.await_count == 2
+
+    async def test_get_revocation_state_cache_error(self):
+        self.context.injector.bind_instance(BaseStorage, BasicStorage())
+        witness_cache = RevocationWitnessCache()
+        witness_cache.put = async_mock.CoroutineMock(
+            side_effect=StorageError("cache write")
+        )
+        self.context.injector.bind_instance(RevocationWitnessCache, witness_cache)
+
+        state = await self.manager._get_revocation_state(
+            self.holder,
+            self.ledger,
+            RR_ID,
+            "1",
+            {"def": 1},
+            {"delta": 1},
+            NOW,
+            "/tmp/tails",
+        )
+        assert state == self.holder.create_revocation_state.return_value
+        witness_cache.put.assert_awaited_once()
+
     async def test_create_presentation_proof_req_non_revoc_interval_none(self):
         self.context.connection_record = async_mock.MagicMock()
         self.context.connection_record.connection_id = CONN_ID
@@ -874,6 +957,24 @@ class TestPresentationManager(AsyncTestCase):
             save_ex.assert_called_once()
 
             assert exchange_out.state == (V10PresentationExchange.STATE_VERIFIED)
+        self.ledger.get_revoc_reg_def.assert_called_once_with(RR_ID)
+        self.ledger.get_revoc_reg_entry.assert_called_once_with(RR_ID, NOW)
+
+    async def test_verify_presentation_timings(self):
+        collector = Collector()
+        self.context.injector.bind_instance(Collector, collector)
+        exchange_in = V10PresentationExchange()
+        exchange_in.presentation = {
+            "identifiers": [{"schema_id": S_ID, "cred_def_id": CD_ID}]
+        }
+
+        with async_mock.patch.object(V10PresentationExchange, "save", autospec=True):
+            await self.manager.verify_presentation(exchange_in)
+
+        assert collector.results["count"] == {
+            "PresentationManager.verify_presentation.ledger": 1,
+            "PresentationManager.verify_presentation.crypto": 1,
+        }
 
     async def test_send_presentation_ack(self):
         exchange = V10PresentationExchange()
@@ -5,9 +5,10 @@ import logging
 import uuid
 
 from asyncio import shield
+from bisect import bisect_left
 from os.path import join
 from shutil import move
-from typing import Any, Sequence
+from typing import Any, Sequence, Tuple
 from urllib.parse import urlparse
 
 from marshmallow import fields, validate
@@ -83,6 +84,7 @@ class IssuerRevRegRecord(BaseRecord):
         tails_local_path: str = None,
         tails_public_uri: str = None,
         pending_pub: Sequence[str] = None,
+        batch_pub: Sequence[str] = None,
         **kwargs,
     ):
         """Initialize the issuer revocation registry record."""
@@ -104,6 +106,8 @@ class IssuerRevRegRecord(BaseRecord):
         self.pending_pub = (
             sorted(list(set(pending_pub))) if pending_pub else []
         )  # order for eq comparison between instances
+        # pending revocations queued for the next batched publication
+        self.batch_pub = sorted(list(set(batch_pub))) if batch_pub else []
 
     @property
     def record_id(self) -> str:
@@ -125,6 +129,7 @@ class IssuerRevRegRecord(BaseRecord):
                 "tails_public_uri",
                 "tails_local_path",
                 "pending_pub",
+                "batch_pub",
             )
         }
 
@@ -197,8 +202,14 @@ class IssuerRevRegRecord(BaseRecord):
 
     async def stage_pending_registry_definition(
         self, context: InjectionContext,
-    ):
-        """Prepare registry definition for future use."""
+    ) -> Tuple[bool, str]:
+        """
+        Prepare registry definition for future use.
+
+        Returns:
+            Tuple with tails file upload success and any failure reason
+
+        """
         await shield(self.generate_registry(context))
         tails_base_url = context.settings.get("tails_server_base_url")
         await self.set_tails_file_public_uri(
@@ -207,8 +218,8 @@ class IssuerRevRegRecord(BaseRecord):
         await self.publish_registry_definition(context)
 
         tails_server: BaseTailsServer = await context.inject(BaseTailsServer)
-        await tails_server.upload_tails_file(
-            context, self.revoc_reg_id, self.tails_local_path,
+        return await tails_server.upload_tails_file(
+            context, self.revoc_reg_id, self.tails_local_path, self.tails_hash,
         )
 
     async def publish_registry_definition(self, context: InjectionContext):
@@ -275,16 +286,24 @@ class IssuerRevRegRecord(BaseRecord):
                 context, reason="Published initial revocation registry entry"
             )
 
-    async def mark_pending(self, context: InjectionContext, cred_rev_id: str) -> None:
+    async def mark_pending(
+        self, context: InjectionContext, cred_rev_id: str, batch: bool = False
+    ) -> None:
         """Mark a credential revocation id as revoked pending publication to ledger.
 
         Args:
             context: The injection context to use
             cred_rev_id: The credential revocation identifier for credential to revoke
+            batch: Whether to also queue the revocation for batched publication
         """
-        if cred_rev_id not in self.pending_pub:
-            self.pending_pub.append(cred_rev_id)
-            self.pending_pub.sort()
+        changed = False
+        for (pending, add) in ((self.pending_pub, True), (self.batch_pub, batch)):
+            index = bisect_left(pending, cred_rev_id)
+            if add and (index == len(pending) or pending[index] != cred_rev_id):
+                pending.insert(index, cred_rev_id)
+                changed = True
+        if not changed:
+            return  # already pending: nothing to save
 
         await self.save(context, reason="Marked pending revocation")
 
@@ -302,8 +321,10 @@ class IssuerRevRegRecord(BaseRecord):
                 self.pending_pub = [
                     r for r in self.pending_pub if r not in cred_rev_ids
                 ]
+                self.batch_pub = [r for r in self.batch_pub if r not in cred_rev_ids]
             else:
                 self.pending_pub.clear()
+                self.batch_pub.clear()
             await self.save(context, reason="Cleared pending revocations")
 
     async def get_registry(self) -> RevocationRegistry:
@@ -444,3 +465,11 @@ class IssuerRevRegRecordSchema(BaseRecordSchema):
         ),
         required=False,
     )
+    batch_pub = fields.List(
+        fields.Str(example="23"),
+        description=(
+            "Credential revocation identifier for credential "
+            "revoked and queued for batched publication to ledger"
+        ),
+        required=False,
+    )
@@ -183,6 +183,24 @@ class TestRecord(AsyncTestCase):
         found = await IssuerRevRegRecord.query_by_pending(self.context)
         assert not found
 
+    async def test_pending_batch(self):
+        rec = IssuerRevRegRecord()
+        await rec.mark_pending(self.context, "1")
+        await rec.mark_pending(self.context, "2", batch=True)
+        await rec.mark_pending(self.context, "1", batch=True)
+        assert rec.pending_pub == ["1", "2"]
+        assert rec.batch_pub == ["1", "2"]
+
+        with async_mock.patch.object(rec, "save", async_mock.CoroutineMock()) as save:
+            await rec.mark_pending(self.context, "2", batch=True)
+            await rec.mark_pending(self.context, "1")
+            save.assert_not_awaited()
+
+        await rec.clear_pending(self.context, ["1"])
+        assert (rec.pending_pub, rec.batch_pub) == (["2"], ["2"])
+        await rec.clear_pending(self.context)
+        assert (rec.pending_pub, rec.batch_pub) == ([], [])
+
     async def test_set_tails_file_public_uri_rev_reg_undef(self):
         rec = IssuerRevRegRecord()
         with self.assertRaises(RevocationError):
@@ -0,0 +1,189 @@
+"""Pool of revocation registries generated ahead of demand."""
+
+import asyncio
+import logging
+
+from typing import Mapping, Sequence
+
+from ..config.injection_context import InjectionContext
+
+from .error import RevocationError
+from .indy import IndyRevocation
+from .models.issuer_rev_reg_record import IssuerRevRegRecord
+
+LOGGER = logging.getLogger(__name__)
+
+
+class RevocationRegistryPool:
+    """
+    Keep revocation registries ready for each revocable credential definition.
+
+    Registries are generated, published and have their tails files uploaded in
+    the background, by a bounded number of workers, so that when the active
+    registry fills the next one is activated without waiting on generation.
+    """
+
+    def __init__(self, context: InjectionContext, depth: int, max_workers: int = 1):
+        """
+        Initialize a `RevocationRegistryPool` instance.
+
+        Args:
+            context: The injection context to use
+            depth: The number of ready registries to keep per credential definition
+            max_workers: The maximum number of registries generated concurrently
+
+        """
+        self.context = context
+        self.depth = depth
+        self.max_workers = max_workers
+        self.rollover_count = 0
+        self.empty_count = 0
+        self.failed_count = 0
+        self._workers = asyncio.Semaphore(max_workers)
+        self._generating: Mapping[str, int] = {}
+        self._staging = set()  # record ids published but not yet ready
+        self._locks: Mapping[str, asyncio.Lock] = {}
+        self._tasks = set()
+
+    def _lock(self, cred_def_id: str) -> asyncio.Lock:
+        """Get the lock serializing registry switches for a credential definition."""
+        if cred_def_id not in self._locks:
+            self._locks[cred_def_id] = asyncio.Lock()
+        return self._locks[cred_def_id]
+
+    async def start(self):
+        """Top up the pool for each credential definition with an active registry."""
+        active = await IssuerRevRegRecord.query(
+            self.context, {"state": IssuerRevRegRecord.STATE_ACTIVE}
+        )
+        for record in active:
+            await self.replenish(
+                record.cred_def_id, record.issuer_did, record.max_cred_num
+            )
+
+    async def stop(self):
+        """Stop generating registries."""
+        tasks = list(self._tasks)
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+
+    async def ready_registries(self, cred_def_id: str) -> Sequence[IssuerRevRegRecord]:
+        """
+        Get the registries ready for activation, oldest first.
+
+        Args:
+            cred_def_id: The credential definition identifier
+
+        """
+        published = await IssuerRevRegRecord.query_by_cred_def_id(
+            self.context, cred_def_id, IssuerRevRegRecord.STATE_PUBLISHED
+        )
+        return sorted(
+            (rec for rec in published if rec.record_id not in self._staging),
+            key=lambda rec: rec.created_at,
+        )
+
+    async def replenish(
+        self, cred_def_id: str, issuer_did: str, max_cred_num: int = None
+    ) -> int:
+        """
+        Start generating registries to bring the pool up to depth.
+
+        Args:
+            cred_def_id: The credential definition identifier
+            issuer_did: The issuer DID
+            max_cred_num: The size of each registry
+
+        Returns:
+            The number of registries started
+
+        """
+        self._generating.setdefault(cred_def_id, 0)
+        ready = len(await self.ready_registries(cred_def_id))
+        needed = self.depth - ready - self._generating[cred_def_id]
+        for _ in range(max(needed, 0)):
+            self._generating[cred_def_id] += 1
+            task = asyncio.ensure_future(
+                self._generate(cred_def_id, issuer_did, max_cred_num)
+            )
+            self._tasks.add(task)
+            task.add_done_callback(self._tasks.discard)
+        return max(needed, 0)
+
+    async def _generate(self, cred_def_id: str, issuer_did: str, max_cred_num: int):
+        """Generate, publish and upload the tails file of one registry."""
+        record = None
+        try:
+            async with self._workers:
+                revoc = IndyRevocation(self.context)
+                record = await revoc.init_issuer_registry(
+                    cred_def_id, issuer_did, max_cred_num=max_cred_num
+                )
+                self._staging.add(record.record_id)
+                (uploaded, reason) = await record.stage_pending_registry_definition(
+                    self.context
+                )
+                if not uploaded:
+                    raise RevocationError(f"Tails file failed to upload: {reason}")
+                LOGGER.debug("Revocation registry ready: %s", record.revoc_reg_id)
+        except asyncio.CancelledError:
+            raise
+        except Exception:
+            self.failed_count += 1
+            LOGGER.exception("Error generating revocation registry for %s", cred_def_id)
+            if record:  # do not activate a registry without its tails file
+                record.state = IssuerRevRegRecord.STATE_INIT
+                record.error_msg = "Failed to stage revocation registry"
+                await record.save(self.context, reason="Failed staging")
+        finally:
+            self._generating[cred_def_id] -= 1
+            if record:
+                self._staging.discard(record.record_id)
+
+    async def activate_next(self, active_reg: IssuerRevRegRecord) -> IssuerRevRegRecord:
+        """
+        Switch a credential definition from its full registry to a ready one.
+
+        Args:
+            active_reg: The registry record that is now full
+
+        Returns:
+            The newly active registry record, or `None` if none was ready
+
+        """
+        cred_def_id = active_reg.cred_def_id
+        async with self._lock(cred_def_id):
+            ready = await self.ready_registries(cred_def_id)
+            next_reg = ready[0] if ready else None
+            if next_reg:
+                next_reg.state = IssuerRevRegRecord.STATE_STAGED
+                await next_reg.save(self.context, reason="revocation registry staged")
+                await next_reg.publish_registry_entry(self.context)
+                self.rollover_count += 1
+            else:
+                self.empty_count += 1
+                LOGGER.warning("No revocation registry ready for %s", cred_def_id)
+            await active_reg.mark_full(self.context)
+
+        await self.replenish(
+            cred_def_id, active_reg.issuer_did, active_reg.max_cred_num
+        )
+        return next_reg
+
+    async def status(self) -> dict:
+        """Get the pool depth for each credential definition."""
+        cred_defs = {}
+        for cred_def_id in self._generating:
+            cred_defs[cred_def_id] = {
+                "ready": len(await self.ready_registries(cred_def_id)),
+                "generating": self._generating[cred_def_id],
+            }
+        return {
+            "depth": self.depth,
+            "max_workers": self.max_workers,
+            "cred_defs": cred_defs,
+            "rollover_count": self.rollover_count,
+            "empty_count": self.empty_count,
+            "failed_count": self.failed_count,
+        }
@@ -0,0 +1,207 @@
+"""Batched publication of pending revocations to the ledger."""
+
+import asyncio
+import json
+import logging
+import time
+
+from typing import Mapping, Sequence
+
+from ..config.injection_context import InjectionContext
+from ..issuer.base import BaseIssuer
+
+from .models.issuer_rev_reg_record import IssuerRevRegRecord
+
+LOGGER = logging.getLogger(__name__)
+
+
+class RevocationPublisher:
+    """
+    Background scheduler for publishing revocations.
+
+    Revocations are queued for batched publication on their registry record, so
+    that they survive a restart, and are published together as one merged
+    registry delta per registry at each interval, or as soon as a registry has
+    accumulated a full batch. Revocations otherwise pending, as revoked without
+    publication, are left to the controller to publish.
+
+    Each update to the revocations pending on a registry record is made under
+    the lock of the registry, for updates not to overwrite one another while
+    a batch is published.
+    """
+
+    def __init__(
+        self, context: InjectionContext, interval: float, batch_size: int = None
+    ):
+        """
+        Initialize a `RevocationPublisher` instance.
+
+        Args:
+            context: The injection context to use
+            interval: Seconds between publications of pending revocations
+            batch_size: Number of pending revocations in a registry at which to
+                publish without waiting for the interval
+
+        """
+        self.context = context
+        self.interval = interval
+        self.batch_size = batch_size
+        self.flush_count = 0
+        self.published_count = 0
+        self.failed_count = 0
+        self.last_flush: float = None
+        self.last_error: str = None
+        self._pending: Mapping[str, set] = {}
+        self._locks: Mapping[str, asyncio.Lock] = {}
+        self._flush_tasks: Mapping[str, asyncio.Future] = {}
+        self._loop_task: asyncio.Future = None
+
+    @property
+    def pending_count(self) -> int:
+        """Accessor for the number of revocations awaiting publication."""
+        return sum(len(crids) for crids in self._pending.values())
+
+    def registry_lock(self, rev_reg_id: str) -> asyncio.Lock:
+        """Get the lock serializing updates to a registry record."""
+        if rev_reg_id not in self._locks:
+            self._locks[rev_reg_id] = asyncio.Lock()
+        return self._locks[rev_reg_id]
+
+    def track_pending(self, record: IssuerRevRegRecord):
+        """Track the revocations queued on a registry record, as last saved."""
+        if record.batch_pub:
+            self._pending[record.revoc_reg_id] = set(record.batch_pub)
+        else:
+            self._pending.pop(record.revoc_reg_id, None)
+
+    async def start(self):
+        """Load revocations left queued and begin publishing at intervals."""
+        for record in await IssuerRevRegRecord.query_by_pending(self.context):
+            self.track_pending(record)
+        if self._pending:
+            LOGGER.info(
+                "Resuming publication of %d pending revocations", self.pending_count
+            )
+        self._loop_task = asyncio.ensure_future(self._run())
+
+    async def stop(self):
+        """Stop publishing; unpublished revocations remain pending on record."""
+        tasks = list(self._flush_tasks.values())
+        if self._loop_task:
+            tasks.append(self._loop_task)
+            self._loop_task = None
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+
+    async def _run(self):
+        """Publish pending revocations at each interval."""
+        while True:
+            await asyncio.sleep(self.interval)
+            await self.flush()
+
+    async def enqueue(self, rev_reg_id: str, cred_rev_id: str):
+        """
+        Mark a revocation pending for publication in the next batch.
+
+        Args:
+            rev_reg_id: The revocation registry identifier
+            cred_rev_id: The credential revocation identifier
+
+        """
+        async with self.registry_lock(rev_reg_id):
+            record = await IssuerRevRegRecord.retrieve_by_revoc_reg_id(
+                self.context, rev_reg_id
+            )
+            await record.mark_pending(self.context, cred_rev_id, batch=True)
+            self.track_pending(record)
+        if self.batch_size and len(record.batch_pub) >= self.batch_size:
+            self._schedule_flush(rev_reg_id)
+
+    def _schedule_flush(self, rev_reg_id: str):
+        """Publish a registry's pending revocations in the background."""
+        if rev_reg_id in self._flush_tasks:
+            return
+        task = asyncio.ensure_future(self.flush(rev_reg_id))
+        self._flush_tasks[rev_reg_id] = task
+        task.add_done_callback(lambda _: self._flush_tasks.pop(rev_reg_id, None))
+
+    async def flush(self, rev_reg_id: str = None) -> Mapping[str, Sequence[str]]:
+        """
+        Publish pending revocations now.
+
+        A registry failing to publish is logged and left pending for the next
+        attempt, without holding up the others.
+
+        Args:
+            rev_reg_id: The revocation registry to publish; default all
+
+        Returns:
+            Mapping from each revocation registry id to its cred rev ids published
+
+        """
+        rev_reg_ids = [rev_reg_id] if rev_reg_id else list(self._pending)
+        result = {}
+        for rrid in rev_reg_ids:
+            try:
+                published = await self._flush_registry(rrid)
+            except Exception:
+                LOGGER.exception("Error publishing revocations on registry %s", rrid)
+                continue
+            if published:
+                result[rrid] = published
+        return result
+
+    async def _flush_registry(self, rev_reg_id: str) -> Sequence[str]:
+        """Publish one merged delta for the revocations queued on a registry."""
+        async with self.registry_lock(rev_reg_id):
+            record = await IssuerRevRegRecord.retrieve_by_revoc_reg_id(
+                self.context, rev_reg_id
+            )
+            crids = [crid for crid in record.batch_pub if crid in record.pending_pub]
+            if not crids:
+                self.track_pending(record)
+                return []
+
+            issuer: BaseIssuer = await self.context.inject(BaseIssuer)
+            try:
+                (delta_json, failed_crids) = await issuer.revoke_credentials(
+                    rev_reg_id, record.tails_local_path, crids
+                )
+                published = [crid for crid in crids if crid not in failed_crids]
+                # failed revocations stay pending, but are not retried in a batch
+                record.batch_pub = []
+                if delta_json:
+                    record.revoc_reg_entry = json.loads(delta_json)
+                    await record.publish_registry_entry(self.context)
+                if published:
+                    await record.clear_pending(self.context, published)
+                elif not delta_json:
+                    await record.save(self.context, reason="Failed batched revocations")
+            except Exception as err:
+                self.last_error = str(err)
+                raise
+
+            self.flush_count += 1
+            self.published_count += len(published)
+            self.failed_count += len(failed_crids)
+            self.last_flush = time.time()
+            self.track_pending(record)
+            LOGGER.debug(
+                "Published %d revocations on registry %s", len(published), rev_reg_id
+            )
+            return published
+
+    def status(self) -> dict:
+        """Get the state of the publication queue."""
+        return {
+            "interval": self.interval,
+            "batch_size": self.batch_size,
+            "pending": {rrid: sorted(crids) for (rrid, crids) in self._pending.items()},
+            "pending_count": self.pending_count,
+            "flush_count": self.flush_count,
+            "published_count": self.published_count,
+            "failed_count": self.failed_count,
+            "last_flush": self.last_flush,
+            "last_error": self.last_error,
+        }
@@ -23,6 +23,8 @@ from ..storage.base import BaseStorage, StorageNotFoundError
 from .error import RevocationError, RevocationNotSupportedError
 from .indy import IndyRevocation
 from .models.issuer_rev_reg_record import IssuerRevRegRecord, IssuerRevRegRecordSchema
+from .pool import RevocationRegistryPool
+from .publisher import RevocationPublisher
 
 LOGGER = logging.getLogger(__name__)
 
@@ -94,6 +96,59 @@ class RevRegIdMatchInfoSchema(OpenAPISchema):
     )
 
 
+class RevocationPublisherStatusSchema(OpenAPISchema):
+    """Result schema for revocation publication queue state."""
+
+    interval = fields.Float(description="Seconds between publications", example=60)
+    batch_size = fields.Int(
+        description="Pending revocations per registry triggering publication",
+        example=100,
+        allow_none=True,
+    )
+    pending = fields.Dict(
+        keys=fields.Str(description="Revocation registry identifier"),
+        values=fields.List(fields.Str(example="23")),
+        description="Credential revocation identifiers pending, by registry",
+    )
+    pending_count = fields.Int(description="Total revocations pending", example=0)
+    flush_count = fields.Int(description="Registry deltas published", example=0)
+    published_count = fields.Int(description="Revocations published", example=0)
+    failed_count = fields.Int(description="Revocations failed", example=0)
+    last_flush = fields.Float(
+        description="Time of last publication (epoch seconds)", allow_none=True
+    )
+    last_error = fields.Str(description="Last publication error", allow_none=True)
+
+
+class RevRegPoolStatusSchema(OpenAPISchema):
+    """Result schema for revocation registry pool state."""
+
+    depth = fields.Int(
+        description="Ready registries kept per credential definition", example=2
+    )
+    max_workers = fields.Int(description="Registries generated concurrently", example=1)
+    cred_defs = fields.Dict(
+        keys=fields.Str(description="Credential definition identifier"),
+        values=fields.Dict(),
+        description="Registries ready and generating, by credential definition",
+    )
+    rollover_count = fields.Int(description="Switches to a ready registry", example=0)
+    empty_count = fields.Int(
+        description="Registries filled with no ready replacement", example=0
+    )
+    failed_count = fields.Int(description="Registry generation failures", example=0)
+
+
+class RevocationPublisherFlushResultSchema(OpenAPISchema):
+    """Result schema for publishing queued revocations."""
+
+    rrid2crid = fields.Dict(
+        keys=fields.Str(description="Revocation registry identifier"),
+        values=fields.List(fields.Str(example="23")),
+        description="Credential revocation identifiers published, by registry",
+    )
+
+
 class CredDefIdMatchInfoSchema(OpenAPISchema):
     """Path parameters and validators for request taking cred def id."""
 
@@ -343,6 +398,70 @@ async def update_registry(request: web.BaseRequest):
     return web.json_response({"result": revoc_registry.serialize()})
 
 
+async def _get_publisher(context) -> RevocationPublisher:
+    """Get the revocation publisher, if batched publication is configured."""
+    publisher = await context.inject(RevocationPublisher, required=False)
+    if not publisher:
+        raise web.HTTPNotFound(reason="Batched revocation publication not configured")
+    return publisher
+
+
+@docs(tags=["revocation"], summary="Get the state of the revocation publication queue")
+@response_schema(RevocationPublisherStatusSchema(), 200)
+async def get_publisher_status(request: web.BaseRequest):
+    """
+    Request handler to get the state of batched revocation publication.
+
+    Args:
+        request: aiohttp request object
+
+    Returns:
+        The publication queue state
+
+    """
+    context = request.app["request_context"]
+    publisher = await _get_publisher(context)
+    return web.json_response(publisher.status())
+
+
+@docs(tags=["revocation"], summary="Publish queued revocations now")
+@response_schema(RevocationPublisherFlushResultSchema(), 200)
+async def flush_publisher(request: web.BaseRequest):
+    """
+    Request handler to publish queued revocations without waiting for the interval.
+
+    Args:
+        request: aiohttp request object
+
+    Returns:
+        Credential revocation ids published as revoked by revocation registry id
+
+    """
+    context = request.app["request_context"]
+    publisher = await _get_publisher(context)
+    return web.json_response({"rrid2crid": await shield(publisher.flush())})
+
+
+@docs(tags=["revocation"], summary="Get the state of the revocation registry pool")
+@response_schema(RevRegPoolStatusSchema(), 200)
+async def get_registry_pool_status(request: web.BaseRequest):
+    """
+    Request handler to get the depth of the revocation registry pool.
+
+    Args:
+        request: aiohttp request object
+
+    Returns:
+        The registry pool state
+
+    """
+    context = request.app["request_context"]
+    registry_pool = await context.inject(RevocationRegistryPool, required=False)
+    if not registry_pool:
+        raise web.HTTPNotFound(reason="Revocation registry pool not configured")
+    return web.json_response(await registry_pool.status())
+
+
 async def register(app: web.Application):
     """Register routes."""
     app.add_routes(
@@ -368,6 +487,11 @@ async def register(app: web.Application):
             ),
             web.patch("/revocation/registry/{rev_reg_id}", update_registry),
             web.post("/revocation/registry/{rev_reg_id}/publish", publish_registry),
+            web.get("/revocation/publisher", get_publisher_status, allow_head=False),
+            web.post("/revocation/publisher/flush", flush_publisher),
+            web.get(
+                "/revocation/registry-pool", get_registry_pool_status, allow_head=False,
+            ),
         ]
     )
 
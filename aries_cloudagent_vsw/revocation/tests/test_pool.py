@@ -0,0 +1,140 @@
+import asyncio
+
+from asynctest import TestCase as AsyncTestCase
+from asynctest import mock as async_mock
+
+from ...config.injection_context import InjectionContext
+from ...ledger.base import BaseLedger
+from ...storage.base import BaseStorage
+from ...storage.basic import BasicStorage
+
+from .. import pool as test_module
+from ..models.issuer_rev_reg_record import IssuerRevRegRecord
+from ..pool import RevocationRegistryPool
+
+TEST_DID = "55GkHamhTU1ZbTbV2ab9DE"
+CRED_DEF_ID = f"{TEST_DID}:3:CL:1234:default"
+REV_REG_ID = f"{TEST_DID}:4:{CRED_DEF_ID}:CL_ACCUM:0"
+
+
+class TestRevocationRegistryPool(AsyncTestCase):
+    async def setUp(self):
+        self.context = InjectionContext(enforce_typing=False)
+        self.context.injector.bind_instance(BaseStorage, BasicStorage())
+        self.ledger = async_mock.MagicMock(
+            send_revoc_reg_entry=async_mock.CoroutineMock()
+        )
+        self.context.injector.bind_instance(BaseLedger, self.ledger)
+        self.pool = RevocationRegistryPool(self.context, 2)
+        self.staged = []
+
+    async def tearDown(self):
+        await self.pool.stop()
+
+    def mock_init(self, upload=(True, None), gate: asyncio.Event = None):
+        async def stage(record, context):
+            self.staged.append(record)
+            if gate:
+                await gate.wait()
+            record.state = IssuerRevRegRecord.STATE_PUBLISHED
+            await record.save(context)
+            return upload
+
+        async def init_issuer_registry(cred_def_id, issuer_did, max_cred_num=None):
+            record = IssuerRevRegRecord(
+                cred_def_id=cred_def_id,
+                issuer_did=issuer_did,
+                max_cred_num=max_cred_num,
+                revoc_reg_id=f"{REV_REG_ID}{len(self.staged)}",
+                revoc_reg_entry={"entry": 1},
+                tails_public_uri="http://1.2.3.4:8088/tails",
+            )
+            await record.save(self.context)
+            record.stage_pending_registry_definition = lambda ctx: stage(record, ctx)
+            return record
+
+        return async_mock.patch.object(
+            test_module,
+            "IndyRevocation",
+            async_mock.MagicMock(
+                return_value=async_mock.MagicMock(
+                    init_issuer_registry=init_issuer_registry
+                )
+            ),
+        )
+
+    async def test_replenish(self):
+        gate = asyncio.Event()
+        with self.mock_init(gate=gate):
+            assert await self.pool.replenish(CRED_DEF_ID, TEST_DID, 10) == 2
+            await asyncio.sleep(0)
+            # published, tails upload not complete: not ready
+            assert await self.pool.replenish(CRED_DEF_ID, TEST_DID, 10) == 0
+            assert not await self.pool.ready_registries(CRED_DEF_ID)
+
+            gate.set()
+            await asyncio.gather(*self.pool._tasks)
+
+        assert len(await self.pool.ready_registries(CRED_DEF_ID)) == 2
+        status = await self.pool.status()
+        assert status["cred_defs"] == {CRED_DEF_ID: {"ready": 2, "generating": 0}}
+
+    async def test_activate_next(self):
+        with self.mock_init():
+            await self.pool.replenish(CRED_DEF_ID, TEST_DID, 10)
+            await asyncio.gather(*self.pool._tasks)
+
+            active = IssuerRevRegRecord(
+                cred_def_id=CRED_DEF_ID,
+                issuer_did=TEST_DID,
+                max_cred_num=10,
+                revoc_reg_id=REV_REG_ID,
+                state=IssuerRevRegRecord.STATE_ACTIVE,
+            )
+            await active.save(self.context)
+
+            next_reg = await self.pool.activate_next(active)
+            assert next_reg.revoc_reg_id == self.staged[0].revoc_reg_id
+            assert next_reg.state == IssuerRevRegRecord.STATE_ACTIVE
+            assert active.state == IssuerRevRegRecord.STATE_FULL
+            self.ledger.send_revoc_reg_entry.assert_awaited_once()
+
+            # replacement generated
+            await asyncio.gather(*self.pool._tasks)
+            assert len(self.staged) == 3
+            assert len(await self.pool.ready_registries(CRED_DEF_ID)) == 2
+            assert self.pool.rollover_count == 1
+
+    async def test_activate_next_empty(self):
+        active = IssuerRevRegRecord(
+            cred_def_id=CRED_DEF_ID,
+            issuer_did=TEST_DID,
+            revoc_reg_id=REV_REG_ID,
+            state=IssuerRevRegRecord.STATE_ACTIVE,
+        )
+        with self.mock_init():
+            assert await self.pool.activate_next(active) is None
+            await asyncio.gather(*self.pool._tasks)
+        assert active.state == IssuerRevRegRecord.STATE_FULL
+        assert self.pool.empty_count == 1
+
+    async def test_upload_failure(self):
+        with self.mock_init(upload=(False, "unavailable")):
+            await self.pool.replenish(CRED_DEF_ID, TEST_DID, 10)
+            await asyncio.gather(*self.pool._tasks)
+
+        assert not await self.pool.ready_registries(CRED_DEF_ID)
+        assert self.pool.failed_count == 2
+
+    async def test_start(self):
+        active = IssuerRevRegRecord(
+            cred_def_id=CRED_DEF_ID,
+            issuer_did=TEST_DID,
+            revoc_reg_id=REV_REG_ID,
+            state=IssuerRevRegRecord.STATE_ACTIVE,
+        )
+        await active.save(self.context)
+        with self.mock_init():
+            await self.pool.start()
+            await asyncio.gather(*self.pool._tasks)
+        assert len(await self.pool.ready_registries(CRED_DEF_ID)) == 2
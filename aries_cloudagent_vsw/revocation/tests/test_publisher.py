@@ -0,0 +1,171 @@
+import asyncio
+import json
+
+from asynctest import TestCase as AsyncTestCase
+from asynctest import mock as async_mock
+
+from ...config.injection_context import InjectionContext
+from ...issuer.base import BaseIssuer
+from ...ledger.base import BaseLedger
+from ...storage.base import BaseStorage
+from ...storage.basic import BasicStorage
+
+from ..models.issuer_rev_reg_record import IssuerRevRegRecord
+from ..publisher import RevocationPublisher
+
+TEST_DID = "55GkHamhTU1ZbTbV2ab9DE"
+CRED_DEF_ID = f"{TEST_DID}:3:CL:1234:default"
+REV_REG_ID = f"{TEST_DID}:4:{CRED_DEF_ID}:CL_ACCUM:0"
+
+
+class TestRevocationPublisher(AsyncTestCase):
+    async def setUp(self):
+        self.context = InjectionContext(enforce_typing=False)
+        self.context.injector.bind_instance(BaseStorage, BasicStorage())
+
+        self.ledger = async_mock.MagicMock(
+            send_revoc_reg_entry=async_mock.CoroutineMock()
+        )
+        self.context.injector.bind_instance(BaseLedger, self.ledger)
+
+        self.issuer = async_mock.MagicMock(
+            revoke_credentials=async_mock.CoroutineMock(
+                return_value=(json.dumps({"delta": "merged"}), [])
+            )
+        )
+        self.context.injector.bind_instance(BaseIssuer, self.issuer)
+
+        self.record = IssuerRevRegRecord(
+            cred_def_id=CRED_DEF_ID,
+            issuer_did=TEST_DID,
+            revoc_reg_id=REV_REG_ID,
+            revoc_reg_entry={"initial": "entry"},
+            tails_local_path="/tmp/tails",
+            tails_public_uri="http://1.2.3.4:8088/tails",
+            state=IssuerRevRegRecord.STATE_ACTIVE,
+        )
+        await self.record.save(self.context)
+
+        self.publisher = RevocationPublisher(self.context, 3600, 3)
+
+    async def tearDown(self):
+        await self.publisher.stop()
+
+    async def test_enqueue_flush(self):
+        await self.publisher.enqueue(REV_REG_ID, "1")
+        await self.publisher.enqueue(REV_REG_ID, "2")
+        await self.publisher.enqueue(REV_REG_ID, "2")
+        assert self.publisher.pending_count == 2
+        self.ledger.send_revoc_reg_entry.assert_not_called()
+
+        record = await IssuerRevRegRecord.retrieve_by_revoc_reg_id(
+            self.context, REV_REG_ID
+        )
+        assert record.pending_pub == ["1", "2"]
+        assert record.batch_pub == ["1", "2"]
+
+        result = await self.publisher.flush()
+        assert result == {REV_REG_ID: ["1", "2"]}
+        self.issuer.revoke_credentials.assert_awaited_once_with(
+            REV_REG_ID, "/tmp/tails", ["1", "2"]
+        )
+        self.ledger.send_revoc_reg_entry.assert_awaited_once_with(
+            REV_REG_ID, "CL_ACCUM", {"delta": "merged"}, TEST_DID
+        )
+
+        record = await IssuerRevRegRecord.retrieve_by_revoc_reg_id(
+            self.context, REV_REG_ID
+        )
+        assert record.pending_pub == []
+        status = self.publisher.status()
+        assert status["pending_count"] == 0
+        assert status["flush_count"] == 1
+        assert status["published_count"] == 2
+
+        # nothing left to publish
+        assert await self.publisher.flush() == {}
+        self.issuer.revoke_credentials.assert_awaited_once()
+
+    async def test_batch_size(self):
+        for crid in ("1", "2", "3"):
+            await self.publisher.enqueue(REV_REG_ID, crid)
+        assert REV_REG_ID in self.publisher._flush_tasks
+        await asyncio.gather(*self.publisher._flush_tasks.values())
+
+        self.ledger.send_revoc_reg_entry.assert_awaited_once()
+        assert self.publisher.pending_count == 0
+
+    async def test_resume_pending(self):
+        await self.record.mark_pending(self.context, "7", batch=True)
+        with async_mock.patch.object(
+            self.publisher, "_run", async_mock.CoroutineMock()
+        ):
+            await self.publisher.start()
+        assert self.publisher.status()["pending"] == {REV_REG_ID: ["7"]}
+
+        assert await self.publisher.flush() == {REV_REG_ID: ["7"]}
+
+    async def test_unbatched_left_pending(self):
+        # revoked without publication, for the controller to publish
+        await self.record.mark_pending(self.context, "6")
+        with async_mock.patch.object(
+            self.publisher, "_run", async_mock.CoroutineMock()
+        ):
+            await self.publisher.start()
+        assert self.publisher.pending_count == 0
+
+        await self.publisher.enqueue(REV_REG_ID, "7")
+        assert await self.publisher.flush() == {REV_REG_ID: ["7"]}
+        self.issuer.revoke_credentials.assert_awaited_once_with(
+            REV_REG_ID, "/tmp/tails", ["7"]
+        )
+        record = await IssuerRevRegRecord.retrieve_by_revoc_reg_id(
+            self.context, REV_REG_ID
+        )
+        assert (record.pending_pub, record.batch_pub) == (["6"], [])
+
+    async def test_mark_pending_while_publishing(self):
+        await self.publisher.enqueue(REV_REG_ID, "1")
+        revoking = asyncio.Event()
+        resume = asyncio.Event()
+
+        async def revoke_credentials(*args):
+            revoking.set()
+            await resume.wait()
+            return (json.dumps({"delta": "merged"}), [])
+
+        self.issuer.revoke_credentials.side_effect = revoke_credentials
+        flush = asyncio.ensure_future(self.publisher.flush())
+        await revoking.wait()
+
+        async def mark_pending():
+            async with self.publisher.registry_lock(REV_REG_ID):
+                record = await IssuerRevRegRecord.retrieve_by_revoc_reg_id(
+                    self.context, REV_REG_ID
+                )
+                await record.mark_pending(self.context, "2")
+
+        marking = asyncio.ensure_future(mark_pending())
+        await asyncio.sleep(0)
+        resume.set()
+        await asyncio.gather(flush, marking)
+
+        record = await IssuerRevRegRecord.retrieve_by_revoc_reg_id(
+            self.context, REV_REG_ID
+        )
+        assert (record.pending_pub, record.batch_pub) == (["2"], [])
+
+    async def test_flush_x(self):
+        await self.publisher.enqueue(REV_REG_ID, "1")
+        self.ledger.send_revoc_reg_entry.side_effect = Exception("ledger down")
+
+        assert await self.publisher.flush() == {}
+        status = self.publisher.status()
+        assert status["pending_count"] == 1
+        assert status["last_error"] == "ledger down"
+
+        record = await IssuerRevRegRecord.retrieve_by_revoc_reg_id(
+            self.context, REV_REG_ID
+        )
+        assert record.pending_pub == ["1"]
+        assert record.batch_pub == ["1"]
@@ -436,6 +436,64 @@ class TestRevocationRoutes(AsyncTestCase):
             with self.assertRaises(test_module.web.HTTPBadRequest):
                 await test_module.update_registry(request)
 
+    async def test_get_publisher_status(self):
+        request = async_mock.MagicMock()
+        request.app = self.app
+        publisher = async_mock.MagicMock(
+            test_module.RevocationPublisher, status=async_mock.MagicMock()
+        )
+        self.context.injector.bind_instance(test_module.RevocationPublisher, publisher)
+
+        with async_mock.patch.object(
+            test_module.web, "json_response", async_mock.Mock()
+        ) as mock_json_response:
+            result = await test_module.get_publisher_status(request)
+            mock_json_response.assert_called_once_with(publisher.status.return_value)
+            assert result is mock_json_response.return_value
+
+    async def test_flush_publisher(self):
+        request = async_mock.MagicMock()
+        request.app = self.app
+        publisher = async_mock.MagicMock(
+            test_module.RevocationPublisher,
+            flush=async_mock.CoroutineMock(return_value={"rrid": ["1"]}),
+        )
+        self.context.injector.bind_instance(test_module.RevocationPublisher, publisher)
+
+        with async_mock.patch.object(
+            test_module.web, "json_response", async_mock.Mock()
+        ) as mock_json_response:
+            await test_module.flush_publisher(request)
+            mock_json_response.assert_called_once_with({"rrid2crid": {"rrid": ["1"]}})
+
+    async def test_publisher_not_configured(self):
+        request = async_mock.MagicMock()
+        request.app = self.app
+
+        with self.assertRaises(HTTPNotFound):
+            await test_module.get_publisher_status(request)
+        with self.assertRaises(HTTPNotFound):
+            await test_module.flush_publisher(request)
+
+    async def test_get_registry_pool_status(self):
+        request = async_mock.MagicMock()
+        request.app = self.app
+
+        with self.assertRaises(HTTPNotFound):
+            await test_module.get_registry_pool_status(request)
+
+        registry_pool = async_mock.MagicMock(
+            status=async_mock.CoroutineMock(return_value={"depth": 2})
+        )
+        self.context.injector.bind_instance(
+            test_module.RevocationRegistryPool, registry_pool
+        )
+        with async_mock.patch.object(
+            test_module.web, "json_response", async_mock.Mock()
+        ) as mock_json_response:
+            await test_module.get_registry_pool_status(request)
+            mock_json_response.assert_called_once_with({"depth": 2})
+
     async def test_register(self):
         mock_app = async_mock.MagicMock()
         mock_app.add_routes = async_mock.MagicMock()
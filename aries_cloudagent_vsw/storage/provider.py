@@ -1,11 +1,15 @@
 """Default storage provider classes."""
 
+import functools
 import logging
 
 from ..config.base import BaseProvider, BaseInjector, BaseSettings
 from ..utils.classloader import ClassLoader
+from ..utils.metrics import LatencyFamily, Metrics
 from ..wallet.base import BaseWallet
 
+from .base import BaseStorage
+
 LOGGER = logging.getLogger(__name__)
 
 
@@ -29,4 +33,41 @@ class StorageProvider(BaseProvider):
         ).lower()
         storage_class = self.STORAGE_TYPES.get(storage_type, storage_type)
         storage = ClassLoader.load_class(storage_class)(wallet)
+        metrics: Metrics = await injector.inject(Metrics, required=False)
+        if metrics:
+            time_storage(storage, metrics.storage_latency)
         return storage
+
+
+def time_storage(storage: BaseStorage, latency: LatencyFamily):
+    """Record the duration of the operations on a storage instance by record type."""
+
+    def by_record(operation: str):
+        return lambda record, *args, **kwargs: (operation, record.type)
+
+    storage.add_record = latency.timed(storage.add_record, by_record("add"))
+    storage.get_record = latency.timed(
+        storage.get_record, lambda record_type, *args, **kwargs: ("get", record_type)
+    )
+    storage.update_record_value = latency.timed(
+        storage.update_record_value, by_record("update_value")
+    )
+    storage.update_record_tags = latency.timed(
+        storage.update_record_tags, by_record("update_tags")
+    )
+    storage.delete_record_tags = latency.timed(
+        storage.delete_record_tags, by_record("delete_tags")
+    )
+    storage.delete_record = latency.timed(storage.delete_record, by_record("delete"))
+
+    search_records = storage.search_records
+
+    @functools.wraps(search_records)
+    def timed_search(type_filter: str, *args, **kwargs):
+        search = search_records(type_filter, *args, **kwargs)
+        search.fetch = latency.timed(
+            search.fetch, lambda *args, **kwargs: ("search", type_filter)
+        )
+        return search
+
+    storage.search_records = timed_search
@@ -0,0 +1,51 @@
+from asynctest import TestCase as AsyncTestCase
+
+from ...config.injection_context import InjectionContext
+from ...utils.metrics import Metrics
+from ...wallet.base import BaseWallet
+from ...wallet.basic import BasicWallet
+
+from ..basic import BasicStorage
+from ..provider import StorageProvider
+from ..record import StorageRecord
+
+
+class TestStorageProvider(AsyncTestCase):
+    async def setUp(self):
+        self.context = InjectionContext(enforce_typing=False)
+        self.context.injector.bind_instance(BaseWallet, BasicWallet())
+
+    async def test_provide(self):
+        storage = await StorageProvider().provide(
+            self.context.settings, self.context.injector
+        )
+        assert isinstance(storage, BasicStorage)
+
+    async def test_provide_metrics(self):
+        metrics = Metrics()
+        self.context.injector.bind_instance(Metrics, metrics)
+        storage = await StorageProvider().provide(
+            self.context.settings, self.context.injector
+        )
+
+        record = StorageRecord("my_type", "value", {"tag": "a"})
+        await storage.add_record(record)
+        await storage.get_record("my_type", record.id)
+        await storage.update_record_value(record, "new value")
+        await storage.update_record_tags(record, {"tag": "b"})
+        await storage.delete_record_tags(record, {"tag": None})
+        found = await storage.search_records("my_type").fetch_all()
+        assert [item.id for item in found] == [record.id]
+        await storage.delete_record(record)
+
+        latency = metrics.storage_latency
+        for operation in (
+            "add",
+            "get",
+            "update_value",
+            "update_tags",
+            "delete_tags",
+            "delete",
+        ):
+            assert latency.get(operation, "my_type")["count"] == 1
+        assert latency.get("search", "my_type")["count"] == 2
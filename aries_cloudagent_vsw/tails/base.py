@@ -10,11 +10,23 @@ class BaseTailsServer(ABC, metaclass=ABCMeta):
 
     @abstractmethod
     async def upload_tails_file(
-        self, context: InjectionContext, rev_reg_id: str, tails_file_path: str
+        self,
+        context: InjectionContext,
+        rev_reg_id: str,
+        tails_file_path: str,
+        tails_hash: str = None,
     ) -> (bool, str):
         """Upload tails file to tails server.
 
         Args:
             rev_reg_id: The revocation registry identifier
             tails_file: The path to the tails file to upload
+            tails_hash: The expected tails file hash, checked before uploading
         """
+
+    async def close(self):
+        """Release any resources held by the tails server interface."""
+
+    def status(self) -> dict:
+        """Report upload counters, if tracked."""
+        return None
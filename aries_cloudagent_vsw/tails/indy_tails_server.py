@@ -1,22 +1,148 @@
 """Indy tails server interface class."""
 
+import asyncio
+import hashlib
+import logging
+import os
+import time
+
+from typing import Sequence
+
 import aiohttp
+import base58
+
+from aiohttp.payload import AsyncIterablePayload
+
+from ..utils.stats import Collector
 
 from .base import BaseTailsServer
 from .error import TailsServerNotConfiguredError
 
+LOGGER = logging.getLogger(__name__)
+
+
+class TailsUpload:
+    """Progress of a tails file upload."""
+
+    __slots__ = ("rev_reg_id", "size", "bytes_sent", "attempts", "started")
+
+    def __init__(self, rev_reg_id: str, size: int):
+        """Initialize a `TailsUpload` instance."""
+        self.rev_reg_id = rev_reg_id
+        self.size = size
+        self.bytes_sent = 0
+        self.attempts = 0
+        self.started = time.perf_counter()
+
+    def serialize(self) -> dict:
+        """Report upload progress."""
+        return {
+            "rev_reg_id": self.rev_reg_id,
+            "size": self.size,
+            "bytes_sent": self.bytes_sent,
+            "attempts": self.attempts,
+            "elapsed": round(time.perf_counter() - self.started, 3),
+        }
+
 
 class IndyTailsServer(BaseTailsServer):
-    """Indy tails server interface."""
+    """
+    Indy tails server interface.
+
+    Uploads share one HTTP session and are bounded in number. Tails files are
+    streamed from disk in chunks read off the event loop, and failed uploads
+    are retried with exponential backoff. Before a retry, the server is asked
+    whether it already holds the file, in case an earlier attempt completed
+    without its response arriving.
+    """
+
+    CHUNK_SIZE = 1 << 18
+    MAX_CONCURRENCY = 4
+    MAX_ATTEMPTS = 5
+    BACKOFF = 1.0
+    MAX_BACKOFF = 30.0
+    TIMEOUT = 300.0
+    RETRY_STATUSES = (408, 429, 500, 502, 503, 504)
+
+    def __init__(self):
+        """Initialize an `IndyTailsServer` instance."""
+        self._session: aiohttp.ClientSession = None
+        self._limit = asyncio.Semaphore(self.MAX_CONCURRENCY)
+        self.uploads = {}
+        self.uploaded_count = 0
+        self.failed_count = 0
+        self.retry_count = 0
+        self.bytes_uploaded = 0
+
+    def _get_session(self) -> aiohttp.ClientSession:
+        """Get the shared HTTP session, opening it as necessary."""
+        if not self._session or self._session.closed:
+            self._session = aiohttp.ClientSession(
+                timeout=aiohttp.ClientTimeout(total=self.TIMEOUT)
+            )
+        return self._session
+
+    async def close(self):
+        """Close the shared HTTP session."""
+        if self._session:
+            await self._session.close()
+            self._session = None
+
+    @classmethod
+    def tails_hash(cls, tails_file_path: str) -> str:
+        """Compute the base58-encoded sha256 hash of a tails file."""
+        file_hasher = hashlib.sha256()
+        with open(tails_file_path, "rb") as tails_file:
+            for chunk in iter(lambda: tails_file.read(cls.CHUNK_SIZE), b""):
+                file_hasher.update(chunk)
+        return base58.b58encode(file_hasher.digest()).decode("utf-8")
+
+    async def _read_chunks(self, tails_file_path: str, upload: TailsUpload):
+        """Stream a tails file from disk, reading off the event loop."""
+        loop = asyncio.get_event_loop()
+        with open(tails_file_path, "rb") as tails_file:
+            while True:
+                chunk = await loop.run_in_executor(
+                    None, tails_file.read, self.CHUNK_SIZE
+                )
+                if not chunk:
+                    break
+                yield chunk
+                # resumed once the chunk has been written to the request
+                upload.bytes_sent += len(chunk)
+
+    def _form(
+        self, genesis_transactions: str, tails_file_path: str, upload: TailsUpload
+    ) -> aiohttp.MultipartWriter:
+        """Build the multipart upload form."""
+        form = aiohttp.MultipartWriter("form-data")
+        part = form.append(genesis_transactions or "")
+        part.set_content_disposition("form-data", name="genesis")
+        part = form.append_payload(
+            AsyncIterablePayload(self._read_chunks(tails_file_path, upload))
+        )
+        part.set_content_disposition(
+            "form-data", name="tails", filename=os.path.basename(tails_file_path)
+        )
+        return form
+
+    async def _already_uploaded(self, url: str, size: int) -> bool:
+        """Check whether the tails server holds a complete copy of the file."""
+        try:
+            async with self._get_session().head(url) as resp:
+                return resp.status == 200 and resp.content_length == size
+        except (aiohttp.ClientError, asyncio.TimeoutError):
+            return False
 
     async def upload_tails_file(
-        self, context, rev_reg_id: str, tails_file_path: str
+        self, context, rev_reg_id: str, tails_file_path: str, tails_hash: str = None,
     ) -> (bool, str):
         """Upload tails file to tails server.
 
         Args:
             rev_reg_id: The revocation registry identifier
             tails_file: The path to the tails file to upload
+            tails_hash: The expected tails file hash, checked before uploading
         """
 
         genesis_transactions = context.settings.get("ledger.genesis_transactions")
@@ -27,13 +153,89 @@ class IndyTailsServer(BaseTailsServer):
                 "tails_server_base_url setting is not set"
             )
 
-        with open(tails_file_path, "rb") as tails_file:
-            async with aiohttp.ClientSession() as session:
-                async with session.put(
-                    f"{tails_server_base_url}/{rev_reg_id}",
-                    data={"genesis": genesis_transactions, "tails": tails_file},
-                ) as resp:
-                    if resp.status == 200:
-                        return True, None
-                    else:
-                        return False, resp.reason
+        loop = asyncio.get_event_loop()
+        if tails_hash:
+            local_hash = await loop.run_in_executor(
+                None, self.tails_hash, tails_file_path
+            )
+            if local_hash != tails_hash:
+                return False, "Tails file hash does not match registry definition"
+
+        url = f"{tails_server_base_url}/{rev_reg_id}"
+        upload = TailsUpload(rev_reg_id, os.path.getsize(tails_file_path))
+        self.uploads[rev_reg_id] = upload
+        try:
+            (ok, reason) = await self._upload(
+                url, genesis_transactions, tails_file_path, upload
+            )
+        finally:
+            self.uploads.pop(rev_reg_id, None)
+
+        duration = time.perf_counter() - upload.started
+        collector: Collector = await context.inject(Collector, required=False)
+        if collector:
+            collector.log("IndyTailsServer.upload_tails_file", duration)
+        if ok:
+            self.uploaded_count += 1
+            self.bytes_uploaded += upload.size
+            LOGGER.debug(
+                "Uploaded tails file for %s: %d bytes in %.3fs, %d attempt(s)",
+                rev_reg_id,
+                upload.size,
+                duration,
+                upload.attempts,
+            )
+        else:
+            self.failed_count += 1
+            LOGGER.warning("Failed to upload tails file for %s: %s", rev_reg_id, reason)
+        return ok, reason
+
+    async def _upload(
+        self,
+        url: str,
+        genesis_transactions: str,
+        tails_file_path: str,
+        upload: TailsUpload,
+    ) -> (bool, str):
+        """Upload a tails file, retrying transient failures."""
+        reason = None
+        for attempt in range(self.MAX_ATTEMPTS):
+            if attempt:
+                self.retry_count += 1
+                await asyncio.sleep(
+                    min(self.BACKOFF * 2 ** (attempt - 1), self.MAX_BACKOFF)
+                )
+                if await self._already_uploaded(url, upload.size):
+                    return True, None
+            upload.attempts += 1
+            upload.bytes_sent = 0
+            async with self._limit:
+                try:
+                    async with self._get_session().put(
+                        url,
+                        data=self._form(genesis_transactions, tails_file_path, upload),
+                    ) as resp:
+                        if resp.status == 200:
+                            return True, None
+                        reason = resp.reason
+                        if resp.status not in self.RETRY_STATUSES:
+                            return False, reason
+                except (aiohttp.ClientError, asyncio.TimeoutError) as err:
+                    reason = str(err) or err.__class__.__name__
+            LOGGER.debug(
+                "Tails upload attempt %d to %s failed: %s", attempt, url, reason
+            )
+        return False, reason
+
+    def status(self) -> dict:
+        """Report uploads in progress and upload counters."""
+        in_progress: Sequence[dict] = [
+            upload.serialize() for upload in self.uploads.values()
+        ]
+        return {
+            "in_progress": in_progress,
+            "uploaded_count": self.uploaded_count,
+            "failed_count": self.failed_count,
+            "retry_count": self.retry_count,
+            "bytes_uploaded": self.bytes_uploaded,
+        }
@@ -1,7 +1,12 @@
+import os
+
+from tempfile import NamedTemporaryFile
+
 from asynctest import TestCase as AsyncTestCase
 from asynctest import mock as async_mock
 
 from ...config.injection_context import InjectionContext
+from ...utils.stats import Collector
 
 from .. import indy_tails_server as test_module
 
@@ -10,7 +15,35 @@ CRED_DEF_ID = f"{TEST_DID}:3:CL:1234:default"
 REV_REG_ID = f"{TEST_DID}:4:{CRED_DEF_ID}:CL_ACCUM:0"
 
 
+def mock_response(status: int, reason: str = None, content_length: int = None):
+    return async_mock.MagicMock(
+        __aenter__=async_mock.CoroutineMock(
+            return_value=async_mock.MagicMock(
+                status=status, reason=reason, content_length=content_length
+            )
+        ),
+        __aexit__=async_mock.CoroutineMock(return_value=False),
+    )
+
+
 class TestIndyTailsServer(AsyncTestCase):
+    def setUp(self):
+        self.context = InjectionContext(
+            settings={
+                "ledger.genesis_transactions": "dummy",
+                "tails_server_base_url": "http://1.2.3.4:8088",
+            }
+        )
+        self.tails_file = NamedTemporaryFile(delete=False)
+        self.tails_file.write(b"\x00\x02" + bytes(range(256)) * 8)
+        self.tails_file.close()
+        self.indy_tails = test_module.IndyTailsServer()
+        self.indy_tails.BACKOFF = 0
+        self.indy_tails._session = async_mock.MagicMock(closed=False)
+
+    def tearDown(self):
+        os.remove(self.tails_file.name)
+
     async def test_upload_no_tails_base_url_x(self):
         context = InjectionContext(settings={"ledger.genesis_transactions": "dummy"})
         indy_tails = test_module.IndyTailsServer()
@@ -19,66 +52,112 @@ class TestIndyTailsServer(AsyncTestCase):
             await indy_tails.upload_tails_file(context, REV_REG_ID, "/tmp/dummy/path")
 
     async def test_upload(self):
-        context = InjectionContext(
-            settings={
-                "ledger.genesis_transactions": "dummy",
-                "tails_server_base_url": "http://1.2.3.4:8088",
-            }
+        collector = Collector()
+        self.context.injector.bind_instance(Collector, collector)
+        self.indy_tails._session.put = async_mock.MagicMock(
+            return_value=mock_response(200)
         )
-        indy_tails = test_module.IndyTailsServer()
+        (ok, reason) = await self.indy_tails.upload_tails_file(
+            self.context, REV_REG_ID, self.tails_file.name
+        )
+        assert ok
+        assert reason is None
+        self.indy_tails._session.put.assert_called_once()
+        assert (
+            self.indy_tails._session.put.call_args[0][0]
+            == f"http://1.2.3.4:8088/{REV_REG_ID}"
+        )
+        status = self.indy_tails.status()
+        assert status["uploaded_count"] == 1
+        assert status["bytes_uploaded"] == os.path.getsize(self.tails_file.name)
+        assert not status["in_progress"]
+        assert "IndyTailsServer.upload_tails_file" in collector.results["avg"]
 
-        with async_mock.patch(
-            "builtins.open", async_mock.MagicMock()
-        ) as mock_open, async_mock.patch.object(
-            test_module.aiohttp, "ClientSession", async_mock.MagicMock()
-        ) as mock_cli_session:
-            mock_open.return_value = async_mock.MagicMock(
-                __enter__=async_mock.MagicMock()
-            )
-            mock_cli_session.return_value = async_mock.MagicMock(
-                __aenter__=async_mock.CoroutineMock(
-                    return_value=async_mock.MagicMock(
-                        put=async_mock.MagicMock(
-                            return_value=async_mock.MagicMock(
-                                __aenter__=async_mock.CoroutineMock(
-                                    return_value=async_mock.MagicMock(status=200)
-                                )
-                            )
-                        )
-                    )
-                )
-            )
-            (ok, reason) = await indy_tails.upload_tails_file(
-                context, REV_REG_ID, "/tmp/dummy/path"
-            )
-            assert ok
-            assert reason is None
-
-        with async_mock.patch(
-            "builtins.open", async_mock.MagicMock()
-        ) as mock_open, async_mock.patch.object(
-            test_module.aiohttp, "ClientSession", async_mock.MagicMock()
-        ) as mock_cli_session:
-            mock_open.return_value = async_mock.MagicMock(
-                __enter__=async_mock.MagicMock()
-            )
-            mock_cli_session.return_value = async_mock.MagicMock(
-                __aenter__=async_mock.CoroutineMock(
-                    return_value=async_mock.MagicMock(
-                        put=async_mock.MagicMock(
-                            return_value=async_mock.MagicMock(
-                                __aenter__=async_mock.CoroutineMock(
-                                    return_value=async_mock.MagicMock(
-                                        status=403, reason="Unauthorized"
-                                    )
-                                )
-                            )
-                        )
-                    )
-                )
-            )
-            (ok, reason) = await indy_tails.upload_tails_file(
-                context, REV_REG_ID, "/tmp/dummy/path"
+        self.indy_tails._session.put = async_mock.MagicMock(
+            return_value=mock_response(403, "Unauthorized")
+        )
+        (ok, reason) = await self.indy_tails.upload_tails_file(
+            self.context, REV_REG_ID, self.tails_file.name
+        )
+        assert not ok
+        assert reason == "Unauthorized"
+        self.indy_tails._session.put.assert_called_once()
+        assert self.indy_tails.status()["failed_count"] == 1
+
+    async def test_upload_retry(self):
+        self.indy_tails._session.put = async_mock.MagicMock(
+            side_effect=[mock_response(503, "Service Unavailable"), mock_response(200),]
+        )
+        self.indy_tails._session.head = async_mock.MagicMock(
+            return_value=mock_response(404)
+        )
+        (ok, reason) = await self.indy_tails.upload_tails_file(
+            self.context, REV_REG_ID, self.tails_file.name
+        )
+        assert ok
+        assert self.indy_tails._session.put.call_count == 2
+        assert self.indy_tails.retry_count == 1
+
+    async def test_upload_retry_exhausted(self):
+        self.indy_tails.MAX_ATTEMPTS = 3
+        self.indy_tails._session.put = async_mock.MagicMock(
+            side_effect=test_module.aiohttp.ClientConnectionError("refused")
+        )
+        self.indy_tails._session.head = async_mock.MagicMock(
+            side_effect=test_module.aiohttp.ClientConnectionError("refused")
+        )
+        (ok, reason) = await self.indy_tails.upload_tails_file(
+            self.context, REV_REG_ID, self.tails_file.name
+        )
+        assert not ok
+        assert reason == "refused"
+        assert self.indy_tails._session.put.call_count == 3
+
+    async def test_upload_resume_complete(self):
+        size = os.path.getsize(self.tails_file.name)
+        self.indy_tails._session.put = async_mock.MagicMock(
+            return_value=mock_response(502, "Bad Gateway")
+        )
+        self.indy_tails._session.head = async_mock.MagicMock(
+            return_value=mock_response(200, content_length=size)
+        )
+        (ok, reason) = await self.indy_tails.upload_tails_file(
+            self.context, REV_REG_ID, self.tails_file.name
+        )
+        assert ok
+        self.indy_tails._session.put.assert_called_once()
+
+    async def test_upload_hash_mismatch(self):
+        self.indy_tails._session.put = async_mock.MagicMock()
+        tails_hash = test_module.IndyTailsServer.tails_hash(self.tails_file.name)
+        (ok, reason) = await self.indy_tails.upload_tails_file(
+            self.context, REV_REG_ID, self.tails_file.name, "not-" + tails_hash
+        )
+        assert not ok
+        assert "hash" in reason
+        self.indy_tails._session.put.assert_not_called()
+
+    async def test_read_chunks(self):
+        self.indy_tails.CHUNK_SIZE = 100
+        size = os.path.getsize(self.tails_file.name)
+        upload = test_module.TailsUpload(REV_REG_ID, size)
+        chunks = [
+            chunk
+            async for chunk in self.indy_tails._read_chunks(
+                self.tails_file.name, upload
             )
-            assert not ok
-            assert reason == "Unauthorized"
+        ]
+        assert len(chunks) == -(-size // 100)
+        with open(self.tails_file.name, "rb") as tails_file:
+            assert b"".join(chunks) == tails_file.read()
+        assert upload.bytes_sent == size
+
+    async def test_read_chunks_sent(self):
+        self.indy_tails.CHUNK_SIZE = 100
+        upload = test_module.TailsUpload(REV_REG_ID, 250)
+        chunks = self.indy_tails._read_chunks(self.tails_file.name, upload)
+        await chunks.__anext__()
+        assert upload.bytes_sent == 0  # not yet written
+        await chunks.__anext__()
+        assert upload.bytes_sent == 100
+        await chunks.aclose()
@@ -0,0 +1,92 @@
+"""In-process loopback transport, connecting agents running in the same process."""
+
+import logging
+from typing import Union
+
+from .base import BaseInboundTransport, InboundTransportSetupError
+
+LOGGER = logging.getLogger(__name__)
+
+# the running loopback transports, by address
+LOOPBACK_TRANSPORTS = {}
+
+
+class LoopbackTransport(BaseInboundTransport):
+    """
+    Loopback transport class.
+
+    Messages are handed over in memory by the loopback outbound transport of
+    another agent in the same process, addressed to the endpoint
+    `loopback://<host>:<port>`. The host and port only name the transport and
+    no socket is opened, so that many agents can be run together without any
+    network I/O, as in tests and benchmarks.
+    """
+
+    def __init__(self, host: str, port: int, create_session, **kwargs) -> None:
+        """
+        Initialize an inbound loopback transport instance.
+
+        Args:
+            host: Host name of the transport address
+            port: Port of the transport address
+            create_session: Method to create a new inbound session
+
+        """
+        super().__init__("loopback", create_session, **kwargs)
+        self.host = host
+        self.port = port
+
+    @property
+    def address(self) -> str:
+        """Accessor for the address of the transport in its endpoint."""
+        return f"{self.host}:{self.port}"
+
+    async def start(self) -> None:
+        """
+        Start this transport.
+
+        Raises:
+            InboundTransportSetupError: If the address is already in use
+
+        """
+        if self.address in LOOPBACK_TRANSPORTS:
+            raise InboundTransportSetupError(
+                f"Loopback address '{self.address}' is already in use"
+            )
+        LOOPBACK_TRANSPORTS[self.address] = self
+
+    async def stop(self) -> None:
+        """Stop this transport."""
+        if LOOPBACK_TRANSPORTS.get(self.address) is self:
+            del LOOPBACK_TRANSPORTS[self.address]
+
+    async def receive(self, payload: Union[str, bytes]) -> Union[str, bytes]:
+        """
+        Receive a message from another agent.
+
+        Args:
+            payload: The encoded message
+
+        Returns:
+            The direct response, if one was requested and sent
+
+        Raises:
+            MessageParseError: If the message could not be parsed
+
+        """
+        session = await self.create_session(
+            accept_undelivered=True,
+            can_respond=True,
+            client_info={"host": self.host, "remote": "loopback"},
+        )
+
+        async with session:
+            inbound = await session.receive(payload)
+
+            if inbound.receipt.direct_response_requested:
+                response = await session.wait_response()
+
+                # no more responses
+                session.can_respond = False
+                session.clear_response()
+                return response
@@ -8,6 +8,7 @@ from typing import Callable, Coroutine
 
 from ...config.injection_context import InjectionContext
 from ...utils.classloader import ClassLoader, ModuleLoadError, ClassNotFoundError
+from ...utils.spans import SpanTracer
 from ...utils.task_queue import CompletedTask, TaskQueue
 
 from ..outbound.message import OutboundMessage
@@ -44,6 +45,7 @@ class InboundTransportManager:
         self.running_transports = {}
         self.sessions = OrderedDict()
         self.session_limit: asyncio.Semaphore = None
+        self.span_tracer: SpanTracer = None
         self.task_queue = TaskQueue()
         self.undelivered_queue: DeliveryQueue = None
 
@@ -66,6 +68,8 @@ class InboundTransportManager:
         if self.context.settings.get("transport.enable_undelivered_queue"):
             self.undelivered_queue = DeliveryQueue()
 
+        self.span_tracer = await self.context.inject(SpanTracer, required=False)
+
         # self.session_limit = asyncio.Semaphore(50)
 
     def register(self, config: InboundTransportConfiguration) -> str:
@@ -172,6 +176,7 @@ class InboundTransportManager:
             close_handler=self.closed_session,
             inbound_handler=self.receive_inbound,
             session_id=str(uuid.uuid4()),
+            span_tracer=self.span_tracer,
             transport_type=transport_type,
             wire_format=wire_format,
         )
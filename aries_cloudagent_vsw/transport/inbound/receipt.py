@@ -2,6 +2,8 @@
 
 from datetime import datetime
 
+from ...utils.spans import MessageTrace
+
 
 class MessageReceipt:
     """Properties of an agent message's delivery."""
@@ -24,7 +26,9 @@ class MessageReceipt:
         recipient_did_public: bool = None,
         sender_did: str = None,
         sender_verkey: str = None,
+        spans: MessageTrace = None,
         thread_id: str = None,
+        trace: bool = None,
     ):
         """Initialize the message delivery instance."""
         self._connection_id = connection_id
@@ -36,7 +40,9 @@ class MessageReceipt:
         self._recipient_did_public = recipient_did_public
         self._sender_did = sender_did
         self._sender_verkey = sender_verkey
+        self._spans = spans
         self._thread_id = thread_id
+        self._trace = trace
 
     @property
     def connection_id(self) -> str:
@@ -244,6 +250,28 @@ class MessageReceipt:
         """
         self._sender_verkey = verkey
 
+    @property
+    def spans(self) -> MessageTrace:
+        """
+        Accessor for the latency spans of the message, if it is sampled.
+
+        Returns:
+            The message trace, or `None`
+
+        """
+        return self._spans
+
+    @spans.setter
+    def spans(self, spans: MessageTrace):
+        """
+        Setter for the latency spans of the message.
+
+        Args:
+            spans: The message trace
+
+        """
+        self._spans = spans
+
     @property
     def thread_id(self) -> str:
         """
@@ -266,6 +294,28 @@ class MessageReceipt:
         """
         self._thread_id = thread
 
+    @property
+    def trace(self) -> bool:
+        """
+        Accessor for whether trace events are logged for the message.
+
+        Returns:
+            The tracing decision made on receipt, or `None` if undecided
+
+        """
+        return self._trace
+
+    @trace.setter
+    def trace(self, trace: bool):
+        """
+        Setter for whether trace events are logged for the message.
+
+        Args:
+            trace: The tracing decision
+
+        """
+        self._trace = trace
+
     def __repr__(self) -> str:
         """
         Provide a human readable representation of this object.
@@ -5,6 +5,7 @@ import logging
 from typing import Callable, Sequence, Union
 
 from ...config.injection_context import InjectionContext
+from ...utils.spans import SpanTracer
 
 from ..error import WireFormatError
 from ..outbound.message import OutboundMessage
@@ -46,6 +47,7 @@ class InboundSession:
         reply_mode: str = None,
         reply_thread_ids: Sequence[str] = None,
         reply_verkeys: Sequence[str] = None,
+        span_tracer: SpanTracer = None,
         transport_type: str = None,
     ):
         """Initialize the inbound session."""
@@ -59,6 +61,7 @@ class InboundSession:
         self.close_handler = close_handler
         self.response_buffer: OutboundMessage = None
         self.response_event = asyncio.Event()
+        self.span_tracer = span_tracer
         self.transport_type = transport_type
 
         self._can_respond = can_respond
@@ -164,9 +167,25 @@ class InboundSession:
 
     async def parse_inbound(self, payload_enc: Union[str, bytes]) -> InboundMessage:
         """Convert a message payload and to an inbound message."""
-        payload, receipt = await self.wire_format.parse_message(
-            self.context, payload_enc
+        spans = self.span_tracer and self.span_tracer.sample(
+            "inbound_message", transport=self.transport_type
         )
+        if not spans:
+            payload, receipt = await self.wire_format.parse_message(
+                self.context, payload_enc
+            )
+        else:
+            span = spans.start("inbound.unpack")
+            try:
+                payload, receipt = await self.wire_format.parse_message(
+                    self.context, payload_enc
+                )
+            except Exception:
+                span.finish(error=True)
+                spans.root.finish(error=True)
+                raise
+            span.finish()
+            receipt.spans = spans
         return InboundMessage(
             payload,
             receipt,
@@ -257,11 +276,15 @@ class InboundSession:
             if self.response_buffer:
                 response = self.response_buffer.enc_payload
                 if not response:
+                    spans = self.response_buffer.spans
+                    span = spans and spans.start("outbound.encode", direct=True)
                     try:
                         response = await self.encode_outbound(self.response_buffer)
                     except WireFormatError as e:
                         LOGGER.warning("Error encoding direct response: %s", str(e))
                         self.clear_response()
+                    if span:
+                        span.finish(error=True if not response else None)
                 if response:
                     return response
             self.response_event.clear()
@@ -0,0 +1,76 @@
+import asyncio
+import json
+
+import pytest
+
+from asynctest import TestCase as AsyncTestCase
+
+from ...outbound.message import OutboundMessage
+from ...wire_format import JsonWireFormat
+
+from ..loopback import LOOPBACK_TRANSPORTS, LoopbackTransport
+from ..message import InboundMessage
+from ..session import InboundSession
+from .. import loopback as test_module
+
+
+class TestLoopbackTransport(AsyncTestCase):
+    def setUp(self):
+        self.message_results = []
+        self.session = None
+        self.transport = LoopbackTransport("agent", 8020, self.create_session)
+        self.transport.wire_format = JsonWireFormat()
+        self.response_message = None
+
+    def create_session(
+        self,
+        transport_type,
+        *,
+        client_info,
+        wire_format,
+        can_respond: bool = False,
+        **kwargs
+    ):
+        self.session = InboundSession(
+            context=None,
+            can_respond=can_respond,
+            inbound_handler=self.receive_message,
+            session_id=None,
+            wire_format=wire_format,
+            client_info=client_info,
+            transport_type=transport_type,
+        )
+        result = asyncio.Future()
+        result.set_result(self.session)
+        return result
+
+    def receive_message(self, message: InboundMessage, can_respond: bool = False):
+        self.message_results.append((message.payload, message.receipt, can_respond))
+        if self.response_message:
+            self.session.set_response(self.response_message)
+
+    async def test_start_stop(self):
+        await self.transport.start()
+        assert LOOPBACK_TRANSPORTS["agent:8020"] is self.transport
+
+        with pytest.raises(test_module.InboundTransportSetupError):
+            await LoopbackTransport("agent", 8020, self.create_session).start()
+
+        await self.transport.stop()
+        assert "agent:8020" not in LOOPBACK_TRANSPORTS
+
+    async def test_receive(self):
+        test_message = {"test": "message"}
+        assert await self.transport.receive(json.dumps(test_message)) is None
+        assert self.session.transport_type == "loopback"
+        assert self.message_results == [
+            (test_message, self.message_results[0][1], True)
+        ]
+
+    async def test_receive_response(self):
+        test_message = {"~transport": {"return_route": "all"}, "test": "message"}
+        self.response_message = OutboundMessage(
+            payload=None, enc_payload=json.dumps({"response": "ok"})
+        )
+        response = await self.transport.receive(json.dumps(test_message))
+        assert json.loads(response) == {"response": "ok"}
@@ -4,6 +4,7 @@ import pytest
 from asynctest import TestCase, mock as async_mock
 
 from ....config.injection_context import InjectionContext
+from ....utils.spans import SpanTracer
 
 from ...error import WireFormatError
 from ...outbound.message import OutboundMessage
@@ -100,6 +101,37 @@ class TestInboundSession(TestCase):
         assert result.session_id == test_session_id
         assert result.transport_type == test_transport_type
 
+    async def test_parse_inbound_spans(self):
+        test_wire_format = async_mock.MagicMock()
+        test_wire_format.parse_message = async_mock.CoroutineMock(
+            side_effect=[("parsed-payload", MessageReceipt()), WireFormatError()]
+        )
+        tracer = SpanTracer(1.0, "unused")
+        sess = InboundSession(
+            context=InjectionContext(),
+            inbound_handler=None,
+            session_id="session-id",
+            span_tracer=tracer,
+            transport_type="http",
+            wire_format=test_wire_format,
+        )
+
+        with async_mock.patch.object(tracer, "record", autospec=True) as mock_record:
+            result = await sess.parse_inbound("{}")
+            spans = result.receipt.spans
+            assert spans.root.attributes == {"transport": "http"}
+            [[[unpack], _]] = mock_record.call_args_list
+            assert unpack.name == "inbound.unpack"
+            assert unpack.parent_id == spans.root.span_id
+
+            mock_record.reset_mock()
+            with self.assertRaises(WireFormatError):
+                await sess.parse_inbound("{}")
+            assert [call[0][0].name for call in mock_record.call_args_list] == [
+                "inbound.unpack",
+                "inbound_message",
+            ]
+
     async def test_receive(self):
         test_ctx = InjectionContext()
         sess = InboundSession(
@@ -220,6 +252,29 @@ class TestInboundSession(TestCase):
         sess.close()
         assert await asyncio.wait_for(sess.wait_response(), 0.1) is None
 
+    async def test_wait_response_spans(self):
+        sess = InboundSession(
+            context=InjectionContext(),
+            inbound_handler=None,
+            session_id=None,
+            wire_format=None,
+        )
+        tracer = SpanTracer(1.0, "unused")
+        sess.set_response(
+            OutboundMessage(payload=None, spans=tracer.sample("inbound_message"))
+        )
+
+        with async_mock.patch.object(
+            sess, "encode_outbound", async_mock.CoroutineMock()
+        ) as encode, async_mock.patch.object(
+            tracer, "record", autospec=True
+        ) as mock_record:
+            result = await asyncio.wait_for(sess.wait_response(), 0.1)
+            assert result is encode.return_value
+            [[[encode_span], _]] = mock_record.call_args_list
+            assert encode_span.name == "outbound.encode"
+            assert encode_span.attributes == {"direct": True}
+
     async def test_wait_response_x(self):
         test_ctx = InjectionContext()
         sess = InboundSession(
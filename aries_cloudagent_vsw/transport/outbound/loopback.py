@@ -0,0 +1,55 @@
+"""In-process loopback outbound transport."""
+
+import logging
+from typing import Union
+from urllib.parse import urlparse
+
+from ...config.injection_context import InjectionContext
+from ...messaging.error import MessageParseError
+
+from ..inbound.loopback import LOOPBACK_TRANSPORTS
+
+from .base import BaseOutboundTransport, OutboundTransportError
+
+
+class LoopbackTransport(BaseOutboundTransport):
+    """Loopback outbound transport class."""
+
+    schemes = ("loopback",)
+
+    def __init__(self) -> None:
+        """Initialize a `LoopbackTransport` instance."""
+        super().__init__()
+        self.logger = logging.getLogger(__name__)
+
+    async def start(self):
+        """Start the outbound transport."""
+        return self
+
+    async def stop(self):
+        """Stop the outbound transport."""
+
+    async def handle_message(
+        self, context: InjectionContext, payload: Union[str, bytes], endpoint: str
+    ):
+        """
+        Handle message from queue.
+
+        Args:
+            context: the context that produced the message
+            payload: message payload in string or byte format
+            endpoint: URI endpoint for delivery
+        """
+        if not endpoint:
+            raise OutboundTransportError("No endpoint provided")
+        transport = LOOPBACK_TRANSPORTS.get(urlparse(endpoint).netloc)
+        if not transport:
+            raise OutboundTransportError(
+                f"No loopback transport is running at {endpoint}"
+            )
+        try:
+            await transport.receive(payload)
+        except MessageParseError as e:
+            raise OutboundTransportError(
+                f"Message could not be parsed by {endpoint}"
+            ) from e
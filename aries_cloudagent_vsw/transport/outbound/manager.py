@@ -11,10 +11,11 @@ from urllib.parse import urlparse
 from ...connections.models.connection_target import ConnectionTarget
 from ...config.injection_context import InjectionContext
 from ...utils.classloader import ClassLoader, ModuleLoadError, ClassNotFoundError
+from ...utils.spans import Span
 from ...utils.stats import Collector
 from ...utils.task_queue import CompletedTask, TaskQueue, task_exc_info
 
-from ...utils.tracing import trace_event, get_timer
+from ...utils.tracing import trace_event, get_timer, tracing_enabled
 
 from ..wire_format import BaseWireFormat
 
@@ -54,11 +55,23 @@ class QueuedOutboundMessage:
         self.payload: Union[str, bytes] = None
         self.retries = None
         self.retry_at: float = None
+        self.span: Span = None
         self.state = self.STATE_NEW
         self.target = target
         self.task: asyncio.Task = None
+        self.trace = False
         self.transport_id: str = transport_id
 
+    def start_span(self, name: str, **attributes):
+        """Finish the open span of a sampled message and start the next step."""
+        self.span.finish()
+        self.span = self.message.spans.start(name, **attributes)
+
+    def finish_span(self, **attributes):
+        """Finish the open span of a sampled message."""
+        self.span.finish(**attributes)
+        self.span = None
+
 
 class OutboundTransportManager:
     """Outbound transport manager class."""
@@ -87,6 +100,7 @@ class OutboundTransportManager:
         self.running_transports = {}
         self.task_queue = TaskQueue(max_active=200)
         self._process_task: asyncio.Task = None
+        self.trace_enabled = bool(self.context.settings.get("trace.enabled"))
         if self.context.settings.get("transport.max_outbound_retry"):
             self.MAX_RETRY_COUNT = self.context.settings["transport.max_outbound_retry"]
 
@@ -254,6 +268,12 @@ class OutboundTransportManager:
 
         queued = QueuedOutboundMessage(context, outbound, target, transport_id)
         queued.retries = self.MAX_RETRY_COUNT
+        trace = outbound.trace
+        if trace is None:
+            trace = tracing_enabled(self.context.settings, outbound)
+        queued.trace = self.trace_enabled or bool(trace)
+        if outbound.spans:
+            queued.span = outbound.spans.start("outbound.queue")
         self.outbound_new.append(queued)
         self.process_queued()
 
@@ -279,6 +299,7 @@ class OutboundTransportManager:
         queued.payload = json.dumps(payload)
         queued.state = QueuedOutboundMessage.STATE_PENDING
         queued.retries = 4 if max_attempts is None else max_attempts - 1
+        queued.trace = bool(tracing_enabled(self.context.settings, payload))
         self.outbound_new.append(queued)
         self.process_queued()
 
@@ -342,20 +363,25 @@ class OutboundTransportManager:
 
                 if deliver:
                     queued.state = QueuedOutboundMessage.STATE_DELIVER
-                    p_time = trace_event(
-                        self.context.settings,
-                        queued.message if queued.message else queued.payload,
-                        outcome="OutboundTransportManager.DELIVER.START."
-                        + queued.endpoint,
-                    )
-                    self.deliver_queued_message(queued)
-                    trace_event(
-                        self.context.settings,
-                        queued.message if queued.message else queued.payload,
-                        outcome="OutboundTransportManager.DELIVER.END."
-                        + queued.endpoint,
-                        perf_counter=p_time,
-                    )
+                    if queued.trace:
+                        p_time = trace_event(
+                            self.context.settings,
+                            queued.message if queued.message else queued.payload,
+                            outcome="OutboundTransportManager.DELIVER.START."
+                            + queued.endpoint,
+                            force_trace=True,
+                        )
+                        self.deliver_queued_message(queued)
+                        trace_event(
+                            self.context.settings,
+                            queued.message if queued.message else queued.payload,
+                            outcome="OutboundTransportManager.DELIVER.END."
+                            + queued.endpoint,
+                            perf_counter=p_time,
+                            force_trace=True,
+                        )
+                    else:
+                        self.deliver_queued_message(queued)
 
                 upd_buffer.append(queued)
 
@@ -371,18 +397,23 @@ class OutboundTransportManager:
                         new_pending += 1
                     else:
                         queued.state = QueuedOutboundMessage.STATE_ENCODE
-                        p_time = trace_event(
-                            self.context.settings,
-                            queued.message if queued.message else queued.payload,
-                            outcome="OutboundTransportManager.ENCODE.START",
-                        )
-                        self.encode_queued_message(queued)
-                        trace_event(
-                            self.context.settings,
-                            queued.message if queued.message else queued.payload,
-                            outcome="OutboundTransportManager.ENCODE.END",
-                            perf_counter=p_time,
-                        )
+                        if queued.trace:
+                            p_time = trace_event(
+                                self.context.settings,
+                                queued.message if queued.message else queued.payload,
+                                outcome="OutboundTransportManager.ENCODE.START",
+                                force_trace=True,
+                            )
+                            self.encode_queued_message(queued)
+                            trace_event(
+                                self.context.settings,
+                                queued.message if queued.message else queued.payload,
+                                outcome="OutboundTransportManager.ENCODE.END",
+                                perf_counter=p_time,
+                                force_trace=True,
+                            )
+                        else:
+                            self.encode_queued_message(queued)
                 else:
                     new_pending += 1
 
@@ -408,6 +439,8 @@ class OutboundTransportManager:
 
     async def perform_encode(self, queued: QueuedOutboundMessage):
         """Perform message encoding."""
+        if queued.span:
+            queued.start_span("outbound.encode")
         transport = self.get_transport_instance(queued.transport_id)
         wire_format = transport.wire_format or await queued.context.inject(
             BaseWireFormat
@@ -425,20 +458,33 @@ class OutboundTransportManager:
         if completed.exc_info:
             queued.error = completed.exc_info
             queued.state = QueuedOutboundMessage.STATE_DONE
+            if queued.span:
+                queued.finish_span(error=True)
         else:
             queued.state = QueuedOutboundMessage.STATE_PENDING
+            if queued.span:
+                queued.start_span("outbound.queue")
         queued.task = None
         self.process_queued()
 
     def deliver_queued_message(self, queued: QueuedOutboundMessage) -> asyncio.Task:
         """Kick off delivery of a queued message."""
         transport = self.get_transport_instance(queued.transport_id)
+        deliver = transport.handle_message(
+            queued.context, queued.payload, queued.endpoint
+        )
+        if queued.span:
+            deliver = self.perform_deliver_span(queued, deliver)
         queued.task = self.task_queue.run(
-            transport.handle_message(queued.context, queued.payload, queued.endpoint),
-            lambda completed: self.finished_deliver(queued, completed),
+            deliver, lambda completed: self.finished_deliver(queued, completed),
         )
         return queued.task
 
+    async def perform_deliver_span(self, queued: QueuedOutboundMessage, deliver):
+        """Record the delivery span of a sampled message."""
+        queued.start_span("outbound.deliver", endpoint=queued.endpoint)
+        await deliver
+
     def finished_deliver(self, queued: QueuedOutboundMessage, completed: CompletedTask):
         """Handle completion of queued message delivery."""
         if completed.exc_info:
@@ -468,15 +514,22 @@ class OutboundTransportManager:
                 queued.retries -= 1
                 queued.state = QueuedOutboundMessage.STATE_RETRY
                 queued.retry_at = time.perf_counter() + 10
+                if queued.span:
+                    queued.span.attributes["error"] = True
+                    queued.start_span("outbound.retry_wait")
             else:
                 LOGGER.exception(
                     ">>> Outbound message failed to deliver, NOT Re-queued.",
                     exc_info=queued.error,
                 )
                 queued.state = QueuedOutboundMessage.STATE_DONE
+                if queued.span:
+                    queued.finish_span(error=True)
         else:
             queued.error = None
             queued.state = QueuedOutboundMessage.STATE_DONE
+            if queued.span:
+                queued.finish_span()
         queued.task = None
         self.process_queued()
 
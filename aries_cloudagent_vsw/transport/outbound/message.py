@@ -3,6 +3,7 @@
 from typing import Sequence, Union
 
 from ...connections.models.connection_target import ConnectionTarget
+from ...utils.spans import MessageTrace
 
 
 class OutboundMessage:
@@ -19,9 +20,11 @@ class OutboundMessage:
         reply_thread_id: str = None,
         reply_to_verkey: str = None,
         reply_from_verkey: str = None,
+        spans: MessageTrace = None,
         target: ConnectionTarget = None,
         target_list: Sequence[ConnectionTarget] = None,
         to_session_only: bool = False,
+        trace: bool = None,
     ):
         """Initialize an outgoing message."""
         self.connection_id = connection_id
@@ -32,9 +35,11 @@ class OutboundMessage:
         self.reply_thread_id = reply_thread_id
         self.reply_to_verkey = reply_to_verkey
         self.reply_from_verkey = reply_from_verkey
+        self.spans = spans
         self.target = target
         self.target_list = list(target_list) if target_list else []
         self.to_session_only = to_session_only
+        self.trace = trace
 
     def __repr__(self) -> str:
         """
@@ -0,0 +1,44 @@
+from asynctest import TestCase as AsyncTestCase
+from asynctest import mock as async_mock
+
+from ....config.injection_context import InjectionContext
+from ....messaging.error import MessageParseError
+
+from ..base import OutboundTransportError
+from ..loopback import LoopbackTransport
+from .. import loopback as test_module
+
+
+class TestLoopbackTransport(AsyncTestCase):
+    async def setUp(self):
+        self.context = InjectionContext()
+        self.inbound = async_mock.MagicMock(receive=async_mock.CoroutineMock())
+        self.transport = LoopbackTransport()
+        await self.transport.start()
+
+    async def test_handle_message(self):
+        with async_mock.patch.dict(
+            test_module.LOOPBACK_TRANSPORTS, {"agent:8020": self.inbound}
+        ):
+            await self.transport.handle_message(
+                self.context, b"{}", "loopback://agent:8020"
+            )
+        self.inbound.receive.assert_awaited_once_with(b"{}")
+        await self.transport.stop()
+
+    async def test_handle_message_x(self):
+        with self.assertRaises(OutboundTransportError):
+            await self.transport.handle_message(self.context, "{}", None)
+        with self.assertRaises(OutboundTransportError):
+            await self.transport.handle_message(
+                self.context, "{}", "loopback://missing:1"
+            )
+
+        self.inbound.receive.side_effect = MessageParseError()
+        with async_mock.patch.dict(
+            test_module.LOOPBACK_TRANSPORTS, {"agent:8020": self.inbound}
+        ):
+            with self.assertRaises(OutboundTransportError):
+                await self.transport.handle_message(
+                    self.context, "{}", "loopback://agent:8020"
+                )
@@ -5,6 +5,7 @@ from asynctest import TestCase as AsyncTestCase, mock as async_mock
 
 from ....config.injection_context import InjectionContext
 from ....connections.models.connection_target import ConnectionTarget
+from ....utils.spans import SpanTracer
 
 from .. import manager as test_module
 from ..manager import (
@@ -113,6 +114,99 @@ class TestOutboundTransportManager(AsyncTestCase):
         assert mgr.get_running_transport_for_scheme("http") is None
         transport.stop.assert_awaited_once_with()
 
+    async def test_send_message_spans(self):
+        mgr = OutboundTransportManager(InjectionContext())
+        transport = async_mock.MagicMock()
+        transport.handle_message = async_mock.CoroutineMock(
+            side_effect=[ValueError(), None]
+        )
+        transport.wire_format.encode_message = async_mock.CoroutineMock()
+        transport.start = async_mock.CoroutineMock()
+        transport.stop = async_mock.CoroutineMock()
+        transport.schemes = ["http"]
+        transport_cls = async_mock.MagicMock(schemes=["http"], return_value=transport)
+        mgr.register_class(transport_cls, "transport_cls")
+        await mgr.start()
+        await mgr.task_queue
+
+        tracer = SpanTracer(1.0, "unused")
+        message = OutboundMessage(payload="{}", spans=tracer.sample("inbound_message"))
+        message.target = ConnectionTarget(
+            endpoint="http://localhost", recipient_keys=[1], sender_key=2
+        )
+        with async_mock.patch.object(
+            tracer, "record", autospec=True
+        ) as mock_record, async_mock.patch.object(
+            test_module, "get_timer", async_mock.MagicMock()
+        ) as mock_timer:
+            # retry immediately
+            mock_timer.return_value = float("inf")
+            mgr.enqueue_message(InjectionContext(), message)
+            await mgr.flush()
+
+        spans = [call[0][0] for call in mock_record.call_args_list]
+        assert [span.name for span in spans] == [
+            "outbound.queue",
+            "outbound.encode",
+            "outbound.queue",
+            "outbound.deliver",
+            "outbound.retry_wait",
+            "outbound.deliver",
+        ]
+        assert spans[3].attributes == {"endpoint": "http://localhost", "error": True}
+        assert spans[-1].attributes == {"endpoint": "http://localhost"}
+        assert all(span.parent_id == message.spans.root.span_id for span in spans)
+        await mgr.stop()
+
+    async def test_send_message_trace(self):
+        mgr = OutboundTransportManager(InjectionContext())
+        transport = async_mock.MagicMock()
+        transport.handle_message = async_mock.CoroutineMock()
+        transport.wire_format.encode_message = async_mock.CoroutineMock()
+        transport.start = async_mock.CoroutineMock()
+        transport.stop = async_mock.CoroutineMock()
+        transport.schemes = ["http"]
+        transport_cls = async_mock.MagicMock(schemes=["http"], return_value=transport)
+        mgr.register_class(transport_cls, "transport_cls")
+        await mgr.start()
+        await mgr.task_queue
+
+        target = ConnectionTarget(
+            endpoint="http://localhost", recipient_keys=[1], sender_key=2
+        )
+        with async_mock.patch.object(
+            test_module, "trace_event", async_mock.MagicMock()
+        ) as mock_trace, async_mock.patch.object(
+            test_module, "tracing_enabled", async_mock.MagicMock()
+        ) as mock_enabled:
+            mgr.enqueue_message(
+                InjectionContext(),
+                OutboundMessage(payload='{"trace": true}', target=target, trace=False),
+            )
+            await mgr.flush()
+            mock_enabled.assert_not_called()
+            mock_trace.assert_not_called()
+
+            mgr.enqueue_message(
+                InjectionContext(),
+                OutboundMessage(payload="{}", target=target, trace=True),
+            )
+            await mgr.flush()
+            assert mock_trace.call_count == 4
+            assert all(call[1]["force_trace"] for call in mock_trace.call_args_list)
+
+            # undecided, as for messages not created by a responder
+            mock_trace.reset_mock()
+            mock_enabled.return_value = False
+            mgr.enqueue_message(
+                InjectionContext(), OutboundMessage(payload="{}", target=target)
+            )
+            await mgr.flush()
+            mock_enabled.assert_called_once()
+            mock_trace.assert_not_called()
+
+        await mgr.stop()
+
     async def test_stop_cancel(self):
         context = InjectionContext()
         context.update_settings({"transport.outbound_configs": ["http"]})
@@ -95,6 +95,11 @@ class PackWireFormat(BaseWireFormat):
         if transport_dec:
             receipt.direct_response_mode = transport_dec.get("return_route")
 
+        # decide once whether to log trace events as the message is handled
+        receipt.trace = bool(
+            context.settings.get("trace.enabled") or message_dict.get("~trace")
+        )
+
         LOGGER.debug(f"Expanded message: {message_dict}")
 
         return message_dict, receipt
@@ -116,6 +116,19 @@ class TestPackWireFormat(AsyncTestCase):
         assert message_dict["@type"] == self.test_message_type
         assert delivery.thread_id == self.test_thread_id
         assert delivery.direct_response_mode == "all"
+        assert delivery.trace is False
+
+    async def test_trace(self):
+        serializer = PackWireFormat()
+        message = dict(self.test_message, **{"~trace": {"target": "log"}})
+        _, delivery = await serializer.parse_message(self.context, json.dumps(message))
+        assert delivery.trace is True
+
+        self.context.update_settings({"trace.enabled": True})
+        _, delivery = await serializer.parse_message(
+            self.context, json.dumps(self.test_message)
+        )
+        assert delivery.trace is True
 
     async def test_fallback(self):
         serializer = PackWireFormat()
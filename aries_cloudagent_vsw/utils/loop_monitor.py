@@ -0,0 +1,147 @@
+"""Event loop lag measurement and capture of the calls blocking the loop."""
+
+import asyncio
+import logging
+import sys
+import threading
+import time
+import traceback
+from collections import deque
+
+from .metrics import Metrics
+from .stats import PERCENTILES, Histogram
+
+LOGGER = logging.getLogger(__name__)
+
+
+class LoopMonitor:
+    """
+    Measure the scheduling lag of the event loop and report the calls blocking it.
+
+    A task on the loop sleeps for a fixed interval and records how late it is
+    woken. Before each sleep it leaves a heartbeat, which a watchdog thread
+    checks: once the task is late by more than the threshold, the loop is
+    blocked, and the watchdog captures the stack of the loop thread, which is
+    the call blocking it. The stall is reported with that stack when the loop
+    recovers.
+    """
+
+    def __init__(
+        self,
+        threshold: float,
+        interval: float = 0.1,
+        *,
+        max_stalls: int = 20,
+        metrics: Metrics = None,
+    ):
+        """
+        Initialize a `LoopMonitor` instance.
+
+        Args:
+            threshold: The lag above which the loop is considered blocked,
+                in seconds
+            interval: The interval between measurements, in seconds
+            max_stalls: The number of recent stalls to keep
+            metrics: The metrics to report the lag in
+
+        """
+        self.threshold = threshold
+        self.interval = interval
+        self.metrics = metrics
+        self.histogram = Histogram()
+        self.max_lag = 0.0
+        self.stall_count = 0
+        self.stall_total = 0  # not reset, for the stalls counter metric
+        self.stalls = deque(maxlen=max_stalls)
+        self._beat: float = None
+        self._captured: float = None
+        self._stack: list = None
+        self._loop_thread: int = None
+        self._stopped = threading.Event()
+        self._task: asyncio.Future = None
+        self._watchdog: threading.Thread = None
+
+    async def start(self):
+        """Start measuring the lag and watching for stalls."""
+        self._loop_thread = threading.get_ident()
+        self._stopped.clear()
+        self._task = asyncio.ensure_future(self._monitor())
+        self._watchdog = threading.Thread(
+            target=self._watch, name="loop-monitor", daemon=True
+        )
+        self._watchdog.start()
+
+    async def stop(self):
+        """Stop the monitor."""
+        self._stopped.set()
+        if self._task:
+            self._task.cancel()
+            await asyncio.gather(self._task, return_exceptions=True)
+            self._task = None
+        if self._watchdog:
+            self._watchdog.join()
+            self._watchdog = None
+
+    async def _monitor(self):
+        """Measure the lag of each wake-up of the loop."""
+        loop = asyncio.get_event_loop()
+        while True:
+            expected = loop.time() + self.interval
+            self._beat = time.perf_counter()
+            await asyncio.sleep(self.interval)
+            self.record(max(loop.time() - expected, 0.0))
+
+    def record(self, lag: float):
+        """Record a measured lag, reporting a stall if it is above the threshold."""
+        (stack, self._stack) = (self._stack, None)
+        self.histogram.add(lag)
+        if lag > self.max_lag:
+            self.max_lag = lag
+        if self.metrics:
+            self.metrics.event_loop_lag.observe(lag)
+        if lag >= self.threshold:
+            self.stall_count += 1
+            self.stall_total += 1
+            self.stalls.append({"lag": lag, "time": time.time(), "stack": stack})
+            if self.metrics:
+                self.metrics.event_loop_stalls.set(self.stall_total)
+            LOGGER.warning(
+                "Event loop blocked for %.3fs%s",
+                lag,
+                stack and ":\n" + "".join(stack) or "",
+            )
+
+    def _watch(self):
+        """Capture the stack of the loop thread once it is late to wake."""
+        limit = self.interval + self.threshold
+        while not self._stopped.wait(self.threshold / 2):
+            beat = self._beat
+            if (
+                beat is not None
+                and beat != self._captured
+                and time.perf_counter() - beat > limit
+            ):
+                frame = sys._current_frames().get(self._loop_thread)
+                if frame:
+                    self._stack = traceback.format_stack(frame)
+                    self._captured = beat
+
+    def reset(self):
+        """Clear the measurements, other than the total number of stalls."""
+        self.histogram = Histogram()
+        self.max_lag = 0.0
+        self.stall_count = 0
+        self.stalls.clear()
+
+    def status(self) -> dict:
+        """Get the lag percentiles and the recent stalls."""
+        return {
+            "interval": self.interval,
+            "threshold": self.threshold,
+            "count": self.histogram.count,
+            "max_lag": self.max_lag,
+            "percentiles": self.histogram.percentiles(PERCENTILES),
+            "stall_count": self.stall_count,
+            "stall_total": self.stall_total,
+            "stalls": list(self.stalls),
+        }
@@ -0,0 +1,312 @@
+"""Metrics in the Prometheus text exposition format."""
+
+import functools
+import time
+from typing import Callable, Coroutine, Sequence
+
+from .stats import PERCENTILES, Collector, Histogram
+
+
+def _escape(value) -> str:
+    """Escape a label value."""
+    return str(value).replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _labels(names: Sequence[str], values: Sequence, extra: str = None) -> str:
+    """Format a set of labels."""
+    pairs = [f'{name}="{_escape(value)}"' for (name, value) in zip(names, values)]
+    if extra:
+        pairs.append(extra)
+    return "{" + ",".join(pairs) + "}" if pairs else ""
+
+
+class MetricFamily:
+    """
+    A named family of gauges or counters sharing a set of label names.
+
+    The header of the family and the name and labels of each series are formatted
+    once, when the family or the series is created, so that producing the text
+    of a family only formats the current values.
+    """
+
+    def __init__(
+        self, name: str, kind: str, description: str, labelnames: Sequence[str] = ()
+    ):
+        """
+        Initialize a `MetricFamily` instance.
+
+        Args:
+            name: The metric name
+            kind: The metric type, `gauge` or `counter`
+            description: The help text of the metric
+            labelnames: The names of the labels distinguishing each series
+
+        """
+        self.name = name
+        self.labelnames = tuple(labelnames)
+        self.header = f"# HELP {name} {description}\n# TYPE {name} {kind}\n"
+        self._series = {}
+        self._values = {}
+
+    def set(self, value: float, *labels):
+        """Set the value of a series, given its label values in order."""
+        if labels not in self._series:
+            self._series[labels] = f"{self.name}{_labels(self.labelnames, labels)} "
+        self._values[labels] = value
+
+    def get(self, *labels) -> float:
+        """Get the value of a series, given its label values in order."""
+        return self._values.get(labels)
+
+    def to_text(self) -> str:
+        """Format the family in the text exposition format."""
+        series = self._series
+        return self.header + "".join(
+            f"{series[labels]}{value:.6g}\n" for (labels, value) in self._values.items()
+        )
+
+
+class _LatencySeries:
+    """The observations of a single latency series."""
+
+    __slots__ = ("count", "histogram", "lines", "total")
+
+    def __init__(self, lines: Sequence[str]):
+        self.count = 0
+        self.histogram = Histogram()
+        self.lines = lines
+        self.total = 0.0
+
+
+class LatencyFamily:
+    """
+    A named family of durations in seconds, reported as summaries.
+
+    Each series keeps a fixed-size histogram, from which the percentiles are
+    computed when the family is formatted.
+    """
+
+    def __init__(self, name: str, description: str, labelnames: Sequence[str]):
+        """
+        Initialize a `LatencyFamily` instance.
+
+        Args:
+            name: The metric name
+            description: The help text of the metric
+            labelnames: The names of the labels distinguishing each series
+
+        """
+        self.name = name
+        self.labelnames = tuple(labelnames)
+        self.header = f"# HELP {name} {description}\n# TYPE {name} summary\n"
+        self._series = {}
+
+    def observe(self, duration: float, *labels):
+        """Record a duration, given the label values of its series in order."""
+        series = self._series.get(labels)
+        if not series:
+            names = self.labelnames
+            lines = [
+                self.name + _labels(names, labels, 'quantile="%s"' % fraction) + " "
+                for fraction in PERCENTILES.values()
+            ]
+            lines.append(f"{self.name}_sum{_labels(names, labels)} ")
+            lines.append(f"{self.name}_count{_labels(names, labels)} ")
+            series = self._series[labels] = _LatencySeries(lines)
+        series.count += 1
+        series.total += duration
+        series.histogram.add(duration)
+
+    def get(self, *labels) -> dict:
+        """Get the count and total of a series, given its label values in order."""
+        series = self._series.get(labels)
+        return series and {"count": series.count, "total": series.total}
+
+    def timed(self, fn: Callable, label_fn: Callable) -> Coroutine:
+        """
+        Wrap a coroutine function to record the duration of each call.
+
+        Args:
+            fn: The coroutine function to wrap
+            label_fn: Called with the arguments of each call to get the label
+                values of its series
+
+        """
+
+        @functools.wraps(fn)
+        async def wrapped(*args, **kwargs):
+            start = time.perf_counter()
+            try:
+                return await fn(*args, **kwargs)
+            finally:
+                self.observe(time.perf_counter() - start, *label_fn(*args, **kwargs))
+
+        return wrapped
+
+    def to_text(self) -> str:
+        """Format the family in the text exposition format."""
+        parts = [self.header]
+        for series in self._series.values():
+            lines = series.lines
+            quantiles = series.histogram.percentiles(PERCENTILES)
+            for (line, key) in zip(lines, PERCENTILES):
+                parts.append(f"{line}{quantiles[key]:.6g}\n")
+            parts.append(f"{lines[-2]}{series.total:.6g}\n")
+            parts.append(f"{lines[-1]}{series.count}\n")
+        return "".join(parts)
+
+
+class Metrics:
+    """
+    The metric families reported by the agent.
+
+    Durations are recorded as they happen. Values which are only of interest
+    when reported, such as queue depths, are set by the collector functions
+    registered with `add_collector`, which are run before the metrics are
+    formatted.
+    """
+
+    def __init__(self):
+        """Initialize a `Metrics` instance."""
+        self._collectors = []
+        self.task_queue = MetricFamily(
+            "acapy_task_queue_tasks",
+            "gauge",
+            "Number of tasks in a task queue",
+            ("queue", "state"),
+        )
+        self.task_queue_completed = MetricFamily(
+            "acapy_task_queue_completed_total",
+            "counter",
+            "Number of tasks completed by a task queue",
+            ("queue", "result"),
+        )
+        self.outbound_buffer = MetricFamily(
+            "acapy_outbound_buffer_messages",
+            "gauge",
+            "Number of outbound messages buffered for delivery",
+            ("state",),
+        )
+        self.inbound_sessions = MetricFamily(
+            "acapy_inbound_sessions", "gauge", "Number of open inbound sessions"
+        )
+        self.cache_hits = MetricFamily(
+            "acapy_cache_hits_total", "counter", "Number of cache hits", ("cache",)
+        )
+        self.cache_misses = MetricFamily(
+            "acapy_cache_misses_total", "counter", "Number of cache misses", ("cache",)
+        )
+        self.cache_hit_ratio = MetricFamily(
+            "acapy_cache_hit_ratio",
+            "gauge",
+            "Fraction of cache lookups which were hits",
+            ("cache",),
+        )
+        self.ledger_latency = LatencyFamily(
+            "acapy_ledger_request_seconds",
+            "Duration of ledger requests",
+            ("request_type",),
+        )
+        self.storage_latency = LatencyFamily(
+            "acapy_storage_operation_seconds",
+            "Duration of storage operations",
+            ("operation", "record_type"),
+        )
+        self.event_loop_lag = LatencyFamily(
+            "acapy_event_loop_lag_seconds",
+            "Delay in waking a task on the event loop",
+            (),
+        )
+        self.event_loop_stalls = MetricFamily(
+            "acapy_event_loop_stalls_total",
+            "counter",
+            "Number of times the event loop was blocked beyond the threshold",
+        )
+        self.wallet_key_pool = MetricFamily(
+            "acapy_wallet_key_pool_items",
+            "gauge",
+            "Number of DIDs and signing keys ready in the wallet key pool",
+            ("kind",),
+        )
+        self.connection_cache_warmed = MetricFamily(
+            "acapy_connection_cache_warmed_total",
+            "counter",
+            "Number of connections whose resolution caches were warmed",
+            ("result",),
+        )
+        self.connection_cache_warming = MetricFamily(
+            "acapy_connection_cache_warming",
+            "gauge",
+            "Whether the caches of stored connections are being warmed",
+        )
+        self.tails_uploads = MetricFamily(
+            "acapy_tails_uploads_total",
+            "counter",
+            "Number of tails file uploads completed",
+            ("result",),
+        )
+        self.tails_upload_retries = MetricFamily(
+            "acapy_tails_upload_retries_total",
+            "counter",
+            "Number of tails file upload attempts retried",
+        )
+        self.tails_uploaded_bytes = MetricFamily(
+            "acapy_tails_uploaded_bytes_total",
+            "counter",
+            "Number of bytes of tails files uploaded",
+        )
+        self.tails_uploads_in_progress = MetricFamily(
+            "acapy_tails_uploads_in_progress",
+            "gauge",
+            "Number of tails file uploads in progress",
+        )
+        self.families = (
+            self.task_queue,
+            self.task_queue_completed,
+            self.outbound_buffer,
+            self.inbound_sessions,
+            self.cache_hits,
+            self.cache_misses,
+            self.cache_hit_ratio,
+            self.ledger_latency,
+            self.storage_latency,
+            self.event_loop_lag,
+            self.event_loop_stalls,
+            self.wallet_key_pool,
+            self.connection_cache_warmed,
+            self.connection_cache_warming,
+            self.tails_uploads,
+            self.tails_upload_retries,
+            self.tails_uploaded_bytes,
+            self.tails_uploads_in_progress,
+        )
+
+    def add_collector(self, collector: Coroutine):
+        """Register a coroutine function to run before the metrics are formatted."""
+        self._collectors.append(collector)
+
+    def set_cache(self, cache: str, hits: int, misses: int):
+        """Set the counters of a cache."""
+        self.cache_hits.set(hits, cache)
+        self.cache_misses.set(misses, cache)
+        if hits or misses:
+            self.cache_hit_ratio.set(hits / (hits + misses), cache)
+
+    async def collect(self):
+        """Run the registered collector functions."""
+        for collector in self._collectors:
+            await collector(self)
+
+    async def to_text(self, timing: Collector = None) -> str:
+        """
+        Collect and format the metrics in the text exposition format.
+
+        Args:
+            timing: A timing statistics collector to include
+
+        """
+        await self.collect()
+        text = "".join(family.to_text() for family in self.families)
+        if timing:
+            text += timing.to_text()
+        return text
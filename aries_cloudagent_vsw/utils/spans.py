@@ -0,0 +1,252 @@
+"""Sampled latency spans for messages, exported in the OTLP JSON format."""
+
+import asyncio
+import json
+import logging
+import os
+import random
+import time
+from typing import Sequence
+
+from aiohttp import ClientError, ClientSession, ClientTimeout
+
+LOGGER = logging.getLogger(__name__)
+
+
+class Span:
+    """A timed step in the processing of a message."""
+
+    __slots__ = ("attributes", "end", "name", "parent_id", "span_id", "start", "trace")
+
+    def __init__(
+        self, trace: "MessageTrace", name: str, parent_id: str = None, **attributes
+    ):
+        """
+        Initialize a `Span` instance, starting it.
+
+        Args:
+            trace: The trace of the message
+            name: The name of the step
+            parent_id: The identifier of the parent span, if any
+            attributes: Additional attributes of the span
+
+        """
+        self.attributes = attributes
+        self.end: int = None
+        self.name = name
+        self.parent_id = parent_id
+        self.span_id = os.urandom(8).hex()
+        self.start = int(time.time() * 1e9)
+        self.trace = trace
+
+    def finish(self, **attributes):
+        """End the span, adding any further attributes which are set, and record it."""
+        if self.end is None:
+            self.end = int(time.time() * 1e9)
+            for (key, value) in attributes.items():
+                if value is not None:
+                    self.attributes[key] = value
+            self.trace.tracer.record(self)
+
+    def to_otlp(self) -> dict:
+        """Convert the span to its OTLP JSON representation."""
+        result = {
+            "traceId": self.trace.trace_id,
+            "spanId": self.span_id,
+            "name": self.name,
+            "kind": 1,  # SPAN_KIND_INTERNAL
+            "startTimeUnixNano": str(self.start),
+            "endTimeUnixNano": str(self.end),
+            "attributes": [
+                {"key": key, "value": otlp_value(value)}
+                for (key, value) in self.attributes.items()
+                if value is not None
+            ],
+        }
+        if self.parent_id:
+            result["parentSpanId"] = self.parent_id
+        return result
+
+
+class MessageTrace:
+    """
+    The spans of a single sampled message.
+
+    All steps from the receipt of the message to the delivery of its responses
+    are children of the root span, which ends once the message is handled.
+    """
+
+    __slots__ = ("handoff", "root", "trace_id", "tracer")
+
+    def __init__(self, tracer: "SpanTracer", name: str, **attributes):
+        """
+        Initialize a `MessageTrace` instance, starting its root span.
+
+        Args:
+            tracer: The tracer recording the spans
+            name: The name of the root span
+            attributes: Additional attributes of the root span
+
+        """
+        self.trace_id = os.urandom(16).hex()
+        self.tracer = tracer
+        self.root = Span(self, name, **attributes)
+        # a span started by one step and finished by the next
+        self.handoff: Span = None
+
+    def start(self, name: str, **attributes) -> Span:
+        """Start a span as a child of the root span."""
+        return Span(self, name, self.root.span_id, **attributes)
+
+
+def otlp_value(value) -> dict:
+    """Convert an attribute value to its OTLP JSON representation."""
+    if isinstance(value, bool):
+        return {"boolValue": value}
+    if isinstance(value, int):
+        return {"intValue": str(value)}
+    if isinstance(value, float):
+        return {"doubleValue": value}
+    return {"stringValue": str(value)}
+
+
+class SpanTracer:
+    """
+    Sample messages and export the latency spans of those sampled.
+
+    Whether a message is traced is decided once, as it is received. Unsampled
+    messages carry no trace, so that each step only checks for its absence.
+    Finished spans are exported in batches, as OTLP JSON lines appended to a
+    file or posted to the HTTP endpoint of a collector.
+    """
+
+    def __init__(
+        self,
+        sample_rate: float,
+        target: str,
+        *,
+        service_name: str = "aca-py",
+        batch_size: int = 512,
+        flush_interval: float = 5.0,
+    ):
+        """
+        Initialize a `SpanTracer` instance.
+
+        Args:
+            sample_rate: The fraction of messages to trace
+            target: A file path, or an HTTP URL such as that of the
+                `/v1/traces` endpoint of an OpenTelemetry collector
+            service_name: The service name to report the spans under
+            batch_size: The number of finished spans which triggers an export
+            flush_interval: The maximum interval between exports, in seconds
+
+        """
+        self.sample_rate = sample_rate
+        self.target = target
+        self.service_name = service_name
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self.exported_count = 0
+        self.failed_count = 0
+        self._pending = []
+        self._flush_task: asyncio.Future = None
+        self._timer_task: asyncio.Future = None
+
+    def sample(self, name: str, **attributes) -> MessageTrace:
+        """Decide whether to trace a message, and if so start its trace."""
+        if self.sample_rate < 1 and random.random() >= self.sample_rate:
+            return None
+        return MessageTrace(self, name, **attributes)
+
+    def record(self, span: Span):
+        """Queue a finished span for export."""
+        self._pending.append(span)
+        if len(self._pending) >= self.batch_size and not self._flush_task:
+            self._flush_task = asyncio.ensure_future(self.flush())
+
+    async def start(self):
+        """Start exporting spans periodically."""
+        self._timer_task = asyncio.ensure_future(self._flush_loop())
+
+    async def stop(self):
+        """Stop exporting spans periodically and export those pending."""
+        if self._timer_task:
+            self._timer_task.cancel()
+            await asyncio.gather(self._timer_task, return_exceptions=True)
+            self._timer_task = None
+        await self.flush()
+
+    async def _flush_loop(self):
+        """Export spans at a regular interval."""
+        while True:
+            await asyncio.sleep(self.flush_interval)
+            await self.flush()
+
+    def to_otlp(self, spans: Sequence[Span]) -> dict:
+        """Build an OTLP trace export request for a batch of spans."""
+        return {
+            "resourceSpans": [
+                {
+                    "resource": {
+                        "attributes": [
+                            {
+                                "key": "service.name",
+                                "value": {"stringValue": self.service_name},
+                            }
+                        ]
+                    },
+                    "scopeSpans": [
+                        {
+                            "scope": {"name": "aries_cloudagent_vsw"},
+                            "spans": [span.to_otlp() for span in spans],
+                        }
+                    ],
+                }
+            ]
+        }
+
+    async def flush(self):
+        """Export the finished spans."""
+        try:
+            while self._pending:
+                spans = self._pending[: self.batch_size]
+                del self._pending[: self.batch_size]
+                try:
+                    await self.export(json.dumps(self.to_otlp(spans)))
+                except (ClientError, OSError, asyncio.TimeoutError):
+                    self.failed_count += len(spans)
+                    LOGGER.exception("Error exporting %d spans", len(spans))
+                else:
+                    self.exported_count += len(spans)
+        finally:
+            self._flush_task = None
+
+    async def export(self, body: str):
+        """Write an export request to the target."""
+        if self.target.startswith(("http://", "https://")):
+            async with ClientSession(timeout=ClientTimeout(total=10)) as session:
+                async with session.post(
+                    self.target,
+                    data=body,
+                    headers={"Content-Type": "application/json"},
+                    raise_for_status=True,
+                ):
+                    pass
+        else:
+            await asyncio.get_event_loop().run_in_executor(
+                None, self._append, body + "\n"
+            )
+
+    def _append(self, line: str):
+        """Append a line to the target file."""
+        with open(self.target, "a") as target_file:
+            target_file.write(line)
+
+    def status(self) -> dict:
+        """Get the export counters."""
+        return {
+            "sample_rate": self.sample_rate,
+            "pending_count": len(self._pending),
+            "exported_count": self.exported_count,
+            "failed_count": self.failed_count,
+        }
@@ -0,0 +1,48 @@
+"""Report of where the time to start up the agent goes."""
+
+import time
+from contextlib import contextmanager
+
+
+class StartupTimer:
+    """Record the duration of each phase of startup."""
+
+    def __init__(self):
+        """Initialize a `StartupTimer` instance, starting the clock."""
+        self.started = time.perf_counter()
+        self.phases = []
+        self.total: float = None
+
+    @contextmanager
+    def phase(self, name: str):
+        """Time a phase of startup, or work deferred from it once started."""
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.phases.append((name, time.perf_counter() - start))
+
+    def finish(self):
+        """Record the total time to start up."""
+        self.total = time.perf_counter() - self.started
+
+    def report(self) -> dict:
+        """Get the total time to start up and the time of each phase, in seconds."""
+        return {
+            "total": None if self.total is None else round(self.total, 6),
+            "phases": [
+                {"name": name, "duration": round(duration, 6)}
+                for (name, duration) in self.phases
+            ],
+        }
+
+    def format(self) -> str:
+        """Format the report as text, one phase per line."""
+        width = max([len(name) for (name, _) in self.phases] + [5])
+        lines = [
+            f"Started in {self.total:.3f}s" if self.total is not None else "Starting up"
+        ]
+        lines.extend(
+            f"  {name:<{width}}  {duration:8.3f}s" for (name, duration) in self.phases
+        )
+        return "\n".join(lines)
@@ -2,19 +2,131 @@
 
 import functools
 import inspect
+import math
 import time
-from typing import Sequence, TextIO, Union
+from typing import Mapping, Sequence, TextIO, Union
+
+PERCENTILES = {"p50": 0.5, "p90": 0.9, "p99": 0.99, "p999": 0.999}
+
+
+class Histogram:
+    """
+    Fixed-memory histogram of durations in seconds.
+
+    Buckets are log-linear: each power of two is divided into `SUB_BUCKETS`
+    buckets of equal width, so that a value is reported to within half a
+    bucket, about 3% of its magnitude, between 1 microsecond and an hour.
+    Adding a value costs the same whatever the number already added, and
+    histograms add together bucket by bucket.
+    """
+
+    SUB_BUCKETS = 16
+    MIN_EXP = -20
+    MAX_EXP = 12
+    SIZE = (MAX_EXP - MIN_EXP) * SUB_BUCKETS + 2
+
+    __slots__ = ("buckets", "count")
+
+    def __init__(self):
+        """Initialize the Histogram instance."""
+        self.buckets = [0] * self.SIZE
+        self.count = 0
+
+    @classmethod
+    def index(cls, value: float) -> int:
+        """Get the bucket index for a value: 0 below range, SIZE - 1 above."""
+        if value <= 0:
+            return 0
+        (mantissa, exp) = math.frexp(value)  # value = mantissa * 2 ** exp
+        if exp <= cls.MIN_EXP:
+            return 0
+        if exp > cls.MAX_EXP:
+            return cls.SIZE - 1
+        return (
+            (exp - cls.MIN_EXP - 1) * cls.SUB_BUCKETS
+            + int((mantissa - 0.5) * 2 * cls.SUB_BUCKETS)
+            + 1
+        )
+
+    @classmethod
+    def midpoint(cls, index: int) -> float:
+        """Get the value representing a bucket."""
+        if index <= 0:
+            return 0.0
+        if index >= cls.SIZE - 1:
+            return math.ldexp(1.0, cls.MAX_EXP)
+        (octave, sub) = divmod(index - 1, cls.SUB_BUCKETS)
+        mantissa = 0.5 + (sub + 0.5) / (2 * cls.SUB_BUCKETS)
+        return math.ldexp(mantissa, octave + cls.MIN_EXP + 1)
+
+    def add(self, value: float):
+        """Add a value to the histogram."""
+        self.buckets[self.index(value)] += 1
+        self.count += 1
+
+    def merge(self, other: "Histogram") -> "Histogram":
+        """Add the counts of another histogram to this one."""
+        self.buckets = [a + b for (a, b) in zip(self.buckets, other.buckets)]
+        self.count += other.count
+        return self
+
+    def copy(self) -> "Histogram":
+        """Create a copy of the histogram."""
+        result = Histogram()
+        result.buckets = self.buckets.copy()
+        result.count = self.count
+        return result
+
+    def percentiles(self, quantiles: Mapping[str, float]) -> Mapping[str, float]:
+        """
+        Find values at or below which given fractions of values fall.
+
+        Args:
+            quantiles: Mapping from each name to report to a fraction in (0, 1]
+
+        Returns:
+            Mapping from each name to the corresponding value, or empty if none
+
+        """
+        if not self.count:
+            return {}
+        targets = sorted(
+            (max(math.ceil(fraction * self.count), 1), name)
+            for (name, fraction) in quantiles.items()
+        )
+        result = {}
+        seen = 0
+        pos = 0
+        for (index, bucket_count) in enumerate(self.buckets):
+            seen += bucket_count
+            while pos < len(targets) and seen >= targets[pos][0]:
+                result[targets[pos][1]] = self.midpoint(index)
+                pos += 1
+            if pos == len(targets):
+                break
+        return result
 
 
 class Stats:
     """A collection of statistics."""
 
-    def __init__(self):
-        """Initialize the Stats instance."""
+    def __init__(self, window: float = None):
+        """
+        Initialize the Stats instance.
+
+        Args:
+            window: The period, in seconds, over which percentiles are reported;
+                default since the stats were created
+
+        """
         self.counts = {}
         self.max_time = {}
         self.min_time = {}
         self.total_time = {}
+        self.histograms = {}
+        self.window = window
+        self.window_start = time.perf_counter()
+        self.last_window = {}
 
     def log(self, name: str, duration: float):
         """Log an entry in the stats."""
@@ -28,9 +140,35 @@ class Stats:
             self.max_time[name] = duration
             self.min_time[name] = duration
             self.total_time[name] = duration
+        if self.window and time.perf_counter() - self.window_start >= self.window:
+            self.roll_window()
+        hist = self.histograms.get(name)
+        if not hist:
+            hist = self.histograms[name] = Histogram()
+        hist.add(duration)
+
+    def roll_window(self):
+        """Start a new window of percentile histograms."""
+        now = time.perf_counter()
+        if self.window and now - self.window_start >= 2 * self.window:
+            self.last_window = {}  # no values logged in the last complete window
+        else:
+            self.last_window = self.histograms
+        self.histograms = {}
+        self.window_start = now
+
+    def histogram(self, name: str) -> Histogram:
+        """Get the histogram for the current and last complete window."""
+        hist = self.histograms.get(name)
+        last = self.last_window.get(name)
+        if hist and last:
+            return hist.copy().merge(last)
+        return hist or last
 
     def extract(self, names: Sequence[str] = None) -> dict:
         """Summarize the stats in a dictionary."""
+        if self.window and time.perf_counter() - self.window_start >= self.window:
+            self.roll_window()
         counts = self.counts.copy()
         all_names = set(counts)
         if names is None:
@@ -49,13 +187,42 @@ class Stats:
                 name: val for (name, val) in self.total_time.items() if name in names
             }
 
-        return {
+        result = {
             "avg": {name: totals[name] / counts[name] for name in names},
             "count": counts,
             "max": maxes,
             "min": mins,
             "total": totals,
         }
+        for key in PERCENTILES:
+            result[key] = {}
+        for name in names:
+            hist = self.histogram(name)
+            if hist:
+                for (key, value) in hist.percentiles(PERCENTILES).items():
+                    # a bucket midpoint may lie beyond the values observed
+                    result[key][name] = min(max(value, mins[name]), maxes[name])
+        return result
+
+    def to_text(self, prefix: str = "acapy_timing") -> str:
+        """Format the stats as text, in the Prometheus summary exposition format."""
+        results = self.extract()
+        metric = f"{prefix}_seconds"
+        lines = [
+            f"# HELP {metric} Duration of timed operations",
+            f"# TYPE {metric} summary",
+        ]
+        for name in sorted(results["count"]):
+            label = name.replace("\\", "\\\\").replace('"', '\\"')
+            for (key, fraction) in PERCENTILES.items():
+                if name in results[key]:
+                    lines.append(
+                        f'{metric}{{name="{label}",quantile="{fraction}"}} '
+                        f"{results[key][name]:.6g}"
+                    )
+            lines.append(f'{metric}_sum{{name="{label}"}} {results["total"][name]:.6g}')
+            lines.append(f'{metric}_count{{name="{label}"}} {results["count"][name]}')
+        return "\n".join(lines) + "\n"
 
 
 class Timer:
@@ -97,17 +264,20 @@ class Timer:
 class Collector:
     """Collector for a set of statistics."""
 
-    def __init__(self, *, enabled: bool = True, log_path: str = None):
+    def __init__(
+        self, *, enabled: bool = True, log_path: str = None, window: float = None
+    ):
         """Initialize the Collector instance."""
         self._enabled = enabled
         self._log_file: TextIO = None
         self._log_path = log_path
         self._stats = None
+        self._window = window
         self.reset()
 
     def reset(self):
         """Reset the collector's statistics."""
-        self._stats = Stats()
+        self._stats = Stats(self._window)
         if self._log_file:
             self._log_file.close()
             self._log_file = None
@@ -208,3 +378,7 @@ class Collector:
     def extract(self, groups: Sequence[str] = None) -> dict:
         """Extract statistics for a specific set of groups."""
         return self._stats.extract(groups)
+
+    def to_text(self) -> str:
+        """Format the collected statistics as text for a metrics scraper."""
+        return self._stats.to_text()
@@ -0,0 +1,68 @@
+"""Run a set of dependent asyncio steps, each as soon as it can start."""
+
+import asyncio
+
+from collections import OrderedDict
+from typing import Awaitable, Callable, Mapping, Sequence
+
+from .startup_timer import StartupTimer
+
+
+class TaskGraph:
+    """
+    Run named steps concurrently, each once the steps it depends on are done.
+
+    Steps must be added after the steps they depend on, so there is no cycle.
+    """
+
+    def __init__(self, timer: StartupTimer = None):
+        """Initialize a `TaskGraph` instance, timing each step with `timer`."""
+        self.steps = OrderedDict()
+        self.timer = timer
+
+    def add(self, name: str, step: Callable[[], Awaitable], after: Sequence[str] = ()):
+        """Add a step, to run once the steps named in `after` are done."""
+        if name in self.steps:
+            raise ValueError(f"Duplicate step: {name}")
+        for dependency in after:
+            if dependency not in self.steps:
+                raise ValueError(f"Unknown dependency of step {name}: {dependency}")
+        self.steps[name] = (step, tuple(after))
+
+    async def run(self) -> Mapping[str, object]:
+        """
+        Run all steps.
+
+        Returns:
+            The result of each step, by name
+
+        Raises:
+            The exception of the first step to fail, once the other steps are
+            cancelled
+
+        """
+        tasks = OrderedDict()
+
+        async def run_step(name: str, step: Callable[[], Awaitable], after):
+            if after:
+                # wait does not cancel the dependencies if this step is cancelled
+                await asyncio.wait([tasks[dependency] for dependency in after])
+                for dependency in after:
+                    tasks[dependency].result()
+            if not self.timer:
+                return await step()
+            with self.timer.phase(name):
+                return await step()
+
+        for (name, (step, after)) in self.steps.items():
+            tasks[name] = asyncio.ensure_future(run_step(name, step, after))
+        if not tasks:
+            return {}
+        try:
+            await asyncio.gather(*tasks.values())
+        except BaseException:
+            for task in tasks.values():
+                task.cancel()
+            await asyncio.wait(tasks.values())
+            raise
+        return {name: task.result() for (name, task) in tasks.items()}
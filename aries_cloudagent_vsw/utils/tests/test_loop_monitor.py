@@ -0,0 +1,52 @@
+import asyncio
+import time
+
+from asynctest import TestCase as AsyncTestCase
+
+from ..loop_monitor import LoopMonitor
+from ..metrics import Metrics
+
+
+def block(duration: float):
+    time.sleep(duration)
+
+
+class TestLoopMonitor(AsyncTestCase):
+    async def test_record(self):
+        metrics = Metrics()
+        monitor = LoopMonitor(0.1, metrics=metrics)
+        monitor.record(0.01)
+        monitor.record(0.2)
+        status = monitor.status()
+        assert status["count"] == 2
+        assert status["max_lag"] == 0.2
+        assert status["stall_count"] == 1
+        assert status["stalls"][0]["lag"] == 0.2
+        assert status["stalls"][0]["stack"] is None
+        assert metrics.event_loop_lag.get()["count"] == 2
+        assert metrics.event_loop_stalls.get() == 1
+
+        monitor.reset()
+        status = monitor.status()
+        assert status["count"] == status["stall_count"] == 0
+        assert not status["stalls"]
+
+        # the counter metric does not go back on reset
+        monitor.record(0.3)
+        assert monitor.status()["stall_count"] == 1
+        assert monitor.status()["stall_total"] == 2
+        assert metrics.event_loop_stalls.get() == 2
+
+    async def test_blocking_stack(self):
+        monitor = LoopMonitor(0.05, 0.01)
+        await monitor.start()
+        await asyncio.sleep(0.05)
+        block(0.3)
+        await asyncio.sleep(0.05)
+        await monitor.stop()
+
+        assert monitor.stall_count == 1
+        [stall] = monitor.stalls
+        assert stall["lag"] >= 0.2
+        assert "in block" in stall["stack"][-1]
+        assert monitor.histogram.count > 1
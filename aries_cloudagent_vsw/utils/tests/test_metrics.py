@@ -0,0 +1,69 @@
+from asynctest import TestCase as AsyncTestCase
+from asynctest import mock as async_mock
+
+from ..metrics import LatencyFamily, MetricFamily, Metrics
+from ..stats import Collector
+
+
+class TestMetrics(AsyncTestCase):
+    async def test_family(self):
+        family = MetricFamily("test_total", "counter", "Test count", ("name",))
+        family.set(2, 'say "hi"')
+        family.set(3, 'say "hi"')
+        family.set(1.5, "other")
+        assert family.get('say "hi"') == 3
+        assert family.get("missing") is None
+        assert family.to_text() == (
+            "# HELP test_total Test count\n"
+            "# TYPE test_total counter\n"
+            'test_total{name="say \\"hi\\""} 3\n'
+            'test_total{name="other"} 1.5\n'
+        )
+
+        family = MetricFamily("test", "gauge", "Test gauge")
+        family.set(4)
+        assert family.to_text().endswith("\ntest 4\n")
+
+    async def test_latency(self):
+        family = LatencyFamily("test_seconds", "Test duration", ("op", "type"))
+        family.observe(0.5, "get", "a")
+        family.observe(0.5, "get", "a")
+        assert family.get("get", "a") == {"count": 2, "total": 1.0}
+        assert family.get("get", "b") is None
+
+        text = family.to_text()
+        assert "# TYPE test_seconds summary\n" in text
+        assert 'test_seconds{op="get",type="a",quantile="0.99"} 0.5' in text
+        assert 'test_seconds_sum{op="get",type="a"} 1\n' in text
+        assert 'test_seconds_count{op="get",type="a"} 2\n' in text
+
+    async def test_timed(self):
+        family = LatencyFamily("test_seconds", "Test duration", ("type",))
+        mock_fn = async_mock.CoroutineMock(side_effect=[1, ValueError()])
+        timed = family.timed(mock_fn, lambda record_type, **kwargs: (record_type,))
+
+        assert await timed("a", option=True) == 1
+        mock_fn.assert_awaited_once_with("a", option=True)
+        with self.assertRaises(ValueError):
+            await timed("a")
+        assert family.get("a")["count"] == 2
+
+    async def test_to_text(self):
+        metrics = Metrics()
+
+        async def collect(metrics):
+            metrics.inbound_sessions.set(5)
+            metrics.set_cache("shared", 3, 1)
+
+        metrics.add_collector(collect)
+        metrics.set_cache("empty", 0, 0)
+        metrics.ledger_latency.observe(0.25, "GET_NYM")
+
+        timing = Collector()
+        timing.log("handle", 0.5)
+        text = await metrics.to_text(timing)
+        assert "\nacapy_inbound_sessions 5\n" in text
+        assert 'acapy_cache_hit_ratio{cache="shared"} 0.75\n' in text
+        assert 'acapy_cache_hit_ratio{cache="empty"}' not in text
+        assert 'acapy_ledger_request_seconds_count{request_type="GET_NYM"} 1' in text
+        assert 'acapy_timing_seconds_count{name="handle"} 1' in text
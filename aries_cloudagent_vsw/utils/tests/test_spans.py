@@ -0,0 +1,102 @@
+import json
+
+from tempfile import NamedTemporaryFile
+
+from asynctest import TestCase as AsyncTestCase
+from asynctest import mock as async_mock
+
+from .. import spans as test_module
+from ..spans import SpanTracer
+
+
+class TestSpanTracer(AsyncTestCase):
+    async def setUp(self):
+        self.target = NamedTemporaryFile()
+        self.tracer = SpanTracer(1.0, self.target.name, service_name="test")
+
+    def exported(self) -> list:
+        with open(self.target.name) as target_file:
+            return [json.loads(line) for line in target_file]
+
+    async def test_sample(self):
+        tracer = SpanTracer(0.25, self.target.name)
+        with async_mock.patch.object(
+            test_module.random, "random", async_mock.MagicMock()
+        ) as mock_random:
+            mock_random.return_value = 0.5
+            assert tracer.sample("message") is None
+            mock_random.return_value = 0.1
+            assert tracer.sample("message")
+
+    async def test_spans(self):
+        trace = self.tracer.sample("message", transport="http")
+        span = trace.start("step", count=2)
+        span.finish(ok=True, skipped=None)
+        span.finish()
+        trace.root.finish(ratio=0.5)
+        assert self.tracer.status()["pending_count"] == 2
+
+        await self.tracer.flush()
+        assert self.tracer.exported_count == 2
+        [request] = self.exported()
+        [resource] = request["resourceSpans"]
+        assert resource["resource"]["attributes"] == [
+            {"key": "service.name", "value": {"stringValue": "test"}}
+        ]
+        [scope] = resource["scopeSpans"]
+        (step, root) = scope["spans"]
+        assert step["traceId"] == root["traceId"] == trace.trace_id
+        assert len(trace.trace_id) == 32
+        assert step["parentSpanId"] == root["spanId"]
+        assert "parentSpanId" not in root
+        assert step["name"] == "step"
+        assert int(step["endTimeUnixNano"]) >= int(step["startTimeUnixNano"])
+        assert step["attributes"] == [
+            {"key": "count", "value": {"intValue": "2"}},
+            {"key": "ok", "value": {"boolValue": True}},
+        ]
+        assert root["attributes"] == [
+            {"key": "transport", "value": {"stringValue": "http"}},
+            {"key": "ratio", "value": {"doubleValue": 0.5}},
+        ]
+
+    async def test_batch(self):
+        self.tracer.batch_size = 2
+        trace = self.tracer.sample("message")
+        trace.start("one").finish()
+        assert not self.tracer._flush_task
+        trace.start("two").finish()
+        await self.tracer._flush_task
+        assert len(self.exported()) == 1
+
+    async def test_start_stop(self):
+        self.tracer.flush_interval = 0.01
+        await self.tracer.start()
+        trace = self.tracer.sample("message")
+        trace.root.finish()
+        await self.tracer.stop()
+        assert self.tracer.exported_count == 1
+        assert not self.tracer._timer_task
+
+    async def test_export_error(self):
+        trace = self.tracer.sample("message")
+        trace.root.finish()
+        with async_mock.patch.object(
+            self.tracer, "export", async_mock.CoroutineMock(side_effect=OSError())
+        ):
+            await self.tracer.flush()
+        assert self.tracer.failed_count == 1
+
+    async def test_export_http(self):
+        tracer = SpanTracer(1.0, "http://localhost:4318/v1/traces")
+        with async_mock.patch.object(
+            test_module, "ClientSession", async_mock.MagicMock()
+        ) as mock_session:
+            session = mock_session.return_value.__aenter__.return_value
+            await tracer.export("{}")
+            session.post.assert_called_once_with(
+                "http://localhost:4318/v1/traces",
+                data="{}",
+                headers={"Content-Type": "application/json"},
+                raise_for_status=True,
+            )
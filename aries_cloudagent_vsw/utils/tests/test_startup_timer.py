@@ -0,0 +1,25 @@
+from asynctest import TestCase as AsyncTestCase
+
+from ..startup_timer import StartupTimer
+
+
+class TestStartupTimer(AsyncTestCase):
+    async def test_phases(self):
+        timer = StartupTimer()
+        with timer.phase("wallet"):
+            pass
+        with self.assertRaises(ValueError):
+            with timer.phase("ledger"):
+                raise ValueError()
+
+        report = timer.report()
+        assert report["total"] is None
+        assert [phase["name"] for phase in report["phases"]] == ["wallet", "ledger"]
+        assert timer.format().startswith("Starting up\n  wallet")
+
+        timer.finish()
+        report = timer.report()
+        assert report["total"] >= sum(phase["duration"] for phase in report["phases"])
+        lines = timer.format().splitlines()
+        assert lines[0].startswith("Started in ")
+        assert lines[2].split() == ["ledger", f"{timer.phases[1][1]:.3f}s"]
@@ -3,7 +3,8 @@ from tempfile import NamedTemporaryFile
 from asynctest import TestCase as AsyncTestCase
 from asynctest import mock as async_mock
 
-from ..stats import Collector
+from .. import stats as test_module
+from ..stats import Collector, Histogram, Stats
 
 
 class TestStats(AsyncTestCase):
@@ -98,3 +99,74 @@ class TestStats(AsyncTestCase):
 
         stats.reset()
         assert not stats.results["avg"]
+
+    async def test_percentiles(self):
+        stats = Collector()
+        for i in range(1, 1001):
+            stats.log("test", i / 1000)
+
+        results = stats.results
+        for (key, expected) in (("p50", 0.5), ("p90", 0.9), ("p99", 0.99)):
+            assert abs(results[key]["test"] - expected) / expected < 0.04
+        assert results["p999"]["test"] <= results["max"]["test"] == 1.0
+
+        stats.log("single", 0.123)
+        results = stats.extract(["single"])
+        assert results["p50"] == {"single": 0.123}
+        assert results["p999"] == {"single": 0.123}
+
+    async def test_histogram(self):
+        for value in (1e-6, 0.0015, 0.3, 7.0, 1800.0):
+            midpoint = Histogram.midpoint(Histogram.index(value))
+            assert abs(midpoint - value) / value < 0.04
+        assert Histogram.index(0.0) == 0
+        assert Histogram.index(1e-9) == 0
+        assert Histogram.index(1e9) == Histogram.SIZE - 1
+
+        first = Histogram()
+        second = Histogram()
+        for i in range(100):
+            first.add(0.01)
+            second.add(1.0)
+        merged = first.copy().merge(second)
+        assert merged.count == 200
+        assert first.count == 100
+        quantiles = merged.percentiles({"low": 0.25, "high": 0.75})
+        assert abs(quantiles["low"] - 0.01) < 0.001
+        assert abs(quantiles["high"] - 1.0) < 0.04
+        assert not Histogram().percentiles({"p50": 0.5})
+
+    async def test_window(self):
+        stats = Stats(window=10)
+        with async_mock.patch.object(
+            test_module.time, "perf_counter", async_mock.MagicMock()
+        ) as mock_time:
+            mock_time.return_value = stats.window_start
+            stats.log("test", 1.0)
+
+            # values from the last complete window are still reported
+            mock_time.return_value = stats.window_start + 11
+            stats.log("test", 3.0)
+            assert stats.histogram("test").count == 2
+
+            mock_time.return_value = stats.window_start + 12
+            results = stats.extract()
+            assert results["p50"]["test"] == 3.0
+            assert stats.histogram("test").count == 1
+
+            # windows with no values clear the percentiles
+            mock_time.return_value = stats.window_start + 50
+            results = stats.extract()
+            assert results["p50"] == {}
+            assert results["count"] == {"test": 2}
+
+    async def test_to_text(self):
+        stats = Collector()
+        stats.log('say "hi"', 0.5)
+        stats.log('say "hi"', 1.5)
+
+        text = stats.to_text()
+        assert "# TYPE acapy_timing_seconds summary" in text
+        assert 'acapy_timing_seconds{name="say \\"hi\\"",quantile="0.5"}' in text
+        assert 'acapy_timing_seconds_sum{name="say \\"hi\\""} 2' in text
+        assert 'acapy_timing_seconds_count{name="say \\"hi\\""} 2' in text
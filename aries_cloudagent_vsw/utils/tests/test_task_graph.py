@@ -0,0 +1,76 @@
+import asyncio
+
+from asynctest import TestCase as AsyncTestCase
+
+from ..startup_timer import StartupTimer
+from ..task_graph import TaskGraph
+
+
+class TestTaskGraph(AsyncTestCase):
+    async def test_run(self):
+        events = []
+
+        def step(name: str, delay: float = 0.0):
+            async def run():
+                events.append(("start", name))
+                await asyncio.sleep(delay)
+                events.append(("end", name))
+                return name.upper()
+
+            return run
+
+        timer = StartupTimer()
+        graph = TaskGraph(timer)
+        graph.add("wallet", step("wallet", 0.02))
+        graph.add("genesis", step("genesis", 0.01))
+        graph.add("ledger", step("ledger"), after=("genesis", "wallet"))
+        results = await graph.run()
+
+        assert results == {"wallet": "WALLET", "genesis": "GENESIS", "ledger": "LEDGER"}
+        # independent steps run concurrently, dependent steps once they are done
+        assert events == [
+            ("start", "wallet"),
+            ("start", "genesis"),
+            ("end", "genesis"),
+            ("end", "wallet"),
+            ("start", "ledger"),
+            ("end", "ledger"),
+        ]
+        assert [name for (name, _) in timer.phases] == ["genesis", "wallet", "ledger"]
+
+    async def test_run_empty(self):
+        assert await TaskGraph().run() == {}
+
+    async def test_add_x(self):
+        graph = TaskGraph()
+        graph.add("wallet", asyncio.sleep)
+        with self.assertRaises(ValueError):
+            graph.add("wallet", asyncio.sleep)
+        with self.assertRaises(ValueError):
+            graph.add("ledger", asyncio.sleep, after=("genesis",))
+
+    async def test_run_x(self):
+        cancelled = []
+        ran = []
+
+        async def fail():
+            raise ValueError("failed")
+
+        async def slow():
+            try:
+                await asyncio.sleep(10)
+            except asyncio.CancelledError:
+                cancelled.append("slow")
+                raise
+
+        async def dependent():
+            ran.append("dependent")
+
+        graph = TaskGraph()
+        graph.add("slow", slow)
+        graph.add("fail", fail)
+        graph.add("dependent", dependent, after=("fail",))
+        with self.assertRaises(ValueError):
+            await graph.run()
+        assert cancelled == ["slow"]
+        assert not ran
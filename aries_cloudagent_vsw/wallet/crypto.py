@@ -3,6 +3,7 @@
 import json
 
 from collections import OrderedDict
+from functools import lru_cache
 from typing import Callable, Optional, Sequence, Tuple
 
 import nacl.bindings
@@ -14,6 +15,9 @@ from marshmallow import fields, Schema, ValidationError
 from .error import WalletError
 from .util import bytes_to_b58, bytes_to_b64, b64_to_bytes, b58_to_bytes
 
+# Upper bound on the number of memoized ed25519 -> curve25519 conversions
+KEY_CONVERSION_CACHE_SIZE = 1024
+
 
 class PackMessageSchema(Schema):
     """Packed message schema."""
@@ -99,6 +103,59 @@ def sign_pk_from_sk(secret: bytes) -> bytes:
     return secret[seed_len:]
 
 
+@lru_cache(maxsize=KEY_CONVERSION_CACHE_SIZE)
+def ed25519_pk_to_curve25519(verkey: bytes) -> bytes:
+    """
+    Convert an ed25519 verkey to a curve25519 public key, memoizing the result.
+
+    Args:
+        verkey: The ed25519 verification key
+
+    Returns:
+        The curve25519 public key
+
+    """
+    return nacl.bindings.crypto_sign_ed25519_pk_to_curve25519(verkey)
+
+
+@lru_cache(maxsize=KEY_CONVERSION_CACHE_SIZE)
+def ed25519_sk_to_curve25519(secret: bytes) -> bytes:
+    """
+    Convert an ed25519 secret key to a curve25519 secret key, memoizing the result.
+
+    Args:
+        secret: The ed25519 secret signing key
+
+    Returns:
+        The curve25519 secret key
+
+    """
+    return nacl.bindings.crypto_sign_ed25519_sk_to_curve25519(secret)
+
+
+@lru_cache(maxsize=KEY_CONVERSION_CACHE_SIZE)
+def pack_sender_material(secret: bytes) -> Tuple[bytes, bytes]:
+    """
+    Derive the sender-side material used to authcrypt a packed message.
+
+    Args:
+        secret: The sender secret signing key
+
+    Returns:
+        A tuple of (base58-encoded sender verkey as bytes, curve25519 secret key)
+
+    """
+    sender_vk = bytes_to_b58(sign_pk_from_sk(secret)).encode("ascii")
+    return sender_vk, ed25519_sk_to_curve25519(secret)
+
+
+def clear_key_conversion_cache():
+    """Discard all memoized key conversions and derived sender material."""
+    ed25519_pk_to_curve25519.cache_clear()
+    ed25519_sk_to_curve25519.cache_clear()
+    pack_sender_material.cache_clear()
+
+
 def validate_seed(seed: (str, bytes)) -> bytes:
     """
     Convert a seed parameter to standard format and check length.
@@ -177,16 +234,15 @@ def prepare_pack_recipient_keys(
     cek = nacl.bindings.crypto_secretstream_xchacha20poly1305_keygen()
     recips = []
 
+    if from_secret:
+        sender_vk, sender_sk = pack_sender_material(from_secret)
+
     for target_vk in to_verkeys:
-        target_pk = nacl.bindings.crypto_sign_ed25519_pk_to_curve25519(target_vk)
+        target_pk = ed25519_pk_to_curve25519(target_vk)
         if from_secret:
-            sender_pk = sign_pk_from_sk(from_secret)
-            sender_vk = bytes_to_b58(sender_pk).encode("ascii")
             enc_sender = nacl.bindings.crypto_box_seal(sender_vk, target_pk)
-            sk = nacl.bindings.crypto_sign_ed25519_sk_to_curve25519(from_secret)
-
             nonce = nacl.utils.random(nacl.bindings.crypto_box_NONCEBYTES)
-            enc_cek = nacl.bindings.crypto_box(cek, nonce, target_pk, sk)
+            enc_cek = nacl.bindings.crypto_box(cek, nonce, target_pk, sender_sk)
         else:
             enc_sender = None
             nonce = None
@@ -506,17 +562,15 @@ def extract_payload_key(sender_cek: dict, recip_secret: bytes) -> Tuple[bytes, s
     Returns: A tuple of the CEK and sender verkey
     """
     recip_vk = sign_pk_from_sk(recip_secret)
-    recip_pk = nacl.bindings.crypto_sign_ed25519_pk_to_curve25519(recip_vk)
-    recip_sk = nacl.bindings.crypto_sign_ed25519_sk_to_curve25519(recip_secret)
+    recip_pk = ed25519_pk_to_curve25519(recip_vk)
+    recip_sk = ed25519_sk_to_curve25519(recip_secret)
 
     if sender_cek["nonce"] and sender_cek["sender"]:
         sender_vk_bin = nacl.bindings.crypto_box_seal_open(
             sender_cek["sender"], recip_pk, recip_sk
         )
         sender_vk = sender_vk_bin.decode("ascii")
-        sender_pk = nacl.bindings.crypto_sign_ed25519_pk_to_curve25519(
-            b58_to_bytes(sender_vk_bin)
-        )
+        sender_pk = ed25519_pk_to_curve25519(b58_to_bytes(sender_vk_bin))
         cek = nacl.bindings.crypto_box_open(
             sender_cek["key"], sender_cek["nonce"], sender_pk, recip_sk
         )
@@ -0,0 +1,196 @@
+"""Pool of pairwise DIDs and signing keys created ahead of demand."""
+
+import asyncio
+import logging
+
+from collections import deque
+
+from ..config.injection_context import InjectionContext
+from ..storage.base import BaseStorage
+from ..storage.error import StorageNotFoundError
+from ..storage.record import StorageRecord
+
+from .base import BaseWallet, DIDInfo, KeyInfo
+from .error import WalletNotFoundError
+
+LOGGER = logging.getLogger(__name__)
+
+
+class WalletKeyPool:
+    """
+    Keep local DIDs and signing keys created in advance for new connections.
+
+    Creating a key pair and writing it to the wallet is taken off the path of
+    connection setup: a new DID or key is handed out from the pool, and the pool
+    is refilled in the background. When the pool is empty, as under a burst of
+    requests on a multi-use invitation, DIDs and keys are created on demand.
+
+    Pooled DIDs and keys carry the `pooled` metadata flag, cleared when handed
+    out, and are indexed in storage so that those left in the pool at shutdown
+    are reloaded on the next start rather than abandoned in the wallet.
+    """
+
+    RECORD_TYPE = "wallet_key_pool"
+    KIND_DID = "did"
+    KIND_KEY = "key"
+
+    def __init__(self, context: InjectionContext, size: int):
+        """
+        Initialize a `WalletKeyPool` instance.
+
+        Args:
+            context: The injection context to use
+            size: The number of DIDs, and of signing keys, to keep ready
+
+        """
+        self.context = context
+        self.size = size
+        self.low_water = max(size // 2, 1)
+        self.hit_count = 0
+        self.miss_count = 0
+        self._dids = deque()
+        self._keys = deque()
+        self._refill_task: asyncio.Future = None
+
+    async def start(self):
+        """Reload the DIDs and keys left in the pool, then fill it in the background."""
+        await self._reload()
+        self._schedule_refill()
+
+    async def _reload(self):
+        """Reload the unused DIDs and keys pooled before the last shutdown."""
+        storage: BaseStorage = await self.context.inject(BaseStorage)
+        wallet: BaseWallet = await self.context.inject(BaseWallet)
+        records = await storage.search_records(self.RECORD_TYPE).fetch_all()
+        for record in records:
+            kind = record.tags.get("kind")
+            try:
+                if kind == self.KIND_DID:
+                    item = await wallet.get_local_did(record.value)
+                else:
+                    item = await wallet.get_signing_key(record.value)
+            except WalletNotFoundError:
+                item = None
+            if item and item.metadata.get("pooled"):
+                (self._dids if kind == self.KIND_DID else self._keys).append(item)
+            else:
+                await storage.delete_record(record)
+        if records:
+            LOGGER.info(
+                "Reloaded %d DIDs and %d keys into the wallet key pool",
+                len(self._dids),
+                len(self._keys),
+            )
+
+    async def stop(self):
+        """Stop refilling the pool."""
+        if self._refill_task:
+            self._refill_task.cancel()
+            await asyncio.gather(self._refill_task, return_exceptions=True)
+            self._refill_task = None
+
+    def _schedule_refill(self):
+        """Start refilling the pool, unless already in progress."""
+        if not self._refill_task or self._refill_task.done():
+            self._refill_task = asyncio.ensure_future(self._refill())
+
+    async def _refill(self):
+        """Create DIDs and signing keys until the pool is full."""
+        wallet: BaseWallet = await self.context.inject(BaseWallet)
+        storage: BaseStorage = await self.context.inject(BaseStorage)
+        try:
+            while len(self._dids) < self.size or len(self._keys) < self.size:
+                if len(self._dids) <= len(self._keys):
+                    did_info = await wallet.create_local_did(metadata={"pooled": True})
+                    await storage.add_record(
+                        StorageRecord(
+                            self.RECORD_TYPE,
+                            did_info.did,
+                            {"kind": self.KIND_DID},
+                            did_info.did,
+                        )
+                    )
+                    self._dids.append(did_info)
+                else:
+                    key_info = await wallet.create_signing_key(
+                        metadata={"pooled": True}
+                    )
+                    await storage.add_record(
+                        StorageRecord(
+                            self.RECORD_TYPE,
+                            key_info.verkey,
+                            {"kind": self.KIND_KEY},
+                            key_info.verkey,
+                        )
+                    )
+                    self._keys.append(key_info)
+        except asyncio.CancelledError:
+            raise
+        except Exception:
+            LOGGER.exception("Error refilling wallet key pool")
+
+    def _take(self, items: deque):
+        """Hand out an item from the pool, refilling as it runs low."""
+        item = items.popleft() if items else None
+        if item:
+            self.hit_count += 1
+        else:
+            self.miss_count += 1
+        if len(items) < self.low_water:
+            self._schedule_refill()
+        return item
+
+    async def _release(self, record_id: str):
+        """Remove a DID or key handed out from the pool index."""
+        storage: BaseStorage = await self.context.inject(BaseStorage)
+        try:
+            await storage.delete_record(
+                StorageRecord(self.RECORD_TYPE, record_id, None, record_id)
+            )
+        except StorageNotFoundError:
+            pass
+
+    async def create_local_did(self) -> DIDInfo:
+        """
+        Get a new local DID, from the pool if available.
+
+        Returns:
+            The `DIDInfo` of a DID not yet in use
+
+        """
+        did_info = self._take(self._dids)
+        wallet: BaseWallet = await self.context.inject(BaseWallet)
+        if not did_info:
+            return await wallet.create_local_did()
+        # no longer reloaded once released, even if the flag is not yet cleared
+        await self._release(did_info.did)
+        metadata = {k: v for (k, v) in did_info.metadata.items() if k != "pooled"}
+        await wallet.replace_local_did_metadata(did_info.did, metadata)
+        return did_info._replace(metadata=metadata)
+
+    async def create_signing_key(self) -> KeyInfo:
+        """
+        Get a new signing key, from the pool if available.
+
+        Returns:
+            The `KeyInfo` of a signing key not yet in use
+
+        """
+        key_info = self._take(self._keys)
+        wallet: BaseWallet = await self.context.inject(BaseWallet)
+        if not key_info:
+            return await wallet.create_signing_key()
+        await self._release(key_info.verkey)
+        metadata = {k: v for (k, v) in key_info.metadata.items() if k != "pooled"}
+        await wallet.replace_signing_key_metadata(key_info.verkey, metadata)
+        return key_info._replace(metadata=metadata)
+
+    def status(self) -> dict:
+        """Get the number of DIDs and keys ready and the pool hit counts."""
+        return {
+            "size": self.size,
+            "dids": len(self._dids),
+            "keys": len(self._keys),
+            "hit_count": self.hit_count,
+            "miss_count": self.miss_count,
+        }
@@ -139,3 +139,31 @@ class TestUtil(TestCase):
                 ]
             )
         assert "Unexpected iv" in str(excinfo.value)
+
+    def test_pack_unpack_key_conversion_cache(self):
+        test_module.clear_key_conversion_cache()
+        (sender_pk, sender_sk) = test_module.create_keypair()
+        recips = [test_module.create_keypair() for _ in range(5)]
+
+        for _ in range(2):
+            packed = test_module.encode_pack_message(
+                "hello", [pk for (pk, _) in recips], sender_sk
+            )
+        info = test_module.ed25519_pk_to_curve25519.cache_info()
+        assert info.currsize == len(recips)
+        assert info.hits == len(recips)
+        assert test_module.pack_sender_material.cache_info().misses == 1
+
+        secrets = {test_module.bytes_to_b58(pk): sk for (pk, sk) in recips}
+        for _ in range(2):
+            (message, sender_vk, recip_vk) = test_module.decode_pack_message(
+                packed, secrets.get
+            )
+            assert message == "hello"
+            assert sender_vk == test_module.bytes_to_b58(sender_pk)
+            assert recip_vk in secrets
+        assert test_module.ed25519_sk_to_curve25519.cache_info().hits >= 1
+
+        test_module.clear_key_conversion_cache()
+        assert test_module.ed25519_pk_to_curve25519.cache_info().currsize == 0
+        assert test_module.pack_sender_material.cache_info().currsize == 0
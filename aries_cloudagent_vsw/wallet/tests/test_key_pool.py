@@ -0,0 +1,120 @@
+import asyncio
+
+from asynctest import TestCase as AsyncTestCase
+from asynctest import mock as async_mock
+
+from ...config.injection_context import InjectionContext
+from ...storage.base import BaseStorage
+from ...storage.basic import BasicStorage
+
+from ..base import BaseWallet
+from ..basic import BasicWallet
+from ..key_pool import WalletKeyPool
+
+
+class TestWalletKeyPool(AsyncTestCase):
+    async def setUp(self):
+        self.wallet = BasicWallet()
+        self.context = InjectionContext(enforce_typing=False)
+        self.storage = BasicStorage()
+        self.context.injector.bind_instance(BaseWallet, self.wallet)
+        self.context.injector.bind_instance(BaseStorage, self.storage)
+        self.pool = WalletKeyPool(self.context, 4)
+
+    async def test_fill_and_take(self):
+        await self.pool.start()
+        await self.pool._refill_task
+        assert self.pool.status()["dids"] == 4
+        assert self.pool.status()["keys"] == 4
+
+        dids = [await self.pool.create_local_did() for _ in range(3)]
+        assert len({did_info.did for did_info in dids}) == 3
+        for did_info in dids:
+            assert await self.wallet.get_local_did(did_info.did) == did_info
+        key_info = await self.pool.create_signing_key()
+        assert await self.wallet.get_signing_key(key_info.verkey) == key_info
+        assert self.pool.hit_count == 4
+
+        # refilled in the background once below half full
+        await self.pool._refill_task
+        assert self.pool.status()["dids"] == 4
+        await self.pool.stop()
+
+    async def test_pooled_flag(self):
+        await self.pool.start()
+        await self.pool._refill_task
+        pooled = self.pool._dids[0]
+        assert (await self.wallet.get_local_did(pooled.did)).metadata == {
+            "pooled": True
+        }
+        did_info = await self.pool.create_local_did()
+        assert did_info.did == pooled.did
+        assert did_info.metadata == {}
+        assert (await self.wallet.get_local_did(did_info.did)).metadata == {}
+        key_info = await self.pool.create_signing_key()
+        assert (await self.wallet.get_signing_key(key_info.verkey)).metadata == {}
+        await self.pool.stop()
+
+    async def test_reload(self):
+        await self.pool.start()
+        await self.pool._refill_task
+        taken = await self.pool.create_local_did()
+        await self.pool._refill()  # full again
+        await self.pool.stop()
+        left = {did_info.did for did_info in self.pool._dids}
+
+        # restarted: the unused DIDs and keys are reused, not created anew
+        pool = WalletKeyPool(self.context, 4)
+        with async_mock.patch.object(
+            self.wallet, "create_local_did", async_mock.CoroutineMock()
+        ) as mock_create_did, async_mock.patch.object(
+            self.wallet, "create_signing_key", async_mock.CoroutineMock()
+        ) as mock_create_key:
+            await pool.start()
+            await pool._refill_task
+            mock_create_did.assert_not_called()
+            mock_create_key.assert_not_called()
+        assert {did_info.did for did_info in pool._dids} == left
+        assert taken.did not in left
+        assert pool.status()["keys"] == 4
+        await pool.stop()
+
+    async def test_reload_released(self):
+        await self.pool.start()
+        await self.pool._refill_task
+        await self.pool.stop()
+        # handed out, but stopped before the index record was removed
+        pooled = self.pool._dids[0]
+        await self.wallet.replace_local_did_metadata(pooled.did, {})
+
+        pool = WalletKeyPool(self.context, 4)
+        pool._schedule_refill = async_mock.MagicMock()
+        await pool.start()
+        assert pooled.did not in {did_info.did for did_info in pool._dids}
+        assert len(pool._dids) == 3
+        records = await self.storage.search_records(
+            WalletKeyPool.RECORD_TYPE, {"kind": WalletKeyPool.KIND_DID}
+        ).fetch_all()
+        assert len(records) == 3
+
+    async def test_empty(self):
+        did_info = await self.pool.create_local_did()
+        assert await self.wallet.get_local_did(did_info.did) == did_info
+        assert self.pool.miss_count == 1
+        await self.pool.stop()
+
+    async def test_concurrent_take(self):
+        await self.pool.start()
+        await self.pool._refill_task
+        dids = await asyncio.gather(*[self.pool.create_local_did() for _ in range(10)])
+        assert len({did_info.did for did_info in dids}) == 10
+        await self.pool.stop()
+
+    async def test_refill_error(self):
+        with async_mock.patch.object(
+            self.wallet, "create_local_did", async_mock.CoroutineMock()
+        ) as mock_create:
+            mock_create.side_effect = ValueError()
+            await self.pool.start()
+            await self.pool._refill_task
+        assert self.pool.status()["dids"] == 0
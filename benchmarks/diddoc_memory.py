@@ -0,0 +1,77 @@
+"""
+Memory and parse time of cached DID documents.
+
+Run from the repository root with `python -m benchmarks.diddoc_memory`.
+"""
+
+import argparse
+import json
+import time
+import tracemalloc
+
+from typing import Tuple
+
+from aries_cloudagent_vsw.connections.did_doc_cache import DIDDocCache
+from aries_cloudagent_vsw.connections.models.diddoc import (
+    DIDDoc,
+    PublicKey,
+    PublicKeyType,
+    Service,
+)
+from aries_cloudagent_vsw.storage.record import StorageRecord
+from aries_cloudagent_vsw.wallet.crypto import create_keypair, seed_to_did
+from aries_cloudagent_vsw.wallet.util import bytes_to_b58
+
+
+def make_doc_json(index: int) -> Tuple[str, str]:
+    """Build a pairwise DID document like those exchanged on connection."""
+    seed = index.to_bytes(32, "big")
+    (verkey, _) = create_keypair(seed)
+    did = seed_to_did(seed)
+    verkey = bytes_to_b58(verkey)
+    doc = DIDDoc(did)
+    pk = PublicKey(did, "1", verkey, PublicKeyType.ED25519_SIG_2018, did, True)
+    doc.set(pk)
+    doc.set(
+        Service(did, "indy", "IndyAgent", [pk], [], f"http://agent-{index}.example", 0)
+    )
+    return did, doc.to_json()
+
+
+def run(count: int) -> dict:
+    """Parse and cache a number of DID documents."""
+    docs = [make_doc_json(index) for index in range(count)]
+    cache = DIDDocCache(max_items=count)
+
+    tracemalloc.start()
+    start = time.perf_counter()
+    for (did, doc_json) in docs:
+        cache.set(did, DIDDoc.from_json(doc_json), StorageRecord("did_doc", doc_json))
+    parse_time = time.perf_counter() - start
+    (current, _) = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    start = time.perf_counter()
+    for (did, _) in docs:
+        cache.get(did)
+    hit_time = time.perf_counter() - start
+
+    return {
+        "docs": count,
+        "memory_mb": round(current / 2 ** 20, 1),
+        "bytes_per_doc": current // count,
+        "parse_per_sec": round(count / parse_time, 1),
+        "cached_per_sec": round(count / hit_time, 1),
+    }
+
+
+def main():
+    """Run the benchmark from the command line."""
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("-n", "--count", type=int, default=100000)
+    args = parser.parse_args()
+    print(json.dumps(run(args.count)))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,357 @@
+"""
+End-to-end throughput and latency of agents connected in memory.
+
+Several agents run in this process, each a full conductor, exchanging
+messages through the loopback transport so that no ports, HTTP servers or
+ledger are needed. Each scenario runs a number of operations, with a
+limited number in flight, and reports one JSON line with the operations and
+messages per second and the latency percentiles of the operations.
+
+The issuance scenario issues credentials from the first agent, over the
+memory ledger with a configurable latency; it requires indy wallets, and so
+libindy.
+
+Run from the repository root with `python -m benchmarks.e2e`.
+"""
+
+import argparse
+import asyncio
+import contextlib
+import io
+import itertools
+import json
+import time
+import uuid
+
+from typing import Awaitable, Callable, Sequence
+
+from aries_cloudagent_vsw.admin.server import AdminResponder
+from aries_cloudagent_vsw.config.default_context import DefaultContextBuilder
+from aries_cloudagent_vsw.core.conductor import Conductor
+from aries_cloudagent_vsw.issuer.base import BaseIssuer
+from aries_cloudagent_vsw.ledger.base import BaseLedger
+from aries_cloudagent_vsw.messaging.responder import BaseResponder
+from aries_cloudagent_vsw.protocols.basicmessage.v1_0.messages.basicmessage import (
+    BasicMessage,
+)
+from aries_cloudagent_vsw.protocols.connections.v1_0.manager import ConnectionManager
+from aries_cloudagent_vsw.protocols.issue_credential.v1_0.manager import (
+    CredentialManager,
+)
+from aries_cloudagent_vsw.protocols.issue_credential.v1_0.messages.credential_proposal import (  # noqa: E501
+    CredentialProposal,
+)
+from aries_cloudagent_vsw.protocols.issue_credential.v1_0.messages.inner.credential_preview import (  # noqa: E501
+    CredAttrSpec,
+    CredentialPreview,
+)
+from aries_cloudagent_vsw.protocols.trustping.v1_0.messages.ping import Ping
+from aries_cloudagent_vsw.transport.inbound.message import InboundMessage
+from aries_cloudagent_vsw.utils.stats import PERCENTILES, Histogram
+from aries_cloudagent_vsw.utils.task_queue import CompletedTask
+from aries_cloudagent_vsw.wallet.base import BaseWallet
+
+
+class BenchConductor(Conductor):
+    """Conductor recording when each inbound message has been handled."""
+
+    def __init__(self, *args, **kwargs):
+        """Initialize a `BenchConductor` instance."""
+        super().__init__(*args, **kwargs)
+        self.handled = {}
+        self.waiting = {}
+
+    def dispatch_complete(self, message: InboundMessage, completed: CompletedTask):
+        """Record the completion of a message, by its type and thread."""
+        super().dispatch_complete(message, completed)
+        payload = message.payload
+        if not isinstance(payload, dict) or "@type" not in payload:
+            return
+        key = (
+            payload["@type"].rsplit("/", 1)[-1],
+            (payload.get("~thread") or {}).get("thid") or payload.get("@id"),
+        )
+        waiter = self.waiting.pop(key, None)
+        if waiter:
+            waiter.set_result(completed.exc_info)
+        else:
+            self.handled[key] = completed.exc_info
+
+    async def handled_message(self, name: str, thread_id: str):
+        """Wait until a message of a type name in a thread has been handled."""
+        key = (name, thread_id)
+        if key in self.handled:
+            exc_info = self.handled.pop(key)
+        else:
+            self.waiting[key] = asyncio.get_event_loop().create_future()
+            exc_info = await self.waiting[key]
+        if exc_info:
+            raise exc_info[1]
+
+
+class Agent:
+    """An agent running in this process, reachable over the loopback transport."""
+
+    def __init__(self, name: str, port: int, settings: dict = None):
+        """
+        Initialize an `Agent` instance.
+
+        Args:
+            name: The label of the agent and the host name of its endpoint
+            port: The port of its endpoint
+            settings: Additional settings for the agent
+
+        """
+        self.name = name
+        self.settings = {
+            "default_label": name,
+            "default_endpoint": f"loopback://{name}:{port}",
+            "transport.inbound_configs": [["loopback", name, port]],
+            "transport.outbound_configs": ["loopback"],
+            "debug.auto_accept_invites": True,
+            "debug.auto_accept_requests": True,
+            **(settings or {}),
+        }
+        self.conductor = BenchConductor(DefaultContextBuilder(self.settings))
+
+    @property
+    def context(self):
+        """Accessor for the context of the agent."""
+        return self.conductor.context
+
+    async def start(self):
+        """Set up and start the agent, which then sends messages directly."""
+        await self.conductor.setup()
+        with contextlib.redirect_stdout(io.StringIO()):
+            await self.conductor.start()
+        self.context.injector.bind_instance(
+            BaseResponder,
+            AdminResponder(
+                self.context, self.conductor.outbound_message_router, self.webhook
+            ),
+        )
+
+    async def stop(self):
+        """Stop the agent, removing any indy wallet it created."""
+        await self.conductor.stop()
+        wallet: BaseWallet = await self.context.inject(BaseWallet)
+        if wallet.type == "indy":
+            await wallet.remove()
+
+    async def webhook(self, topic: str, payload: dict):
+        """Discard a webhook."""
+
+    async def send(self, message, connection_id: str):
+        """Send a message over a connection."""
+        responder: BaseResponder = await self.context.inject(BaseResponder)
+        await responder.send(message, connection_id=connection_id)
+
+    async def handled_message(self, name: str, thread_id: str):
+        """Wait until a message of a type name in a thread has been handled."""
+        await self.conductor.handled_message(name, thread_id)
+
+
+async def connect(inviter: Agent, invitee: Agent) -> Sequence[str]:
+    """Form a connection, returning the identifiers of its two records."""
+    (invitation_record, invitation) = await ConnectionManager(
+        inviter.context
+    ).create_invitation()
+    record = await ConnectionManager(invitee.context).receive_invitation(invitation)
+    await invitee.handled_message("response", record.request_id)
+    return (invitation_record.connection_id, record.connection_id)
+
+
+def issuance_settings(name: str, read_latency: float, write_latency: float) -> dict:
+    """Get the settings of an agent issuing or holding credentials."""
+    return {
+        "wallet.type": "indy",
+        "wallet.name": f"e2e-{name}-{uuid.uuid4().hex}",
+        "ledger.type": "memory",
+        "ledger.pool_name": "e2e",
+        "ledger.memory_read_latency": read_latency,
+        "ledger.memory_write_latency": write_latency,
+        "debug.auto_respond_credential_offer": True,
+        "debug.auto_store_credential": True,
+    }
+
+
+async def publish_cred_def(issuer: Agent) -> str:
+    """Register a public DID for an agent and publish a credential definition."""
+    wallet: BaseWallet = await issuer.context.inject(BaseWallet)
+    public_info = await wallet.create_public_did()
+    ledger: BaseLedger = await issuer.context.inject(BaseLedger)
+    await ledger.register_nym(public_info.did, public_info.verkey)
+    indy_issuer: BaseIssuer = await issuer.context.inject(BaseIssuer)
+    (schema_id, _) = await ledger.create_and_send_schema(
+        indy_issuer, "e2e", "1.0", ["name", "score"]
+    )
+    (cred_def_id, _, _) = await ledger.create_and_send_credential_definition(
+        indy_issuer, schema_id
+    )
+    return cred_def_id
+
+
+async def run_scenario(
+    name: str,
+    operation: Callable[[int], Awaitable],
+    count: int,
+    concurrency: int,
+    messages_per_op: int,
+) -> dict:
+    """Run a number of operations, with a limited number in flight."""
+    histogram = Histogram()
+    max_latency = 0.0
+    limit = asyncio.Semaphore(concurrency)
+
+    async def timed(index: int):
+        nonlocal max_latency
+        async with limit:
+            start = time.perf_counter()
+            await operation(index)
+            latency = time.perf_counter() - start
+        histogram.add(latency)
+        max_latency = max(max_latency, latency)
+
+    start = time.perf_counter()
+    await asyncio.gather(*(timed(index) for index in range(count)))
+    elapsed = time.perf_counter() - start
+    return {
+        "scenario": name,
+        "count": count,
+        "concurrency": concurrency,
+        "elapsed": round(elapsed, 4),
+        "ops_per_sec": round(count / elapsed, 1),
+        "msgs_per_sec": round(count * messages_per_op / elapsed, 1),
+        "latency_ms": dict(
+            {
+                key: round(value * 1000, 3)
+                for (key, value) in histogram.percentiles(PERCENTILES).items()
+            },
+            max=round(max_latency * 1000, 3),
+        ),
+    }
+
+
+async def run(
+    scenarios: Sequence[str],
+    agent_count: int,
+    count: int,
+    concurrency: int,
+    ledger_latency: Sequence[float] = (0.0, 0.0),
+) -> Sequence[dict]:
+    """Start the agents and run the scenarios in order."""
+    agents = [
+        Agent(
+            f"agent{index}",
+            8000 + index,
+            issuance_settings(f"agent{index}", *ledger_latency)
+            if "issuance" in scenarios
+            else None,
+        )
+        for index in range(agent_count)
+    ]
+    for agent in agents:
+        await agent.start()
+    # each pair of the first agent and another, in turn
+    pairs = list(zip(itertools.repeat(agents[0]), agents[1:]))
+    results = []
+    try:
+        connections = [await connect(*pair) for pair in pairs]
+
+        async def connection(index: int):
+            await connect(*pairs[index % len(pairs)])
+
+        async def trust_ping(index: int):
+            (sender, _) = pairs[index % len(pairs)]
+            ping = Ping(response_requested=True)
+            await sender.send(ping, connections[index % len(pairs)][0])
+            await sender.handled_message("ping_response", ping._id)
+
+        async def basic_message(index: int):
+            (sender, receiver) = pairs[index % len(pairs)]
+            message = BasicMessage(content=f"message {index}")
+            await sender.send(message, connections[index % len(pairs)][0])
+            await receiver.handled_message("message", message._id)
+
+        if "issuance" in scenarios:
+            cred_def_id = await publish_cred_def(agents[0])
+
+        async def issuance(index: int):
+            (issuer, _) = pairs[index % len(pairs)]
+            connection_id = connections[index % len(pairs)][0]
+            proposal = CredentialProposal(
+                credential_proposal=CredentialPreview(
+                    attributes=[
+                        CredAttrSpec(name="name", value=f"holder {index}"),
+                        CredAttrSpec(name="score", value=str(index)),
+                    ]
+                ),
+                cred_def_id=cred_def_id,
+            )
+            (record, offer) = await CredentialManager(issuer.context).prepare_send(
+                connection_id, proposal
+            )
+            await issuer.send(offer, connection_id)
+            # offer, request, credential and ack
+            await issuer.handled_message("ack", record.thread_id)
+
+        operations = {
+            "connections": (connection, 2),
+            "trust_pings": (trust_ping, 2),
+            "basic_messages": (basic_message, 1),
+            "issuance": (issuance, 4),
+        }
+        for scenario in scenarios:
+            (operation, messages_per_op) = operations[scenario]
+            result = await run_scenario(
+                scenario, operation, count, concurrency, messages_per_op
+            )
+            result["agents"] = agent_count
+            results.append(result)
+    finally:
+        for agent in agents:
+            await agent.stop()
+    return results
+
+
+SCENARIOS = ("connections", "trust_pings", "basic_messages", "issuance")
+
+
+def main():
+    """Run the benchmark from the command line."""
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("-n", "--count", type=int, default=200)
+    parser.add_argument("-c", "--concurrency", type=int, default=10)
+    parser.add_argument("-a", "--agents", type=int, default=2)
+    parser.add_argument(
+        "-s", "--scenarios", nargs="+", choices=SCENARIOS, default=SCENARIOS[:3]
+    )
+    parser.add_argument(
+        "-l",
+        "--ledger-latency",
+        nargs=2,
+        type=float,
+        default=(0.0, 0.0),
+        metavar=("READ_MS", "WRITE_MS"),
+        help="simulated latency of memory ledger reads and writes, for issuance",
+    )
+    args = parser.parse_args()
+    if args.agents < 2:
+        parser.error("at least two agents are required")
+
+    loop = asyncio.get_event_loop()
+    results = loop.run_until_complete(
+        run(
+            args.scenarios,
+            args.agents,
+            args.count,
+            args.concurrency,
+            [latency / 1000 for latency in args.ledger_latency],
+        )
+    )
+    for result in results:
+        print(json.dumps(result))
+
+
+if __name__ == "__main__":
+    main()
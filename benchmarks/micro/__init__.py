@@ -0,0 +1,10 @@
+"""
+Microbenchmarks of the core hot paths, with regression tracking.
+
+Each benchmark times one operation: packing and unpacking messages, the
+serialization of each protocol message, storage searches, message type
+resolution, wire format parsing, cache access, task queue throughput and
+DID document round trips. Results are compared to a tracked baseline, and a
+run fails when any benchmark is slower than its baseline by more than a
+threshold.
+"""
@@ -0,0 +1,105 @@
+"""
+Run the microbenchmarks and compare them to the baseline.
+
+Run from the repository root with `python -m benchmarks.micro`. The exit
+status is 1 when any benchmark regressed by more than the threshold. As
+timings depend on the machine, regenerate the baseline with `--save` when
+the machine changes, or after an accepted change in performance.
+"""
+
+import argparse
+import asyncio
+import json
+import os
+import sys
+
+from aries_cloudagent_vsw.config.default_context import DefaultContextBuilder
+
+from . import cases
+from .runner import (
+    compare,
+    environment,
+    format_report,
+    load_baseline,
+    run,
+    save_baseline,
+    select,
+)
+
+BASELINE = os.path.join(os.path.dirname(__file__), "baseline.json")
+
+
+async def run_selected(patterns, min_time: float, repeat: int) -> dict:
+    """Build a context, then set up and run the selected benchmarks."""
+    context = await DefaultContextBuilder().build()
+    await cases.register_message_benchmarks(context)
+    return await run(select(patterns), context, min_time, repeat)
+
+
+def main():
+    """Run the benchmarks from the command line."""
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument(
+        "-k",
+        "--select",
+        nargs="+",
+        metavar="PATTERN",
+        help="run only the benchmarks matching any of these glob patterns",
+    )
+    parser.add_argument("-b", "--baseline", default=BASELINE)
+    parser.add_argument(
+        "-t",
+        "--threshold",
+        type=float,
+        default=25.0,
+        help="percentage by which a benchmark may be slower than its baseline",
+    )
+    parser.add_argument(
+        "--min-time",
+        type=float,
+        default=0.05,
+        help="minimum duration of each timed batch, in seconds",
+    )
+    parser.add_argument("-r", "--repeat", type=int, default=5)
+    parser.add_argument(
+        "--save",
+        action="store_true",
+        help="save the results as the baseline instead of failing on regressions",
+    )
+    parser.add_argument(
+        "--json", action="store_true", help="print the comparison as JSON lines"
+    )
+    args = parser.parse_args()
+    if args.threshold < 0:
+        parser.error("the threshold cannot be negative")
+    if args.repeat < 1:
+        parser.error("at least one repeat is required")
+
+    loop = asyncio.get_event_loop()
+    results = loop.run_until_complete(
+        run_selected(args.select, args.min_time, args.repeat)
+    )
+    if not results:
+        parser.error("no benchmark matches the selection")
+    baseline = load_baseline(args.baseline)
+    if baseline["environment"] and baseline["environment"] != environment():
+        print(
+            "warning: the baseline was recorded in another environment: "
+            + json.dumps(baseline["environment"]),
+            file=sys.stderr,
+        )
+    rows = compare(results, baseline, args.threshold / 100)
+    if args.json:
+        for row in rows:
+            print(json.dumps(row))
+    else:
+        print(format_report(rows))
+
+    if args.save:
+        save_baseline(args.baseline, results, baseline)
+    elif any(row["status"] == "regressed" for row in rows):
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,223 @@
+"""The microbenchmarks of the core hot paths."""
+
+import asyncio
+import itertools
+import json
+
+from typing import Callable
+
+from aries_cloudagent_vsw.cache.basic import BasicCache
+from aries_cloudagent_vsw.config.injection_context import InjectionContext
+from aries_cloudagent_vsw.connections.models.diddoc import DIDDoc
+from aries_cloudagent_vsw.core.protocol_registry import ProtocolRegistry
+from aries_cloudagent_vsw.storage.basic import BasicStorage
+from aries_cloudagent_vsw.storage.record import StorageRecord
+from aries_cloudagent_vsw.transport.pack_format import PackWireFormat
+from aries_cloudagent_vsw.utils.task_queue import TaskQueue
+from aries_cloudagent_vsw.wallet import crypto
+from aries_cloudagent_vsw.wallet.base import BaseWallet
+from aries_cloudagent_vsw.wallet.util import bytes_to_b58
+
+from .messages import make_did_doc, sample_messages
+from .runner import benchmark, register
+
+MESSAGE = json.dumps({"@type": "test", "@id": "1", "content": "x" * 512})
+
+
+def pack_benchmark(recipients: int):
+    """Register a benchmark packing a message for a number of recipients."""
+
+    async def setup(context: InjectionContext) -> Callable:
+        (_, sender_sk) = crypto.create_keypair()
+        to_verkeys = [crypto.create_keypair()[0] for _ in range(recipients)]
+        return lambda: crypto.encode_pack_message(MESSAGE, to_verkeys, sender_sk)
+
+    register(f"crypto.pack.{recipients}", setup)
+
+
+for recipients in (1, 5):
+    pack_benchmark(recipients)
+
+
+@benchmark("crypto.unpack")
+async def crypto_unpack(context: InjectionContext) -> Callable:
+    """Unpack a message for one recipient."""
+    (_, sender_sk) = crypto.create_keypair()
+    (pk, sk) = crypto.create_keypair()
+    packed = crypto.encode_pack_message(MESSAGE, [pk], sender_sk)
+    secrets = {bytes_to_b58(pk): sk}
+    return lambda: crypto.decode_pack_message(packed, secrets.get)
+
+
+def message_benchmarks(name: str, message):
+    """Register the serialization and deserialization of a message."""
+    serialized = message.serialize()
+    message_class = type(message)
+
+    async def serialize(context: InjectionContext) -> Callable:
+        return message.serialize
+
+    async def deserialize(context: InjectionContext) -> Callable:
+        return lambda: message_class.deserialize(serialized)
+
+    register(f"model.serialize.{name}", serialize)
+    register(f"model.deserialize.{name}", deserialize)
+
+
+async def register_message_benchmarks(context: InjectionContext):
+    """
+    Register benchmarks of each message class of the protocol registry.
+
+    These depend on the registry of the context, so they are registered once
+    it is built.
+    """
+    registry: ProtocolRegistry = await context.inject(ProtocolRegistry)
+    samples = await sample_messages(await context.inject(BaseWallet))
+    seen = set()
+    for message_type in sorted(registry.message_types):
+        message_class = registry.resolve_message_class(message_type)
+        if message_class in seen:
+            continue  # registered under several type prefixes
+        seen.add(message_class)
+        message = samples.get(message_class) or message_class()
+        # name by protocol and message, without the type prefix
+        message_benchmarks("/".join(message_type.split("/")[-3:]), message)
+
+
+@benchmark("storage.search.tag")
+async def storage_search_tag(context: InjectionContext) -> Callable:
+    """Search for the one record with a tag value among 1000 of its type."""
+    storage = BasicStorage()
+    for index in range(1000):
+        await storage.add_record(
+            StorageRecord(
+                "connection",
+                json.dumps({"index": index}),
+                {"state": "active", "their_did": f"did{index}"},
+            )
+        )
+
+    async def search():
+        await storage.search_records("connection", {"their_did": "did500"}).fetch_all()
+
+    return search
+
+
+@benchmark("storage.search.type")
+async def storage_search_type(context: InjectionContext) -> Callable:
+    """Fetch the first 10 records of a type among 1000 records of 10 types."""
+    storage = BasicStorage()
+    for index in range(1000):
+        await storage.add_record(
+            StorageRecord(f"type{index % 10}", "{}", {"index": str(index)})
+        )
+
+    async def search():
+        async with storage.search_records("type5") as search:
+            await search.fetch(10)
+
+    return search
+
+
+@benchmark("protocol_registry.resolve_message_class")
+async def resolve_message_class(context: InjectionContext) -> Callable:
+    """Resolve each registered message type in turn."""
+    registry: ProtocolRegistry = await context.inject(ProtocolRegistry)
+    message_types = itertools.cycle(sorted(registry.message_types))
+    return lambda: registry.resolve_message_class(next(message_types))
+
+
+@benchmark("wire_format.parse_message.packed")
+async def parse_packed(context: InjectionContext) -> Callable:
+    """Unpack and parse a message sent to a key of the wallet."""
+    wallet: BaseWallet = await context.inject(BaseWallet)
+    recipient = await wallet.create_signing_key()
+    sender = await wallet.create_signing_key()
+    packed = await wallet.pack_message(MESSAGE, [recipient.verkey], sender.verkey)
+    wire_format = PackWireFormat()
+
+    async def parse():
+        await wire_format.parse_message(context, packed)
+
+    return parse
+
+
+@benchmark("wire_format.parse_message.plain")
+async def parse_plain(context: InjectionContext) -> Callable:
+    """Parse a message sent in plain text."""
+    wire_format = PackWireFormat()
+
+    async def parse():
+        await wire_format.parse_message(context, MESSAGE)
+
+    return parse
+
+
+@benchmark("cache.basic.get")
+async def cache_get(context: InjectionContext) -> Callable:
+    """Get each of 1000 cached values in turn."""
+    cache = BasicCache()
+    for index in range(1000):
+        await cache.set(f"key{index}", {"index": index}, 3600)
+    keys = itertools.cycle([f"key{index}" for index in range(1000)])
+
+    async def get():
+        await cache.get(next(keys))
+
+    return get
+
+
+@benchmark("cache.basic.set")
+async def cache_set(context: InjectionContext) -> Callable:
+    """Set each of 1000 cached values in turn."""
+    cache = BasicCache()
+    keys = itertools.cycle([f"key{index}" for index in range(1000)])
+
+    async def set_value():
+        await cache.set(next(keys), {"value": 1}, 3600)
+
+    return set_value
+
+
+@benchmark("task_queue.run.100")
+async def task_queue_run(context: InjectionContext) -> Callable:
+    """Run 100 tasks through a queue of at most 10 active tasks."""
+    queue = TaskQueue(max_active=10)
+
+    async def task():
+        await asyncio.sleep(0)
+
+    async def run():
+        for _ in range(100):
+            queue.put(task())
+        await queue.flush()
+
+    return run
+
+
+@benchmark("diddoc.serialize")
+async def diddoc_serialize(context: InjectionContext) -> Callable:
+    """Serialize a pairwise DID document to JSON."""
+    (verkey, _) = crypto.create_keypair()
+    doc = make_did_doc("GjZWsBLgZCR18aL468JAT7", bytes_to_b58(verkey), "http://a")
+    return doc.to_json
+
+
+@benchmark("diddoc.deserialize")
+async def diddoc_deserialize(context: InjectionContext) -> Callable:
+    """Parse a pairwise DID document from JSON."""
+    (verkey, _) = crypto.create_keypair()
+    doc_json = make_did_doc(
+        "GjZWsBLgZCR18aL468JAT7", bytes_to_b58(verkey), "http://a"
+    ).to_json()
+    return lambda: DIDDoc.from_json(doc_json)
+
+
+@benchmark("diddoc.round_trip")
+async def diddoc_round_trip(context: InjectionContext) -> Callable:
+    """Parse a pairwise DID document and serialize it back."""
+    (verkey, _) = crypto.create_keypair()
+    doc_json = make_did_doc(
+        "GjZWsBLgZCR18aL468JAT7", bytes_to_b58(verkey), "http://a"
+    ).to_json()
+    return lambda: DIDDoc.from_json(doc_json).to_json()
@@ -0,0 +1,239 @@
+"""Sample protocol messages, with contents of realistic size."""
+
+from typing import Mapping
+
+from aries_cloudagent_vsw.connections.models.diddoc import (
+    DIDDoc,
+    PublicKey,
+    PublicKeyType,
+    Service,
+)
+from aries_cloudagent_vsw.messaging.agent_message import AgentMessage
+from aries_cloudagent_vsw.messaging.decorators.attach_decorator import AttachDecorator
+from aries_cloudagent_vsw.protocols.actionmenu.v1_0.messages.perform import Perform
+from aries_cloudagent_vsw.protocols.basicmessage.v1_0.messages.basicmessage import (
+    BasicMessage,
+)
+from aries_cloudagent_vsw.protocols.connections.v1_0.messages.connection_invitation import (  # noqa: E501
+    ConnectionInvitation,
+)
+from aries_cloudagent_vsw.protocols.connections.v1_0.messages.connection_request import (  # noqa: E501
+    ConnectionRequest,
+)
+from aries_cloudagent_vsw.protocols.connections.v1_0.messages.connection_response import (  # noqa: E501
+    ConnectionResponse,
+)
+from aries_cloudagent_vsw.protocols.connections.v1_0.models.connection_detail import (
+    ConnectionDetail,
+)
+from aries_cloudagent_vsw.protocols.discovery.v1_0.messages.query import Query
+from aries_cloudagent_vsw.protocols.introduction.v0_1.messages.forward_invitation import (  # noqa: E501
+    ForwardInvitation,
+)
+from aries_cloudagent_vsw.protocols.introduction.v0_1.messages.invitation import (
+    Invitation,
+)
+from aries_cloudagent_vsw.protocols.introduction.v0_1.messages.invitation_request import (  # noqa: E501
+    InvitationRequest,
+)
+from aries_cloudagent_vsw.protocols.issue_credential.v1_0.messages.credential_issue import (  # noqa: E501
+    CredentialIssue,
+)
+from aries_cloudagent_vsw.protocols.issue_credential.v1_0.messages.credential_offer import (  # noqa: E501
+    CredentialOffer,
+)
+from aries_cloudagent_vsw.protocols.issue_credential.v1_0.messages.credential_proposal import (  # noqa: E501
+    CredentialProposal,
+)
+from aries_cloudagent_vsw.protocols.issue_credential.v1_0.messages.credential_request import (  # noqa: E501
+    CredentialRequest,
+)
+from aries_cloudagent_vsw.protocols.issue_credential.v1_0.messages.inner.credential_preview import (  # noqa: E501
+    CredAttrSpec,
+    CredentialPreview,
+)
+from aries_cloudagent_vsw.protocols.out_of_band.v1_0.messages.invitation import (
+    Invitation as OutOfBandInvitation,
+)
+from aries_cloudagent_vsw.protocols.out_of_band.v1_0.messages.service import (
+    Service as OutOfBandService,
+)
+from aries_cloudagent_vsw.protocols.present_proof.v1_0.messages.inner.presentation_preview import (  # noqa: E501
+    PresAttrSpec,
+    PresentationPreview,
+)
+from aries_cloudagent_vsw.protocols.present_proof.v1_0.messages.presentation import (
+    Presentation,
+)
+from aries_cloudagent_vsw.protocols.present_proof.v1_0.messages.presentation_proposal import (  # noqa: E501
+    PresentationProposal,
+)
+from aries_cloudagent_vsw.protocols.present_proof.v1_0.messages.presentation_request import (  # noqa: E501
+    PresentationRequest,
+)
+from aries_cloudagent_vsw.protocols.routing.v1_0.messages.forward import Forward
+from aries_cloudagent_vsw.wallet.base import BaseWallet
+from aries_cloudagent_vsw.wallet.util import naked_to_did_key
+
+ATTRIBUTES = ("name", "birthdate", "degree", "score", "issued")
+CRED_DEF_ID = "WgWxqztrNooG92RXvxSTWv:3:CL:20:tag"
+SCHEMA_ID = "WgWxqztrNooG92RXvxSTWv:2:degree:1.0"
+# the size of the decimal numbers making up anoncreds structures
+NUMBER = str(7 ** 900)[:617]
+
+
+def make_did_doc(did: str, verkey: str, endpoint: str) -> DIDDoc:
+    """Build a pairwise DID document like those exchanged on connection."""
+    doc = DIDDoc(did)
+    pk = PublicKey(did, "1", verkey, PublicKeyType.ED25519_SIG_2018, did, True)
+    doc.set(pk)
+    doc.set(Service(did, "indy", "IndyAgent", [pk], [], endpoint, 0))
+    return doc
+
+
+def attachment(value: dict) -> AttachDecorator:
+    """Attach an anoncreds structure."""
+    return AttachDecorator.from_indy_dict(value, ident="libindy-0")
+
+
+def credential_preview() -> CredentialPreview:
+    """Build the preview of a credential."""
+    return CredentialPreview(
+        attributes=[
+            CredAttrSpec(name=name, value=f"{name} value") for name in ATTRIBUTES
+        ]
+    )
+
+
+def anoncreds_offer() -> dict:
+    """Build a structure the shape and size of an anoncreds credential offer."""
+    return {
+        "schema_id": SCHEMA_ID,
+        "cred_def_id": CRED_DEF_ID,
+        "nonce": NUMBER[:30],
+        "key_correctness_proof": {
+            "c": NUMBER[:77],
+            "xz_cap": NUMBER,
+            "xr_cap": [[name, NUMBER] for name in ATTRIBUTES + ("master_secret",)],
+        },
+    }
+
+
+def anoncreds_credential() -> dict:
+    """Build a structure the shape and size of an anoncreds credential."""
+    return {
+        "schema_id": SCHEMA_ID,
+        "cred_def_id": CRED_DEF_ID,
+        "rev_reg_id": None,
+        "values": {name: {"raw": name, "encoded": NUMBER[:40]} for name in ATTRIBUTES},
+        "signature": {
+            "p_credential": {"m_2": NUMBER[:77], "a": NUMBER, "e": NUMBER[:150]},
+            "r_credential": None,
+        },
+        "signature_correctness_proof": {"se": NUMBER, "c": NUMBER[:77]},
+        "rev_reg": None,
+        "witness": None,
+    }
+
+
+def proof_request() -> dict:
+    """Build an anoncreds proof request."""
+    return {
+        "name": "proof",
+        "version": "1.0",
+        "nonce": NUMBER[:30],
+        "requested_attributes": {
+            f"{name}_uuid": {
+                "name": name,
+                "restrictions": [{"cred_def_id": CRED_DEF_ID}],
+            }
+            for name in ATTRIBUTES
+        },
+        "requested_predicates": {},
+    }
+
+
+async def sample_messages(wallet: BaseWallet) -> Mapping[type, AgentMessage]:
+    """
+    Build a sample of each message class whose fields are required or large.
+
+    Other message classes are sampled as constructed without arguments.
+    """
+    did_info = await wallet.create_local_did()
+    (did, verkey) = (did_info.did, did_info.verkey)
+    endpoint = "http://agent.example:8020"
+    detail = ConnectionDetail(did=did, did_doc=make_did_doc(did, verkey, endpoint))
+    invitation = ConnectionInvitation(
+        label="Agent", recipient_keys=[verkey], endpoint=endpoint
+    )
+    response = ConnectionResponse(connection=detail)
+    await response.sign_field("connection", verkey, wallet)
+
+    samples = [
+        BasicMessage(content="Hello, " * 20),
+        invitation,
+        ConnectionRequest(label="Agent", connection=detail),
+        response,
+        Perform(name="option", params={"key": "value"}),
+        Query(query="*"),
+        ForwardInvitation(invitation=invitation, message="Meet Agent"),
+        Invitation(invitation=invitation, message="Meet Agent"),
+        InvitationRequest(responder="Agent", message="Please introduce"),
+        OutOfBandInvitation(
+            label="Agent",
+            handshake_protocols=[ConnectionInvitation.Meta.message_type],
+            service=[
+                OutOfBandService(
+                    _id="#inline",
+                    _type="did-communication",
+                    recipient_keys=[naked_to_did_key(verkey)],
+                    routing_keys=[],
+                    service_endpoint=endpoint,
+                )
+            ],
+        ),
+        Forward(to=verkey, msg={"protected": NUMBER, "ciphertext": NUMBER * 2}),
+        CredentialProposal(
+            credential_proposal=credential_preview(), cred_def_id=CRED_DEF_ID
+        ),
+        CredentialOffer(
+            credential_preview=credential_preview(),
+            offers_attach=[attachment(anoncreds_offer())],
+        ),
+        CredentialRequest(
+            requests_attach=[
+                attachment(
+                    {
+                        "prover_did": did,
+                        "cred_def_id": CRED_DEF_ID,
+                        "blinded_ms": {"u": NUMBER, "ur": None},
+                        "nonce": NUMBER[:30],
+                    }
+                )
+            ]
+        ),
+        CredentialIssue(credentials_attach=[attachment(anoncreds_credential())]),
+        PresentationProposal(
+            presentation_proposal=PresentationPreview(
+                attributes=[
+                    PresAttrSpec(name=name, cred_def_id=CRED_DEF_ID)
+                    for name in ATTRIBUTES
+                ]
+            )
+        ),
+        PresentationRequest(request_presentations_attach=[attachment(proof_request())]),
+        Presentation(
+            presentations_attach=[
+                attachment(
+                    {
+                        "proof": {"proofs": [anoncreds_credential()]},
+                        "requested_proof": {"revealed_attrs": {}},
+                        "identifiers": [
+                            {"schema_id": SCHEMA_ID, "cred_def_id": CRED_DEF_ID}
+                        ],
+                    }
+                )
+            ]
+        ),
+    ]
+    return {type(message): message for message in samples}
@@ -0,0 +1,205 @@
+"""Registration, timing and baseline comparison of the microbenchmarks."""
+
+import asyncio
+import fnmatch
+import gc
+import json
+import platform
+import time
+
+from typing import Awaitable, Callable, Mapping, Sequence
+
+from aries_cloudagent_vsw.config.injection_context import InjectionContext
+
+# setup coroutine functions by benchmark name, in order of registration
+BENCHMARKS = {}
+
+
+def register(name: str, setup: Callable[[InjectionContext], Awaitable[Callable]]):
+    """
+    Register a benchmark.
+
+    Args:
+        name: The dotted name of the benchmark
+        setup: Coroutine function preparing the benchmark from a shared context
+            and returning its operation, a function or coroutine function
+            called without arguments
+
+    """
+    if name in BENCHMARKS:
+        raise ValueError(f"Duplicate benchmark: {name}")
+    BENCHMARKS[name] = setup
+
+
+def benchmark(name: str):
+    """Register the decorated setup function as a benchmark."""
+
+    def wrapper(setup):
+        register(name, setup)
+        return setup
+
+    return wrapper
+
+
+def select(patterns: Sequence[str] = None) -> Sequence[str]:
+    """Get the names of the benchmarks matching any of a list of glob patterns."""
+    return [
+        name
+        for name in BENCHMARKS
+        if not patterns
+        or any(fnmatch.fnmatchcase(name, pattern) for pattern in patterns)
+    ]
+
+
+async def time_batch(operation: Callable, number: int) -> float:
+    """
+    Time a number of calls of an operation, in seconds.
+
+    As with `timeit`, garbage collection is disabled while timing.
+    """
+    gc_enabled = gc.isenabled()
+    gc.disable()
+    try:
+        if asyncio.iscoroutinefunction(operation):
+            start = time.perf_counter()
+            for _ in range(number):
+                await operation()
+        else:
+            start = time.perf_counter()
+            for _ in range(number):
+                operation()
+        return time.perf_counter() - start
+    finally:
+        if gc_enabled:
+            gc.enable()
+
+
+async def calibrate(operation: Callable, min_time: float) -> int:
+    """
+    Find the number of calls of an operation making up a timed batch.
+
+    As with `timeit`, the number is raised until a batch lasts at least
+    `min_time`.
+    """
+    number = 1
+    while True:
+        elapsed = await time_batch(operation, number)
+        if elapsed >= min_time:
+            return number
+        number = max(number * 2, int(number * min_time / max(elapsed, 1e-9) * 1.2))
+
+
+async def run(
+    names: Sequence[str], context: InjectionContext, min_time: float, repeat: int
+) -> Mapping[str, dict]:
+    """
+    Set up and measure each of a list of benchmarks.
+
+    The benchmarks are timed in `repeat` rounds, one batch of each per round,
+    and the fastest batch of each is kept, being the least disturbed by the
+    rest of the system. Spreading the batches of a benchmark over the whole
+    run keeps a slow period of the machine from affecting it alone.
+    """
+    operations = {}
+    for name in names:
+        operations[name] = await BENCHMARKS[name](context)
+    numbers = {}
+    for (name, operation) in operations.items():
+        numbers[name] = await calibrate(operation, min_time)
+    best = {}
+    for _ in range(repeat):
+        for (name, operation) in operations.items():
+            gc.collect()
+            elapsed = await time_batch(operation, numbers[name])
+            best[name] = min(best.get(name, elapsed), elapsed)
+    return {
+        name: {"us_per_op": round(best[name] * 1e6 / numbers[name], 3)}
+        for name in names
+    }
+
+
+def environment() -> dict:
+    """Describe the environment of a run, for comparisons to be meaningful."""
+    return {
+        "python": platform.python_version(),
+        "implementation": platform.python_implementation(),
+        "machine": platform.machine(),
+        "system": platform.system(),
+    }
+
+
+def load_baseline(path: str) -> dict:
+    """Load a baseline file, returning an empty baseline if it does not exist."""
+    try:
+        with open(path, "r") as baseline_file:
+            return json.load(baseline_file)
+    except FileNotFoundError:
+        return {"environment": None, "benchmarks": {}}
+
+
+def save_baseline(path: str, results: Mapping[str, dict], merge: dict = None):
+    """Save results as the baseline, keeping any other benchmarks of `merge`."""
+    benchmarks = dict(merge["benchmarks"]) if merge else {}
+    for (name, result) in results.items():
+        benchmarks[name] = {"us_per_op": result["us_per_op"]}
+    with open(path, "w") as baseline_file:
+        json.dump(
+            {"environment": environment(), "benchmarks": benchmarks},
+            baseline_file,
+            indent=2,
+            sort_keys=True,
+        )
+        baseline_file.write("\n")
+
+
+def compare(
+    results: Mapping[str, dict], baseline: dict, threshold: float
+) -> Sequence[dict]:
+    """
+    Compare results to a baseline.
+
+    Args:
+        results: The measured results by benchmark name
+        baseline: The loaded baseline
+        threshold: The fraction by which a benchmark may be slower than its
+            baseline before it is reported as regressed
+
+    Returns:
+        A comparison for each result, with the status "regressed", "improved",
+        "ok", or "new" for a benchmark without a baseline
+
+    """
+    rows = []
+    for (name, result) in results.items():
+        base = baseline["benchmarks"].get(name)
+        row = {"name": name, "us_per_op": result["us_per_op"], "baseline": None}
+        if not base:
+            row["status"] = "new"
+        else:
+            change = result["us_per_op"] / base["us_per_op"] - 1
+            row["baseline"] = base["us_per_op"]
+            row["change"] = round(change, 4)
+            if change > threshold:
+                row["status"] = "regressed"
+            elif change < -threshold:
+                row["status"] = "improved"
+            else:
+                row["status"] = "ok"
+        rows.append(row)
+    return rows
+
+
+def format_report(rows: Sequence[dict]) -> str:
+    """Format a comparison as a text table."""
+    width = max([len(row["name"]) for row in rows] + [9])
+    lines = [f"{'benchmark':<{width}}  {'baseline':>12}  {'current':>12}  change"]
+    for row in rows:
+        baseline = "-" if row["baseline"] is None else f"{row['baseline']:.3f}"
+        change = f"{row['change']:+.1%}" if "change" in row else ""
+        status = "" if row["status"] == "ok" else "  " + row["status"].upper()
+        lines.append(
+            f"{row['name']:<{width}}  {baseline:>12}  {row['us_per_op']:>12.3f}"
+            f"  {change:>7}{status}"
+        )
+    lines.append("(microseconds per operation)")
+    return "\n".join(lines)
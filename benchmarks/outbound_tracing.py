@@ -0,0 +1,130 @@
+"""
+Cost of disabled event tracing on the outbound transport loop.
+
+Messages are queued through an outbound transport manager with a transport
+which encodes and delivers them without any I/O, so that the time measured is
+that of the queue itself. Each run reports the throughput of the loop with the
+tracing decision carried on the messages and with it made on enqueue, and the
+time per message of the trace checks which the loop ran for every encode and
+delivery before the decision was carried.
+
+Run from the repository root with `python -m benchmarks.outbound_tracing`.
+"""
+
+import argparse
+import asyncio
+import json
+import time
+
+from aries_cloudagent_vsw.config.injection_context import InjectionContext
+from aries_cloudagent_vsw.connections.models.connection_target import ConnectionTarget
+from aries_cloudagent_vsw.transport.outbound.base import BaseOutboundTransport
+from aries_cloudagent_vsw.transport.outbound.manager import OutboundTransportManager
+from aries_cloudagent_vsw.transport.outbound.message import OutboundMessage
+from aries_cloudagent_vsw.transport.wire_format import BaseWireFormat
+from aries_cloudagent_vsw.utils.tracing import trace_event
+
+PAYLOAD = json.dumps({"@type": "test", "@id": "1", "content": "x" * 512})
+TARGET = ConnectionTarget(
+    endpoint="bench://localhost", recipient_keys=["key"], sender_key="key"
+)
+
+
+class StubWireFormat(BaseWireFormat):
+    """Wire format returning payloads unchanged."""
+
+    async def encode_message(self, context, message_json, *args, **kwargs):
+        """Return the payload unchanged."""
+        return message_json
+
+
+class StubTransport(BaseOutboundTransport):
+    """Outbound transport which discards messages."""
+
+    schemes = ("bench",)
+
+    def __init__(self):
+        """Initialize a `StubTransport` instance."""
+        super().__init__(StubWireFormat())
+
+    async def start(self):
+        """Start the transport."""
+
+    async def stop(self):
+        """Stop the transport."""
+
+    async def handle_message(self, context, payload, endpoint):
+        """Discard a message."""
+
+
+async def run_loop(count: int, trace: bool) -> float:
+    """Send a number of messages through the outbound queue, returning msgs/sec."""
+    context = InjectionContext()
+    manager = OutboundTransportManager(context)
+    manager.register_class(StubTransport)
+    await manager.start()
+    await manager.task_queue
+
+    messages = [
+        OutboundMessage(payload=PAYLOAD, target=TARGET, trace=trace)
+        for _ in range(count)
+    ]
+    start = time.perf_counter()
+    for message in messages:
+        manager.enqueue_message(context, message)
+    await manager.flush()
+    elapsed = time.perf_counter() - start
+    await manager.stop()
+    return count / elapsed
+
+
+def former_checks(count: int) -> float:
+    """Time the unconditional trace calls once made per message, in microseconds."""
+    settings = InjectionContext().settings
+    message = OutboundMessage(payload=PAYLOAD, target=TARGET)
+    start = time.perf_counter()
+    for _ in range(count):
+        for outcome in ("ENCODE.START", "ENCODE.END"):
+            trace_event(
+                settings, message, outcome="OutboundTransportManager." + outcome
+            )
+        for outcome in ("DELIVER.START.", "DELIVER.END."):
+            trace_event(
+                settings,
+                message,
+                outcome="OutboundTransportManager." + outcome + TARGET.endpoint,
+            )
+    return (time.perf_counter() - start) * 1e6 / count
+
+
+def run(count: int, rounds: int) -> dict:
+    """Run the benchmark, keeping the best of several rounds of each mode."""
+    loop = asyncio.get_event_loop()
+    carried = max(
+        loop.run_until_complete(run_loop(count, False)) for _ in range(rounds)
+    )
+    decided = max(loop.run_until_complete(run_loop(count, None)) for _ in range(rounds))
+    checks = min(former_checks(count) for _ in range(rounds))
+    return {
+        "messages": count,
+        "rounds": rounds,
+        "carried_msgs_per_sec": round(carried, 1),
+        "decided_on_enqueue_msgs_per_sec": round(decided, 1),
+        "loop_us_per_msg": round(1e6 / carried, 2),
+        "former_checks_us_per_msg": round(checks, 2),
+        "former_checks_fraction": round(checks * carried / 1e6, 4),
+    }
+
+
+def main():
+    """Run the benchmark from the command line."""
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("-n", "--messages", type=int, default=5000)
+    parser.add_argument("-r", "--rounds", type=int, default=5)
+    args = parser.parse_args()
+
+    print(json.dumps(run(args.messages, args.rounds)))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,61 @@
+"""
+Pack/unpack throughput benchmark for wallet/crypto.py.
+
+Run from the repository root with `python -m benchmarks.pack_unpack`.
+"""
+
+import argparse
+import json
+import time
+
+from aries_cloudagent_vsw.wallet import crypto
+from aries_cloudagent_vsw.wallet.util import bytes_to_b58
+
+MESSAGE = json.dumps({"@type": "test", "content": "x" * 512})
+
+
+def run(recipients: int, iterations: int, cold: bool) -> dict:
+    """Pack and unpack a message for a number of recipients."""
+    _, sender_sk = crypto.create_keypair()
+    keys = [crypto.create_keypair() for _ in range(recipients)]
+    to_verkeys = [pk for (pk, _) in keys]
+    secrets = {bytes_to_b58(pk): sk for (pk, sk) in keys}
+
+    crypto.clear_key_conversion_cache()
+    start = time.perf_counter()
+    for _ in range(iterations):
+        if cold:
+            crypto.clear_key_conversion_cache()
+        packed = crypto.encode_pack_message(MESSAGE, to_verkeys, sender_sk)
+    pack_time = time.perf_counter() - start
+
+    start = time.perf_counter()
+    for _ in range(iterations):
+        if cold:
+            crypto.clear_key_conversion_cache()
+        crypto.decode_pack_message(packed, secrets.get)
+    unpack_time = time.perf_counter() - start
+
+    return {
+        "recipients": recipients,
+        "iterations": iterations,
+        "cache": "cold" if cold else "warm",
+        "pack_per_sec": round(iterations / pack_time, 1),
+        "unpack_per_sec": round(iterations / unpack_time, 1),
+    }
+
+
+def main():
+    """Run the benchmark from the command line."""
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("-n", "--iterations", type=int, default=500)
+    parser.add_argument("-r", "--recipients", type=int, nargs="+", default=[1, 5, 20])
+    args = parser.parse_args()
+
+    for count in args.recipients:
+        for cold in (True, False):
+            print(json.dumps(run(count, args.iterations, cold)))
+
+
+if __name__ == "__main__":
+    main()